@@ -12,6 +12,7 @@ from app.models.pareja import Pareja
 from app.models.mesa import Mesa
 from app.models.campeonato import Campeonato
 from app.models.resultado import Resultado
+from app.models.clasificacion import Clasificacion
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,60 @@
+"""tabla enfrentamientos: índice de rivales de cada pareja
+
+Revision ID: 3e8b61f0c2a4
+Revises: 7c41e9a2b5d3
+Create Date: 2026-10-17 14:05:12.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b61f0c2a4'
+down_revision: Union[str, None] = '7c41e9a2b5d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'enfrentamientos',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('campeonato_id', sa.Integer(), nullable=False),
+        sa.Column('partida', sa.Integer(), nullable=False),
+        sa.Column('mesa_id', sa.Integer(), nullable=False),
+        sa.Column('pareja_id', sa.Integer(), nullable=False),
+        sa.Column('rival_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['campeonato_id'], ['campeonatos.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['mesa_id'], ['mesas.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['pareja_id'], ['parejas.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['rival_id'], ['parejas.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mesa_id', 'pareja_id', name='uq_enfrentamiento_mesa_pareja')
+    )
+    op.create_index('ix_enfrentamientos_campeonato_pareja', 'enfrentamientos', ['campeonato_id', 'pareja_id', 'partida'], unique=False)
+    op.create_index('ix_enfrentamientos_pareja', 'enfrentamientos', ['pareja_id'], unique=False)
+    op.create_index('ix_enfrentamientos_rival', 'enfrentamientos', ['rival_id'], unique=False)
+
+    # Poblar el índice con las mesas ya sorteadas: una fila por cada pareja sentada
+    op.execute(
+        """
+        INSERT INTO enfrentamientos (campeonato_id, partida, mesa_id, pareja_id, rival_id)
+        SELECT campeonato_id, partida, id, pareja1_id, pareja2_id
+        FROM mesas
+        WHERE campeonato_id IS NOT NULL AND pareja1_id IS NOT NULL
+        UNION ALL
+        SELECT campeonato_id, partida, id, pareja2_id, pareja1_id
+        FROM mesas
+        WHERE campeonato_id IS NOT NULL AND pareja2_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_enfrentamientos_rival', table_name='enfrentamientos')
+    op.drop_index('ix_enfrentamientos_pareja', table_name='enfrentamientos')
+    op.drop_index('ix_enfrentamientos_campeonato_pareja', table_name='enfrentamientos')
+    op.drop_table('enfrentamientos')
@@ -0,0 +1,75 @@
+"""claves foráneas con borrado en cascada, índices de sus columnas y marca de eliminación
+
+Revision ID: 51028bc7ae00
+Revises: d4cab3534280
+Create Date: 2026-10-17 12:45:42.536855
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '51028bc7ae00'
+down_revision: Union[str, None] = 'd4cab3534280'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabla, columna, tabla referenciada, acción al borrar). Las referencias de
+# mesas y resultados a parejas no se incluyen: borrar una pareja que ya ha
+# jugado debe seguir fallando en lugar de borrar sus resultados
+CLAVES_FORANEAS = [
+    ('parejas', 'campeonato_id', 'campeonatos', 'CASCADE'),
+    ('jugadores', 'campeonato_id', 'campeonatos', 'CASCADE'),
+    ('jugadores', 'pareja_id', 'parejas', 'CASCADE'),
+    ('mesas', 'campeonato_id', 'campeonatos', 'CASCADE'),
+    ('resultados', 'campeonato_id', 'campeonatos', 'CASCADE'),
+    ('resultados', 'mesa_id', 'mesas', 'SET NULL'),
+    ('clasificaciones', 'campeonato_id', 'campeonatos', 'CASCADE'),
+    ('clasificaciones', 'id_pareja', 'parejas', 'CASCADE'),
+]
+
+# Índices sobre las columnas que referencian a otra tabla y no tenían uno que
+# empezara por ellas. Sin ellos, cada fila borrada en cascada (o comprobada al
+# borrar su padre) obliga a recorrer la tabla hija entera
+INDICES_CLAVES_FORANEAS = [
+    ('ix_mesas_pareja1', 'mesas', 'pareja1_id'),
+    ('ix_mesas_pareja2', 'mesas', 'pareja2_id'),
+    ('ix_jugadores_pareja', 'jugadores', 'pareja_id'),
+    ('ix_jugadores_campeonato', 'jugadores', 'campeonato_id'),
+    ('ix_resultados_pareja', 'resultados', 'id_pareja'),
+    ('ix_clasificaciones_pareja', 'clasificaciones', 'id_pareja'),
+]
+
+
+def _recrear_claves(con_accion: bool) -> None:
+    for tabla, columna, referida, accion in CLAVES_FORANEAS:
+        nombre = f'{tabla}_{columna}_fkey'
+        op.drop_constraint(nombre, tabla, type_='foreignkey')
+        op.create_foreign_key(
+            nombre,
+            tabla,
+            referida,
+            [columna],
+            ['id'],
+            ondelete=accion if con_accion else None
+        )
+
+
+def upgrade() -> None:
+    op.add_column(
+        'campeonatos',
+        sa.Column('en_eliminacion', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    for nombre, tabla, columna in INDICES_CLAVES_FORANEAS:
+        op.create_index(nombre, tabla, [columna], unique=False)
+    _recrear_claves(con_accion=True)
+
+
+def downgrade() -> None:
+    _recrear_claves(con_accion=False)
+    for nombre, tabla, _ in INDICES_CLAVES_FORANEAS:
+        op.drop_index(nombre, table_name=tabla)
+    op.drop_column('campeonatos', 'en_eliminacion')
@@ -0,0 +1,105 @@
+"""indices compuestos para las rutas calientes
+
+Revision ID: 56e725fb831b
+Revises: afe6ae6a1566
+Create Date: 2026-10-17 09:40:05.918273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '56e725fb831b'
+down_revision: Union[str, None] = 'afe6ae6a1566'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Grupos duplicados que se muestran como máximo en el informe de error
+MAXIMO_GRUPOS_INFORME = 50
+
+
+def _informe_duplicados(tabla: str, columnas: Sequence[str]) -> list:
+    """
+    Busca las filas de una tabla que repiten los valores de unas columnas.
+
+    Args:
+        tabla: Nombre de la tabla
+        columnas: Columnas de la futura restricción única
+
+    Returns:
+        list: Una línea por grupo repetido con sus valores y los IDs de sus filas
+
+    Note:
+        Las filas con alguna columna a NULL no se comparan (la restricción
+        única tampoco las considera iguales)
+    """
+    iguales = " AND ".join(f"o.{c} = t.{c}" for c in columnas)
+    filas = op.get_bind().execute(sa.text(
+        f"SELECT t.id, {', '.join(f't.{c}' for c in columnas)} FROM {tabla} t "
+        f"WHERE EXISTS (SELECT 1 FROM {tabla} o WHERE {iguales} AND o.id <> t.id) "
+        f"ORDER BY {', '.join(f't.{c}' for c in columnas)}, t.id"
+    )).all()
+
+    grupos = {}
+    for fila in filas:
+        grupos.setdefault(tuple(fila[1:]), []).append(fila[0])
+    return [
+        f"  {tabla} ({', '.join(columnas)}) = {valores}: ids {ids}"
+        for valores, ids in grupos.items()
+    ]
+
+
+def upgrade() -> None:
+    # Las restricciones únicas no se pueden crear si ya hay filas repetidas.
+    # No se borra nada: la migración se detiene con la lista de filas en
+    # conflicto para que se revisen a mano (p. ej. qué acta es la buena)
+    informe = (
+        _informe_duplicados('resultados', ('mesa_id', 'id_pareja')) +
+        _informe_duplicados('mesas', ('campeonato_id', 'partida', 'numero'))
+    )
+    if informe:
+        restantes = len(informe) - MAXIMO_GRUPOS_INFORME
+        raise RuntimeError(
+            "Hay filas duplicadas que impiden crear las restricciones únicas "
+            "uq_resultado_mesa_pareja y uq_mesa_campeonato_partida_numero:\n" +
+            "\n".join(informe[:MAXIMO_GRUPOS_INFORME]) +
+            (f"\n  ... y {restantes} grupos más" if restantes > 0 else "") +
+            "\nDeje una sola fila de cada grupo (pasando a la mesa que se conserve "
+            "los resultados de las que se borren) y vuelva a ejecutar la migración"
+        )
+
+    op.create_unique_constraint(
+        'uq_resultado_mesa_pareja',
+        'resultados',
+        ['mesa_id', 'id_pareja']
+    )
+    op.create_index(
+        'ix_resultados_campeonato_partida_mesa',
+        'resultados',
+        ['campeonato_id', 'partida', 'mesa_id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_resultados_campeonato_pareja',
+        'resultados',
+        ['campeonato_id', 'id_pareja'],
+        unique=False
+    )
+    # El índice de esta restricción cubre también las búsquedas por
+    # (campeonato_id, partida), por lo que no se crea un índice aparte
+    op.create_unique_constraint(
+        'uq_mesa_campeonato_partida_numero',
+        'mesas',
+        ['campeonato_id', 'partida', 'numero']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_mesa_campeonato_partida_numero', 'mesas', type_='unique')
+    op.drop_index('ix_resultados_campeonato_pareja', table_name='resultados')
+    op.drop_index('ix_resultados_campeonato_partida_mesa', table_name='resultados')
+    op.drop_constraint('uq_resultado_mesa_pareja', 'resultados', type_='unique')
@@ -1,30 +0,0 @@
-"""create resultados table
-
-Revision ID: 5767953bc7a4
-Revises: 
-Create Date: 2024-11-14 10:41:00.396768
-
-"""
-from typing import Sequence, Union
-
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision: str = '5767953bc7a4'
-down_revision: Union[str, None] = None
-branch_labels: Union[str, Sequence[str], None] = None
-depends_on: Union[str, Sequence[str], None] = None
-
-
-def upgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('resultados', sa.Column('PT', sa.Integer(), nullable=True))
-    # ### end Alembic commands ###
-
-
-def downgrade() -> None:
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_column('resultados', 'PT')
-    # ### end Alembic commands ###
@@ -0,0 +1,29 @@
+"""versión de los datos de cada campeonato para la caché de exportaciones
+
+Revision ID: 7c41e9a2b5d3
+Revises: 51028bc7ae00
+Create Date: 2026-10-17 13:20:12.184406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41e9a2b5d3'
+down_revision: Union[str, None] = '51028bc7ae00'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'campeonatos',
+        sa.Column('version_datos', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('campeonatos', 'version_datos')
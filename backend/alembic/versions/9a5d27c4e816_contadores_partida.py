@@ -0,0 +1,55 @@
+"""contadores_partida: mesas pendientes de cada partida
+
+Revision ID: 9a5d27c4e816
+Revises: 3e8b61f0c2a4
+Create Date: 2026-10-17 16:42:37.509218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a5d27c4e816'
+down_revision: Union[str, None] = '3e8b61f0c2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'contadores_partida',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('campeonato_id', sa.Integer(), nullable=False),
+        sa.Column('partida', sa.Integer(), nullable=False),
+        sa.Column('mesas', sa.Integer(), nullable=False),
+        sa.Column('mesas_pendientes', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['campeonato_id'], ['campeonatos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('campeonato_id', 'partida', name='uq_contador_partida')
+    )
+
+    # Contar las mesas sorteadas y las que aún no tienen el resultado de
+    # todas sus parejas
+    op.execute(
+        """
+        INSERT INTO contadores_partida (campeonato_id, partida, mesas, mesas_pendientes)
+        SELECT m.campeonato_id, m.partida, COUNT(*),
+               SUM(CASE WHEN (m.pareja1_id IS NOT NULL AND NOT EXISTS (
+                                  SELECT 1 FROM resultados r
+                                  WHERE r.mesa_id = m.id AND r.id_pareja = m.pareja1_id))
+                          OR (m.pareja2_id IS NOT NULL AND NOT EXISTS (
+                                  SELECT 1 FROM resultados r
+                                  WHERE r.mesa_id = m.id AND r.id_pareja = m.pareja2_id))
+                        THEN 1 ELSE 0 END)
+        FROM mesas m
+        WHERE m.campeonato_id IS NOT NULL AND m.partida IS NOT NULL
+        GROUP BY m.campeonato_id, m.partida
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('contadores_partida')
@@ -0,0 +1,73 @@
+"""tabla clasificaciones
+
+Revision ID: afe6ae6a1566
+Revises: 5767953bc7a4
+Create Date: 2026-10-17 09:12:31.104552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'afe6ae6a1566'
+down_revision: Union[str, None] = '5767953bc7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'clasificaciones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('campeonato_id', sa.Integer(), nullable=False),
+        sa.Column('id_pareja', sa.Integer(), nullable=False),
+        sa.Column('GB', sa.String(), nullable=False),
+        sa.Column('PG', sa.Integer(), nullable=False),
+        sa.Column('PP', sa.Integer(), nullable=False),
+        sa.Column('RP', sa.Integer(), nullable=False),
+        sa.Column('partidas_jugadas', sa.Integer(), nullable=False),
+        sa.Column('ultima_partida', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['campeonato_id'], ['campeonatos.id']),
+        sa.ForeignKeyConstraint(['id_pareja'], ['parejas.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('campeonato_id', 'id_pareja', name='uq_clasificacion_pareja')
+    )
+    op.create_index(op.f('ix_clasificaciones_id'), 'clasificaciones', ['id'], unique=False)
+    op.create_index('ix_clasificaciones_ranking', 'clasificaciones', ['campeonato_id', 'PG', 'PP'], unique=False)
+    op.create_index('ix_clasificaciones_ranking_grupo', 'clasificaciones', ['campeonato_id', 'GB', 'PG', 'PP'], unique=False)
+
+    # Poblar la clasificación con los resultados ya registrados. El grupo vigente
+    # es el del resultado de la última partida de cada pareja
+    op.execute(
+        """
+        INSERT INTO clasificaciones
+            (campeonato_id, id_pareja, "GB", "PG", "PP", "RP", partidas_jugadas, ultima_partida)
+        SELECT t.campeonato_id, t.id_pareja,
+               COALESCE((SELECT MAX(u."GB") FROM resultados u
+                         WHERE u.campeonato_id = t.campeonato_id
+                           AND u.id_pareja = t.id_pareja
+                           AND u.partida = t.ultima_partida), 'A'),
+               t.pg, t.pp, t.rp, t.jugadas, t.ultima_partida
+        FROM (
+            SELECT campeonato_id, id_pareja,
+                   COALESCE(SUM("PG"), 0) AS pg,
+                   COALESCE(SUM("PP"), 0) AS pp,
+                   COALESCE(SUM("RP"), 0) AS rp,
+                   COUNT(id) AS jugadas,
+                   COALESCE(MAX(partida), 0) AS ultima_partida
+            FROM resultados
+            WHERE campeonato_id IS NOT NULL AND id_pareja IS NOT NULL
+            GROUP BY campeonato_id, id_pareja
+        ) AS t
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_clasificaciones_ranking_grupo', table_name='clasificaciones')
+    op.drop_index('ix_clasificaciones_ranking', table_name='clasificaciones')
+    op.drop_index(op.f('ix_clasificaciones_id'), table_name='clasificaciones')
+    op.drop_table('clasificaciones')
@@ -0,0 +1,76 @@
+"""contador de numeración de parejas por campeonato
+
+Revision ID: d4cab3534280
+Revises: 56e725fb831b
+Create Date: 2026-10-17 12:10:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4cab3534280'
+down_revision: Union[str, None] = '56e725fb831b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'campeonatos',
+        sa.Column('ultimo_numero_pareja', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # Renumerar las parejas con número repetido dentro de un campeonato
+    # (creadas por inscripciones simultáneas). Se conserva el número de la
+    # pareja más antigua y las demás pasan al final de la numeración
+    op.execute(
+        """
+        WITH repetidas AS (
+            SELECT id, campeonato_id,
+                   ROW_NUMBER() OVER (PARTITION BY campeonato_id, numero ORDER BY id) AS orden
+            FROM parejas
+            WHERE numero IS NOT NULL
+        ),
+        maximos AS (
+            SELECT campeonato_id, MAX(numero) AS maximo
+            FROM parejas
+            GROUP BY campeonato_id
+        ),
+        nuevos AS (
+            SELECT r.id,
+                   m.maximo + ROW_NUMBER() OVER (PARTITION BY r.campeonato_id ORDER BY r.id) AS numero
+            FROM repetidas r
+            JOIN maximos m ON m.campeonato_id = r.campeonato_id
+            WHERE r.orden > 1
+        )
+        UPDATE parejas
+        SET numero = (SELECT nuevos.numero FROM nuevos WHERE nuevos.id = parejas.id)
+        WHERE id IN (SELECT id FROM nuevos)
+        """
+    )
+
+    # Inicializar el contador con el mayor número asignado en cada campeonato
+    op.execute(
+        """
+        UPDATE campeonatos
+        SET ultimo_numero_pareja = COALESCE(
+            (SELECT MAX(numero) FROM parejas WHERE parejas.campeonato_id = campeonatos.id),
+            0
+        )
+        """
+    )
+
+    op.create_unique_constraint(
+        'uq_pareja_campeonato_numero',
+        'parejas',
+        ['campeonato_id', 'numero']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_pareja_campeonato_numero', 'parejas', type_='unique')
+    op.drop_column('campeonatos', 'ultimo_numero_pareja')
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from app.core.config import settings
+from app.core.constants import ARTEFACTOS_GRACIA
+
+def clave_artefacto(campeonato_id: int, informe: str, formato: str, version: int) -> str:
+    """
+    Construye la clave de un artefacto exportado.
+
+    Args:
+        campeonato_id: ID del campeonato
+        informe: 'ranking' o 'resultados'
+        formato: 'excel', 'csv' o 'pdf'
+        version: Versión de los datos del campeonato con la que se generó
+
+    Returns:
+        str: Clave del tipo '12-ranking-pdf-v34'
+    """
+    return f"{campeonato_id}-{informe}-{formato}-v{version}"
+
+def _separar_version(clave: str) -> Tuple[str, int]:
+    """Separa la clave en el informe ('12-ranking-pdf') y la versión de los datos."""
+    informe, version = clave.rsplit("-v", 1)
+    return informe, int(version)
+
+class AlmacenArtefactos:
+    """
+    Almacén en disco de archivos exportados, direccionado por contenido.
+
+    Estructura del directorio:
+        objetos/ab/abcdef...  Contenido de cada archivo, con su SHA-256 como nombre
+        indice/<clave>.json   Para cada clave: sha256, nombre sugerido y tamaño
+        tmp/                  Archivos que se están escribiendo
+
+    Note:
+        - La clave incluye la versión de los datos del campeonato, de modo que
+          un cambio en los datos nunca sirve un archivo viejo: simplemente la
+          nueva clave todavía no existe
+        - Al guardar una versión se eliminan las anteriores del mismo informe y
+          los objetos que ya no usa ninguna clave (una generación lenta de una
+          versión vieja no retira la nueva)
+        - Los archivos se publican con os.replace, que es atómico: otro proceso
+          (u otro worker) ve el archivo completo o no lo ve
+        - Los objetos sin clave se borran pasados ARTEFACTOS_GRACIA segundos,
+          por si otro worker acaba de escribirlo y aún no ha creado su índice
+    """
+
+    def __init__(self, directorio: str):
+        """
+        Args:
+            directorio: Carpeta raíz del almacén (se crea si no existe)
+        """
+        self.directorio = directorio
+        self._dir_objetos = os.path.join(directorio, "objetos")
+        self._dir_indice = os.path.join(directorio, "indice")
+        self._dir_tmp = os.path.join(directorio, "tmp")
+        self._lock = threading.Lock()
+        for carpeta in (self._dir_objetos, self._dir_indice, self._dir_tmp):
+            os.makedirs(carpeta, exist_ok=True)
+
+    def _ruta_objeto(self, sha256: str) -> str:
+        return os.path.join(self._dir_objetos, sha256[:2], sha256)
+
+    def _ruta_indice(self, clave: str) -> str:
+        return os.path.join(self._dir_indice, f"{clave}.json")
+
+    def obtener(self, clave: str) -> Optional[Dict[str, object]]:
+        """
+        Busca el archivo guardado para una clave.
+
+        Args:
+            clave: Clave del artefacto (ver clave_artefacto)
+
+        Returns:
+            dict: sha256, nombre, tamano y ruta del archivo; None si no existe
+        """
+        try:
+            with open(self._ruta_indice(clave), encoding="utf-8") as f:
+                entrada = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        ruta = self._ruta_objeto(entrada["sha256"])
+        if not os.path.exists(ruta):
+            return None
+        return {**entrada, "ruta": ruta}
+
+    def guardar(self, clave: str, nombre: str, bloques: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Guarda un archivo mientras se envía al cliente.
+
+        Args:
+            clave: Clave del artefacto
+            nombre: Nombre sugerido para la descarga
+            bloques: Contenido del archivo por bloques
+
+        Yields:
+            bytes: Los mismos bloques, a medida que se escriben en disco
+
+        Note:
+            El archivo solo se publica si se han consumido todos los bloques;
+            si la descarga se corta o la generación falla se descarta
+        """
+        descriptor, temporal = tempfile.mkstemp(dir=self._dir_tmp)
+        resumen = hashlib.sha256()
+        tamano = 0
+        completo = False
+        try:
+            with os.fdopen(descriptor, "wb") as fichero:
+                for bloque in bloques:
+                    fichero.write(bloque)
+                    resumen.update(bloque)
+                    tamano += len(bloque)
+                    yield bloque
+            completo = True
+        finally:
+            if completo:
+                self._publicar(clave, nombre, temporal, resumen.hexdigest(), tamano)
+            elif os.path.exists(temporal):
+                os.remove(temporal)
+
+    def _publicar(self, clave: str, nombre: str, temporal: str, sha256: str, tamano: int) -> None:
+        """Mueve el archivo a su objeto, escribe el índice y retira las versiones anteriores."""
+        ruta = self._ruta_objeto(sha256)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        os.replace(temporal, ruta)
+
+        descriptor, indice_temporal = tempfile.mkstemp(dir=self._dir_tmp)
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump({"sha256": sha256, "nombre": nombre, "tamano": tamano}, f)
+        with self._lock:
+            os.replace(indice_temporal, self._ruta_indice(clave))
+            informe, version = _separar_version(clave)
+
+            def anterior(otra: str) -> bool:
+                otro_informe, otra_version = _separar_version(otra)
+                return otro_informe == informe and otra_version < version
+
+            self._eliminar_claves(anterior)
+
+    def eliminar_campeonato(self, campeonato_id: int) -> None:
+        """Elimina todos los archivos guardados de un campeonato."""
+        with self._lock:
+            self._eliminar_claves(lambda clave: clave.startswith(f"{campeonato_id}-"))
+
+    def _eliminar_claves(self, condicion: Callable[[str], bool]) -> None:
+        """Borra las claves que cumplen la condición y los objetos huérfanos. Requiere el lock."""
+        en_uso = set()
+        for archivo in os.listdir(self._dir_indice):
+            clave = archivo[:-len(".json")]
+            ruta = os.path.join(self._dir_indice, archivo)
+            try:
+                if condicion(clave):
+                    os.remove(ruta)
+                    continue
+            except (FileNotFoundError, ValueError):
+                continue
+            try:
+                with open(ruta, encoding="utf-8") as f:
+                    en_uso.add(json.load(f)["sha256"])
+            except (FileNotFoundError, ValueError, KeyError):
+                continue
+
+        # Los objetos recién escritos pueden estar esperando su índice en otro proceso
+        limite = time.time() - ARTEFACTOS_GRACIA
+        for carpeta in os.listdir(self._dir_objetos):
+            for sha256 in os.listdir(os.path.join(self._dir_objetos, carpeta)):
+                if sha256 in en_uso:
+                    continue
+                ruta = self._ruta_objeto(sha256)
+                try:
+                    if os.path.getmtime(ruta) < limite:
+                        os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+
+# Almacén compartido de las exportaciones
+almacen_exportaciones = AlmacenArtefactos(settings.EXPORTACIONES_DIRECTORIO)
@@ -0,0 +1,143 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from app.core.constants import CACHE_RANKING_CAPACIDAD, CACHE_RANKING_TTL
+
+class CacheLRU:
+    """
+    Caché en memoria del proceso con expulsión LRU y caducidad por tiempo (TTL).
+
+    Cada campeonato tiene un número de versión que se incrementa cada vez que se
+    escriben resultados; las claves incluyen esa versión, de modo que una
+    escritura deja inaccesibles las entradas anteriores sin tener que buscarlas.
+
+    Note:
+        - Es segura entre hilos (los manejadores síncronos se ejecutan en el threadpool)
+        - Con varios workers cada proceso tiene su propia caché y sus versiones;
+          por eso las claves del ranking incluyen además la versión de datos
+          del campeonato leída de la base de datos (Campeonato.version_datos),
+          que cambia con cualquier escritura hecha desde cualquier worker
+    """
+
+    def __init__(self, capacidad: int, ttl: float):
+        """
+        Args:
+            capacidad: Número máximo de entradas
+            ttl: Segundos de validez de cada entrada
+        """
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any, str]]" = OrderedDict()
+        self._versiones: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def version(self, campeonato_id: int) -> int:
+        """Devuelve la versión actual de los resultados de un campeonato."""
+        with self._lock:
+            return self._versiones.get(campeonato_id, 0)
+
+    def invalidar(self, campeonato_id: int) -> None:
+        """
+        Invalida las entradas de un campeonato incrementando su versión.
+
+        Args:
+            campeonato_id: ID del campeonato cuyos resultados han cambiado
+        """
+        with self._lock:
+            self._versiones[campeonato_id] = self._versiones.get(campeonato_id, 0) + 1
+            self.invalidaciones += 1
+
+    def obtener_o_calcular(self, clave: Hashable, calcular: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Devuelve el valor cacheado para la clave o lo calcula y lo guarda.
+
+        Args:
+            clave: Clave de la entrada (debe incluir la versión del campeonato)
+            calcular: Función sin argumentos que produce el valor si no está en caché
+
+        Returns:
+            Tuple[Any, str]: Valor y su ETag (hash del contenido serializado)
+
+        Note:
+            El cálculo se hace fuera del lock: dos peticiones simultáneas pueden
+            calcular el mismo valor, pero ninguna bloquea a las demás
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada and entrada[0] > ahora:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[1], entrada[2]
+            self.fallos += 1
+
+        valor = calcular()
+        etag = calcular_etag(valor)
+
+        with self._lock:
+            self._entradas[clave] = (ahora + self.ttl, valor, etag)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+        return valor, etag
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores de uso de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos, invalidaciones y entradas
+        """
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / total, 4) if total else 0.0,
+                "invalidaciones": self.invalidaciones,
+                "entradas": len(self._entradas),
+                "capacidad": self.capacidad,
+                "ttl": self.ttl
+            }
+
+def calcular_etag(valor: Any) -> str:
+    """
+    Calcula un ETag débil a partir del contenido serializado.
+
+    Note:
+        Al depender solo del contenido, el ETag es el mismo en todos los workers
+        y tras un reinicio, por lo que nunca produce un 304 con datos distintos
+    """
+    contenido = orjson.dumps(valor, default=str, option=orjson.OPT_SORT_KEYS)
+    return f'W/"{hashlib.sha1(contenido).hexdigest()}"'
+
+def respuesta_con_etag(request: Request, valor: Any, etag: str) -> Response:
+    """
+    Construye la respuesta JSON con ETag, o 304 si el cliente ya tiene esa versión.
+
+    Args:
+        request: Petición entrante (se lee la cabecera If-None-Match)
+        valor: Contenido a devolver
+        etag: ETag del contenido
+
+    Returns:
+        Response: 304 sin cuerpo si If-None-Match coincide; JSON con ETag si no
+    """
+    cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etiquetas = {e.strip() for e in if_none_match.split(",")}
+        if "*" in etiquetas or etag in etiquetas:
+            return Response(status_code=304, headers=cabeceras)
+    return ORJSONResponse(content=valor, headers=cabeceras)
+
+# Caché compartida de los rankings de todos los campeonatos
+cache_ranking = CacheLRU(capacidad=CACHE_RANKING_CAPACIDAD, ttl=CACHE_RANKING_TTL)
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -18,6 +19,27 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "375CheyTac")
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "tournament")
     
+    # Pool de conexiones y ajustes del engine desde .env
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))              # Conexiones permanentes del pool
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))        # Conexiones extra en picos de carga
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))        # Segundos de espera por una conexión libre
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Comprobar la conexión antes de usarla
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))      # Segundos antes de reciclar una conexión
+    DB_STATEMENT_TIMEOUT: int = int(os.getenv("DB_STATEMENT_TIMEOUT", "30000"))  # Milisegundos máximos por sentencia (0 = sin límite)
+    DB_APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "tournament-api")  # Nombre visible en pg_stat_activity
+    
+    # Instrumentación de las consultas SQL por petición desde .env
+    SQL_INSTRUMENTACION: bool = os.getenv("SQL_INSTRUMENTACION", "true").lower() == "true"  # Server-Timing y log por petición
+    SQL_DETECTAR_N_MAS_1: bool = os.getenv("SQL_DETECTAR_N_MAS_1", "false").lower() == "true"  # Avisar de sentencias repetidas
+    SQL_UMBRAL_N_MAS_1: int = int(os.getenv("SQL_UMBRAL_N_MAS_1", "5"))   # Repeticiones de una misma sentencia para avisar
+    
+    # Almacén de archivos exportados desde .env
+    EXPORTACIONES_DIRECTORIO: str = os.getenv(
+        "EXPORTACIONES_DIRECTORIO",
+        os.path.join(tempfile.gettempdir(), "tournament-exportaciones")
+    )  # Carpeta de los archivos generados: compartida por los workers, una por base de datos
+    EXPORTACIONES_PREGENERAR: bool = os.getenv("EXPORTACIONES_PREGENERAR", "true").lower() == "true"  # Generar al cerrar una partida
+    
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "")
     
@@ -4,6 +4,15 @@ class GrupoJuego(str, Enum):
     A = "A"
     B = "B"
 
+class FormatoExportacion(str, Enum):
+    EXCEL = "excel"
+    CSV = "csv"
+    PDF = "pdf"
+
+class InformeExportacion(str, Enum):
+    RANKING = "ranking"
+    RESULTADOS = "resultados"
+
 class EstadoPartida(str, Enum):
     NO_INICIADA = "no_iniciada"
     EN_CURSO = "en_curso"
@@ -14,6 +23,12 @@ class EstadoCampeonato(str, Enum):
     ACTIVO = "activo"
     FINALIZADO = "finalizado"
 
+class EstadoTrabajo(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    ERROR = "error"
+
 # Configuración del juego
 PUNTOS_VICTORIA_MESA_LIBRE = 150
 PUNTOS_MINIMOS_DIFERENCIA = 1
@@ -21,6 +36,46 @@ DIFERENCIA_PP_MAXIMA = 300
 MINIMO_PAREJAS_TORNEO = 4
 MAXIMO_PAREJAS_POR_MESA = 2
 
+# Configuración del sorteo suizo
+VENTANA_EMPAREJAMIENTO = 8  # Posiciones exploradas por debajo para evitar repetir rival
+
+# Configuración de las exportaciones
+TAMANO_LOTE_EXPORTACION = 1000  # Filas leídas por lote del cursor de servidor
+TAMANO_BLOQUE_DESCARGA = 64 * 1024  # Bytes por bloque enviado al cliente
+PDF_PROCESOS = 2  # Procesos que renderizan PDF a la vez
+PDF_TAREAS_POR_PROCESO = 50  # PDF generados por un proceso antes de reemplazarlo (libera memoria)
+PDF_TIEMPO_MAXIMO = 120  # Segundos máximos de espera por un PDF
+PDF_FILAS_POR_TABLA = 250  # Filas de cada tabla del PDF (las secciones largas se trocean)
+
+# Configuración de la paginación por cursor de los listados
+PAGINA_POR_DEFECTO = 100  # Registros por página si no se indica límite
+PAGINA_MAXIMA = 1000  # Límite máximo admitido por página
+
+# Configuración de la caché de rankings
+CACHE_RANKING_CAPACIDAD = 256  # Entradas máximas (campeonato, vista y paginación)
+CACHE_RANKING_TTL = 30  # Segundos de validez de cada entrada
+
+# Configuración de los eventos en vivo (SSE)
+EVENTOS_COLA_MAXIMA = 100  # Eventos pendientes por conexión antes de descartar
+EVENTOS_KEEPALIVE = 15  # Segundos entre comentarios de keep-alive
+
+# Configuración de los trabajos en segundo plano
+TRABAJOS_HILOS = 2  # Trabajos ejecutados a la vez por proceso
+TRABAJOS_RETENCION = 3600  # Segundos que se conserva el estado de un trabajo terminado
+TAMANO_LOTE_PURGA = 5000  # Filas borradas por transacción al eliminar un campeonato
+ARTEFACTOS_GRACIA = 300  # Segundos que se conserva un archivo exportado sin clave antes de borrarlo
+
+# Instrumentación de las consultas SQL por petición
+SQL_LONGITUD_MAXIMA_LOG = 500  # Caracteres de una sentencia que se escriben en los logs
+N_MAS_1_MAXIMO_DETECCIONES = 200  # Patrones N+1 distintos que se conservan en memoria
+
+# Cubetas (segundos) de los histogramas de /metrics
+CUBETAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # Peticiones HTTP y tiempo en base de datos
+CUBETAS_EXPORTACION = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)  # Generación de exportaciones
+
+# Bloqueos consultivos de PostgreSQL (pg_advisory_xact_lock(clase, id))
+CLASE_BLOQUEO_CAMPEONATO = 1  # Primer entero de la clave: operaciones sobre un campeonato
+
 # Configuración de grupos
 PORCENTAJE_GRUPO_B = 0.5  # 50% de las parejas van al grupo B
 MINIMO_PAREJAS_GRUPO_B = 4
@@ -3,8 +3,8 @@ from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 
 def get_db() -> Generator[Session, None, None]:
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
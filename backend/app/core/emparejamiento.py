@@ -0,0 +1,144 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from app.core.constants import VENTANA_EMPAREJAMIENTO
+
+# Un enfrentamiento se identifica por el par de IDs de pareja ordenado
+Enfrentamiento = Tuple[int, int]
+MesaSorteada = Tuple[int, Optional[int]]
+
+def clave_enfrentamiento(pareja_a: int, pareja_b: int) -> Enfrentamiento:
+    """
+    Devuelve la clave canónica de un enfrentamiento entre dos parejas.
+
+    Args:
+        pareja_a: ID de una de las parejas
+        pareja_b: ID de la otra pareja
+
+    Returns:
+        Tupla (menor_id, mayor_id), independiente del orden de los argumentos
+    """
+    return (pareja_a, pareja_b) if pareja_a < pareja_b else (pareja_b, pareja_a)
+
+def ordenar_por_clasificacion(
+    pareja_ids: Iterable[int],
+    totales: Dict[int, Tuple[int, int]]
+) -> List[int]:
+    """
+    Ordena las parejas según la clasificación precalculada.
+
+    Args:
+        pareja_ids: IDs de las parejas que participan en el sorteo
+        totales: Diccionario pareja_id -> (PG, PP) acumulados. Las parejas sin
+                 entrada se consideran con 0 partidas ganadas y 0 puntos
+
+    Returns:
+        Lista de IDs ordenada por PG y PP descendentes (desempate por ID)
+
+    Note:
+        Coste O(n log n); no recorre los resultados de cada pareja
+    """
+    def clave(pareja_id: int):
+        pg, pp = totales.get(pareja_id, (0, 0))
+        return (-pg, -pp, pareja_id)
+
+    return sorted(pareja_ids, key=clave)
+
+def elegir_mesa_libre(orden: Sequence[int], con_mesa_libre: Set[int]) -> int:
+    """
+    Elige la pareja que descansará (mesa libre) en una partida con número impar.
+
+    Args:
+        orden: Parejas ordenadas por clasificación (de mejor a peor)
+        con_mesa_libre: Parejas que ya tuvieron mesa libre en el campeonato
+
+    Returns:
+        La pareja peor clasificada que aún no ha tenido mesa libre; si todas la
+        tuvieron ya, la peor clasificada
+    """
+    for pareja_id in reversed(orden):
+        if pareja_id not in con_mesa_libre:
+            return pareja_id
+    return orden[-1]
+
+def emparejar_suizo(
+    orden: Sequence[int],
+    historial: Set[Enfrentamiento],
+    con_mesa_libre: Optional[Set[int]] = None,
+    ventana: int = VENTANA_EMPAREJAMIENTO
+) -> List[MesaSorteada]:
+    """
+    Empareja las parejas por sistema suizo evitando repetir rivales.
+
+    Cada pareja, de mejor a peor clasificada, se enfrenta a la siguiente pareja
+    libre contra la que no haya jugado, buscando como mucho `ventana` posiciones
+    por debajo. Si no hay ninguna, se acepta la repetición con la más cercana y
+    después se intenta deshacer intercambiando rivales con mesas próximas.
+
+    Args:
+        orden: IDs de las parejas ordenados por clasificación (de mejor a peor)
+        historial: Conjunto de claves de enfrentamientos ya jugados en el campeonato
+        con_mesa_libre: Parejas que ya tuvieron mesa libre (para repartirla)
+        ventana: Número máximo de posiciones que se exploran por debajo
+
+    Returns:
+        Lista de mesas (pareja1_id, pareja2_id) en orden de clasificación; con un
+        número impar de parejas la última mesa es la mesa libre (pareja2_id None)
+
+    Note:
+        El coste es O(n · ventana), sin contar la ordenación previa
+    """
+    if not orden:
+        return []
+
+    pendientes = deque(orden)
+    mesa_libre = None
+    if len(pendientes) % 2 == 1:
+        mesa_libre = elegir_mesa_libre(orden, con_mesa_libre or set())
+        pendientes.remove(mesa_libre)
+
+    mesas: List[MesaSorteada] = []
+    while pendientes:
+        pareja = pendientes.popleft()
+        elegido = 0
+        for i in range(min(ventana, len(pendientes))):
+            if clave_enfrentamiento(pareja, pendientes[i]) not in historial:
+                elegido = i
+                break
+        rival = pendientes[elegido]
+        del pendientes[elegido]
+        mesas.append((pareja, rival))
+
+    _reparar_repeticiones(mesas, historial, ventana)
+
+    if mesa_libre is not None:
+        mesas.append((mesa_libre, None))
+    return mesas
+
+def _reparar_repeticiones(
+    mesas: List[MesaSorteada],
+    historial: Set[Enfrentamiento],
+    ventana: int
+) -> None:
+    """
+    Intenta eliminar los enfrentamientos repetidos intercambiando rivales con
+    alguna de las `ventana` mesas anteriores. Modifica la lista en el sitio.
+
+    Args:
+        mesas: Mesas emparejadas (sin mesa libre)
+        historial: Conjunto de enfrentamientos ya jugados
+        ventana: Número máximo de mesas anteriores que se exploran
+    """
+    def nuevo(a: int, b: int) -> bool:
+        return clave_enfrentamiento(a, b) not in historial
+
+    for i, (a, b) in enumerate(mesas):
+        if nuevo(a, b):
+            continue
+        for j in range(i - 1, max(-1, i - 1 - ventana), -1):
+            c, d = mesas[j]
+            if nuevo(c, a) and nuevo(d, b):
+                mesas[j], mesas[i] = (c, a), (d, b)
+                break
+            if nuevo(c, b) and nuevo(d, a):
+                mesas[j], mesas[i] = (c, b), (d, a)
+                break
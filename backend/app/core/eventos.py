@@ -0,0 +1,123 @@
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any, Dict, Set, Tuple
+from app.core.constants import EVENTOS_COLA_MAXIMA
+
+# Tipos de evento publicados a los clientes de un campeonato
+EVENTO_RESULTADO = "resultado"        # Se han registrado resultados de una o varias mesas
+EVENTO_RESULTADO_ELIMINADO = "resultado_eliminado"  # Se han borrado los resultados de una mesa
+EVENTO_GB = "gb"                      # Ha cambiado el grupo de una pareja
+EVENTO_SORTEO = "sorteo"              # Se han sorteado las mesas de una partida
+EVENTO_MESAS_ELIMINADAS = "mesas_eliminadas"  # Se han eliminado las mesas del campeonato
+EVENTO_PARTIDA = "partida"            # Ha empezado o terminado una partida
+EVENTO_RESINCRONIZAR = "resincronizar"  # Se han perdido eventos: el cliente debe recargar todo
+
+Suscripcion = Tuple[asyncio.AbstractEventLoop, asyncio.Queue]
+
+class BrokerEventos:
+    """
+    Distribuidor de eventos en memoria del proceso, agrupados por campeonato.
+
+    Los servicios publican desde los hilos del threadpool y cada conexión SSE
+    abierta recibe los eventos en su propia cola asyncio.
+
+    Note:
+        - publicar() es seguro desde cualquier hilo: entrega los eventos en el
+          bucle de cada suscriptor con call_soon_threadsafe
+        - Si un cliente lento llena su cola se vacía y se deja en ella un único
+          evento 'resincronizar': los eventos pendientes se pierden y el
+          cliente debe recargar los datos completos, ya que los cambios que
+          aplica como diferencias dejarían de cuadrar
+        - Con varios workers cada proceso solo ve sus propias escrituras
+    """
+
+    def __init__(self, cola_maxima: int = EVENTOS_COLA_MAXIMA):
+        """
+        Args:
+            cola_maxima: Eventos pendientes máximos por suscriptor
+        """
+        self.cola_maxima = cola_maxima
+        self._suscriptores: Dict[int, Set[Suscripcion]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def suscribir(self, campeonato_id: int) -> Suscripcion:
+        """
+        Registra un nuevo suscriptor. Debe llamarse desde el bucle de eventos.
+
+        Args:
+            campeonato_id: ID del campeonato cuyos eventos se quieren recibir
+
+        Returns:
+            Suscripción (bucle, cola) que hay que pasar a cancelar() al terminar
+        """
+        suscripcion = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.cola_maxima))
+        with self._lock:
+            self._suscriptores.setdefault(campeonato_id, set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, campeonato_id: int, suscripcion: Suscripcion) -> None:
+        """Elimina un suscriptor de un campeonato."""
+        with self._lock:
+            suscriptores = self._suscriptores.get(campeonato_id)
+            if suscriptores is not None:
+                suscriptores.discard(suscripcion)
+                if not suscriptores:
+                    del self._suscriptores[campeonato_id]
+
+    def suscriptores(self, campeonato_id: int) -> int:
+        """Número de conexiones abiertas para un campeonato."""
+        with self._lock:
+            return len(self._suscriptores.get(campeonato_id, ()))
+
+    def publicar(self, campeonato_id: int, tipo: str, datos: Dict[str, Any]) -> None:
+        """
+        Envía un evento a todos los suscriptores de un campeonato.
+
+        Args:
+            campeonato_id: ID del campeonato
+            tipo: Tipo de evento (EVENTO_*)
+            datos: Contenido del evento; debe ser serializable a JSON
+
+        Note:
+            Llamar solo después de confirmar la transacción, para no anunciar
+            cambios que luego se deshacen
+        """
+        with self._lock:
+            suscriptores = list(self._suscriptores.get(campeonato_id, ()))
+        if not suscriptores:
+            return
+
+        evento = formatear_evento(next(self._ids), tipo, datos)
+        for loop, cola in suscriptores:
+            try:
+                loop.call_soon_threadsafe(self._encolar, cola, evento)
+            except RuntimeError:
+                # El bucle del suscriptor ya se ha cerrado
+                pass
+
+    def _encolar(self, cola: asyncio.Queue, evento: str) -> None:
+        """
+        Añade el evento a la cola; si el cliente no da abasto, sustituye todo
+        lo pendiente por un evento 'resincronizar'.
+        """
+        try:
+            cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            while not cola.empty():
+                cola.get_nowait()
+            cola.put_nowait(formatear_evento(next(self._ids), EVENTO_RESINCRONIZAR, {}))
+
+def formatear_evento(id_evento: int, tipo: str, datos: Dict[str, Any]) -> str:
+    """
+    Da formato server-sent events a un evento.
+
+    Returns:
+        str: Bloque 'id/event/data' terminado en línea en blanco
+    """
+    return f"id: {id_evento}\nevent: {tipo}\ndata: {json.dumps(datos, default=str)}\n\n"
+
+# Broker compartido por toda la aplicación
+broker_eventos = BrokerEventos()
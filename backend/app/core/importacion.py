@@ -0,0 +1,112 @@
+import csv
+import io
+from typing import Dict, Iterable, List, Optional
+
+# Columnas reconocidas en los archivos de inscripción (en minúsculas, sin espacios
+# alrededor). El club es opcional
+COLUMNAS_INSCRIPCION = {
+    "jugador1_nombre",
+    "jugador1_apellido",
+    "jugador2_nombre",
+    "jugador2_apellido",
+    "club",
+}
+COLUMNAS_OBLIGATORIAS = COLUMNAS_INSCRIPCION - {"club"}
+
+class ErrorImportacion(ValueError):
+    """
+    Error de formato en un archivo de inscripción.
+
+    Attributes:
+        errores: Lista de mensajes, uno por fila o columna con problemas
+    """
+
+    def __init__(self, errores: List[str]):
+        super().__init__("; ".join(errores))
+        self.errores = errores
+
+def _normalizar_filas(filas: Iterable[Iterable]) -> List[Dict[str, str]]:
+    """
+    Convierte las filas de un archivo (cabecera incluida) en diccionarios.
+
+    Args:
+        filas: Filas del archivo; la primera es la cabecera
+
+    Returns:
+        Lista de diccionarios columna -> valor, sin filas vacías
+
+    Raises:
+        ErrorImportacion: Si faltan columnas obligatorias o algún valor obligatorio
+    """
+    iterador = iter(filas)
+    cabecera = next(iterador, None)
+    if cabecera is None:
+        raise ErrorImportacion(["El archivo está vacío"])
+
+    columnas = [str(c or "").strip().lower() for c in cabecera]
+    faltan = sorted(COLUMNAS_OBLIGATORIAS - set(columnas))
+    if faltan:
+        raise ErrorImportacion([f"Faltan las columnas: {', '.join(faltan)}"])
+
+    inscripciones = []
+    errores = []
+    # La fila 1 es la cabecera
+    for numero_fila, fila in enumerate(iterador, 2):
+        valores = {
+            columna: str(valor).strip() if valor is not None else ""
+            for columna, valor in zip(columnas, fila)
+            if columna in COLUMNAS_INSCRIPCION
+        }
+        if not any(valores.values()):
+            continue
+        vacias = sorted(c for c in COLUMNAS_OBLIGATORIAS if not valores.get(c))
+        if vacias:
+            errores.append(f"Fila {numero_fila}: faltan {', '.join(vacias)}")
+            continue
+        valores["fila"] = numero_fila
+        inscripciones.append(valores)
+
+    if errores:
+        raise ErrorImportacion(errores)
+    return inscripciones
+
+def leer_inscripciones(nombre_archivo: Optional[str], contenido: bytes) -> List[Dict[str, str]]:
+    """
+    Lee un archivo CSV o XLSX de inscripciones de parejas.
+
+    Args:
+        nombre_archivo: Nombre del archivo subido (determina el formato por la extensión)
+        contenido: Bytes del archivo
+
+    Returns:
+        Lista de inscripciones con jugador1_nombre, jugador1_apellido,
+        jugador2_nombre, jugador2_apellido, club y el número de fila de origen
+
+    Raises:
+        ErrorImportacion: Si el formato no es válido o hay filas incompletas
+
+    Note:
+        El CSV puede venir separado por comas o por punto y coma (Excel en
+        español) y con o sin BOM
+    """
+    nombre = (nombre_archivo or "").lower()
+    if nombre.endswith(".xlsx"):
+        from openpyxl import load_workbook
+        libro = load_workbook(io.BytesIO(contenido), read_only=True, data_only=True)
+        try:
+            return _normalizar_filas(libro.active.iter_rows(values_only=True))
+        finally:
+            libro.close()
+
+    if nombre.endswith(".csv"):
+        try:
+            texto = contenido.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            texto = contenido.decode("latin-1")
+        try:
+            dialecto = csv.Sniffer().sniff(texto.split("\n", 1)[0], delimiters=",;")
+        except csv.Error:
+            dialecto = csv.excel
+        return _normalizar_filas(csv.reader(io.StringIO(texto), dialecto))
+
+    raise ErrorImportacion(["Formato no soportado: se admite CSV o XLSX"])
@@ -0,0 +1,263 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.constants import (
+    N_MAS_1_MAXIMO_DETECCIONES,
+    SQL_LONGITUD_MAXIMA_LOG
+)
+
+logger = logging.getLogger("app.sql")
+
+# Parámetros de una sentencia tal como llegan al driver: %(nombre)s en psycopg2, ? en SQLite
+_PARAMETRO = r"(?:%\([^)]+\)s|\?)"
+# Listas de parámetros de un IN expandido: (%(id_1_1)s, %(id_1_2)s, ...) o (?, ?, ...)
+_LISTA_PARAMETROS = re.compile(rf"\(\s*{_PARAMETRO}(?:\s*,\s*{_PARAMETRO})*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+def forma_sentencia(sentencia: str) -> str:
+    """
+    Normaliza una sentencia SQL a su forma, sin los valores concretos.
+
+    Args:
+        sentencia: SQL tal como se envía al driver
+
+    Returns:
+        str: Sentencia con los espacios compactados y las listas de parámetros
+             reducidas a '(?)', de modo que 'WHERE id IN (1, 2)' y
+             'WHERE id IN (3, 4, 5)' tienen la misma forma
+
+    Note:
+        Las sentencias de SQLAlchemy ya llevan los valores como parámetros, así
+        que dos consultas con la misma forma solo difieren en sus valores
+    """
+    forma = _LISTA_PARAMETROS.sub("(?)", sentencia)
+    return _ESPACIOS.sub(" ", forma).strip()
+
+class MetricasPeticion:
+    """
+    Consultas SQL ejecutadas durante una petición HTTP.
+
+    Attributes:
+        consultas (int): Número de sentencias ejecutadas
+        tiempo_ms (float): Tiempo total en la base de datos
+        lenta_ms (float): Duración de la sentencia más lenta
+        lenta (str): Texto de la sentencia más lenta
+        formas (Counter): Repeticiones de cada forma de sentencia (solo si se
+                          detectan N+1)
+
+    Note:
+        Los manejadores síncronos se ejecutan en el threadpool con una copia del
+        contexto, así que comparten este objeto con el middleware; el lock
+        protege las peticiones que lanzan consultas desde varios hilos
+    """
+
+    def __init__(self, detectar_n_mas_1: bool = False):
+        self.detectar_n_mas_1 = detectar_n_mas_1
+        self.consultas = 0
+        self.tiempo_ms = 0.0
+        self.lenta_ms = 0.0
+        self.lenta = ""
+        self.formas: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def registrar(self, sentencia: str, duracion_ms: float) -> None:
+        """Añade una sentencia ejecutada y su duración."""
+        forma = forma_sentencia(sentencia) if self.detectar_n_mas_1 else None
+        with self._lock:
+            self.consultas += 1
+            self.tiempo_ms += duracion_ms
+            if duracion_ms > self.lenta_ms:
+                self.lenta_ms = duracion_ms
+                self.lenta = sentencia
+            if forma is not None:
+                self.formas[forma] += 1
+
+    def repetidas(self, umbral: int) -> List[Tuple[str, int]]:
+        """
+        Devuelve las formas de sentencia que se repiten al menos 'umbral' veces.
+
+        Returns:
+            list: Pares (forma, repeticiones) de mayor a menor número de repeticiones
+        """
+        with self._lock:
+            return [(forma, veces) for forma, veces in self.formas.most_common() if veces >= umbral]
+
+_metricas_actuales: ContextVar[Optional[MetricasPeticion]] = ContextVar("metricas_sql", default=None)
+
+def metricas_actuales() -> Optional[MetricasPeticion]:
+    """Devuelve las métricas de la petición en curso, o None fuera de una petición."""
+    return _metricas_actuales.get()
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _metricas_actuales.get() is not None and context is not None:
+        context.inicio_consulta = time.perf_counter()
+
+def _registrar_sentencia(context, statement: str) -> None:
+    """Registra en la petición en curso la duración de una sentencia, con o sin error."""
+    metricas = _metricas_actuales.get()
+    inicio = getattr(context, "inicio_consulta", None)
+    if metricas is None or inicio is None:
+        return
+    metricas.registrar(statement, (time.perf_counter() - inicio) * 1000)
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    _registrar_sentencia(context, statement)
+
+def _error_al_ejecutar(contexto_error) -> None:
+    if contexto_error.statement is not None:
+        _registrar_sentencia(contexto_error.execution_context, contexto_error.statement)
+
+def instrumentar_engine(engine: Engine) -> None:
+    """
+    Registra los eventos que miden cada sentencia ejecutada por el engine.
+
+    Args:
+        engine: Engine de la aplicación
+
+    Note:
+        - Fuera de una petición instrumentada (scripts, trabajos en segundo
+          plano lanzados en otros hilos) los eventos no hacen nada
+        - El inicio de cada sentencia se guarda en su contexto de ejecución,
+          que se descarta con ella: una sentencia que falla (p. ej. por una
+          restricción de unicidad) se registra en handle_error y no deja
+          nada pendiente en la conexión
+    """
+    event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+    event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+    event.listen(engine, "handle_error", _error_al_ejecutar)
+
+class RegistroNMas1:
+    """
+    Patrones N+1 detectados desde el arranque, agrupados por endpoint y forma.
+
+    Note:
+        Guarda como máximo N_MAS_1_MAXIMO_DETECCIONES patrones distintos; los
+        nuevos se descartan una vez alcanzado el límite
+    """
+
+    def __init__(self, capacidad: int):
+        self.capacidad = capacidad
+        self._detecciones: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def anotar(self, endpoint: str, forma: str, repeticiones: int) -> None:
+        """Anota una petición del endpoint que repitió la forma de sentencia."""
+        with self._lock:
+            deteccion = self._detecciones.get((endpoint, forma))
+            if deteccion is None:
+                if len(self._detecciones) >= self.capacidad:
+                    return
+                deteccion = {
+                    "endpoint": endpoint,
+                    "sentencia": forma[:SQL_LONGITUD_MAXIMA_LOG],
+                    "peticiones": 0,
+                    "repeticiones_max": 0
+                }
+                self._detecciones[(endpoint, forma)] = deteccion
+            deteccion["peticiones"] += 1
+            deteccion["repeticiones_max"] = max(deteccion["repeticiones_max"], repeticiones)
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """Devuelve los patrones detectados, primero los que más se repiten."""
+        with self._lock:
+            detecciones = [dict(deteccion) for deteccion in self._detecciones.values()]
+        return sorted(detecciones, key=lambda d: (d["repeticiones_max"], d["peticiones"]), reverse=True)
+
+registro_n_mas_1 = RegistroNMas1(N_MAS_1_MAXIMO_DETECCIONES)
+
+class InstrumentacionSQLMiddleware:
+    """
+    Middleware ASGI que mide las consultas SQL de cada petición HTTP.
+
+    Para cada petición añade la cabecera Server-Timing con el tiempo total en
+    base de datos, el número de consultas y la sentencia más lenta, y escribe
+    una línea de log JSON en el logger 'app.sql'. Con la detección de N+1
+    activada, las formas de sentencia que se repiten al menos 'umbral_n_mas_1'
+    veces en una misma petición se registran como aviso y en registro_n_mas_1.
+
+    Note:
+        - Es un middleware ASGI puro y no BaseHTTPMiddleware para no interferir
+          con las respuestas en streaming (eventos SSE)
+        - La cabecera se escribe al empezar la respuesta: las consultas hechas
+          mientras se envía el cuerpo solo cuentan en el log
+    """
+
+    def __init__(self, app, detectar_n_mas_1: bool = False, umbral_n_mas_1: int = 5):
+        self.app = app
+        self.detectar_n_mas_1 = detectar_n_mas_1
+        self.umbral_n_mas_1 = umbral_n_mas_1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metricas = MetricasPeticion(self.detectar_n_mas_1)
+        token = _metricas_actuales.set(metricas)
+        inicio = time.perf_counter()
+        estado = {"codigo": 500}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+                total_ms = (time.perf_counter() - inicio) * 1000
+                cabeceras = list(mensaje.get("headers", []))
+                cabeceras.append((b"server-timing", _server_timing(metricas, total_ms).encode("latin-1")))
+                mensaje = {**mensaje, "headers": cabeceras}
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _metricas_actuales.reset(token)
+            self._registrar(scope, metricas, estado["codigo"], (time.perf_counter() - inicio) * 1000)
+
+    def _registrar(self, scope, metricas: MetricasPeticion, codigo: int, total_ms: float) -> None:
+        """Escribe el log de la petición y anota los patrones N+1 detectados."""
+        endpoint = scope.get("endpoint")
+        nombre = getattr(endpoint, "__name__", scope["path"])
+        logger.info(orjson.dumps({
+            "metodo": scope["method"],
+            "ruta": scope["path"],
+            "endpoint": nombre,
+            "estado": codigo,
+            "duracion_ms": round(total_ms, 2),
+            "consultas": metricas.consultas,
+            "db_ms": round(metricas.tiempo_ms, 2),
+            "lenta_ms": round(metricas.lenta_ms, 2),
+            "lenta": metricas.lenta[:SQL_LONGITUD_MAXIMA_LOG]
+        }).decode())
+
+        if not self.detectar_n_mas_1:
+            return
+        for forma, repeticiones in metricas.repetidas(self.umbral_n_mas_1):
+            registro_n_mas_1.anotar(nombre, forma, repeticiones)
+            logger.warning(orjson.dumps({
+                "n_mas_1": True,
+                "metodo": scope["method"],
+                "ruta": scope["path"],
+                "endpoint": nombre,
+                "repeticiones": repeticiones,
+                "sentencia": forma[:SQL_LONGITUD_MAXIMA_LOG]
+            }).decode())
+
+def _server_timing(metricas: MetricasPeticion, total_ms: float) -> str:
+    """
+    Construye el valor de la cabecera Server-Timing.
+
+    Returns:
+        str: Métricas 'db' (tiempo y número de consultas), 'db-lenta' (sentencia
+             más lenta) y 'app' (tiempo total hasta la respuesta)
+    """
+    return (
+        f'db;dur={metricas.tiempo_ms:.2f};desc="{metricas.consultas} consultas", '
+        f"db-lenta;dur={metricas.lenta_ms:.2f}, "
+        f"app;dur={total_ms:.2f}"
+    )
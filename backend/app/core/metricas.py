@@ -0,0 +1,309 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.core.cache import cache_ranking
+from app.core.constants import CUBETAS_EXPORTACION, CUBETAS_LATENCIA
+from app.core.instrumentacion import metricas_actuales
+from app.db.session import estado_pool
+
+def _escapar(valor: str) -> str:
+    """Escapa el valor de una etiqueta según el formato de texto de Prometheus."""
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatear_etiquetas(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    """Construye el bloque {nombre="valor",...} de una muestra."""
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _formatear_numero(valor: float) -> str:
+    """Formatea un valor de muestra: enteros sin decimales e infinito como +Inf."""
+    valor = float(valor)
+    if valor == float("inf"):
+        return "+Inf"
+    return str(int(valor)) if valor.is_integer() else repr(valor)
+
+class Metrica:
+    """
+    Contador o indicador con etiquetas, en la memoria del proceso.
+
+    Attributes:
+        nombre (str): Nombre de la métrica en Prometheus
+        ayuda (str): Descripción (línea # HELP)
+        tipo (str): 'counter' o 'gauge'
+        etiquetas (tuple): Nombres de las etiquetas
+    """
+
+    def __init__(self, nombre: str, ayuda: str, tipo: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.tipo = tipo
+        self.etiquetas = tuple(etiquetas)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def incrementar(self, cantidad: float = 1, **etiquetas) -> None:
+        """Suma una cantidad (negativa para restar en un indicador)."""
+        clave = tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def fijar(self, valor: float, **etiquetas) -> None:
+        """Fija el valor actual (indicadores y contadores leídos de otra fuente)."""
+        clave = tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+        with self._lock:
+            self._valores[clave] = valor
+
+    def exponer(self) -> Iterator[str]:
+        """Genera las líneas de la métrica en formato de texto de Prometheus."""
+        yield f"# HELP {self.nombre} {self.ayuda}"
+        yield f"# TYPE {self.nombre} {self.tipo}"
+        with self._lock:
+            valores = sorted(self._valores.items())
+        for clave, valor in valores:
+            yield f"{self.nombre}{_formatear_etiquetas(self.etiquetas, clave)} {_formatear_numero(valor)}"
+
+class Histograma:
+    """
+    Histograma acumulado con etiquetas, en la memoria del proceso.
+
+    Attributes:
+        nombre (str): Nombre de la métrica en Prometheus
+        ayuda (str): Descripción (línea # HELP)
+        etiquetas (tuple): Nombres de las etiquetas
+        cubetas (tuple): Límites superiores de las cubetas, en orden creciente
+    """
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str], cubetas: Sequence[float]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.cubetas = tuple(cubetas)
+        # Por combinación de etiquetas: observaciones por cubeta (sin acumular), suma y total
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, **etiquetas) -> None:
+        """Registra una observación en la cubeta que le corresponde."""
+        clave = tuple(str(etiquetas[nombre]) for nombre in self.etiquetas)
+        indice = bisect_left(self.cubetas, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = ([0] * (len(self.cubetas) + 1), [0.0])
+                self._series[clave] = serie
+            serie[0][indice] += 1
+            serie[1][0] += valor
+
+    def exponer(self) -> Iterator[str]:
+        """Genera las líneas _bucket, _sum y _count en formato de texto de Prometheus."""
+        yield f"# HELP {self.nombre} {self.ayuda}"
+        yield f"# TYPE {self.nombre} histogram"
+        with self._lock:
+            series = sorted((clave, list(cuentas), suma[0]) for clave, (cuentas, suma) in self._series.items())
+        for clave, cuentas, suma in series:
+            acumulado = 0
+            for limite, cuenta in zip(self.cubetas + (float("inf"),), cuentas):
+                acumulado += cuenta
+                le = f'le="{_formatear_numero(limite)}"'
+                yield f"{self.nombre}_bucket{_formatear_etiquetas(self.etiquetas, clave, le)} {acumulado}"
+            etiquetas = _formatear_etiquetas(self.etiquetas, clave)
+            yield f"{self.nombre}_sum{etiquetas} {_formatear_numero(suma)}"
+            yield f"{self.nombre}_count{etiquetas} {acumulado}"
+
+class RegistroMetricas:
+    """
+    Conjunto de métricas del proceso que se exponen en /metrics.
+
+    Note:
+        - Las funciones registradas con al_exponer se ejecutan antes de cada
+          lectura, para copiar en indicadores valores que viven en otro sitio
+          (pool de conexiones, caché)
+        - Con varios workers cada proceso tiene sus propias métricas; Prometheus
+          debe leer cada worker por separado o ejecutarse con un solo worker
+    """
+
+    def __init__(self):
+        self._metricas: List = []
+        self._recolectores: List[Callable[[], None]] = []
+
+    def registrar(self, metrica):
+        """Añade una métrica al registro y la devuelve."""
+        self._metricas.append(metrica)
+        return metrica
+
+    def al_exponer(self, funcion: Callable[[], None]) -> Callable[[], None]:
+        """Registra una función que actualiza indicadores antes de cada lectura."""
+        self._recolectores.append(funcion)
+        return funcion
+
+    def exponer(self) -> str:
+        """
+        Devuelve todas las métricas en formato de texto de Prometheus (versión 0.0.4).
+        """
+        for recolector in self._recolectores:
+            recolector()
+        lineas: List[str] = []
+        for metrica in self._metricas:
+            lineas.extend(metrica.exponer())
+        return "\n".join(lineas) + "\n"
+
+# Registro único del proceso y métricas de la aplicación
+registro_metricas = RegistroMetricas()
+
+peticiones_duracion = registro_metricas.registrar(Histograma(
+    "http_peticiones_duracion_segundos",
+    "Duración de las peticiones HTTP por método, ruta y código de estado",
+    ("metodo", "ruta", "estado"),
+    CUBETAS_LATENCIA
+))
+peticiones_db_duracion = registro_metricas.registrar(Histograma(
+    "http_peticiones_db_segundos",
+    "Tiempo en la base de datos de cada petición HTTP por método y ruta",
+    ("metodo", "ruta"),
+    CUBETAS_LATENCIA
+))
+peticiones_en_curso = registro_metricas.registrar(Metrica(
+    "http_peticiones_en_curso",
+    "Peticiones HTTP que se están atendiendo",
+    "gauge"
+))
+peticiones_en_curso.fijar(0)
+exportaciones_duracion = registro_metricas.registrar(Histograma(
+    "exportacion_duracion_segundos",
+    "Duración de la generación y envío de cada exportación por informe y formato",
+    ("informe", "formato"),
+    CUBETAS_EXPORTACION
+))
+exportaciones_guardadas = registro_metricas.registrar(Metrica(
+    "exportacion_archivos_consultas_total",
+    "Exportaciones servidas desde un archivo ya generado (acierto) o generadas (fallo)",
+    "counter",
+    ("informe", "formato", "resultado")
+))
+pool_conexiones = registro_metricas.registrar(Metrica(
+    "db_pool_conexiones",
+    "Conexiones del pool por estado (en_uso, libres, desbordamiento)",
+    "gauge",
+    ("estado",)
+))
+pool_eventos = registro_metricas.registrar(Metrica(
+    "db_pool_eventos_total",
+    "Conexiones físicas abiertas, cerradas e invalidadas desde el arranque",
+    "counter",
+    ("evento",)
+))
+cache_consultas = registro_metricas.registrar(Metrica(
+    "cache_ranking_consultas_total",
+    "Consultas a la caché de rankings por resultado (acierto o fallo)",
+    "counter",
+    ("resultado",)
+))
+cache_tasa_aciertos = registro_metricas.registrar(Metrica(
+    "cache_ranking_tasa_aciertos",
+    "Aciertos sobre el total de consultas a la caché de rankings",
+    "gauge"
+))
+cache_entradas = registro_metricas.registrar(Metrica(
+    "cache_ranking_entradas",
+    "Entradas almacenadas en la caché de rankings",
+    "gauge"
+))
+
+@registro_metricas.al_exponer
+def _recolectar_pool_y_cache() -> None:
+    estado = estado_pool()
+    for clave in ("en_uso", "libres", "desbordamiento"):
+        pool_conexiones.fijar(estado[clave], estado=clave)
+    for clave in ("abiertas", "cerradas", "invalidadas"):
+        pool_eventos.fijar(estado[clave], evento=clave)
+
+    cache = cache_ranking.estadisticas()
+    cache_consultas.fijar(cache["aciertos"], resultado="acierto")
+    cache_consultas.fijar(cache["fallos"], resultado="fallo")
+    cache_tasa_aciertos.fijar(cache["tasa_aciertos"])
+    cache_entradas.fijar(cache["entradas"])
+
+def medir_exportacion(contenido: Iterable[bytes], informe: str, formato: str, inicio: float) -> Iterator[bytes]:
+    """
+    Envuelve el contenido de una exportación para medir su duración completa.
+
+    Args:
+        contenido: Bloques del archivo (generador o buffer)
+        informe: 'ranking' o 'resultados'
+        formato: Formato de la exportación
+        inicio: Instante (time.perf_counter) en que empezó a generarse
+
+    Yields:
+        bytes: Los mismos bloques del contenido
+
+    Note:
+        Excel y CSV se generan mientras se envían, así que la duración se
+        registra cuando se ha entregado el último bloque (o se ha cortado la
+        descarga)
+    """
+    try:
+        for bloque in contenido:
+            yield bloque
+    finally:
+        exportaciones_duracion.observar(time.perf_counter() - inicio, informe=informe, formato=formato)
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI que registra la duración, el tiempo en base de datos y
+    las peticiones en curso de cada ruta.
+
+    Note:
+        - La etiqueta 'ruta' es la plantilla de la ruta (p. ej.
+          /api/partidas/{campeonato_id}/mesas) y no la URL, para que el número
+          de series no crezca con cada ID; las peticiones sin ruta se agrupan
+          en 'sin_ruta'
+        - El tiempo en base de datos sale de la instrumentación SQL, por lo que
+          este middleware debe quedar dentro de InstrumentacionSQLMiddleware
+        - Las peticiones a /metrics no se miden
+    """
+
+    def __init__(self, app, ruta_metricas: str = "/metrics"):
+        self.app = app
+        self.ruta_metricas = ruta_metricas
+        self._plantillas: Optional[Dict[Callable, str]] = None
+
+    def _plantilla(self, scope) -> str:
+        """Devuelve la plantilla de la ruta que atendió la petición."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "sin_ruta"
+        if self._plantillas is None:
+            self._plantillas = {
+                ruta.endpoint: ruta.path
+                for ruta in scope["app"].routes
+                if hasattr(ruta, "endpoint") and hasattr(ruta, "path")
+            }
+        return self._plantillas.get(endpoint, "sin_ruta")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == self.ruta_metricas:
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"codigo": 500}
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                estado["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        peticiones_en_curso.incrementar(1)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracion = time.perf_counter() - inicio
+            peticiones_en_curso.incrementar(-1)
+            ruta = self._plantilla(scope)
+            peticiones_duracion.observar(duracion, metodo=scope["method"], ruta=ruta, estado=estado["codigo"])
+            metricas_sql = metricas_actuales()
+            if metricas_sql is not None:
+                peticiones_db_duracion.observar(metricas_sql.tiempo_ms / 1000, metodo=scope["method"], ruta=ruta)
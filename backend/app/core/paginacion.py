@@ -0,0 +1,205 @@
+# Paginación por cursor (keyset) para los listados
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query
+from app.core.constants import PAGINA_POR_DEFECTO
+
+# Cabeceras con las que los listados devuelven la paginación
+CABECERA_SIGUIENTE_CURSOR = "X-Siguiente-Cursor"
+CABECERA_TOTAL = "X-Total-Count"
+
+# Criterio de orden: lista de (columna, descendente)
+Orden = Sequence[Tuple[Any, bool]]
+
+class Pagina:
+    """
+    Página de resultados de un listado paginado por cursor.
+
+    Attributes:
+        filas (list): Registros de la página, en el orden pedido
+        siguiente_cursor (str): Cursor para pedir la página siguiente,
+                                None si esta es la última
+        total (int): Número total de registros del listado, solo si se pidió
+    """
+
+    def __init__(self, filas: List[Any], siguiente_cursor: Optional[str], total: Optional[int] = None):
+        self.filas = filas
+        self.siguiente_cursor = siguiente_cursor
+        self.total = total
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """
+    Codifica los valores de ordenación del último registro en un cursor opaco.
+
+    Args:
+        valores: Valores de las columnas de ordenación, en el mismo orden
+
+    Returns:
+        str: Cursor en base64 url-safe, sin relleno
+    """
+    datos = json.dumps(list(valores), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode()).rstrip(b"=").decode()
+
+def _valor_de_columna(columna: Any, valor: Any) -> Any:
+    """
+    Comprueba que un valor del cursor es del tipo de su columna de ordenación.
+
+    Args:
+        columna: Columna de ordenación
+        valor: Valor leído del cursor
+
+    Returns:
+        Valor listo para compararlo con la columna (las fechas, que el cursor
+        guarda como texto, se convierten)
+
+    Raises:
+        ValueError: Si el valor no corresponde al tipo de la columna
+    """
+    try:
+        tipo = columna.type.python_type
+    except NotImplementedError:
+        return valor
+
+    if issubclass(tipo, date):
+        # date y datetime se codifican con str(): se recuperan con fromisoformat
+        if not isinstance(valor, str):
+            raise ValueError(valor)
+        return tipo.fromisoformat(valor)
+    if tipo is float:
+        tipos_validos = (int, float)
+    else:
+        tipos_validos = (tipo,)
+    # bool es subclase de int, pero no es un valor válido para una columna entera
+    if isinstance(valor, bool) != (tipo is bool) or not isinstance(valor, tipos_validos):
+        raise ValueError(valor)
+    return valor
+
+def decodificar_cursor(cursor: str, orden: Orden) -> List[Any]:
+    """
+    Recupera los valores de ordenación guardados en un cursor.
+
+    Args:
+        cursor: Cursor recibido del cliente
+        orden: Columnas de ordenación del listado, como (columna, descendente)
+
+    Returns:
+        list: Valores de las columnas de ordenación
+
+    Raises:
+        HTTPException: Si el cursor no es válido para este listado: no se
+                       puede decodificar, no tiene un valor por columna o
+                       algún valor no es del tipo de su columna
+
+    Note:
+        Sin la comprobación de tipos, un cursor manipulado llegaría a la
+        consulta: SQLite compararía el texto con el entero sin error y
+        PostgreSQL fallaría con un 500
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if not isinstance(valores, list) or len(valores) != len(orden):
+            raise ValueError(valores)
+        return [
+            _valor_de_columna(columna, valor)
+            for (columna, _), valor in zip(orden, valores)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación no válido")
+
+def _condicion_keyset(orden: Orden, valores: Sequence[Any]):
+    """
+    Construye la condición que selecciona los registros posteriores al cursor.
+
+    Note:
+        - Si todas las columnas se ordenan en el mismo sentido se compara la
+          tupla completa, que PostgreSQL resuelve con el índice compuesto
+        - Con sentidos mezclados se expande a (a > x) OR (a = x AND b > y) ...
+    """
+    columnas = [columna for columna, _ in orden]
+    sentidos = {descendente for _, descendente in orden}
+    if len(sentidos) == 1:
+        if sentidos.pop():
+            return tuple_(*columnas) < tuple_(*valores)
+        return tuple_(*columnas) > tuple_(*valores)
+
+    alternativas = []
+    for i, (columna, descendente) in enumerate(orden):
+        iguales = [c == v for c, v in zip(columnas[:i], valores[:i])]
+        siguiente = columna < valores[i] if descendente else columna > valores[i]
+        alternativas.append(and_(*iguales, siguiente))
+    return or_(*alternativas)
+
+def paginar(
+    query: Query,
+    orden: Orden,
+    cursor: Optional[str] = None,
+    limite: int = PAGINA_POR_DEFECTO,
+    con_total: bool = False
+) -> Pagina:
+    """
+    Devuelve una página de una consulta usando paginación por cursor.
+
+    Args:
+        query: Consulta con los filtros del listado, sin orden ni límite
+        orden: Columnas de ordenación como (columna, descendente); la última
+               debe ser única (normalmente el id) para que el orden sea estable
+        cursor: Cursor devuelto por la página anterior (None para la primera)
+        limite: Número máximo de registros de la página
+        con_total: Si True, cuenta también el total de registros del listado
+
+    Returns:
+        Pagina: Registros de la página, cursor siguiente y total opcional
+
+    Raises:
+        HTTPException: Si el cursor no es válido
+
+    Note:
+        - A diferencia de OFFSET, el coste de cada página no depende de su
+          posición: la base de datos salta directamente al cursor por índice
+        - Se lee un registro de más para saber si existe página siguiente sin
+          una consulta adicional
+        - Las columnas de ordenación no deben admitir NULL
+        - El total requiere un COUNT sobre todo el listado; solo se calcula
+          cuando se pide
+    """
+    total = query.order_by(None).count() if con_total else None
+
+    if cursor:
+        valores = decodificar_cursor(cursor, orden)
+        query = query.filter(_condicion_keyset(orden, valores))
+
+    filas = query.order_by(
+        *[columna.desc() if descendente else columna.asc() for columna, descendente in orden]
+    ).limit(limite + 1).all()
+
+    siguiente_cursor = None
+    if len(filas) > limite:
+        filas = filas[:limite]
+        siguiente_cursor = codificar_cursor(
+            [getattr(filas[-1], columna.key) for columna, _ in orden]
+        )
+
+    return Pagina(filas, siguiente_cursor, total)
+
+def aplicar_cabeceras(response: Response, pagina: Pagina) -> None:
+    """
+    Añade a la respuesta las cabeceras de paginación.
+
+    Args:
+        response: Respuesta del endpoint
+        pagina: Página devuelta por paginar()
+
+    Note:
+        - X-Siguiente-Cursor solo se envía si hay más registros
+        - X-Total-Count solo se envía si se pidió el total
+    """
+    if pagina.siguiente_cursor:
+        response.headers[CABECERA_SIGUIENTE_CURSOR] = pagina.siguiente_cursor
+    if pagina.total is not None:
+        response.headers[CABECERA_TOTAL] = str(pagina.total)
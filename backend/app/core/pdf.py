@@ -0,0 +1,137 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import List, Optional, Sequence, Tuple
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from app.core.constants import (
+    PDF_FILAS_POR_TABLA,
+    PDF_PROCESOS,
+    PDF_TAREAS_POR_PROCESO,
+    PDF_TIEMPO_MAXIMO
+)
+
+# Una sección del documento: título y filas de su tabla
+Seccion = Tuple[str, List[list]]
+
+# Estilo común de las tablas: cabecera gris repetida en cada página y cuerpo beige
+ESTILO_TABLA = TableStyle([
+    # Estilo del encabezado
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    # Estilo del contenido
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+])
+
+def renderizar_pdf(titulo: str, cabecera: Sequence[str], secciones: Sequence[Seccion]) -> bytes:
+    """
+    Genera un PDF con una sección por bloque de filas (partida, grupo...).
+
+    Args:
+        titulo: Título del documento
+        cabecera: Nombres de las columnas de todas las tablas
+        secciones: Título y filas de cada sección
+
+    Returns:
+        bytes: Contenido del archivo PDF
+
+    Note:
+        - Cada sección empieza en una página nueva
+        - Las filas se reparten en tablas de PDF_FILAS_POR_TABLA filas: maquetar
+          una única tabla de miles de filas es muy lento y obliga a tener toda
+          su geometría en memoria
+        - repeatRows=1 repite la cabecera cuando una tabla continúa en la
+          página siguiente
+        - Es una función de módulo sin estado para poder ejecutarse en otro
+          proceso (ver renderizar_en_proceso)
+    """
+    estilos = getSampleStyleSheet()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, title=titulo)
+    elementos = [Paragraph(titulo, estilos['Title'])]
+
+    for i, (nombre, filas) in enumerate(secciones):
+        if i > 0:
+            elementos.append(PageBreak())
+        elementos.append(Paragraph(nombre, estilos['Heading2']))
+        if not filas:
+            elementos.append(Paragraph("Sin datos", estilos['Normal']))
+            continue
+        for inicio in range(0, len(filas), PDF_FILAS_POR_TABLA):
+            bloque = [list(cabecera)]
+            bloque.extend([str(valor) for valor in fila] for fila in filas[inicio:inicio + PDF_FILAS_POR_TABLA])
+            tabla = Table(bloque, repeatRows=1)
+            tabla.setStyle(ESTILO_TABLA)
+            elementos.append(tabla)
+            elementos.append(Spacer(1, 6))
+
+    doc.build(elementos)
+    return buffer.getvalue()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock_pool = threading.Lock()
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    """Crea el pool de procesos de renderizado la primera vez que se necesita."""
+    global _pool
+    with _lock_pool:
+        if _pool is None:
+            # 'spawn' en lugar de 'fork': los procesos hijos no heredan las
+            # conexiones abiertas del pool de la base de datos
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_PROCESOS,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=PDF_TAREAS_POR_PROCESO
+            )
+        return _pool
+
+def cerrar_pool_pdf() -> None:
+    """Detiene los procesos de renderizado (al apagar la aplicación)."""
+    global _pool
+    with _lock_pool:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def renderizar_en_proceso(titulo: str, cabecera: Sequence[str], secciones: Sequence[Seccion]) -> bytes:
+    """
+    Genera el PDF en el pool de procesos y espera el resultado.
+
+    Args:
+        titulo: Título del documento
+        cabecera: Nombres de las columnas
+        secciones: Título y filas de cada sección
+
+    Returns:
+        bytes: Contenido del archivo PDF
+
+    Raises:
+        TimeoutError: Si el renderizado supera PDF_TIEMPO_MAXIMO segundos
+        BrokenProcessPool: Si un proceso de renderizado ha muerto; el pool se
+                           recrea en la siguiente llamada
+
+    Note:
+        - reportlab es Python puro y retiene el GIL: en un hilo bloquearía al
+          resto de peticiones del worker. En otro proceso usa otro núcleo y el
+          hilo que espera no consume CPU
+        - El pool tiene PDF_PROCESOS procesos; las peticiones que llegan con
+          todos ocupados esperan su turno sin lanzar procesos nuevos
+    """
+    try:
+        futuro = _obtener_pool().submit(renderizar_pdf, titulo, list(cabecera), list(secciones))
+        return futuro.result(timeout=PDF_TIEMPO_MAXIMO)
+    except BrokenProcessPool:
+        cerrar_pool_pdf()
+        raise
@@ -0,0 +1,129 @@
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.core.constants import EstadoTrabajo, TRABAJOS_HILOS, TRABAJOS_RETENCION
+
+class Trabajo:
+    """
+    Estado de un trabajo en segundo plano.
+
+    Attributes:
+        id (str): Identificador del trabajo (se devuelve al cliente)
+        tipo (str): Tipo de trabajo, p. ej. 'eliminar_campeonato'
+        estado (EstadoTrabajo): Pendiente, en curso, completado o error
+        progreso (dict): Datos de avance que actualiza la función del trabajo
+        resultado (Any): Valor devuelto por la función al terminar
+        error (str): Mensaje de error si ha fallado
+        creado, iniciado, terminado (float): Marcas de tiempo (epoch)
+    """
+
+    def __init__(self, tipo: str, parametros: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.parametros = parametros
+        self.estado = EstadoTrabajo.PENDIENTE
+        self.progreso: Dict[str, Any] = {}
+        self.resultado: Any = None
+        self.error: Optional[str] = None
+        self.creado = time.time()
+        self.iniciado: Optional[float] = None
+        self.terminado: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte el trabajo en un diccionario serializable.
+
+        Returns:
+            dict: Identificador, tipo, estado, progreso, resultado, error y tiempos
+        """
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "parametros": self.parametros,
+            "estado": self.estado.value,
+            "progreso": dict(self.progreso),
+            "resultado": self.resultado,
+            "error": self.error,
+            "creado": self.creado,
+            "iniciado": self.iniciado,
+            "terminado": self.terminado
+        }
+
+class RegistroTrabajos:
+    """
+    Ejecuta funciones en hilos de fondo y guarda su estado para consultarlo.
+
+    Note:
+        - El registro vive en memoria del proceso: con varios workers el estado
+          de un trabajo solo se puede consultar en el worker que lo lanzó, y se
+          pierde al reiniciar (los trabajos deben poder relanzarse sin daño)
+        - Los trabajos terminados se olvidan pasados TRABAJOS_RETENCION segundos
+    """
+
+    def __init__(self, hilos: int = TRABAJOS_HILOS, retencion: float = TRABAJOS_RETENCION):
+        """
+        Args:
+            hilos: Número de trabajos que se ejecutan a la vez
+            retencion: Segundos que se conserva un trabajo terminado
+        """
+        self.retencion = retencion
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="trabajo")
+        self._trabajos: Dict[str, Trabajo] = {}
+        self._lock = threading.Lock()
+
+    def lanzar(self, tipo: str, funcion: Callable[..., Any], **parametros) -> Trabajo:
+        """
+        Encola un trabajo y devuelve su estado inicial sin esperar a que termine.
+
+        Args:
+            tipo: Tipo de trabajo
+            funcion: Función a ejecutar; recibe el Trabajo como primer argumento
+                     (para actualizar su progreso) y los parámetros por nombre
+            **parametros: Argumentos de la función; se muestran en el estado
+
+        Returns:
+            Trabajo: Trabajo registrado, en estado pendiente
+        """
+        trabajo = Trabajo(tipo, parametros)
+        with self._lock:
+            self._olvidar_terminados()
+            self._trabajos[trabajo.id] = trabajo
+        self._ejecutor.submit(self._ejecutar, trabajo, funcion, parametros)
+        return trabajo
+
+    def obtener(self, trabajo_id: str) -> Optional[Trabajo]:
+        """Devuelve un trabajo por su identificador, o None si no existe."""
+        with self._lock:
+            return self._trabajos.get(trabajo_id)
+
+    def _ejecutar(self, trabajo: Trabajo, funcion: Callable[..., Any], parametros: Dict[str, Any]) -> None:
+        """Ejecuta la función del trabajo registrando su estado final."""
+        trabajo.estado = EstadoTrabajo.EN_CURSO
+        trabajo.iniciado = time.time()
+        try:
+            trabajo.resultado = funcion(trabajo, **parametros)
+            trabajo.estado = EstadoTrabajo.COMPLETADO
+        except Exception as e:
+            # HTTPException guarda el mensaje en detail y su str() está vacío
+            trabajo.error = str(getattr(e, "detail", None) or e)
+            trabajo.estado = EstadoTrabajo.ERROR
+            print(f"Error en el trabajo {trabajo.tipo} {trabajo.id}: {str(e)}")
+            traceback.print_exc()
+        finally:
+            trabajo.terminado = time.time()
+
+    def _olvidar_terminados(self) -> None:
+        """Elimina los trabajos terminados hace más de la retención. Requiere el lock."""
+        limite = time.time() - self.retencion
+        caducados = [
+            trabajo_id for trabajo_id, trabajo in self._trabajos.items()
+            if trabajo.terminado is not None and trabajo.terminado < limite
+        ]
+        for trabajo_id in caducados:
+            del self._trabajos[trabajo_id]
+
+# Registro compartido por toda la aplicación
+registro_trabajos = RegistroTrabajos()
@@ -1,33 +1,6 @@
-from typing import List, Dict, Any
-from app.core.constants import PORCENTAJE_GRUPO_B, MINIMO_PAREJAS_GRUPO_B
-from app.models.pareja import Pareja
+from app.core.constants import GrupoJuego, MINIMO_PAREJAS_GRUPO_B, PORCENTAJE_GRUPO_B
 from app.models.resultado import Resultado
 
-def calcular_grupos(parejas: List[Pareja]) -> Dict[str, List[Pareja]]:
-    """
-    Calcula la distribución de parejas en grupos A y B.
-    """
-    # Ordenar parejas por PG (descendente) y PP (ascendente)
-    parejas_ordenadas = sorted(
-        parejas,
-        key=lambda p: (-sum(r.PG for r in p.resultados), sum(r.PP for r in p.resultados))
-    )
-    
-    total_parejas = len(parejas_ordenadas)
-    if total_parejas < MINIMO_PAREJAS_GRUPO_B * 2:
-        return {
-            'A': parejas_ordenadas,
-            'B': []
-        }
-    
-    # Calcular el punto de corte para el grupo B
-    corte_grupo_b = int(total_parejas * PORCENTAJE_GRUPO_B)
-    
-    return {
-        'A': parejas_ordenadas[:corte_grupo_b],
-        'B': parejas_ordenadas[corte_grupo_b:]
-    }
-
 def validar_resultados_mesa(resultado1: Resultado, resultado2: Resultado | None) -> bool:
     """
     Valida que los resultados de una mesa sean correctos.
@@ -50,4 +23,30 @@ def generar_nombre_pareja(jugador1_nombre: str, jugador2_nombre: str) -> str:
     """
     Genera el nombre de una pareja a partir de los nombres de sus jugadores.
     """
-    return f"{jugador1_nombre} y {jugador2_nombre}" 
\ No newline at end of file
+    return f"{jugador1_nombre} y {jugador2_nombre}"
+
+def grupo_clasificacion(
+    posicion: int,
+    total: int,
+    porcentaje: float = PORCENTAJE_GRUPO_B,
+    minimo: int = MINIMO_PAREJAS_GRUPO_B
+) -> GrupoJuego:
+    """
+    Indica el grupo que corresponde a una posición de la clasificación.
+
+    Args:
+        posicion: Posición en la clasificación (1 es la primera)
+        total: Número de parejas clasificadas
+        porcentaje: Fracción de la clasificación que queda en el grupo A
+        minimo: Parejas mínimas del grupo B; con menos de 2 * minimo parejas
+                no hay grupo B
+
+    Returns:
+        GrupoJuego.A o GrupoJuego.B
+
+    Note:
+        ClasificacionService.dividir_grupos aplica la misma regla en SQL
+    """
+    if total < minimo * 2 or posicion <= total * porcentaje:
+        return GrupoJuego.A
+    return GrupoJuego.B
@@ -2,6 +2,8 @@ from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from app.core.constants import PAGINA_POR_DEFECTO
+from app.core.paginacion import Pagina, paginar
 from app.db.base_class import Base
 
 # Definición de tipos genéricos para el CRUD
@@ -36,19 +38,45 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def get_pagina(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limite: int = PAGINA_POR_DEFECTO,
+        con_total: bool = False
+    ) -> Pagina:
+        """
+        Obtiene una página de registros ordenados por ID usando un cursor.
+        Args:
+            db: Sesión de la base de datos
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limite: Número máximo de registros a devolver
+            con_total: Si True, incluye el número total de registros
+        Returns:
+            Página con los registros, el cursor siguiente y el total opcional
+        """
+        return paginar(
+            db.query(self.model),
+            [(self.model.id, False)],
+            cursor=cursor,
+            limite=limite,
+            con_total=con_total
+        )
+
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = PAGINA_POR_DEFECTO
     ) -> List[ModelType]:
         """
-        Obtiene múltiples registros con paginación.
+        Obtiene múltiples registros con paginación por cursor.
         Args:
             db: Sesión de la base de datos
-            skip: Número de registros a saltar (offset)
+            cursor: Cursor devuelto por la página anterior (None para la primera)
             limit: Número máximo de registros a devolver
         Returns:
-            Lista de objetos encontrados
+            Lista de objetos encontrados (use get_pagina para obtener el cursor siguiente)
         """
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self.get_pagina(db, cursor=cursor, limite=limit).filas
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
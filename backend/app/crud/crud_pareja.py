@@ -1,4 +1,7 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.constants import PAGINA_POR_DEFECTO
+from app.core.paginacion import Pagina, paginar
 from app.models.jugador import Jugador
 from app.models.pareja import Pareja
 from app.schemas.jugador import ParejaCreate, ParejaUpdate
@@ -14,17 +17,17 @@ def get_pareja(db: Session, pareja_id: int):
     """
     return db.query(Pareja).filter(Pareja.id == pareja_id).first()
 
-def get_parejas(db: Session, skip: int = 0, limit: int = 100):
+def get_parejas(db: Session, cursor: Optional[str] = None, limite: int = PAGINA_POR_DEFECTO) -> Pagina:
     """
-    Obtiene una lista paginada de parejas.
+    Obtiene una página de parejas ordenadas por ID.
     Args:
         db: Sesión de la base de datos
-        skip: Número de registros a saltar (para paginación)
-        limit: Número máximo de registros a devolver
+        cursor: Cursor devuelto por la página anterior (None para la primera)
+        limite: Número máximo de registros a devolver
     Returns:
-        Lista de objetos Pareja
+        Página con los objetos Pareja y el cursor de la página siguiente
     """
-    return db.query(Pareja).offset(skip).limit(limit).all()
+    return paginar(db.query(Pareja), [(Pareja.id, False)], cursor=cursor, limite=limite)
 
 def create_pareja(db: Session, pareja: ParejaCreate) -> Pareja:
     """
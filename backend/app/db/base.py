@@ -10,6 +10,9 @@ from app.models.jugador import Jugador        # Modelo para gestionar jugadores
 from app.models.pareja import Pareja          # Modelo para gestionar parejas
 from app.models.mesa import Mesa              # Modelo para gestionar mesas de juego
 from app.models.resultado import Resultado     # Modelo para gestionar resultados
+from app.models.clasificacion import Clasificacion  # Clasificación materializada por pareja
+from app.models.enfrentamiento import Enfrentamiento  # Índice de rivales de cada pareja
+from app.models.contador_partida import ContadorPartida  # Mesas pendientes de cada partida
 
 # Lista de exportación que hace que Base esté disponible cuando se importa este módulo
 # Esto permite que otros módulos importen Base directamente desde aquí
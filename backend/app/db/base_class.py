@@ -1,5 +1,5 @@
 # Importaciones necesarias para la clase base
-from typing import Any
+from typing import Any, Tuple
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 
 # Decorador que marca esta clase como la clase base declarativa para SQLAlchemy
@@ -44,7 +44,19 @@ class Base:
             Este método puede ser sobrescrito en las clases hijas si se necesita
             una implementación específica de serialización.
         """
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        return {nombre: getattr(self, nombre) for nombre in self._nombres_columnas()}
+
+    @classmethod
+    def _nombres_columnas(cls) -> Tuple[str, ...]:
+        """
+        Devuelve los nombres de las columnas de la tabla del modelo.
+        
+        Note:
+            Se calculan la primera vez y se guardan en la propia clase, en lugar
+            de recorrer __table__.columns en cada llamada a to_dict
+        """
+        nombres = cls.__dict__.get('_columnas_to_dict')
+        if nombres is None:
+            nombres = tuple(column.name for column in cls.__table__.columns)
+            cls._columnas_to_dict = nombres
+        return nombres
@@ -0,0 +1,64 @@
+# Bloqueos por campeonato para serializar las operaciones que cambian su estado
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.constants import CLASE_BLOQUEO_CAMPEONATO
+
+def bloquear_campeonato(db: Session, campeonato_id: int) -> None:
+    """
+    Adquiere el bloqueo exclusivo de un campeonato para la transacción en curso.
+
+    Args:
+        db: Sesión de la base de datos
+        campeonato_id: ID del campeonato a bloquear
+
+    Note:
+        - En PostgreSQL usa pg_advisory_xact_lock(clase, campeonato_id): solo
+          espera a otra transacción que tenga bloqueado el mismo campeonato y se
+          libera automáticamente con el commit o el rollback
+        - No bloquea filas ni tablas, así que las lecturas y escrituras de otros
+          campeonatos nunca esperan
+        - La espera está acotada por el statement_timeout de la conexión
+        - En SQLite (pruebas) no hay bloqueos consultivos: una escritura nula
+          sobre la fila del campeonato toma ya el bloqueo de escritura de la
+          base de datos, que se libera con el commit o el rollback. Así la
+          segunda transacción espera antes de leer, en lugar de fallar al
+          escribir con lo que leyó antes de que la primera confirmara
+        - En otros dialectos no hace nada
+    """
+    dialecto = db.get_bind().dialect.name
+    if dialecto == "sqlite":
+        db.execute(
+            text("UPDATE campeonatos SET id = id WHERE id = :campeonato_id"),
+            {"campeonato_id": campeonato_id}
+        )
+        return
+    if dialecto != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:clase, :campeonato_id)"),
+        {"clase": CLASE_BLOQUEO_CAMPEONATO, "campeonato_id": campeonato_id}
+    )
+
+@contextmanager
+def transaccion_campeonato(db: Session, campeonato_id: int):
+    """
+    Ejecuta un bloque en una transacción con el campeonato bloqueado.
+
+    Confirma la transacción al salir del bloque y la deshace si se produce una
+    excepción; en ambos casos se libera el bloqueo.
+
+    Args:
+        db: Sesión de la base de datos
+        campeonato_id: ID del campeonato a bloquear
+
+    Yields:
+        Control de la transacción bloqueada
+    """
+    bloquear_campeonato(db, campeonato_id)
+    try:
+        yield
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
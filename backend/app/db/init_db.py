@@ -1,7 +1,7 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import text
 from app.core.config import settings
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import engine, SessionLocal
 
 def init_db() -> None:
     """
@@ -36,9 +36,10 @@ def get_db():
     
     Note:
         La sesión se cierra automáticamente al final del contexto,
-        incluso si ocurre una excepción
+        incluso si ocurre una excepción. Usa la misma fábrica SessionLocal
+        (y por tanto el mismo pool) que app.db.session.get_db
     """
-    db = Session(engine)
+    db = SessionLocal()
     try:
         yield db
     finally:
@@ -57,7 +58,7 @@ def check_db_connected() -> bool:
     """
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         print(f"Error conectando a la base de datos: {e}")
@@ -79,7 +80,7 @@ def create_first_superuser() -> None:
     from app.core.security import get_password_hash
     from app.models.user import User
     
-    db = Session(engine)
+    db = SessionLocal()
     try:
         user = db.query(User).filter(User.is_superuser == True).first()
         if not user:
@@ -0,0 +1,43 @@
+# Consultas de proyección: leen solo las columnas que necesita un esquema de respuesta
+from functools import lru_cache
+from typing import Any, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, Session
+from app.db.base_class import Base
+
+@lru_cache(maxsize=None)
+def columnas(modelo: Type[Base], esquema: Type[BaseModel]) -> Tuple[Any, ...]:
+    """
+    Devuelve las columnas del modelo que corresponden a los campos del esquema.
+
+    Args:
+        modelo: Clase del modelo SQLAlchemy
+        esquema: Esquema Pydantic de respuesta; todos sus campos deben ser
+                 columnas del modelo con el mismo nombre
+
+    Returns:
+        tuple: Atributos instrumentados del modelo, en el orden de los campos
+
+    Note:
+        Se calcula una sola vez por pareja (modelo, esquema)
+    """
+    return tuple(getattr(modelo, campo) for campo in esquema.model_fields)
+
+def proyectar(db: Session, modelo: Type[Base], esquema: Type[BaseModel]) -> Query:
+    """
+    Crea una consulta que lee solo las columnas del esquema de respuesta.
+
+    Args:
+        db: Sesión de la base de datos
+        modelo: Clase del modelo SQLAlchemy
+        esquema: Esquema Pydantic de respuesta
+
+    Returns:
+        Query: Consulta de filas ligeras (Row), sin construir objetos ORM ni
+               registrarlos en la sesión; el esquema las valida por atributos
+
+    Note:
+        Evita cargar columnas que la respuesta no usa y el coste de
+        hidratar las entidades del ORM en listados grandes
+    """
+    return db.query(*columnas(modelo, esquema))
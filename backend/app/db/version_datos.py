@@ -0,0 +1,73 @@
+# Versión de los datos de cada campeonato
+from typing import Optional, Set
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from app.models import Campeonato, Clasificacion, Jugador, Mesa, Pareja, Resultado
+
+# Modelos cuyos cambios alteran las exportaciones de su campeonato
+MODELOS_VERSIONADOS = (Pareja, Jugador, Mesa, Resultado, Clasificacion)
+
+# Clave en Session.info con los campeonatos modificados en la transacción en curso
+_CLAVE_MODIFICADOS = "campeonatos_modificados"
+
+def marcar_modificado(db: Session, campeonato_id: Optional[int] = None) -> None:
+    """
+    Anota que la transacción en curso modifica los datos de un campeonato.
+
+    Args:
+        db: Sesión de la base de datos
+        campeonato_id: ID del campeonato; None si la transacción afecta a todos
+
+    Note:
+        Los cambios hechos con objetos del ORM se anotan solos al hacer flush.
+        Hay que llamar a esta función tras las sentencias masivas (insert,
+        update o delete sobre el modelo), que no pasan por el flush
+    """
+    modificados = db.info.setdefault(_CLAVE_MODIFICADOS, set())
+    modificados.add(campeonato_id)
+
+def version_datos(db: Session, campeonato_id: int) -> Optional[int]:
+    """
+    Devuelve la versión actual de los datos de un campeonato.
+
+    Returns:
+        int: Versión, o None si el campeonato no existe
+    """
+    return db.query(Campeonato.version_datos).filter(Campeonato.id == campeonato_id).scalar()
+
+@event.listens_for(Session, "before_flush")
+def _anotar_cambios_orm(session: Session, flush_context, instances) -> None:
+    """Anota los campeonatos de los objetos nuevos, modificados o borrados."""
+    modificados: Set[Optional[int]] = session.info.setdefault(_CLAVE_MODIFICADOS, set())
+    for objeto in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(objeto, MODELOS_VERSIONADOS):
+            if objeto in session.dirty and not session.is_modified(objeto):
+                continue
+            if objeto.campeonato_id is not None:
+                modificados.add(objeto.campeonato_id)
+        elif isinstance(objeto, Campeonato) and objeto.id is not None and session.is_modified(objeto):
+            modificados.add(objeto.id)
+
+@event.listens_for(Session, "before_commit")
+def _incrementar_versiones(session: Session) -> None:
+    """
+    Incrementa la versión de los campeonatos modificados justo antes del commit.
+
+    Note:
+        - Se hace flush antes para anotar los cambios pendientes del ORM
+        - El UPDATE bloquea la fila del campeonato solo durante el commit, igual
+          que el contador de numeración de parejas
+    """
+    session.flush()
+    modificados = session.info.pop(_CLAVE_MODIFICADOS, None)
+    if not modificados:
+        return
+    sentencia = update(Campeonato).values(version_datos=Campeonato.version_datos + 1)
+    if None not in modificados:
+        sentencia = sentencia.where(Campeonato.id.in_(sorted(modificados)))
+    session.execute(sentencia, execution_options={"synchronize_session": False})
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_cambios(session: Session) -> None:
+    """Olvida los campeonatos anotados por una transacción deshecha."""
+    session.info.pop(_CLAVE_MODIFICADOS, None)
@@ -1,6 +1,7 @@
 # Importaciones necesarias para la aplicación FastAPI
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from app.routers import (
     campeonatos,
     parejas,
@@ -8,11 +9,24 @@ from app.routers import (
     mesas,
     partidas,
     resultados,
-    ranking
+    ranking,
+    exportacion,
+    eventos,
+    trabajos,
+    estadisticas,
+    historial
 )
+from app.core.cache import cache_ranking
+from app.core.config import settings
+from app.core.instrumentacion import InstrumentacionSQLMiddleware, registro_n_mas_1
+from app.core.metricas import MetricasMiddleware, registro_metricas
+from app.core.pdf import cerrar_pool_pdf
+from app.db.session import estado_pool
+from app.schemas.estado import EstadoCache, EstadoPool, EstadoSQL
 
 # Creación de la instancia principal de la aplicación FastAPI
-app = FastAPI()
+# Las respuestas JSON se serializan con orjson en lugar del módulo json estándar
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Configuración del middleware CORS (Cross-Origin Resource Sharing)
 # Permite que el frontend acceda a la API desde un origen diferente
@@ -26,8 +40,27 @@ app.add_middleware(
     allow_methods=["*"],
     # Permite todos los headers en las peticiones
     allow_headers=["*"],
+    # Cabeceras de respuesta que el frontend puede leer (paginación, caché y trabajos)
+    expose_headers=["X-Siguiente-Cursor", "X-Total-Count", "ETag", "Location", "Server-Timing"],
 )
 
+# Métricas de Prometheus por ruta (duración, tiempo en base de datos y
+# peticiones en curso). Se añade antes que la instrumentación SQL para quedar
+# dentro de ella y poder leer el tiempo en base de datos de la petición
+app.add_middleware(MetricasMiddleware)
+
+# Medición de las consultas SQL de cada petición: cabecera Server-Timing,
+# log estructurado en 'app.sql' y, opcionalmente, detección de N+1
+if settings.SQL_INSTRUMENTACION:
+    app.add_middleware(
+        InstrumentacionSQLMiddleware,
+        detectar_n_mas_1=settings.SQL_DETECTAR_N_MAS_1,
+        umbral_n_mas_1=settings.SQL_UMBRAL_N_MAS_1
+    )
+
+# Los procesos de renderizado de PDF se detienen al apagar la aplicación
+app.add_event_handler("shutdown", cerrar_pool_pdf)
+
 # Inclusión de los diferentes routers de la aplicación
 # Cada router maneja un conjunto específico de endpoints relacionados
 app.include_router(
@@ -65,6 +98,31 @@ app.include_router(
     prefix="/api/ranking",
     tags=["ranking"]
 )
+app.include_router(
+    exportacion,
+    prefix="/api/exportar",
+    tags=["exportacion"]
+)
+app.include_router(
+    eventos,
+    prefix="/api/eventos",
+    tags=["eventos"]
+)
+app.include_router(
+    trabajos,
+    prefix="/api/trabajos",
+    tags=["trabajos"]
+)
+app.include_router(
+    estadisticas,
+    prefix="/api/estadisticas",
+    tags=["estadisticas"]
+)
+app.include_router(
+    historial,
+    prefix="/api/historial",
+    tags=["historial"]
+)
 
 # Endpoint raíz para verificar que la API está funcionando
 @app.get("/")
@@ -76,3 +134,57 @@ def read_root():
         dict: Mensaje simple de confirmación
     """
     return {"Hello": "World"}
+
+@app.get("/api/estado/pool", response_model=EstadoPool)
+def get_estado_pool():
+    """
+    Devuelve el uso del pool de conexiones a la base de datos.
+    
+    Returns:
+        dict: Conexiones en uso, libres, de desbordamiento y contadores de
+              aperturas y cierres, para dimensionar DB_POOL_SIZE y DB_MAX_OVERFLOW
+    """
+    return estado_pool()
+
+@app.get("/api/estado/cache", response_model=EstadoCache)
+def get_estado_cache():
+    """
+    Devuelve los contadores de la caché de rankings.
+    
+    Returns:
+        dict: Aciertos, fallos, tasa de aciertos, invalidaciones y entradas en uso
+    """
+    return cache_ranking.estadisticas()
+
+
+@app.get("/api/estado/sql", response_model=EstadoSQL)
+def get_estado_sql():
+    """
+    Devuelve la configuración de la instrumentación SQL y los patrones N+1 detectados.
+    
+    Returns:
+        dict: Si la instrumentación y la detección de N+1 están activas, el
+              umbral de repeticiones y los patrones detectados desde el arranque,
+              primero los que más se repiten
+    """
+    return {
+        "instrumentacion": settings.SQL_INSTRUMENTACION,
+        "detectar_n_mas_1": settings.SQL_DETECTAR_N_MAS_1,
+        "umbral_n_mas_1": settings.SQL_UMBRAL_N_MAS_1,
+        "patrones": registro_n_mas_1.listar()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metricas():
+    """
+    Expone las métricas del proceso en formato de texto de Prometheus.
+    
+    Returns:
+        PlainTextResponse: Histogramas de latencia y tiempo en base de datos por
+        ruta, peticiones en curso, estado del pool de conexiones, caché de
+        rankings y duración de las exportaciones
+    """
+    return PlainTextResponse(
+        registro_metricas.exponer(),
+        media_type="text/plain; version=0.0.4"
+    )
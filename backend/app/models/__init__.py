@@ -3,5 +3,8 @@ from .pareja import Pareja
 from .campeonato import Campeonato
 from .mesa import Mesa
 from .resultado import Resultado
+from .clasificacion import Clasificacion
+from .enfrentamiento import Enfrentamiento
+from .contador_partida import ContadorPartida
 
-__all__ = ['Jugador', 'Pareja', 'Campeonato', 'Mesa', 'Resultado']
+__all__ = ['Jugador', 'Pareja', 'Campeonato', 'Mesa', 'Resultado', 'Clasificacion', 'Enfrentamiento', 'ContadorPartida']
@@ -16,6 +16,13 @@ class Campeonato(Base):
         numero_partidas (int): Número total de partidas programadas
         grupo_b (bool): Indica si existe grupo B en el campeonato
         partida_actual (int): Número de la partida actual en curso
+        ultimo_numero_pareja (int): Último número de pareja asignado (contador
+            que se incrementa de forma atómica al inscribir parejas)
+        en_eliminacion (bool): El campeonato se está borrando en segundo plano
+            y ya no se muestra
+        version_datos (int): Contador que se incrementa en cada transacción
+            que modifica sus parejas, mesas o resultados (clave de la caché de
+            exportaciones, ver app/db/version_datos.py)
     """
     __tablename__ = "campeonatos"
     __table_args__ = {'extend_existing': True}
@@ -28,13 +35,18 @@ class Campeonato(Base):
     numero_partidas = Column(Integer)
     grupo_b = Column(Boolean, default=False)
     partida_actual = Column(Integer, default=0)
+    ultimo_numero_pareja = Column(Integer, nullable=False, default=0, server_default='0')
+    en_eliminacion = Column(Boolean, nullable=False, default=False, server_default='false')
+    version_datos = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Relaciones con otras tablas
-    # Cada relación define una conexión bidireccional con otros modelos
-    parejas = relationship("Pareja", back_populates="campeonato")      # Relación uno a muchos con Pareja
-    jugadores = relationship("Jugador", back_populates="campeonato")   # Relación uno a muchos con Jugador
-    mesas = relationship("Mesa", back_populates="campeonato")          # Relación uno a muchos con Mesa
-    resultados = relationship("Resultado", back_populates="campeonato") # Relación uno a muchos con Resultado
+    # Cada relación define una conexión bidireccional con otros modelos.
+    # Las claves foráneas son ON DELETE CASCADE: con passive_deletes el ORM no
+    # carga los hijos al borrar un campeonato y deja el borrado a la base de datos
+    parejas = relationship("Pareja", back_populates="campeonato", passive_deletes=True)          # Relación uno a muchos con Pareja
+    jugadores = relationship("Jugador", back_populates="campeonato", passive_deletes=True)       # Relación uno a muchos con Jugador
+    mesas = relationship("Mesa", back_populates="campeonato", passive_deletes=True)              # Relación uno a muchos con Mesa
+    resultados = relationship("Resultado", back_populates="campeonato", passive_deletes=True)    # Relación uno a muchos con Resultado
 
     def __repr__(self):
         """
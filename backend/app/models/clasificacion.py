@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+
+class Clasificacion(Base):
+    """
+    Modelo que representa la clasificación acumulada de una pareja en un campeonato.
+    Es una tabla materializada que se mantiene al registrar, editar o eliminar
+    resultados, de modo que los rankings no tengan que agregar la tabla de resultados.
+    
+    Attributes:
+        id (int): Identificador único de la fila de clasificación
+        campeonato_id (int): ID del campeonato
+        id_pareja (int): ID de la pareja
+        GB (str): Grupo actual de la pareja (el de su último resultado)
+        PG (int): Total de partidas ganadas
+        PP (int): Total de puntos
+        RP (int): Total de resultados parciales
+        partidas_jugadas (int): Número de resultados acumulados
+        ultima_partida (int): Número de la última partida con resultado
+    """
+    __tablename__ = "clasificaciones"
+    __table_args__ = (
+        # Una única fila de clasificación por pareja y campeonato
+        UniqueConstraint('campeonato_id', 'id_pareja', name='uq_clasificacion_pareja'),
+        # Índices que sirven directamente los ORDER BY de los rankings
+        Index('ix_clasificaciones_ranking', 'campeonato_id', 'PG', 'PP'),
+        Index('ix_clasificaciones_ranking_grupo', 'campeonato_id', 'GB', 'PG', 'PP'),
+        # Clave foránea hacia parejas (borrado en cascada de una pareja)
+        Index('ix_clasificaciones_pareja', 'id_pareja'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"), nullable=False)
+    id_pareja = Column(Integer, ForeignKey("parejas.id", ondelete="CASCADE"), nullable=False)
+    GB = Column(String, default='A', nullable=False)
+    PG = Column(Integer, default=0, nullable=False)
+    PP = Column(Integer, default=0, nullable=False)
+    RP = Column(Integer, default=0, nullable=False)
+    partidas_jugadas = Column(Integer, default=0, nullable=False)
+    ultima_partida = Column(Integer, default=0, nullable=False)
+
+    # Relaciones
+    pareja = relationship("Pareja")
+
+    def to_dict(self):
+        """
+        Convierte el objeto Clasificacion a un diccionario.
+        Útil para serialización y respuestas API.
+        
+        Returns:
+            dict: Diccionario con los atributos de la clasificación
+        """
+        return {
+            "campeonato_id": self.campeonato_id,
+            "id_pareja": self.id_pareja,
+            "GB": self.GB,
+            "PG": self.PG,
+            "PP": self.PP,
+            "RP": self.RP,
+            "partidas_jugadas": self.partidas_jugadas,
+            "ultima_partida": self.ultima_partida
+        }
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from app.db.base_class import Base
+
+class ContadorPartida(Base):
+    """
+    Contador de mesas pendientes de cada partida de un campeonato.
+
+    Se crea al sortear la partida (todas sus mesas pendientes) y se
+    descuenta al registrar los resultados que completan una mesa, de modo que
+    saber si la partida puede cerrarse es leer una sola fila.
+
+    Attributes:
+        id (int): Identificador único
+        campeonato_id (int): ID del campeonato
+        partida (int): Número de la partida
+        mesas (int): Mesas sorteadas en la partida
+        mesas_pendientes (int): Mesas a las que aún les falta algún resultado
+
+    Note:
+        Las mesas se borran siempre con todo su campeonato; al hacerlo se
+        borran también sus contadores
+    """
+    __tablename__ = "contadores_partida"
+    __table_args__ = (
+        # Un único contador por partida
+        UniqueConstraint('campeonato_id', 'partida', name='uq_contador_partida'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"), nullable=False)
+    partida = Column(Integer, nullable=False)
+    mesas = Column(Integer, default=0, nullable=False)
+    mesas_pendientes = Column(Integer, default=0, nullable=False)
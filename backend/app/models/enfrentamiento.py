@@ -0,0 +1,110 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint, delete, event, insert, inspect
+from sqlalchemy.orm import Session
+from app.db.base_class import Base
+from app.models.mesa import Mesa
+
+class Enfrentamiento(Base):
+    """
+    Índice de rivales: una fila por pareja y mesa sorteada.
+
+    Cada mesa genera dos filas (una desde cada pareja) y la mesa libre una
+    sola, sin rival. Así los rivales de una pareja se leen con el índice
+    (campeonato_id, pareja_id, partida), en O(partidas) y sin combinar las
+    columnas pareja1_id y pareja2_id de las mesas.
+
+    Attributes:
+        id (int): Identificador único
+        campeonato_id (int): ID del campeonato
+        partida (int): Número de la partida
+        mesa_id (int): Mesa en la que se enfrentaron
+        pareja_id (int): Pareja desde cuyo punto de vista se registra
+        rival_id (int): Pareja rival; None si la pareja tuvo mesa libre
+
+    Note:
+        Se mantiene solo al guardar mesas con el ORM (ver
+        _sincronizar_enfrentamientos); las inserciones masivas de mesas deben
+        insertar también sus filas con filas_enfrentamientos. Al borrar la mesa
+        sus filas se borran en cascada
+    """
+    __tablename__ = "enfrentamientos"
+    __table_args__ = (
+        # Una pareja aparece una sola vez en cada mesa
+        UniqueConstraint('mesa_id', 'pareja_id', name='uq_enfrentamiento_mesa_pareja'),
+        # Historial, rivales y cara a cara de una pareja, ordenados por partida
+        Index('ix_enfrentamientos_campeonato_pareja', 'campeonato_id', 'pareja_id', 'partida'),
+        # Claves foráneas hacia parejas (borrado en cascada de una pareja)
+        Index('ix_enfrentamientos_pareja', 'pareja_id'),
+        Index('ix_enfrentamientos_rival', 'rival_id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"), nullable=False)
+    partida = Column(Integer, nullable=False)
+    mesa_id = Column(Integer, ForeignKey("mesas.id", ondelete="CASCADE"), nullable=False)
+    pareja_id = Column(Integer, ForeignKey("parejas.id", ondelete="CASCADE"), nullable=False)
+    rival_id = Column(Integer, ForeignKey("parejas.id", ondelete="CASCADE"), nullable=True)
+
+def filas_enfrentamientos(mesa_id: int, campeonato_id: int, partida: int, pareja1_id, pareja2_id) -> list:
+    """
+    Construye las filas de enfrentamientos de una mesa.
+
+    Args:
+        mesa_id: ID de la mesa
+        campeonato_id: ID del campeonato
+        partida: Número de la partida
+        pareja1_id: Primera pareja (None si la posición está vacía)
+        pareja2_id: Segunda pareja (None si es mesa libre)
+
+    Returns:
+        Lista de diccionarios listos para insertar: uno por pareja sentada
+    """
+    base = {"mesa_id": mesa_id, "campeonato_id": campeonato_id, "partida": partida}
+    filas = []
+    if pareja1_id is not None:
+        filas.append({**base, "pareja_id": pareja1_id, "rival_id": pareja2_id})
+    if pareja2_id is not None:
+        filas.append({**base, "pareja_id": pareja2_id, "rival_id": pareja1_id})
+    return filas
+
+# Columnas de la mesa que determinan sus enfrentamientos
+_COLUMNAS_MESA = ('campeonato_id', 'partida', 'pareja1_id', 'pareja2_id')
+
+@event.listens_for(Session, 'after_flush')
+def _sincronizar_enfrentamientos(session, flush_context):
+    """
+    Mantiene los enfrentamientos de las mesas creadas, modificadas o borradas en el flush.
+
+    Args:
+        session: Sesión que acaba de hacer flush
+        flush_context: Contexto interno del flush
+
+    Note:
+        - Las filas de todas las mesas del flush se insertan con una única
+          sentencia de varias filas, no una por mesa
+        - Una mesa a la que se cambian las parejas rehace sus filas
+    """
+    nuevas = [m for m in session.new if isinstance(m, Mesa)]
+    cambiadas = [
+        m for m in session.dirty
+        if isinstance(m, Mesa) and any(
+            inspect(m).attrs[columna].history.has_changes() for columna in _COLUMNAS_MESA
+        )
+    ]
+    borradas = [m.id for m in session.deleted if isinstance(m, Mesa)]
+    if not (nuevas or cambiadas or borradas):
+        return
+
+    # Sentencias Core sobre la conexión del flush: el ORM no admite otro flush aquí
+    conexion = session.connection()
+    rehacer = [m.id for m in cambiadas] + borradas
+    if rehacer:
+        conexion.execute(delete(Enfrentamiento.__table__).where(Enfrentamiento.mesa_id.in_(rehacer)))
+
+    filas = [
+        fila
+        for m in nuevas + cambiadas
+        if m.campeonato_id is not None
+        for fila in filas_enfrentamientos(m.id, m.campeonato_id, m.partida, m.pareja1_id, m.pareja2_id)
+    ]
+    if filas:
+        conexion.execute(insert(Enfrentamiento.__table__), filas)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -22,6 +22,9 @@ class Jugador(Base):
     __table_args__ = (
         # Asegura que no haya dos jugadores con el mismo nombre y apellido en un campeonato
         UniqueConstraint('nombre', 'apellido', 'campeonato_id', name='uq_jugador_campeonato'),
+        # Claves foráneas: jugadores de una pareja y purga por campeonato
+        Index('ix_jugadores_pareja', 'pareja_id'),
+        Index('ix_jugadores_campeonato', 'campeonato_id'),
         {'extend_existing': True}
     )
 
@@ -29,8 +32,8 @@ class Jugador(Base):
     id = Column(Integer, primary_key=True, index=True)                     # ID único del jugador
     nombre = Column(String, index=True)                                    # Nombre del jugador (indexado para búsquedas)
     apellido = Column(String, index=True)                                 # Apellido del jugador (indexado para búsquedas)
-    pareja_id = Column(Integer, ForeignKey("parejas.id"))                # Referencia a la tabla parejas
-    campeonato_id = Column(Integer, ForeignKey("campeonatos.id"))        # Referencia a la tabla campeonatos
+    pareja_id = Column(Integer, ForeignKey("parejas.id", ondelete="CASCADE"))          # Referencia a la tabla parejas
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"))  # Referencia a la tabla campeonatos
 
     # Relaciones con otros modelos
     pareja = relationship("Pareja", back_populates="jugadores")          # Relación bidireccional con Pareja
@@ -1,5 +1,5 @@
 # Importaciones necesarias para el modelo
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -19,10 +19,20 @@ class Mesa(Base):
     # Nombre de la tabla en la base de datos
     __tablename__ = "mesas"
 
+    # Restricciones de la tabla
+    __table_args__ = (
+        # Un número de mesa no puede repetirse dentro de una partida. El índice de
+        # esta restricción también sirve las búsquedas por (campeonato_id, partida)
+        UniqueConstraint('campeonato_id', 'partida', 'numero', name='uq_mesa_campeonato_partida_numero'),
+        # Claves foráneas hacia parejas: sin índice, borrar una pareja recorre la tabla entera
+        Index('ix_mesas_pareja1', 'pareja1_id'),
+        Index('ix_mesas_pareja2', 'pareja2_id'),
+    )
+
     # Columnas de la tabla
     id = Column(Integer, primary_key=True, index=True)                     # ID único de la mesa
     numero = Column(Integer, nullable=False)                               # Número de mesa en el campeonato
-    campeonato_id = Column(Integer, ForeignKey("campeonatos.id"))         # Referencia al campeonato
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"))  # Referencia al campeonato
     partida = Column(Integer, nullable=False)                             # Número de partida
     pareja1_id = Column(Integer, ForeignKey("parejas.id"))                # Referencia a la primera pareja
     pareja2_id = Column(Integer, ForeignKey("parejas.id"), nullable=True) # Referencia a la segunda pareja (opcional)
@@ -39,7 +49,7 @@ class Mesa(Base):
         foreign_keys=[pareja2_id], 
         back_populates="mesas_como_pareja2"
     )  # Relación con la segunda pareja
-    resultados = relationship("Resultado", back_populates="mesa")         # Relación con los resultados
+    resultados = relationship("Resultado", back_populates="mesa", passive_deletes=True)  # Relación con los resultados
 
     def to_dict(self):
         """
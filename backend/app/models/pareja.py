@@ -16,16 +16,20 @@ class Pareja(Base):
         campeonato_id (int): ID del campeonato al que pertenece
     """
     __tablename__ = "parejas"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # El número de pareja es único dentro de cada campeonato
+        UniqueConstraint('campeonato_id', 'numero', name='uq_pareja_campeonato_numero'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, index=True)
     club = Column(String, nullable=True)
     activa = Column(Boolean, default=True)
     numero = Column(Integer)
-    campeonato_id = Column(Integer, ForeignKey("campeonatos.id"))
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"))
 
-    jugadores = relationship("Jugador", back_populates="pareja")
+    jugadores = relationship("Jugador", back_populates="pareja", passive_deletes=True)
     campeonato = relationship("Campeonato", back_populates="parejas")
     mesas_como_pareja1 = relationship("Mesa", foreign_keys="Mesa.pareja1_id", back_populates="pareja1")
     mesas_como_pareja2 = relationship("Mesa", foreign_keys="Mesa.pareja2_id", back_populates="pareja2")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, event
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint, event
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -19,10 +19,20 @@ class Resultado(Base):
         RP (int): Resultados de puntos
     """
     __tablename__ = "resultados"
+    __table_args__ = (
+        # Una pareja solo puede tener un resultado por mesa
+        UniqueConstraint('mesa_id', 'id_pareja', name='uq_resultado_mesa_pareja'),
+        # Resultados de una mesa en una partida (tablero de mesas, completitud de partida)
+        Index('ix_resultados_campeonato_partida_mesa', 'campeonato_id', 'partida', 'mesa_id'),
+        # Resultados de una pareja en un campeonato (historial, estadísticas)
+        Index('ix_resultados_campeonato_pareja', 'campeonato_id', 'id_pareja'),
+        # Clave foránea hacia parejas (comprobación al borrar una pareja)
+        Index('ix_resultados_pareja', 'id_pareja'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    campeonato_id = Column(Integer, ForeignKey("campeonatos.id"))
-    mesa_id = Column(Integer, ForeignKey("mesas.id"))
+    campeonato_id = Column(Integer, ForeignKey("campeonatos.id", ondelete="CASCADE"))
+    mesa_id = Column(Integer, ForeignKey("mesas.id", ondelete="SET NULL"))
     partida = Column(Integer)
     id_pareja = Column(Integer, ForeignKey("parejas.id"))
     GB = Column(String)
@@ -55,6 +65,21 @@ class Resultado(Base):
             "RP": self.RP
         }
 
+def calcular_pg(pp: int) -> int:
+    """
+    Calcula las partidas ganadas (PG) de un resultado a partir de sus puntos (PP).
+    
+    Args:
+        pp: Puntos del resultado
+    
+    Returns:
+        int: 1 si PP es mayor que 0, 0 en caso contrario
+    
+    Note:
+        Se comparte con las inserciones masivas, que no disparan los eventos del ORM
+    """
+    return 1 if pp > 0 else 0
+
 @event.listens_for(Resultado, 'before_insert')
 @event.listens_for(Resultado, 'before_update')
 def calcular_campos(mapper, connection, target):
@@ -70,4 +95,4 @@ def calcular_campos(mapper, connection, target):
         - Establece PG a 1 si PP es mayor que 0, de lo contrario a 0
         - Este cálculo se realiza automáticamente antes de guardar el resultado
     """
-    target.PG = 1 if target.PP > 0 else 0
+    target.PG = calcular_pg(target.PP)
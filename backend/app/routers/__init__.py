@@ -4,6 +4,11 @@ from .jugadores import router as jugadores
 from .mesas import router as mesas
 from .partidas import router as partidas
 from .resultados import router as resultados
+from .exportacion import router as exportacion
+from .eventos import router as eventos
+from .trabajos import router as trabajos
+from .estadisticas import router as estadisticas
+from .historial import router as historial
 
 __all__ = [
     'campeonatos',
@@ -11,5 +16,10 @@ __all__ = [
     'jugadores',
     'mesas',
     'partidas',
-    'resultados'
+    'resultados',
+    'exportacion',
+    'eventos',
+    'trabajos',
+    'estadisticas',
+    'historial'
 ] 
\ No newline at end of file
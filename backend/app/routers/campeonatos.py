@@ -1,54 +1,54 @@
 # Importaciones necesarias para definir las rutas y manejar las solicitudes
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.campeonato import Campeonato
-from app.models.pareja import Pareja
-from app.models.jugador import Jugador
-from app.models.mesa import Mesa
-from app.models.resultado import Resultado
-from app.schemas.campeonato import CampeonatoCreate, CampeonatoUpdate
+from app.core.constants import EstadoPartida, PAGINA_MAXIMA, PAGINA_POR_DEFECTO
+from app.core.eventos import broker_eventos, EVENTO_PARTIDA
+from app.core.paginacion import aplicar_cabeceras
+from app.db.bloqueos import bloquear_campeonato
+from app.db.proyeccion import proyectar
+from app.schemas.campeonato import (
+    CampeonatoCreate,
+    CampeonatoResponse,
+    CampeonatoUpdate,
+    EliminacionCampeonatoResponse
+)
+from app.services.campeonato_service import CampeonatoService
+from app.services.exportacion_service import programar_pregeneracion
 from datetime import date
-from sqlalchemy import text, func
-from contextlib import contextmanager
-from sqlalchemy.exc import OperationalError
+from typing import List, Optional
 
 # Creación de un enrutador para manejar las rutas relacionadas con campeonatos
 router = APIRouter()
 
-@contextmanager
-def transaction_lock(db: Session):
-    """
-    Ejecuta operaciones en una transacción bloqueada.
-    Utiliza un bloqueo exclusivo en la tabla campeonatos para evitar operaciones concurrentes.
-    
-    Args:
-        db: Sesión de la base de datos
-    
-    Yields:
-        Control de la transacción bloqueada
-    """
-    try:
-        # Bloquear la tabla para evitar operaciones concurrentes
-        db.execute(text("LOCK TABLE campeonatos IN EXCLUSIVE MODE"))
-        yield
-    finally:
-        db.commit()
-
-@router.get("/")
-def get_campeonatos(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[CampeonatoResponse])
+def get_campeonatos(
+    response: Response,
+    cursor: Optional[str] = None,
+    limite: int = Query(PAGINA_POR_DEFECTO, ge=1, le=PAGINA_MAXIMA),
+    con_total: bool = False,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todos los campeonatos de la base de datos.
+    Obtiene una página de campeonatos ordenados por ID.
     
     Args:
+        response: Respuesta, a la que se añaden las cabeceras de paginación
+        cursor: Cursor devuelto en X-Siguiente-Cursor por la página anterior
+        limite: Número máximo de registros a devolver
+        con_total: Si True, devuelve el total de registros en X-Total-Count
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Lista de todos los campeonatos
+        Lista de campeonatos de la página; si hay más, su cursor va en la
+        cabecera X-Siguiente-Cursor
     """
-    return db.query(Campeonato).all()
+    pagina = CampeonatoService(db).get_campeonatos(cursor=cursor, limite=limite, con_total=con_total)
+    aplicar_cabeceras(response, pagina)
+    return pagina.filas
 
-@router.get("/{campeonato_id}")
+@router.get("/{campeonato_id}", response_model=CampeonatoResponse)
 def get_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
     """
     Obtiene un campeonato específico por su ID.
@@ -61,23 +61,26 @@ def get_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
         El campeonato solicitado o un error 404 si no se encuentra
     """
     try:
-        campeonato = db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
+        # Leer solo las columnas de la respuesta en una única consulta
+        campeonato = proyectar(db, Campeonato, CampeonatoResponse).filter(
+            Campeonato.id == campeonato_id,
+            Campeonato.en_eliminacion == False
+        ).first()
         if not campeonato:
             raise HTTPException(status_code=404, detail="Campeonato no encontrado")
         
-        # Forzar la carga de los datos antes de devolver
-        db.refresh(campeonato)
-        
         # Log para depuración
         print(f"Devolviendo campeonato: {campeonato.id} - {campeonato.nombre}")
         
         return campeonato
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error al obtener campeonato: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/")
-async def create_campeonato(campeonato: CampeonatoCreate, db: Session = Depends(get_db)):
+@router.post("/", response_model=CampeonatoResponse)
+def create_campeonato(campeonato: CampeonatoCreate, db: Session = Depends(get_db)):
     """
     Crea un nuevo campeonato en la base de datos.
     
@@ -105,7 +108,7 @@ async def create_campeonato(campeonato: CampeonatoCreate, db: Session = Depends(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.put("/{campeonato_id}")
+@router.put("/{campeonato_id}", response_model=CampeonatoResponse)
 def update_campeonato(
     campeonato_id: int, 
     campeonato_data: CampeonatoUpdate,
@@ -123,16 +126,31 @@ def update_campeonato(
         El campeonato actualizado o un error 404 si no se encuentra
     """
     try:
+        # El cambio de partida no debe cruzarse con un sorteo o un borrado
+        bloquear_campeonato(db, campeonato_id)
         campeonato = db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
         if not campeonato:
             raise HTTPException(status_code=404, detail="Campeonato no encontrado")
         
+        partida_anterior = campeonato.partida_actual
         for key, value in campeonato_data.dict(exclude_unset=True).items():
             setattr(campeonato, key, value)
         
         db.commit()
         db.refresh(campeonato)
         
+        # Avisar a los clientes conectados cuando cambia la partida en juego
+        if campeonato.partida_actual != partida_anterior:
+            broker_eventos.publicar(campeonato_id, EVENTO_PARTIDA, {
+                "partida_actual": campeonato.partida_actual,
+                "estado": EstadoPartida.EN_CURSO.value
+            })
+        
+        # Al pasar a la siguiente partida se cierra la anterior: generar ya las
+        # exportaciones que se van a descargar
+        if campeonato.partida_actual > partida_anterior:
+            programar_pregeneracion(campeonato_id)
+        
         # Log para depuración
         print(f"Campeonato actualizado: {campeonato.id} - {campeonato.nombre}")
         
@@ -142,51 +160,36 @@ def update_campeonato(
         print(f"Error al actualizar campeonato: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.delete("/{campeonato_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
+@router.delete(
+    "/{campeonato_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=EliminacionCampeonatoResponse
+)
+def delete_campeonato(campeonato_id: int, response: Response, db: Session = Depends(get_db)):
     """
     Elimina un campeonato y sus datos relacionados de la base de datos.
     
     Args:
         campeonato_id: ID del campeonato a eliminar
+        response: Respuesta HTTP (para añadir la cabecera Location)
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Mensaje de éxito o un error 404 si no se encuentra
+        Identificador y estado del trabajo de borrado, o un error 404 si no se encuentra
+    
+    Note:
+        Responde 202 al instante: el campeonato deja de listarse y sus datos se
+        borran en segundo plano por lotes. El avance se consulta en
+        /api/trabajos/{trabajo_id}
     """
-    try:
-        with transaction_lock(db):
-            # Verificar que el campeonato existe
-            campeonato = db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
-            if not campeonato:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Campeonato no encontrado"
-                )
-
-            # Eliminar datos relacionados en orden
-            db.query(Resultado).filter(Resultado.campeonato_id == campeonato_id).delete(synchronize_session=False)
-            db.query(Mesa).filter(Mesa.campeonato_id == campeonato_id).delete(synchronize_session=False)
-            db.query(Jugador).filter(Jugador.campeonato_id == campeonato_id).delete(synchronize_session=False)
-            db.query(Pareja).filter(Pareja.campeonato_id == campeonato_id).delete(synchronize_session=False)
-            db.query(Campeonato).filter(Campeonato.id == campeonato_id).delete(synchronize_session=False)
-
-            # Verificar si quedan campeonatos de forma segura
-            remaining_count = db.query(func.count(Campeonato.id)).scalar()
-            
-            if remaining_count == 0:
-                try:
-                    db.execute(text("ALTER SEQUENCE campeonatos_id_seq RESTART WITH 1"))
-                except OperationalError as e:
-                    print(f"No se pudo reiniciar la secuencia de IDs: {str(e)}")
-                    # No lanzamos el error para que la operación principal se complete
-        
-        return {"message": "Campeonato eliminado correctamente"}
-        
-    except Exception as e:
-        db.rollback()
-        print(f"Error al eliminar campeonato: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error al eliminar el campeonato: {str(e)}"
-        ) 
\ No newline at end of file
+    trabajo = CampeonatoService(db).eliminar_campeonato(campeonato_id)
+    url_trabajo = f"/api/trabajos/{trabajo.id}"
+    response.headers["Location"] = url_trabajo
+    
+    print(f"Eliminación del campeonato {campeonato_id} lanzada en el trabajo {trabajo.id}")
+    return {
+        "message": "Eliminación del campeonato en curso",
+        "trabajo_id": trabajo.id,
+        "estado": trabajo.estado.value,
+        "url": url_trabajo
+    }
@@ -0,0 +1,42 @@
+# Importaciones necesarias para las estadísticas de las parejas
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from app.core.cache import respuesta_con_etag
+from app.db.session import get_db
+from app.schemas.resultado import EstadisticasPareja, ResultadoEstadisticas
+from app.services.estadisticas_service import EstadisticasService
+from typing import List
+
+# Creación del enrutador para las rutas de estadísticas
+router = APIRouter()
+
+@router.get("/{campeonato_id}", response_model=List[EstadisticasPareja])
+def get_estadisticas_campeonato(request: Request, campeonato_id: int, db: Session = Depends(get_db)):
+    """
+    Obtiene las estadísticas de todas las parejas de un campeonato.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        db: Sesión de la base de datos (inyectada automáticamente)
+    
+    Returns:
+        Estadísticas de cada pareja ordenadas por número, con cabecera ETag;
+        304 sin cuerpo si If-None-Match coincide
+    """
+    estadisticas, etag = EstadisticasService(db).get_estadisticas_campeonato(campeonato_id)
+    return respuesta_con_etag(request, estadisticas, etag)
+
+@router.get("/{campeonato_id}/parejas/{pareja_id}", response_model=ResultadoEstadisticas)
+def get_estadisticas_pareja(campeonato_id: int, pareja_id: int, db: Session = Depends(get_db)):
+    """
+    Obtiene las estadísticas de una pareja en un campeonato.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        pareja_id: ID de la pareja
+        db: Sesión de la base de datos (inyectada automáticamente)
+    
+    Returns:
+        Estadísticas de la pareja; valores a 0 si no tiene resultados
+    """
+    return EstadisticasService(db).get_estadisticas_pareja(pareja_id, campeonato_id)
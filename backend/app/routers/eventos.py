@@ -0,0 +1,50 @@
+# Importaciones necesarias para los eventos en vivo
+import asyncio
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.core.constants import EVENTOS_KEEPALIVE
+from app.core.eventos import broker_eventos
+
+# Creación del enrutador para las rutas de eventos en vivo
+router = APIRouter()
+
+@router.get("/{campeonato_id}")
+async def stream_eventos(campeonato_id: int, request: Request):
+    """
+    Abre un flujo server-sent events con los cambios de un campeonato.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        request: Petición entrante (para detectar la desconexión del cliente)
+    
+    Returns:
+        StreamingResponse de tipo text/event-stream con los eventos 'resultado',
+        'resultado_eliminado', 'gb', 'sorteo', 'mesas_eliminadas', 'partida' y
+        'resincronizar'
+    
+    Note:
+        - Es asíncrono porque no accede a la base de datos: solo espera eventos
+        - Cada EVENTOS_KEEPALIVE segundos sin eventos envía un comentario para
+          mantener abierta la conexión a través de proxies
+    """
+    async def generar():
+        suscripcion = broker_eventos.suscribir(campeonato_id)
+        _, cola = suscripcion
+        try:
+            # Indicar al navegador que reintente a los 3 segundos si se corta
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(cola.get(), timeout=EVENTOS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+        finally:
+            broker_eventos.cancelar(campeonato_id, suscripcion)
+
+    return StreamingResponse(
+        generar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,171 @@
+# Importaciones necesarias para las exportaciones
+import time
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.artefactos import almacen_exportaciones
+from app.core.constants import EstadoTrabajo, FormatoExportacion, InformeExportacion
+from app.core.metricas import exportaciones_guardadas, medir_exportacion
+from app.core.trabajos import registro_trabajos
+from app.db.session import get_db
+from app.schemas.exportacion import ExportacionTrabajoCreate, ExportacionTrabajoResponse
+from app.services.exportacion_service import ExportacionService
+
+# Creación del enrutador para las rutas de exportación
+router = APIRouter()
+
+# Tipo MIME de cada formato de exportación
+TIPOS_MIME = {
+    FormatoExportacion.EXCEL: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    FormatoExportacion.CSV: "text/csv",
+    FormatoExportacion.PDF: "application/pdf",
+}
+
+def _respuesta_archivo(
+    db: Session,
+    campeonato_id: int,
+    informe: InformeExportacion,
+    formato: FormatoExportacion
+):
+    """
+    Construye la respuesta de descarga de un informe.
+
+    Args:
+        db: Sesión de base de datos
+        campeonato_id: ID del campeonato
+        informe: Ranking o resultados
+        formato: Formato de exportación (determina el tipo MIME)
+
+    Returns:
+        FileResponse con el archivo ya generado para la versión actual de los
+        datos, o StreamingResponse que lo genera, lo envía por bloques y lo
+        guarda para las siguientes descargas
+    """
+    inicio = time.perf_counter()
+    contenido, nombre, ruta = ExportacionService(db).exportar(campeonato_id, informe, formato)
+    if ruta:
+        exportaciones_guardadas.incrementar(informe=informe.value, formato=formato.value, resultado="acierto")
+        return FileResponse(ruta, media_type=TIPOS_MIME[formato], filename=nombre)
+
+    exportaciones_guardadas.incrementar(informe=informe.value, formato=formato.value, resultado="fallo")
+    return StreamingResponse(
+        medir_exportacion(contenido, informe.value, formato.value, inicio),
+        media_type=TIPOS_MIME[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'}
+    )
+
+@router.get("/ranking/{campeonato_id}")
+def exportar_ranking(
+    campeonato_id: int,
+    formato: FormatoExportacion = FormatoExportacion.EXCEL,
+    db: Session = Depends(get_db)
+):
+    """
+    Exporta el ranking de un campeonato.
+
+    Args:
+        campeonato_id: ID del campeonato
+        formato: 'excel', 'csv' o 'pdf'
+        db: Sesión de base de datos
+
+    Returns:
+        El archivo guardado si los datos no han cambiado desde la última
+        exportación; si no, se genera leyendo la clasificación por lotes
+    """
+    return _respuesta_archivo(db, campeonato_id, InformeExportacion.RANKING, formato)
+
+@router.get("/resultados/{campeonato_id}")
+def exportar_resultados(
+    campeonato_id: int,
+    formato: FormatoExportacion = FormatoExportacion.EXCEL,
+    db: Session = Depends(get_db)
+):
+    """
+    Exporta los resultados detallados de un campeonato.
+
+    Args:
+        campeonato_id: ID del campeonato
+        formato: 'excel', 'csv' o 'pdf'
+        db: Sesión de base de datos
+
+    Returns:
+        El archivo guardado si los datos no han cambiado desde la última
+        exportación; si no, se genera leyendo los resultados con un cursor de
+        servidor, con memoria constante
+    """
+    return _respuesta_archivo(db, campeonato_id, InformeExportacion.RESULTADOS, formato)
+
+@router.post(
+    "/trabajos",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ExportacionTrabajoResponse
+)
+def crear_trabajo_exportacion(
+    solicitud: ExportacionTrabajoCreate,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """
+    Lanza la generación de una exportación en segundo plano.
+
+    Args:
+        solicitud: Campeonato, informe y formato
+        response: Respuesta HTTP (para añadir la cabecera Location)
+        db: Sesión de base de datos
+
+    Returns:
+        Identificador y estado del trabajo, ruta para consultar su avance y
+        ruta de descarga del archivo
+
+    Raises:
+        HTTPException: 404 si el campeonato no existe
+
+    Note:
+        Pensado para los PDF de campeonatos grandes: el cliente consulta
+        /api/trabajos/{trabajo_id} y descarga el archivo cuando el estado es
+        'completado', sin mantener abierta una petición larga
+    """
+    trabajo = ExportacionService(db).solicitar_exportacion(
+        solicitud.campeonato_id,
+        solicitud.informe,
+        solicitud.formato
+    )
+    url_trabajo = f"/api/trabajos/{trabajo.id}"
+    response.headers["Location"] = url_trabajo
+    return {
+        "message": "Exportación en curso",
+        "trabajo_id": trabajo.id,
+        "estado": trabajo.estado.value,
+        "url": url_trabajo,
+        "url_archivo": f"/api/exportar/trabajos/{trabajo.id}/archivo"
+    }
+
+@router.get("/trabajos/{trabajo_id}/archivo")
+def descargar_trabajo_exportacion(trabajo_id: str):
+    """
+    Descarga el archivo generado por un trabajo de exportación.
+
+    Args:
+        trabajo_id: Identificador devuelto al lanzar la exportación
+
+    Returns:
+        FileResponse con el archivo
+
+    Raises:
+        HTTPException: 404 si el trabajo no existe o no es una exportación;
+                       409 si todavía no ha terminado o ha fallado;
+                       410 si los datos han cambiado y el archivo ya no existe
+    """
+    trabajo = registro_trabajos.obtener(trabajo_id)
+    if not trabajo or trabajo.tipo != "exportacion":
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    if trabajo.estado == EstadoTrabajo.ERROR:
+        raise HTTPException(status_code=409, detail=f"La exportación ha fallado: {trabajo.error}")
+    if trabajo.estado != EstadoTrabajo.COMPLETADO:
+        raise HTTPException(status_code=409, detail="La exportación todavía no ha terminado")
+
+    guardado = almacen_exportaciones.obtener(trabajo.resultado["clave"])
+    if not guardado:
+        raise HTTPException(status_code=410, detail="Los datos han cambiado; solicite una nueva exportación")
+    formato = FormatoExportacion(trabajo.parametros["formato"])
+    return FileResponse(guardado["ruta"], media_type=TIPOS_MIME[formato], filename=guardado["nombre"])
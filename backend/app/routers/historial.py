@@ -0,0 +1,42 @@
+# Importaciones necesarias para el historial de enfrentamientos de las parejas
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.schemas.resultado import CaraACara, ResultadoHistorico
+from app.services.historial_service import HistorialService
+from typing import List
+
+# Creación del enrutador para las rutas de historial
+router = APIRouter()
+
+@router.get("/{campeonato_id}/parejas/{pareja_id}", response_model=List[ResultadoHistorico])
+def get_historial_pareja(campeonato_id: int, pareja_id: int, db: Session = Depends(get_db)):
+    """
+    Obtiene las mesas jugadas por una pareja, con su rival y los resultados de ambos.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        pareja_id: ID de la pareja
+        db: Sesión de la base de datos (inyectada automáticamente)
+    
+    Returns:
+        Historial de la pareja ordenado por partida; lista vacía si aún no
+        se le ha sorteado ninguna mesa
+    """
+    return HistorialService(db).get_historial_pareja(pareja_id, campeonato_id)
+
+@router.get("/{campeonato_id}/parejas/{pareja_id}/rivales/{rival_id}", response_model=CaraACara)
+def get_cara_a_cara(campeonato_id: int, pareja_id: int, rival_id: int, db: Session = Depends(get_db)):
+    """
+    Obtiene el balance de una pareja contra un rival.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        pareja_id: ID de la pareja
+        rival_id: ID de la pareja rival
+        db: Sesión de la base de datos (inyectada automáticamente)
+    
+    Returns:
+        Enfrentamientos, victorias, derrotas y puntos de la pareja contra el rival
+    """
+    return HistorialService(db).get_cara_a_cara(campeonato_id, pareja_id, rival_id)
@@ -1,29 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session, joinedload
+from app.core.constants import PAGINA_MAXIMA, PAGINA_POR_DEFECTO
+from app.core.paginacion import aplicar_cabeceras, paginar
+from app.db.proyeccion import proyectar
 from app.db.session import get_db
 from app.models.jugador import Jugador
 from app.models.pareja import Pareja
-from typing import List
-from app.schemas.jugador import JugadorCreate, ParejaCreate, JugadorResponse, ParejaUpdate
-from sqlalchemy import func
+from typing import List, Optional
+from app.schemas.comun import MensajeResponse
+from app.schemas.jugador import (
+    JugadorCreate,
+    JugadorResponse,
+    ParejaConJugadores,
+    ParejaCreate,
+    ParejaResponse,
+    ParejaUpdate
+)
+from app.services.jugador_service import JugadorService
+from app.services.pareja_service import ParejaService
 
 # Creación de un enrutador para manejar las rutas relacionadas con jugadores y parejas
 router = APIRouter()
 
-@router.get("/jugadores")
-def get_jugadores(db: Session = Depends(get_db)):
+@router.get("/jugadores", response_model=List[JugadorResponse])
+def get_jugadores(
+    response: Response,
+    cursor: Optional[str] = None,
+    limite: int = Query(PAGINA_POR_DEFECTO, ge=1, le=PAGINA_MAXIMA),
+    con_total: bool = False,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todos los jugadores de la base de datos.
+    Obtiene una página de jugadores ordenados por ID.
     
     Args:
+        response: Respuesta, a la que se añaden las cabeceras de paginación
+        cursor: Cursor devuelto en X-Siguiente-Cursor por la página anterior
+        limite: Número máximo de registros a devolver
+        con_total: Si True, devuelve el total de registros en X-Total-Count
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Lista de todos los jugadores
+        Lista de jugadores de la página; si hay más, su cursor va en la
+        cabecera X-Siguiente-Cursor
     """
-    return db.query(Jugador).all()
+    pagina = JugadorService(db).get_jugadores(cursor=cursor, limite=limite, con_total=con_total)
+    aplicar_cabeceras(response, pagina)
+    return pagina.filas
 
-@router.get("/jugadores/{jugador_id}")
+@router.get("/jugadores/{jugador_id}", response_model=JugadorResponse)
 def get_jugador(jugador_id: int, db: Session = Depends(get_db)):
     """
     Obtiene un jugador específico por su ID.
@@ -35,25 +60,44 @@ def get_jugador(jugador_id: int, db: Session = Depends(get_db)):
     Returns:
         El jugador solicitado o un error 404 si no se encuentra
     """
-    jugador = db.query(Jugador).filter(Jugador.id == jugador_id).first()
+    jugador = proyectar(db, Jugador, JugadorResponse).filter(Jugador.id == jugador_id).first()
     if not jugador:
         raise HTTPException(status_code=404, detail="Jugador no encontrado")
     return jugador
 
-@router.get("/parejas")
-def get_parejas(db: Session = Depends(get_db)):
+@router.get("/parejas", response_model=List[ParejaResponse])
+def get_parejas(
+    response: Response,
+    cursor: Optional[str] = None,
+    limite: int = Query(PAGINA_POR_DEFECTO, ge=1, le=PAGINA_MAXIMA),
+    con_total: bool = False,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todas las parejas de la base de datos.
+    Obtiene una página de parejas ordenadas por ID.
     
     Args:
+        response: Respuesta, a la que se añaden las cabeceras de paginación
+        cursor: Cursor devuelto en X-Siguiente-Cursor por la página anterior
+        limite: Número máximo de registros a devolver
+        con_total: Si True, devuelve el total de registros en X-Total-Count
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Lista de todas las parejas
+        Lista de parejas de la página; si hay más, su cursor va en la
+        cabecera X-Siguiente-Cursor
     """
-    return db.query(Pareja).all()
+    pagina = paginar(
+        proyectar(db, Pareja, ParejaResponse),
+        [(Pareja.id, False)],
+        cursor=cursor,
+        limite=limite,
+        con_total=con_total
+    )
+    aplicar_cabeceras(response, pagina)
+    return pagina.filas
 
-@router.get("/parejas/campeonato/{campeonato_id}")
+@router.get("/parejas/campeonato/{campeonato_id}", response_model=List[ParejaResponse])
 def get_parejas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
     """
     Obtiene todas las parejas de un campeonato específico.
@@ -65,16 +109,11 @@ def get_parejas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
     Returns:
         Lista de parejas del campeonato o una lista vacía si no hay parejas
     """
-    parejas = db.query(Pareja).filter(
+    return proyectar(db, Pareja, ParejaResponse).filter(
         Pareja.campeonato_id == campeonato_id
     ).order_by(Pareja.numero.desc()).all()
-    
-    if not parejas:
-        return []
-    
-    return parejas
 
-@router.get("/parejas/{pareja_id}")
+@router.get("/parejas/{pareja_id}", response_model=ParejaResponse)
 def get_pareja(pareja_id: int, db: Session = Depends(get_db)):
     """
     Obtiene una pareja específica por su ID.
@@ -86,12 +125,12 @@ def get_pareja(pareja_id: int, db: Session = Depends(get_db)):
     Returns:
         La pareja solicitada o un error 404 si no se encuentra
     """
-    pareja = db.query(Pareja).filter(Pareja.id == pareja_id).first()
+    pareja = proyectar(db, Pareja, ParejaResponse).filter(Pareja.id == pareja_id).first()
     if not pareja:
         raise HTTPException(status_code=404, detail="Pareja no encontrada")
     return pareja
 
-@router.get("/parejas/{pareja_id}/jugadores")
+@router.get("/parejas/{pareja_id}/jugadores", response_model=List[JugadorResponse])
 def get_jugadores_pareja(pareja_id: int, db: Session = Depends(get_db)):
     """
     Obtiene los jugadores de una pareja específica.
@@ -103,18 +142,15 @@ def get_jugadores_pareja(pareja_id: int, db: Session = Depends(get_db)):
     Returns:
         Lista de jugadores de la pareja o un error 404 si no se encuentran jugadores
     """
-    # Obtener la pareja con sus jugadores
-    pareja = db.query(Pareja).options(
-        joinedload(Pareja.jugadores)
-    ).filter(Pareja.id == pareja_id).first()
-    
-    if not pareja:
-        raise HTTPException(status_code=404, detail="Pareja no encontrada")
-    
-    # Ordenar los jugadores por ID para mantener consistencia
-    jugadores = sorted(pareja.jugadores, key=lambda x: x.id)
+    # Obtener los jugadores de la pareja ordenados por ID para mantener consistencia
+    jugadores = proyectar(db, Jugador, JugadorResponse).filter(
+        Jugador.pareja_id == pareja_id
+    ).order_by(Jugador.id).all()
     
     if not jugadores:
+        # Distinguir una pareja inexistente de una pareja sin jugadores
+        if not db.query(Pareja.id).filter(Pareja.id == pareja_id).first():
+            raise HTTPException(status_code=404, detail="Pareja no encontrada")
         raise HTTPException(status_code=404, detail="No se encontraron jugadores para esta pareja")
     
     # Asegurarnos de que devolvemos exactamente dos jugadores
@@ -124,20 +160,10 @@ def get_jugadores_pareja(pareja_id: int, db: Session = Depends(get_db)):
             detail="La pareja debe tener exactamente dos jugadores"
         )
     
-    # Devolver los jugadores en el formato esperado por el frontend
-    return [
-        {
-            "id": jugador.id,
-            "nombre": jugador.nombre,
-            "apellido": jugador.apellido,
-            "pareja_id": jugador.pareja_id,
-            "campeonato_id": jugador.campeonato_id
-        }
-        for jugador in jugadores
-    ]
+    return jugadores
 
-@router.post("/parejas")
-async def create_pareja(pareja_data: ParejaCreate, db: Session = Depends(get_db)):
+@router.post("/parejas", response_model=ParejaResponse)
+def create_pareja(pareja_data: ParejaCreate, db: Session = Depends(get_db)):
     """
     Crea una nueva pareja en la base de datos.
     
@@ -149,13 +175,9 @@ async def create_pareja(pareja_data: ParejaCreate, db: Session = Depends(get_db)
         La pareja creada
     """
     try:
-        # Obtener el último número de pareja para este campeonato
-        ultimo_numero = db.query(func.max(Pareja.numero))\
-            .filter(Pareja.campeonato_id == pareja_data.campeonato_id)\
-            .scalar()
-        
-        # Si no hay parejas, empezar desde 1, si no, incrementar el último número
-        nuevo_numero = 1 if ultimo_numero is None else ultimo_numero + 1
+        # Reservar el siguiente número de forma atómica: el contador del
+        # campeonato evita números repetidos en inscripciones simultáneas
+        nuevo_numero = ParejaService(db).reservar_numeros(pareja_data.campeonato_id)
 
         # Crear la pareja con el nuevo número
         nueva_pareja = Pareja(
@@ -192,8 +214,8 @@ async def create_pareja(pareja_data: ParejaCreate, db: Session = Depends(get_db)
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e)) 
 
-@router.put("/parejas/{pareja_id}")
-async def update_pareja(
+@router.put("/parejas/{pareja_id}", response_model=ParejaConJugadores)
+def update_pareja(
     pareja_id: int,
     pareja_data: ParejaUpdate,
     db: Session = Depends(get_db)
@@ -242,10 +264,10 @@ async def update_pareja(
         try:
             db.commit()
             db.refresh(pareja)
-            return {
-                **pareja.__dict__,
-                "jugadores": [j.to_dict() for j in jugadores]
-            }
+            return ParejaConJugadores(
+                **ParejaResponse.model_validate(pareja).model_dump(),
+                jugadores=[JugadorResponse.model_validate(j) for j in jugadores]
+            )
         except Exception as e:
             db.rollback()
             raise HTTPException(status_code=400, detail=f"Error al actualizar la base de datos: {str(e)}")
@@ -254,8 +276,8 @@ async def update_pareja(
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e)) 
 
-@router.delete("/parejas/{pareja_id}")
-async def delete_pareja(pareja_id: int, db: Session = Depends(get_db)):
+@router.delete("/parejas/{pareja_id}", response_model=MensajeResponse)
+def delete_pareja(pareja_id: int, db: Session = Depends(get_db)):
     """
     Elimina una pareja y sus jugadores asociados de la base de datos.
     
@@ -1,26 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
+from app.core.constants import PAGINA_MAXIMA, PAGINA_POR_DEFECTO
+from app.core.paginacion import aplicar_cabeceras, paginar
+from app.db.proyeccion import proyectar
 from app.db.session import get_db
-from app.models import Mesa, Pareja
+from app.models import Mesa
+from app.schemas.mesa import MesaDetalle, MesaResponse
+from typing import List, Optional
 
 # Creación de un enrutador para manejar las rutas relacionadas con mesas
 router = APIRouter()
 
-@router.get("/")
-def get_mesas(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[MesaResponse])
+def get_mesas(
+    response: Response,
+    cursor: Optional[str] = None,
+    limite: int = Query(PAGINA_POR_DEFECTO, ge=1, le=PAGINA_MAXIMA),
+    con_total: bool = False,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todas las mesas de la base de datos.
+    Obtiene una página de mesas ordenadas por ID.
     
     Args:
+        response: Respuesta, a la que se añaden las cabeceras de paginación
+        cursor: Cursor devuelto en X-Siguiente-Cursor por la página anterior
+        limite: Número máximo de registros a devolver
+        con_total: Si True, devuelve el total de registros en X-Total-Count
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Lista de todas las mesas
+        Lista de mesas de la página; si hay más, su cursor va en la
+        cabecera X-Siguiente-Cursor
     """
-    return db.query(Mesa).all()
+    pagina = paginar(proyectar(db, Mesa, MesaResponse), [(Mesa.id, False)], cursor=cursor, limite=limite, con_total=con_total)
+    aplicar_cabeceras(response, pagina)
+    return pagina.filas
 
-@router.get("/{mesa_id}")
-async def get_mesa(mesa_id: int, db: Session = Depends(get_db)):
+@router.get("/{mesa_id}", response_model=MesaDetalle)
+def get_mesa(mesa_id: int, db: Session = Depends(get_db)):
     """
     Obtiene una mesa específica por su ID.
     
@@ -32,16 +50,14 @@ async def get_mesa(mesa_id: int, db: Session = Depends(get_db)):
         La mesa solicitada con sus parejas relacionadas o un error 404 si no se encuentra
     """
     try:
-        # Buscar la mesa por ID
-        mesa = db.query(Mesa).filter(Mesa.id == mesa_id).first()
+        # Buscar la mesa por ID junto con sus parejas en una única consulta
+        mesa = db.query(Mesa).options(
+            joinedload(Mesa.pareja1),
+            joinedload(Mesa.pareja2)
+        ).filter(Mesa.id == mesa_id).first()
         if not mesa:
             raise HTTPException(status_code=404, detail="Mesa no encontrada")
 
-        # Cargar las parejas relacionadas
-        mesa.pareja1 = db.query(Pareja).filter(Pareja.id == mesa.pareja1_id).first()
-        if mesa.pareja2_id:
-            mesa.pareja2 = db.query(Pareja).filter(Pareja.id == mesa.pareja2_id).first()
-
         return mesa
     except Exception as e:
         # Manejo de excepciones y retorno de un error 500 en caso de fallo
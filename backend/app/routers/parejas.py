@@ -1,18 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
+from app.core.importacion import ErrorImportacion, leer_inscripciones
+from app.db.proyeccion import proyectar
 from app.db.session import get_db
 from app.models.pareja import Pareja
 from app.models.jugador import Jugador
-from app.schemas.pareja import ParejaCreate, ParejaUpdate
+from app.schemas.jugador import ParejaResponse
+from app.schemas.pareja import ImportacionResponse, ParejaCreate, ParejaUpdate
+from app.services.pareja_service import ParejaService
 from typing import Dict, List
 
 router = APIRouter()
 
-@router.get("/campeonato/{campeonato_id}")
+@router.get("/campeonato/{campeonato_id}", response_model=List[ParejaResponse])
 def get_parejas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
     try:
         # Obtener todas las parejas del campeonato
-        parejas = db.query(Pareja).filter(
+        parejas = proyectar(db, Pareja, ParejaResponse).filter(
             Pareja.campeonato_id == campeonato_id
         ).all()
         
@@ -26,8 +30,39 @@ def get_parejas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
             detail=f"Error al obtener parejas: {str(e)}"
         )
 
-@router.post("/")
-async def create_pareja(pareja_data: Dict, db: Session = Depends(get_db)):
+@router.post("/importar/{campeonato_id}", response_model=ImportacionResponse)
+def importar_parejas(
+    campeonato_id: int,
+    archivo: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Inscribe las parejas de un archivo CSV o XLSX en una sola transacción.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        archivo: Archivo con las columnas jugador1_nombre, jugador1_apellido,
+                 jugador2_nombre, jugador2_apellido y, opcionalmente, club
+        db: Sesión de la base de datos
+    
+    Returns:
+        Número de parejas importadas y la lista de parejas creadas con su número
+    
+    Raises:
+        HTTPException: 400 con la lista de errores por fila si el archivo no es
+                       válido; en ese caso no se inscribe ninguna pareja
+    """
+    try:
+        inscripciones = leer_inscripciones(archivo.filename, archivo.file.read())
+    except ErrorImportacion as e:
+        raise HTTPException(status_code=400, detail=e.errores)
+
+    parejas = ParejaService(db).importar_parejas(campeonato_id, inscripciones)
+    print(f"Parejas importadas en el campeonato {campeonato_id}: {len(parejas)}")
+    return {"importadas": len(parejas), "parejas": parejas}
+
+@router.post("/", response_model=ParejaResponse)
+def create_pareja(pareja_data: Dict, db: Session = Depends(get_db)):
     try:
         # Crear la pareja
         nueva_pareja = Pareja(
@@ -37,13 +72,8 @@ async def create_pareja(pareja_data: Dict, db: Session = Depends(get_db)):
             campeonato_id=pareja_data['campeonato_id']
         )
 
-        # Obtener el último número de pareja para este campeonato
-        ultima_pareja = db.query(Pareja)\
-            .filter(Pareja.campeonato_id == pareja_data['campeonato_id'])\
-            .order_by(Pareja.numero.desc())\
-            .first()
-        
-        nueva_pareja.numero = 1 if not ultima_pareja else ultima_pareja.numero + 1
+        # Reservar el siguiente número de forma atómica
+        nueva_pareja.numero = ParejaService(db).reservar_numeros(pareja_data['campeonato_id'])
         
         db.add(nueva_pareja)
         db.flush()  # Para obtener el ID de la pareja
@@ -79,8 +109,8 @@ async def create_pareja(pareja_data: Dict, db: Session = Depends(get_db)):
             detail=f"Error al crear pareja: {str(e)}"
         )
 
-@router.put("/{pareja_id}")
-async def update_pareja(
+@router.put("/{pareja_id}", response_model=ParejaResponse)
+def update_pareja(
     pareja_id: int,
     update_data: Dict,
     db: Session = Depends(get_db)
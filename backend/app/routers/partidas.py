@@ -1,15 +1,99 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
+from app.db.bloqueos import bloquear_campeonato, transaccion_campeonato
 from app.db.session import get_db
-from app.models import Campeonato, Pareja, Mesa, Resultado
-from typing import List
-from sqlalchemy import and_
-import random
+from app.db.version_datos import marcar_modificado
+from app.models import Campeonato, Pareja, Mesa, Resultado, Enfrentamiento, ContadorPartida
+from app.schemas.comun import MensajeResponse
+from app.schemas.mesa import CierrePartida, CierrePartidaResponse, MesaPartida, ProgresoPartida
+from app.core.eventos import broker_eventos, EVENTO_SORTEO, EVENTO_MESAS_ELIMINADAS
+from app.services.partida_service import PartidaService, mesa_pendiente
+from typing import List, Optional
+from sqlalchemy import and_, exists
 
 router = APIRouter()
 
-@router.get("/{campeonato_id}/mesas")
-async def get_mesas_partida(campeonato_id: int, db: Session = Depends(get_db)):
+def _pareja_mesa(pareja_id, numero, nombre, club) -> dict | None:
+    """
+    Construye la información resumida de una pareja sentada en una mesa.
+
+    Args:
+        pareja_id, numero, nombre, club: Columnas de la pareja leídas por la
+                                         proyección (None si la posición está libre)
+
+    Returns:
+        Diccionario con id, número, nombre y club de la pareja, o None
+    """
+    if pareja_id is None:
+        return None
+    return {"id": pareja_id, "numero": numero, "nombre": nombre, "club": club}
+
+def _mesas_partida(
+    db: Session,
+    campeonato_id: int,
+    partida: int,
+    solo_pendientes: bool = False
+) -> List[dict]:
+    """
+    Lee las mesas de una partida con sus parejas y el indicador de resultados.
+
+    Args:
+        db: Sesión de la base de datos
+        campeonato_id: ID del campeonato
+        partida: Número de la partida
+        solo_pendientes: Si es True, solo las mesas a las que les falta algún resultado
+
+    Returns:
+        Lista de mesas con el formato de MesaPartida, ordenada por número
+    """
+    # Subconsulta correlacionada que indica si la mesa ya tiene resultados
+    tiene_resultado = exists().where(
+        Resultado.mesa_id == Mesa.id,
+        Resultado.partida == partida
+    ).label('tiene_resultado')
+
+    # Obtener las mesas de la partida junto con las columnas de sus parejas y
+    # el indicador de resultados en una única consulta de proyección, sin
+    # construir objetos ORM
+    Pareja1 = aliased(Pareja)
+    Pareja2 = aliased(Pareja)
+    consulta = db.query(
+        Mesa.id,
+        Mesa.numero,
+        Mesa.campeonato_id,
+        Mesa.partida,
+        tiene_resultado,
+        Pareja1.id, Pareja1.numero, Pareja1.nombre, Pareja1.club,
+        Pareja2.id, Pareja2.numero, Pareja2.nombre, Pareja2.club
+    ).outerjoin(
+        Pareja1, Pareja1.id == Mesa.pareja1_id
+    ).outerjoin(
+        Pareja2, Pareja2.id == Mesa.pareja2_id
+    ).filter(
+        and_(
+            Mesa.campeonato_id == campeonato_id,
+            Mesa.partida == partida
+        )
+    )
+    if solo_pendientes:
+        consulta = consulta.filter(mesa_pendiente())
+
+    # Construir la respuesta detallada a partir de las filas leídas
+    return [
+        {
+            "id": fila[0],
+            "numero": fila[1],
+            "campeonato_id": fila[2],
+            "partida": fila[3],
+            "tieneResultado": bool(fila[4]),
+            "pareja1": _pareja_mesa(*fila[5:9]),
+            "pareja2": _pareja_mesa(*fila[9:13])
+        }
+        for fila in consulta.order_by(Mesa.numero).all()
+    ]
+
+@router.get("/{campeonato_id}/mesas", response_model=List[MesaPartida])
+def get_mesas_partida(campeonato_id: int, db: Session = Depends(get_db)):
     """
     Obtiene las mesas asignadas para la partida actual del campeonato.
     
@@ -24,62 +108,14 @@ async def get_mesas_partida(campeonato_id: int, db: Session = Depends(get_db)):
         HTTPException: Si hay error al obtener las mesas o no se encuentra el campeonato
     """
     try:
-        # Obtener el campeonato y su partida actual
-        campeonato = db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
+        # Obtener la partida actual del campeonato
+        campeonato = db.query(Campeonato.partida_actual).filter(
+            Campeonato.id == campeonato_id
+        ).first()
         if not campeonato:
             raise HTTPException(status_code=404, detail="Campeonato no encontrado")
 
-        # Obtener las mesas de la partida actual
-        mesas = db.query(Mesa).filter(
-            and_(
-                Mesa.campeonato_id == campeonato_id,
-                Mesa.partida == campeonato.partida_actual
-            )
-        ).order_by(Mesa.numero).all()
-
-        # Si no hay mesas, devolver lista vacía
-        if not mesas:
-            return []
-
-        # Cargar las parejas relacionadas y construir respuesta detallada
-        mesas_con_parejas = []
-        for mesa in mesas:
-            # Verificar si hay resultados para esta mesa
-            resultado_existente = db.query(Resultado).filter(
-                Resultado.mesa_id == mesa.id,
-                Resultado.partida == campeonato.partida_actual
-            ).first()
-
-            # Obtener pareja1
-            pareja1 = db.query(Pareja).filter(Pareja.id == mesa.pareja1_id).first()
-            # Obtener pareja2 si existe
-            pareja2 = None
-            if mesa.pareja2_id:
-                pareja2 = db.query(Pareja).filter(Pareja.id == mesa.pareja2_id).first()
-
-            # Crear diccionario con toda la información
-            mesa_dict = {
-                "id": mesa.id,
-                "numero": mesa.numero,
-                "campeonato_id": mesa.campeonato_id,
-                "partida": mesa.partida,
-                "tieneResultado": resultado_existente is not None,
-                "pareja1": {
-                    "id": pareja1.id,
-                    "numero": pareja1.numero,
-                    "nombre": pareja1.nombre,
-                    "club": pareja1.club
-                } if pareja1 else None,
-                "pareja2": {
-                    "id": pareja2.id,
-                    "numero": pareja2.numero,
-                    "nombre": pareja2.nombre,
-                    "club": pareja2.club
-                } if pareja2 else None
-            }
-            mesas_con_parejas.append(mesa_dict)
-
-        return mesas_con_parejas
+        return _mesas_partida(db, campeonato_id, campeonato.partida_actual)
 
     except Exception as e:
         raise HTTPException(
@@ -87,8 +123,61 @@ async def get_mesas_partida(campeonato_id: int, db: Session = Depends(get_db)):
             detail=f"Error al obtener las mesas: {str(e)}"
         )
 
-@router.post("/sortear-parejas/{campeonato_id}")
-async def sortear_parejas(campeonato_id: int, db: Session = Depends(get_db)):
+@router.get("/{campeonato_id}/progreso", response_model=ProgresoPartida)
+def get_progreso_partida(
+    campeonato_id: int,
+    partida: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Indica si la partida puede cerrarse: cuántas mesas siguen sin resultados.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        partida: Número de la partida (por defecto la actual)
+        db: Sesión de la base de datos
+    
+    Returns:
+        Mesas sorteadas, mesas pendientes y si la partida está completa
+    
+    Note:
+        Lee el contador mantenido al registrar resultados: una consulta de
+        una fila sea cual sea el tamaño del campeonato
+    """
+    return PartidaService(db).get_progreso_partida(campeonato_id, partida)
+
+@router.get("/{campeonato_id}/mesas/pendientes", response_model=List[MesaPartida])
+def get_mesas_pendientes(
+    campeonato_id: int,
+    partida: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene las mesas de la partida a las que aún les falta algún resultado.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        partida: Número de la partida (por defecto la actual)
+        db: Sesión de la base de datos
+    
+    Returns:
+        Mesas pendientes con sus parejas, ordenadas por número
+    
+    Raises:
+        HTTPException: Si no se encuentra el campeonato
+    """
+    if partida is None:
+        campeonato = db.query(Campeonato.partida_actual).filter(
+            Campeonato.id == campeonato_id
+        ).first()
+        if not campeonato:
+            raise HTTPException(status_code=404, detail="Campeonato no encontrado")
+        partida = campeonato.partida_actual
+
+    return _mesas_partida(db, campeonato_id, partida, solo_pendientes=True)
+
+@router.post("/sortear-parejas/{campeonato_id}", response_model=MensajeResponse)
+def sortear_parejas(campeonato_id: int, db: Session = Depends(get_db)):
     """
     Realiza el sorteo de parejas para una nueva partida.
     
@@ -101,71 +190,45 @@ async def sortear_parejas(campeonato_id: int, db: Session = Depends(get_db)):
     
     Note:
         - Para la primera partida realiza un sorteo aleatorio
-        - Para partidas posteriores ordena por ranking
+        - Para partidas posteriores ordena por la clasificación acumulada
+        - Empareja por sistema suizo evitando repetir rivales y reparte la
+          mesa libre entre las parejas que aún no la han tenido
+        - Bloquea el campeonato mientras sortea: dos sorteos simultáneos de la
+          misma partida no pueden duplicar las mesas (el segundo recibe 409)
     """
     try:
-        # Obtener el campeonato
+        # Bloquear el campeonato hasta el commit y obtenerlo
+        bloquear_campeonato(db, campeonato_id)
         campeonato = db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
         if not campeonato:
             raise HTTPException(status_code=404, detail="Campeonato no encontrado")
 
-        # 1. Obtener todas las parejas activas
-        parejas = db.query(Pareja).filter(
-            Pareja.campeonato_id == campeonato_id,
-            Pareja.activa == True
-        ).all()
+        partida_destino = campeonato.partida_actual
 
-        # 2. Verificar si hay resultados previos para determinar si es la primera partida
-        resultados_previos = db.query(Resultado).filter(
-            Resultado.campeonato_id == campeonato_id,
-            (Resultado.PG != 0) | (Resultado.PP != 0) | (Resultado.RP != 0)
+        # Comprobar que la partida no se ha sorteado ya
+        ya_sorteada = db.query(Mesa.id).filter(
+            Mesa.campeonato_id == campeonato_id,
+            Mesa.partida == partida_destino
         ).first()
-
-        # Si no hay resultados previos, hacer sorteo aleatorio
-        if not resultados_previos:
-            print("Primera partida: realizando sorteo aleatorio")
-            parejas_ordenadas = list(parejas)
-            random.shuffle(parejas_ordenadas)
-        else:
-            print("Partida posterior: ordenando por ranking")
-            # Para siguientes partidas, ordenar por ranking
-            resultados = db.query(Resultado).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).order_by(Resultado.PG.desc(), Resultado.PP.desc()).all()
-            
-            parejas_ordenadas = sorted(
-                parejas,
-                key=lambda p: next(
-                    (r.PG * 1000 + r.PP for r in resultados if r.id_pareja == p.id),
-                    0
-                ),
-                reverse=True
+        if ya_sorteada:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"La partida {partida_destino} ya tiene mesas asignadas"
             )
 
-        # 3. Emparejar las parejas
-        parejas_emparejadas = []
-        for i in range(0, len(parejas_ordenadas), 2):
-            if i + 1 < len(parejas_ordenadas):
-                parejas_emparejadas.append((parejas_ordenadas[i], parejas_ordenadas[i + 1]))
-            else:
-                parejas_emparejadas.append((parejas_ordenadas[i], None))
-
-        # 4. Crear las mesas para la partida correspondiente
-        partida_destino = campeonato.partida_actual
-        
-        for mesa_num, (pareja1, pareja2) in enumerate(parejas_emparejadas, 1):
-            mesa = Mesa(
-                numero=mesa_num,
-                campeonato_id=campeonato_id,
-                partida=partida_destino,
-                pareja1_id=pareja1.id,
-                pareja2_id=pareja2.id if pareja2 else None
-            )
-            db.add(mesa)
+        # Sortear y crear las mesas de la partida
+        mesas = PartidaService(db).sortear_mesas(campeonato_id, partida_destino)
 
         db.commit()
+        broker_eventos.publicar(campeonato_id, EVENTO_SORTEO, {
+            "partida": partida_destino,
+            "mesas": mesas
+        })
         return {"message": "Mesas asignadas correctamente"}
 
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -173,8 +236,33 @@ async def sortear_parejas(campeonato_id: int, db: Session = Depends(get_db)):
             detail=f"Error al sortear parejas: {str(e)}"
         )
 
-@router.delete("/{campeonato_id}/mesas")
-async def eliminar_mesas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
+@router.post("/{campeonato_id}/cerrar", response_model=CierrePartidaResponse)
+def cerrar_partida(campeonato_id: int, cierre: CierrePartida, db: Session = Depends(get_db)):
+    """
+    Cierra la partida actual y sortea la siguiente en una sola operación.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        cierre: Partida que se cierra y si se dividen los grupos
+        db: Sesión de la base de datos
+    
+    Returns:
+        Partida cerrada, nueva partida actual y mesas sorteadas
+    
+    Note:
+        Sustituye a la secuencia finalizar, cambiar el grupo de cada pareja,
+        iniciar y sortear: todo se hace en una transacción, y repetir la
+        petición (p. ej. tras un corte de red) devuelve el mismo resultado
+        sin volver a sortear
+    """
+    return PartidaService(db).cerrar_partida(
+        campeonato_id,
+        cierre.partida,
+        dividir_grupos=cierre.dividir_grupos
+    )
+
+@router.delete("/{campeonato_id}/mesas", response_model=MensajeResponse)
+def eliminar_mesas_campeonato(campeonato_id: int, db: Session = Depends(get_db)):
     """
     Elimina todas las mesas de un campeonato específico.
     
@@ -186,31 +274,31 @@ async def eliminar_mesas_campeonato(campeonato_id: int, db: Session = Depends(ge
         Mensaje de confirmación de la eliminación
     
     Note:
-        Realiza una eliminación segura verificando que todas las mesas
-        se hayan eliminado correctamente
+        - Borra todas las mesas con una única sentencia DELETE; los resultados que
+          las referenciaban conservan sus datos con mesa_id a NULL (ON DELETE SET NULL)
+        - Bloquea el campeonato como el sorteo: un sorteo simultáneo no puede
+          crear mesas que este borrado deje a medias
     """
     try:
-        # Primero obtener todas las mesas del campeonato
-        mesas = db.query(Mesa).filter(Mesa.campeonato_id == campeonato_id).all()
-        
-        if not mesas:
+        # El índice de rivales y los contadores de las partidas se borran en
+        # la misma transacción (también hay ON DELETE CASCADE, pero no todos
+        # los motores lo aplican)
+        with transaccion_campeonato(db, campeonato_id):
+            db.query(Enfrentamiento).filter(
+                Enfrentamiento.campeonato_id == campeonato_id
+            ).delete(synchronize_session=False)
+            db.query(ContadorPartida).filter(
+                ContadorPartida.campeonato_id == campeonato_id
+            ).delete(synchronize_session=False)
+            eliminadas = db.query(Mesa).filter(
+                Mesa.campeonato_id == campeonato_id
+            ).delete(synchronize_session=False)
+            marcar_modificado(db, campeonato_id)
+
+        if not eliminadas:
             return {"message": "No hay mesas para eliminar"}
 
-        # Eliminar cada mesa individualmente para asegurar que se eliminan todas
-        for mesa in mesas:
-            db.delete(mesa)
-        
-        # Hacer commit de los cambios
-        db.commit()
-        
-        # Verificar que se eliminaron todas las mesas
-        mesas_restantes = db.query(Mesa).filter(Mesa.campeonato_id == campeonato_id).count()
-        if mesas_restantes > 0:
-            raise HTTPException(
-                status_code=500,
-                detail="No se pudieron eliminar todas las mesas"
-            )
-            
+        broker_eventos.publicar(campeonato_id, EVENTO_MESAS_ELIMINADAS, {})
         return {"message": "Mesas eliminadas correctamente"}
     except Exception as e:
         db.rollback()
@@ -1,65 +1,83 @@
 # Importaciones necesarias para el manejo del ranking
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
+from app.core.cache import respuesta_con_etag
 from app.db.session import get_db
-from app.models import Resultado, Pareja
-from sqlalchemy import func
+from app.schemas.comun import MensajeResponse
+from app.schemas.resultado import PosicionRankingFinal
+from app.services.clasificacion_service import ClasificacionService
+from app.services.ranking_service import RankingService
+from typing import List, Optional
 
 # Creación del enrutador para las rutas relacionadas con el ranking
 router = APIRouter()
 
-@router.get("/{campeonato_id}/final")
-async def get_ranking_final(campeonato_id: int, db: Session = Depends(get_db)):
+@router.get("/{campeonato_id}/final", response_model=List[PosicionRankingFinal])
+def get_ranking_final(
+    request: Request,
+    campeonato_id: int,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
     """
     Obtiene el ranking final del campeonato con todas las estadísticas acumuladas.
     
     Args:
         campeonato_id: ID del campeonato del cual se quiere obtener el ranking
+        skip: Número de posiciones a saltar (para paginación)
+        limit: Número máximo de posiciones a devolver (todas si no se indica)
         db: Sesión de la base de datos (inyectada automáticamente)
     
     Returns:
-        Lista ordenada de parejas con sus estadísticas finales, ordenada por PG y PP
+        Lista ordenada de parejas con sus estadísticas finales, ordenada por PG y PP,
+        con cabecera ETag; 304 sin cuerpo si If-None-Match coincide
     
     Raises:
         HTTPException: Si ocurre un error al procesar la solicitud
     """
-    try:
-        # Obtener todas las parejas con sus resultados acumulados
-        # Utilizamos func.sum para calcular los totales de cada estadística
-        ranking = db.query(
-            Resultado.id_pareja,
-            func.sum(Resultado.PG).label('total_PG'),    # Total de partidas ganadas
-            func.sum(Resultado.PP).label('total_PP'),    # Total de puntos perdidos
-            func.sum(Resultado.RP).label('total_RP')     # Total de resultados parciales
-        ).filter(
-            Resultado.campeonato_id == campeonato_id
-        ).group_by(
-            Resultado.id_pareja
-        ).all()
+    def calcular():
+        # La clasificación materializada ya contiene los totales de cada pareja
+        # y se devuelve ordenada por PG (descendente) y PP (descendente)
+        filas = ClasificacionService(db).get_clasificacion(
+            campeonato_id,
+            skip=skip,
+            limit=limit
+        )
 
-        # Obtener información de las parejas y construir el resultado final
-        resultados = []
-        for r in ranking:
-            # Buscar la información de la pareja correspondiente
-            pareja = db.query(Pareja).filter(Pareja.id == r.id_pareja).first()
-            if pareja:
-                # Construir el diccionario con toda la información necesaria
-                resultados.append({
-                    'id': pareja.id,
-                    'numero': pareja.numero,
-                    'nombre': pareja.nombre,
-                    'club': pareja.club,
-                    'PG': int(r.total_PG),      # Convertir a entero para asegurar el tipo
-                    'PP': int(r.total_PP),
-                    'RP': int(r.total_RP)
-                })
+        return [
+            {
+                'id': f.id_pareja,
+                'numero': f.numero,
+                'nombre': f.nombre,
+                'club': f.club,
+                'PG': f.PG,
+                'PP': f.PP,
+                'RP': f.RP
+            }
+            for f in filas
+        ]
 
-        # Ordenar el ranking por PG (descendente) y PP (descendente)
-        # Esto asegura que las parejas con más partidas ganadas aparezcan primero
-        # y en caso de empate, se ordenen por puntos perdidos
-        resultados.sort(key=lambda x: (x['PG'], x['PP']), reverse=True)
-        return resultados
+    try:
+        ranking, etag = RankingService(db).get_ranking_cacheado(
+            'final', campeonato_id, calcular, skip, limit
+        )
+        return respuesta_con_etag(request, ranking, etag)
 
     except Exception as e:
         # Capturar cualquier error y devolver una respuesta apropiada
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{campeonato_id}/reconstruir", response_model=MensajeResponse)
+def reconstruir_ranking(campeonato_id: int, db: Session = Depends(get_db)):
+    """
+    Reconstruye la clasificación materializada del campeonato desde sus resultados.
+    
+    Args:
+        campeonato_id: ID del campeonato
+        db: Sesión de la base de datos (inyectada automáticamente)
+    
+    Returns:
+        Mensaje de confirmación
+    """
+    return RankingService(db).actualizar_ranking(campeonato_id)
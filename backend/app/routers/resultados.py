@@ -1,20 +1,58 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
+from app.core.cache import respuesta_con_etag
 from app.db.session import get_db
+from app.services.ranking_service import RankingService
 from app.services.resultado_service import ResultadoService
-from app.schemas.resultado import ResultadoCreate, ResultadoResponse
-from typing import List
+from app.schemas.comun import MensajeResponse
+from app.schemas.resultado import (
+    PosicionRanking,
+    ResultadoCreate,
+    ResultadoMesa,
+    ResultadoResponse,
+    ResultadoLoteCreate,
+    ResultadoLoteResponse
+)
+from typing import List, Optional
 
 router = APIRouter()
 
-@router.get("/ranking/{campeonato_id}")
-def get_ranking(campeonato_id: int, db: Session = Depends(get_db)) -> List[dict]:
+@router.get("/ranking/{campeonato_id}", response_model=List[PosicionRanking])
+def get_ranking(
+    request: Request,
+    campeonato_id: int,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
     resultado_service = ResultadoService(db)
-    return resultado_service.obtener_ranking(campeonato_id)
+    ranking, etag = RankingService(db).get_ranking_cacheado(
+        'resultados',
+        campeonato_id,
+        lambda: resultado_service.obtener_ranking(campeonato_id, skip=skip, limit=limit),
+        skip,
+        limit
+    )
+    return respuesta_con_etag(request, ranking, etag)
 
 @router.post("/")
 def create_resultado(resultado: ResultadoCreate, db: Session = Depends(get_db)) -> ResultadoResponse:
     resultado_service = ResultadoService(db)
     return resultado_service.create_resultado(resultado)
 
+@router.post("/lote")
+def create_resultados_lote(lote: ResultadoLoteCreate, db: Session = Depends(get_db)) -> ResultadoLoteResponse:
+    resultado_service = ResultadoService(db)
+    return resultado_service.create_resultados_lote(lote)
+
+@router.put("/mesa/{mesa_id}")
+def update_resultados_mesa(mesa_id: int, entrada: ResultadoMesa, db: Session = Depends(get_db)) -> ResultadoResponse:
+    resultado_service = ResultadoService(db)
+    return resultado_service.actualizar_resultados_mesa(mesa_id, entrada)
+
+@router.delete("/mesa/{mesa_id}", response_model=MensajeResponse)
+def delete_resultados_mesa(mesa_id: int, db: Session = Depends(get_db)):
+    resultado_service = ResultadoService(db)
+    return resultado_service.eliminar_resultados_mesa(mesa_id)
+
 # ... resto de los endpoints ...
\ No newline at end of file
@@ -0,0 +1,27 @@
+# Importaciones necesarias para consultar los trabajos en segundo plano
+from fastapi import APIRouter, HTTPException
+from app.core.trabajos import registro_trabajos
+from app.schemas.trabajo import TrabajoResponse
+
+# Creación del enrutador para las rutas de trabajos
+router = APIRouter()
+
+@router.get("/{trabajo_id}", response_model=TrabajoResponse)
+def get_trabajo(trabajo_id: str):
+    """
+    Obtiene el estado de un trabajo en segundo plano.
+    
+    Args:
+        trabajo_id: Identificador devuelto al lanzar el trabajo
+    
+    Returns:
+        Estado, progreso, resultado o error del trabajo
+    
+    Raises:
+        HTTPException: 404 si el trabajo no existe, ya se ha olvidado o lo
+        lanzó otro proceso del servidor
+    """
+    trabajo = registro_trabajos.obtener(trabajo_id)
+    if not trabajo:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return trabajo.to_dict()
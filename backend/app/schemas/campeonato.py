@@ -2,6 +2,7 @@
 from pydantic import BaseModel
 from datetime import date
 from typing import Optional
+from app.core.constants import EstadoTrabajo
 
 class CampeonatoBase(BaseModel):
     """
@@ -51,7 +52,7 @@ class CampeonatoUpdate(BaseModel):
     grupo_b: Optional[bool] = None
     partida_actual: Optional[int] = None
 
-class Campeonato(CampeonatoBase):
+class CampeonatoResponse(CampeonatoBase):
     """
     Esquema completo del campeonato que incluye el ID.
     Se utiliza para las respuestas de la API.
@@ -66,3 +67,18 @@ class Campeonato(CampeonatoBase):
 
     class Config:
         from_attributes = True
+
+class EliminacionCampeonatoResponse(BaseModel):
+    """
+    Esquema de respuesta al solicitar la eliminación de un campeonato.
+    
+    Attributes:
+        message (str): Mensaje de confirmación
+        trabajo_id (str): Identificador del trabajo de borrado
+        estado (EstadoTrabajo): Estado inicial del trabajo
+        url (str): Ruta donde consultar el avance del trabajo
+    """
+    message: str
+    trabajo_id: str
+    estado: EstadoTrabajo
+    url: str
@@ -0,0 +1,11 @@
+# Esquemas de respuesta compartidos por varios routers
+from pydantic import BaseModel
+
+class MensajeResponse(BaseModel):
+    """
+    Esquema de las respuestas que solo confirman una operación.
+    
+    Attributes:
+        message (str): Mensaje de confirmación
+    """
+    message: str
@@ -0,0 +1,77 @@
+# Esquemas de respuesta de los endpoints de estado (/api/estado/*)
+from typing import List
+from pydantic import BaseModel
+
+class EstadoPool(BaseModel):
+    """
+    Uso del pool de conexiones a la base de datos.
+    
+    Attributes:
+        pool_size (int): Conexiones permanentes configuradas
+        max_overflow (int): Conexiones adicionales permitidas
+        en_uso (int): Conexiones prestadas en este momento
+        libres (int): Conexiones disponibles en el pool
+        desbordamiento (int): Conexiones de desbordamiento abiertas
+        abiertas (int): Conexiones abiertas desde el arranque
+        cerradas (int): Conexiones cerradas desde el arranque
+        invalidadas (int): Conexiones invalidadas desde el arranque
+    """
+    pool_size: int
+    max_overflow: int
+    en_uso: int
+    libres: int
+    desbordamiento: int
+    abiertas: int
+    cerradas: int
+    invalidadas: int
+
+class EstadoCache(BaseModel):
+    """
+    Contadores de la caché de rankings.
+    
+    Attributes:
+        aciertos (int): Respuestas servidas desde la caché
+        fallos (int): Respuestas que hubo que calcular
+        tasa_aciertos (float): Aciertos sobre el total de consultas
+        invalidaciones (int): Invalidaciones por cambios en los datos
+        entradas (int): Entradas almacenadas
+        capacidad (int): Entradas máximas
+        ttl (float): Segundos de validez de cada entrada
+    """
+    aciertos: int
+    fallos: int
+    tasa_aciertos: float
+    invalidaciones: int
+    entradas: int
+    capacidad: int
+    ttl: float
+
+class PatronNMas1(BaseModel):
+    """
+    Sentencia repetida dentro de una misma petición (posible N+1).
+    
+    Attributes:
+        endpoint (str): Función del router que atendió la petición
+        sentencia (str): Forma de la sentencia, sin los valores
+        peticiones (int): Peticiones en las que se ha detectado
+        repeticiones_max (int): Máximo de repeticiones en una sola petición
+    """
+    endpoint: str
+    sentencia: str
+    peticiones: int
+    repeticiones_max: int
+
+class EstadoSQL(BaseModel):
+    """
+    Configuración de la instrumentación SQL y patrones N+1 detectados.
+    
+    Attributes:
+        instrumentacion (bool): Si se miden las consultas de cada petición
+        detectar_n_mas_1 (bool): Si se buscan sentencias repetidas
+        umbral_n_mas_1 (int): Repeticiones a partir de las que se avisa
+        patrones (List[PatronNMas1]): Patrones detectados desde el arranque
+    """
+    instrumentacion: bool
+    detectar_n_mas_1: bool
+    umbral_n_mas_1: int
+    patrones: List[PatronNMas1]
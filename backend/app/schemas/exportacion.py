@@ -0,0 +1,33 @@
+# Esquemas de los trabajos de exportación
+from pydantic import BaseModel
+from app.core.constants import EstadoTrabajo, FormatoExportacion, InformeExportacion
+
+class ExportacionTrabajoCreate(BaseModel):
+    """
+    Esquema para solicitar la generación de una exportación en segundo plano.
+
+    Attributes:
+        campeonato_id (int): ID del campeonato
+        informe (InformeExportacion): 'ranking' o 'resultados'
+        formato (FormatoExportacion): 'excel', 'csv' o 'pdf'
+    """
+    campeonato_id: int
+    informe: InformeExportacion
+    formato: FormatoExportacion = FormatoExportacion.PDF
+
+class ExportacionTrabajoResponse(BaseModel):
+    """
+    Esquema de respuesta al solicitar una exportación en segundo plano.
+
+    Attributes:
+        message (str): Mensaje de confirmación
+        trabajo_id (str): Identificador del trabajo de exportación
+        estado (EstadoTrabajo): Estado inicial del trabajo
+        url (str): Ruta donde consultar el avance del trabajo
+        url_archivo (str): Ruta de descarga del archivo cuando el trabajo termine
+    """
+    message: str
+    trabajo_id: str
+    estado: EstadoTrabajo
+    url: str
+    url_archivo: str
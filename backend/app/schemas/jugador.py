@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 # Esquema base para Jugador
 class JugadorBase(BaseModel):
@@ -135,3 +135,12 @@ class ParejaResponse(ParejaBase):
 
     class Config:
         from_attributes = True
+
+class ParejaConJugadores(ParejaResponse):
+    """
+    Esquema de respuesta de una pareja junto con sus dos jugadores.
+    
+    Attributes:
+        jugadores (List[JugadorResponse]): Jugadores de la pareja, ordenados por ID
+    """
+    jugadores: List[JugadorResponse] = []
@@ -1,6 +1,7 @@
 # Importaciones necesarias para definir los esquemas de datos
 from pydantic import BaseModel
 from typing import Optional
+from .jugador import ParejaResponse
 
 class MesaBase(BaseModel):
     """
@@ -76,3 +77,98 @@ class MesaConParejas(MesaResponse):
 
     class Config:
         from_attributes = True
+
+class MesaDetalle(MesaResponse):
+    """
+    Esquema de respuesta de una mesa con los datos completos de sus parejas.
+    
+    Attributes:
+        pareja1 (Optional[ParejaResponse]): Primera pareja de la mesa
+        pareja2 (Optional[ParejaResponse]): Segunda pareja (None si es mesa libre)
+    """
+    pareja1: Optional[ParejaResponse] = None
+    pareja2: Optional[ParejaResponse] = None
+
+class ParejaMesa(BaseModel):
+    """
+    Esquema resumido de una pareja sentada en una mesa.
+    
+    Attributes:
+        id (int): Identificador único de la pareja
+        numero (Optional[int]): Número de la pareja en el campeonato
+        nombre (str): Nombre de la pareja
+        club (Optional[str]): Club de la pareja
+    """
+    id: int
+    numero: Optional[int] = None
+    nombre: str
+    club: Optional[str] = None
+
+class MesaPartida(BaseModel):
+    """
+    Esquema de una mesa de la partida en curso tal y como la muestra el frontend.
+    
+    Attributes:
+        id (int): Identificador único de la mesa
+        numero (int): Número de la mesa
+        campeonato_id (int): ID del campeonato
+        partida (int): Número de la partida
+        tieneResultado (bool): Indica si la mesa ya tiene resultados registrados
+        pareja1 (Optional[ParejaMesa]): Primera pareja
+        pareja2 (Optional[ParejaMesa]): Segunda pareja (None si es mesa libre)
+    """
+    id: int
+    numero: int
+    campeonato_id: int
+    partida: int
+    tieneResultado: bool = False
+    pareja1: Optional[ParejaMesa] = None
+    pareja2: Optional[ParejaMesa] = None
+
+class ProgresoPartida(BaseModel):
+    """
+    Esquema con el avance de los resultados de una partida.
+    
+    Attributes:
+        campeonato_id (int): ID del campeonato
+        partida (int): Número de la partida
+        mesas (int): Mesas sorteadas en la partida
+        mesas_pendientes (int): Mesas a las que aún les falta algún resultado
+        completa (bool): True si hay mesas y todas tienen sus resultados
+    """
+    campeonato_id: int
+    partida: int
+    mesas: int = 0
+    mesas_pendientes: int = 0
+    completa: bool = False
+
+class CierrePartida(BaseModel):
+    """
+    Esquema para cerrar la partida actual y sortear la siguiente.
+    
+    Attributes:
+        partida (int): Partida que se cierra; identifica la operación, de modo
+                       que un reintento no cierra también la siguiente
+        dividir_grupos (bool): Si se reparten las parejas en los grupos A y B;
+                               solo tiene efecto en campeonatos con grupo_b
+                               y False permite no repartirlos en este cierre
+    """
+    partida: int
+    dividir_grupos: bool = True
+
+class CierrePartidaResponse(BaseModel):
+    """
+    Esquema de respuesta del cierre de una partida.
+    
+    Attributes:
+        message (str): Mensaje de confirmación
+        partida_cerrada (int): Partida cerrada
+        partida_actual (int): Nueva partida actual (la misma al cerrar la última)
+        mesas (int): Mesas sorteadas para la nueva partida (0 al cerrar la última)
+        repetida (bool): True si la partida ya estaba cerrada (reintento)
+    """
+    message: str
+    partida_cerrada: int
+    partida_actual: int
+    mesas: int
+    repetida: bool = False
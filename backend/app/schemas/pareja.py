@@ -100,3 +100,27 @@ class ParejaSimple(BaseModel):
 
     class Config:
         from_attributes = True
+
+class ParejaImportada(BaseModel):
+    """
+    Esquema de una pareja creada en una importación de inscripciones.
+    
+    Attributes:
+        id (int): Identificador único de la pareja
+        numero (int): Número asignado a la pareja en el campeonato
+        nombre (str): Nombre de la pareja
+    """
+    id: int
+    numero: int
+    nombre: str
+
+class ImportacionResponse(BaseModel):
+    """
+    Esquema de respuesta de una importación de inscripciones.
+    
+    Attributes:
+        importadas (int): Número de parejas inscritas
+        parejas (List[ParejaImportada]): Parejas creadas con su número
+    """
+    importadas: int
+    parejas: List[ParejaImportada]
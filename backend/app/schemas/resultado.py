@@ -1,6 +1,6 @@
 # Importaciones necesarias para definir los esquemas de datos
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 
 class ResultadoPareja(BaseModel):
     id: int
@@ -23,6 +23,57 @@ class ResultadoResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ResultadoMesa(BaseModel):
+    """
+    Esquema con los resultados de una mesa dentro de un envío por lotes.
+    
+    Attributes:
+        mesa_id (int): ID de la mesa
+        pareja1 (ResultadoPareja): Resultado de la primera pareja
+        pareja2 (Optional[ResultadoPareja]): Resultado de la segunda pareja (None en mesa libre)
+    """
+    mesa_id: int
+    pareja1: ResultadoPareja
+    pareja2: Optional[ResultadoPareja] = None
+
+class ResultadoLoteCreate(BaseModel):
+    """
+    Esquema para registrar a la vez los resultados de varias mesas de una partida.
+    
+    Attributes:
+        campeonato_id (int): ID del campeonato
+        partida (int): Número de la partida
+        resultados (List[ResultadoMesa]): Resultados de cada mesa
+        parcial (bool): Si es True se registran las mesas válidas aunque otras
+                        tengan errores; si es False cualquier error cancela el lote
+    """
+    campeonato_id: int
+    partida: int
+    resultados: List[ResultadoMesa]
+    parcial: bool = False
+
+class ErrorResultadoMesa(BaseModel):
+    """
+    Esquema que describe por qué no se registraron los resultados de una mesa.
+    
+    Attributes:
+        mesa_id (int): ID de la mesa
+        detail (str): Descripción del error
+    """
+    mesa_id: int
+    detail: str
+
+class ResultadoLoteResponse(BaseModel):
+    """
+    Esquema de respuesta de un envío de resultados por lotes.
+    
+    Attributes:
+        registradas (List[int]): IDs de las mesas cuyos resultados se registraron
+        errores (List[ErrorResultadoMesa]): Mesas rechazadas y el motivo
+    """
+    registradas: List[int] = []
+    errores: List[ErrorResultadoMesa] = []
+
 class RankingResultado(BaseModel):
     """
     Esquema para representar el resultado de una pareja en el ranking.
@@ -43,7 +94,6 @@ class RankingResultado(BaseModel):
     Config:
         from_attributes: Permite la conversión automática desde objetos ORM
         arbitrary_types_allowed: Permite tipos arbitrarios en el modelo
-        orm_mode: Habilita el modo ORM para la conversión de datos
     """
     posicion: int = 0
     GB: str = 'A'
@@ -58,4 +108,135 @@ class RankingResultado(BaseModel):
     class Config:
         from_attributes = True
         arbitrary_types_allowed = True
-        orm_mode = True
+
+class PosicionRanking(BaseModel):
+    """
+    Esquema de una fila del ranking por grupos (/api/resultados/ranking).
+    
+    Attributes:
+        pareja_id (int): Identificador único de la pareja
+        nombre (str): Nombre de la pareja
+        club (Optional[str]): Club de la pareja
+        numero (Optional[int]): Número de la pareja en el campeonato
+        PG (int): Partidas ganadas
+        PP (int): Puntos acumulados
+        GB (str): Grupo de la pareja
+        ultima_partida (int): Última partida registrada
+    """
+    pareja_id: int
+    nombre: str
+    club: Optional[str] = None
+    numero: Optional[int] = None
+    PG: int
+    PP: int
+    GB: str
+    ultima_partida: int
+
+class PosicionRankingFinal(BaseModel):
+    """
+    Esquema de una fila del ranking final (/api/ranking/{id}/final).
+    
+    Attributes:
+        id (int): Identificador único de la pareja
+        numero (Optional[int]): Número de la pareja en el campeonato
+        nombre (str): Nombre de la pareja
+        club (Optional[str]): Club de la pareja
+        PG (int): Partidas ganadas
+        PP (int): Puntos acumulados
+        RP (int): Resultado en puntos acumulado
+    """
+    id: int
+    numero: Optional[int] = None
+    nombre: str
+    club: Optional[str] = None
+    PG: int
+    PP: int
+    RP: int
+
+class ResultadoEstadisticas(BaseModel):
+    """
+    Estadísticas de una pareja en un campeonato.
+    
+    Attributes:
+        total_partidas (int): Partidas con resultado registrado
+        victorias (int): Partidas con PG mayor que 0
+        derrotas (int): Partidas sin PG
+        promedio_PP (float): Media de puntos por partida
+        mejor_resultado (int): RP más alto
+        peor_resultado (int): RP más bajo
+        resultados_por_grupo (Dict[str, int]): Partidas jugadas en cada grupo ('A', 'B')
+    """
+    total_partidas: int = 0
+    victorias: int = 0
+    derrotas: int = 0
+    promedio_PP: float = 0.0
+    mejor_resultado: int = 0
+    peor_resultado: int = 0
+    resultados_por_grupo: Dict[str, int] = {'A': 0, 'B': 0}
+
+class EstadisticasPareja(ResultadoEstadisticas):
+    """
+    Estadísticas de una pareja dentro del listado de todo el campeonato.
+    
+    Attributes:
+        pareja_id (int): Identificador único de la pareja
+        numero (Optional[int]): Número de la pareja en el campeonato
+        nombre (str): Nombre de la pareja
+    """
+    pareja_id: int
+    numero: Optional[int] = None
+    nombre: str
+
+class ResultadoHistorico(BaseModel):
+    """
+    Esquema de una partida en el historial de una pareja.
+    
+    Attributes:
+        partida (int): Número de la partida
+        mesa_id (int): ID de la mesa en la que jugó
+        mesa_numero (int): Número de la mesa
+        rival_id (Optional[int]): ID de la pareja rival (None si tuvo mesa libre)
+        rival_numero (Optional[int]): Número de la pareja rival
+        rival_nombre (Optional[str]): Nombre de la pareja rival
+        GB (Optional[str]): Grupo de la pareja en la partida
+        PG (Optional[int]): Partidas ganadas (None si aún no hay resultado)
+        PP (Optional[int]): Puntos de la pareja
+        RP (Optional[int]): Resultado en puntos de la pareja
+        rival_PP (Optional[int]): Puntos del rival
+        rival_resultado (Optional[int]): Resultado en puntos del rival
+    """
+    partida: int
+    mesa_id: int
+    mesa_numero: int
+    rival_id: Optional[int] = None
+    rival_numero: Optional[int] = None
+    rival_nombre: Optional[str] = None
+    GB: Optional[str] = None
+    PG: Optional[int] = None
+    PP: Optional[int] = None
+    RP: Optional[int] = None
+    rival_PP: Optional[int] = None
+    rival_resultado: Optional[int] = None
+
+class CaraACara(BaseModel):
+    """
+    Esquema del balance entre dos parejas de un campeonato.
+    
+    Attributes:
+        pareja_id (int): ID de la pareja
+        rival_id (int): ID de la pareja rival
+        enfrentamientos (int): Veces que se han sentado en la misma mesa
+        victorias (int): Enfrentamientos con resultado que ganó la pareja
+        derrotas (int): Enfrentamientos con resultado que ganó el rival
+        PP (int): Puntos sumados por la pareja en esos enfrentamientos
+        rival_PP (int): Puntos sumados por el rival
+        partidas (List[ResultadoHistorico]): Detalle de cada enfrentamiento
+    """
+    pareja_id: int
+    rival_id: int
+    enfrentamientos: int = 0
+    victorias: int = 0
+    derrotas: int = 0
+    PP: int = 0
+    rival_PP: int = 0
+    partidas: List[ResultadoHistorico] = []
@@ -0,0 +1,29 @@
+# Esquemas de respuesta de los trabajos en segundo plano
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from app.core.constants import EstadoTrabajo
+
+class TrabajoResponse(BaseModel):
+    """
+    Estado de un trabajo en segundo plano.
+    
+    Attributes:
+        id (str): Identificador del trabajo
+        tipo (str): Tipo de trabajo, p. ej. 'eliminar_campeonato'
+        parametros (dict): Argumentos con los que se lanzó
+        estado (EstadoTrabajo): Pendiente, en curso, completado o error
+        progreso (dict): Datos de avance publicados por el trabajo
+        resultado (Any): Valor devuelto al terminar
+        error (Optional[str]): Mensaje de error si ha fallado
+        creado, iniciado, terminado (float): Marcas de tiempo (epoch)
+    """
+    id: str
+    tipo: str
+    parametros: Dict[str, Any]
+    estado: EstadoTrabajo
+    progreso: Dict[str, Any]
+    resultado: Any = None
+    error: Optional[str] = None
+    creado: float
+    iniciado: Optional[float] = None
+    terminado: Optional[float] = None
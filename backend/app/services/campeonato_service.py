@@ -1,11 +1,31 @@
 # Importaciones necesarias para el servicio de campeonatos
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.core.artefactos import almacen_exportaciones
+from app.core.cache import cache_ranking
+from app.core.constants import PAGINA_POR_DEFECTO, TAMANO_LOTE_PURGA
+from app.core.paginacion import Pagina, paginar
+from app.core.trabajos import Trabajo, registro_trabajos
+from app.db.bloqueos import bloquear_campeonato, transaccion_campeonato
+from app.db.proyeccion import proyectar
+from app.db.session import SessionLocal
 from app.models.campeonato import Campeonato
+from app.models.clasificacion import Clasificacion
+from app.models.contador_partida import ContadorPartida
+from app.models.enfrentamiento import Enfrentamiento
+from app.models.jugador import Jugador
+from app.models.mesa import Mesa
+from app.models.pareja import Pareja
 from app.models.resultado import Resultado
-from app.schemas.campeonato import CampeonatoCreate, CampeonatoUpdate
-from sqlalchemy import func, case
-from typing import List, Optional
+from app.schemas.campeonato import CampeonatoCreate, CampeonatoResponse, CampeonatoUpdate
+from app.services.clasificacion_service import ClasificacionService
+from typing import Dict, List, Optional
+
+# Tablas hijas de un campeonato en el orden en que se purgan (primero las que
+# referencian a las demás)
+TABLAS_PURGA = [Resultado, Clasificacion, Enfrentamiento, ContadorPartida, Mesa, Jugador, Pareja]
 
 class CampeonatoService:
     """
@@ -22,18 +42,28 @@ class CampeonatoService:
         """
         self.db = db
 
-    def get_campeonatos(self, skip: int = 0, limit: int = 100) -> List[Campeonato]:
+    def get_campeonatos(
+        self,
+        cursor: Optional[str] = None,
+        limite: int = PAGINA_POR_DEFECTO,
+        con_total: bool = False
+    ) -> Pagina:
         """
-        Obtiene una lista paginada de campeonatos.
+        Obtiene una página de campeonatos ordenados por ID.
         
         Args:
-            skip: Número de registros a saltar (para paginación)
-            limit: Número máximo de registros a devolver
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limite: Número máximo de registros a devolver
+            con_total: Si True, incluye el número total de campeonatos
         
         Returns:
-            Lista de objetos Campeonato
+            Página con los campeonatos (solo las columnas de CampeonatoResponse)
+            y el cursor de la página siguiente
         """
-        return self.db.query(Campeonato).offset(skip).limit(limit).all()
+        query = proyectar(self.db, Campeonato, CampeonatoResponse).filter(
+            Campeonato.en_eliminacion == False
+        )
+        return paginar(query, [(Campeonato.id, False)], cursor=cursor, limite=limite, con_total=con_total)
 
     def get_campeonato(self, campeonato_id: int) -> Optional[Campeonato]:
         """
@@ -43,9 +73,12 @@ class CampeonatoService:
             campeonato_id: ID del campeonato a buscar
         
         Returns:
-            Objeto Campeonato si existe, None en caso contrario
+            Objeto Campeonato si existe y no se está eliminando, None en caso contrario
         """
-        return self.db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
+        return self.db.query(Campeonato).filter(
+            Campeonato.id == campeonato_id,
+            Campeonato.en_eliminacion == False
+        ).first()
 
     def create_campeonato(self, campeonato: CampeonatoCreate) -> Campeonato:
         """
@@ -99,6 +132,41 @@ class CampeonatoService:
             self.db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
 
+    def eliminar_campeonato(self, campeonato_id: int) -> Trabajo:
+        """
+        Oculta un campeonato y lanza su borrado en segundo plano.
+
+        Args:
+            campeonato_id: ID del campeonato a eliminar
+
+        Returns:
+            Trabajo: Trabajo de purga lanzado, para consultar su estado
+
+        Raises:
+            HTTPException: Si el campeonato no existe
+
+        Note:
+            - La marca en_eliminacion se confirma antes de responder, de modo que
+              el campeonato deja de listarse al instante
+            - Repetir la petición sobre un campeonato a medio borrar relanza la
+              purga, que continúa donde se quedó
+        """
+        bloquear_campeonato(self.db, campeonato_id)
+        campeonato = self.db.query(Campeonato).filter(Campeonato.id == campeonato_id).first()
+        if not campeonato:
+            self.db.rollback()
+            raise HTTPException(status_code=404, detail="Campeonato no encontrado")
+
+        campeonato.en_eliminacion = True
+        self.db.commit()
+        cache_ranking.invalidar(campeonato_id)
+
+        return registro_trabajos.lanzar(
+            "eliminar_campeonato",
+            purgar_campeonato,
+            campeonato_id=campeonato_id
+        )
+
     def iniciar_partida(self, campeonato_id: int) -> dict:
         """
         Inicia una nueva partida en el campeonato.
@@ -152,45 +220,40 @@ class CampeonatoService:
             "partida_actual": campeonato.partida_actual
         }
 
-    def get_ranking(self, campeonato_id: int) -> List[dict]:
+    def get_ranking(
+        self,
+        campeonato_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[dict]:
         """
         Obtiene el ranking actual del campeonato.
         
         Args:
             campeonato_id: ID del campeonato
+            skip: Número de posiciones a saltar (para paginación)
+            limit: Número máximo de posiciones a devolver (todas si es None)
             
         Returns:
             Lista de diccionarios con las estadísticas de cada pareja,
-            ordenada por partidas ganadas y perdidas
-        """
-        # Obtener los resultados agrupados por pareja
-        resultados = self.db.query(
-            Resultado.id_pareja,
-            func.sum(Resultado.PG).label('total_PG'),
-            func.sum(Resultado.PP).label('total_PP'),
-            func.max(case(
-                (Resultado.GB == 'B', 'B'),
-                else_='A'
-            )).label('GB')
-        ).filter(
-            Resultado.campeonato_id == campeonato_id
-        ).group_by(
-            Resultado.id_pareja
-        ).all()
-
-        # Convertir los resultados a diccionarios y ordenarlos
-        ranking = [
+            ordenada por partidas ganadas y puntos
+        """
+        # Leer la clasificación materializada, ya ordenada en la base de datos
+        filas = ClasificacionService(self.db).get_clasificacion(
+            campeonato_id,
+            skip=skip,
+            limit=limit
+        )
+
+        return [
             {
-                'pareja_id': r.id_pareja,
-                'PG': r.total_PG,
-                'PP': r.total_PP,
-                'GB': r.GB
+                'pareja_id': f.id_pareja,
+                'PG': f.PG,
+                'PP': f.PP,
+                'GB': f.GB
             }
-            for r in resultados
+            for f in filas
         ]
-        
-        ranking.sort(key=lambda x: (-x['PG'], x['PP']))
-        return ranking
 
     def cerrar_campeonato(self, campeonato_id: int) -> dict:
         """
@@ -215,4 +278,84 @@ class CampeonatoService:
                 detail="No se puede cerrar el campeonato hasta completar todas las partidas"
             )
         
-        return {"message": "Campeonato cerrado correctamente"} 
\ No newline at end of file
+        return {"message": "Campeonato cerrado correctamente"} 
+
+def purgar_campeonato(trabajo: Trabajo, campeonato_id: int, tamano_lote: int = TAMANO_LOTE_PURGA) -> Dict[str, int]:
+    """
+    Borra un campeonato y todos sus datos por lotes acotados.
+
+    Args:
+        trabajo: Trabajo en curso; su progreso se actualiza tras cada lote
+        campeonato_id: ID del campeonato a borrar
+        tamano_lote: Filas borradas por transacción
+
+    Returns:
+        dict: Filas borradas de cada tabla
+
+    Note:
+        - Cada lote es una transacción corta con su propio commit, así que un
+          campeonato de toda una temporada nunca retiene bloqueos durante
+          segundos ni genera una transacción enorme
+        - Se ejecuta en un hilo de fondo con su propia sesión
+        - El borrado final de la fila del campeonato arrastra por ON DELETE
+          CASCADE cualquier fila creada mientras tanto
+    """
+    borradas = {Modelo.__tablename__: 0 for Modelo in TABLAS_PURGA}
+    trabajo.progreso = {"tabla": None, "filas_borradas": borradas}
+
+    db = SessionLocal()
+    try:
+        for Modelo in TABLAS_PURGA:
+            trabajo.progreso["tabla"] = Modelo.__tablename__
+            lote = select(Modelo.id).where(
+                Modelo.campeonato_id == campeonato_id
+            ).limit(tamano_lote)
+            while True:
+                filas = db.execute(
+                    delete(Modelo).where(Modelo.id.in_(lote.scalar_subquery())),
+                    execution_options={"synchronize_session": False}
+                ).rowcount
+                db.commit()
+                borradas[Modelo.__tablename__] += filas
+                if filas < tamano_lote:
+                    break
+
+        trabajo.progreso["tabla"] = Campeonato.__tablename__
+        with transaccion_campeonato(db, campeonato_id):
+            db.execute(
+                delete(Campeonato).where(Campeonato.id == campeonato_id),
+                execution_options={"synchronize_session": False}
+            )
+            quedan = db.execute(select(func.count(Campeonato.id))).scalar()
+            if quedan == 0 and db.get_bind().dialect.name == "postgresql":
+                _reiniciar_secuencia_campeonatos(db)
+        trabajo.progreso["tabla"] = None
+
+        cache_ranking.invalidar(campeonato_id)
+        almacen_exportaciones.eliminar_campeonato(campeonato_id)
+        print(f"Campeonato {campeonato_id} eliminado: {borradas}")
+        return borradas
+    finally:
+        db.close()
+
+def _reiniciar_secuencia_campeonatos(db: Session) -> None:
+    """
+    Reinicia la secuencia de IDs de campeonatos cuando la tabla queda vacía.
+
+    Args:
+        db: Sesión de la base de datos (con el campeonato ya eliminado)
+
+    Note:
+        - Bloquea la tabla con NOWAIT dentro de un savepoint: si otra transacción
+          está creando o eliminando campeonatos no espera, simplemente no reinicia
+        - Como solo ocurre al borrar el último campeonato, este bloqueo de tabla
+          no puede hacer esperar a ningún otro torneo
+    """
+    try:
+        with db.begin_nested():
+            db.execute(text("LOCK TABLE campeonatos IN SHARE ROW EXCLUSIVE MODE NOWAIT"))
+            if db.execute(select(func.count(Campeonato.id))).scalar() == 0:
+                db.execute(text("ALTER SEQUENCE campeonatos_id_seq RESTART WITH 1"))
+    except DBAPIError as e:
+        # No lanzamos el error para que la operación principal se complete
+        print(f"No se pudo reiniciar la secuencia de IDs: {str(e)}")
@@ -0,0 +1,342 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, or_, select, update
+from app.core.constants import GrupoJuego, MINIMO_PAREJAS_GRUPO_B, PORCENTAJE_GRUPO_B
+from app.db.version_datos import marcar_modificado
+from app.models.clasificacion import Clasificacion
+from app.models.pareja import Pareja
+from app.models.resultado import Resultado
+from typing import Dict, Iterable, List, Optional, Any
+
+class ClasificacionService:
+    """
+    Servicio que mantiene la tabla materializada de clasificaciones.
+    Aplica de forma incremental cada resultado registrado, editado o eliminado,
+    dentro de la misma transacción que lo escribe, y permite reconstruir la
+    tabla completa a partir de los resultados.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Constructor del servicio de clasificaciones.
+
+        Args:
+            db: Sesión de SQLAlchemy para interactuar con la base de datos
+        """
+        self.db = db
+
+    def _filas_por_pareja(
+        self,
+        campeonato_id: int,
+        pareja_ids: Iterable[int]
+    ) -> Dict[int, Clasificacion]:
+        """
+        Carga (bloqueando) las filas de clasificación de un conjunto de parejas.
+
+        Args:
+            campeonato_id: ID del campeonato
+            pareja_ids: IDs de las parejas afectadas
+
+        Returns:
+            Diccionario id_pareja -> Clasificacion con las filas existentes
+        """
+        filas = self.db.query(Clasificacion).filter(
+            Clasificacion.campeonato_id == campeonato_id,
+            Clasificacion.id_pareja.in_(set(pareja_ids))
+        ).with_for_update().all()
+        return {f.id_pareja: f for f in filas}
+
+    def aplicar_resultados(self, resultados: List[Resultado]) -> None:
+        """
+        Suma a la clasificación los resultados recién insertados.
+
+        Args:
+            resultados: Resultados ya enviados a la base de datos (flush), de modo
+                        que sus campos calculados (PG) estén establecidos
+
+        Note:
+            No realiza commit: el llamador confirma la transacción junto con
+            la inserción de los resultados
+        """
+        por_campeonato: Dict[int, List[Resultado]] = {}
+        for r in resultados:
+            por_campeonato.setdefault(r.campeonato_id, []).append(r)
+
+        for campeonato_id, lote in por_campeonato.items():
+            filas = self._filas_por_pareja(campeonato_id, (r.id_pareja for r in lote))
+            for r in lote:
+                fila = filas.get(r.id_pareja)
+                if fila is None:
+                    fila = Clasificacion(
+                        campeonato_id=campeonato_id,
+                        id_pareja=r.id_pareja,
+                        GB=r.GB or 'A',
+                        PG=0,
+                        PP=0,
+                        RP=0,
+                        partidas_jugadas=0,
+                        ultima_partida=0
+                    )
+                    self.db.add(fila)
+                    filas[r.id_pareja] = fila
+
+                fila.PG += r.PG or 0
+                fila.PP += r.PP or 0
+                fila.RP += r.RP or 0
+                fila.partidas_jugadas += 1
+                # El grupo vigente es el del resultado más reciente
+                if (r.partida or 0) >= fila.ultima_partida:
+                    fila.ultima_partida = r.partida or 0
+                    fila.GB = r.GB or fila.GB
+
+    def recalcular_parejas(self, campeonato_id: int, pareja_ids: Iterable[int]) -> None:
+        """
+        Recalcula la clasificación de unas parejas concretas desde sus resultados.
+        Se utiliza tras editar o eliminar resultados, donde no basta con sumar.
+
+        Args:
+            campeonato_id: ID del campeonato
+            pareja_ids: IDs de las parejas a recalcular
+
+        Note:
+            El coste es proporcional al número de partidas de esas parejas,
+            no al tamaño total de la tabla de resultados. No realiza commit.
+        """
+        pareja_ids = set(pareja_ids)
+        if not pareja_ids:
+            return
+
+        self.db.query(Clasificacion).filter(
+            Clasificacion.campeonato_id == campeonato_id,
+            Clasificacion.id_pareja.in_(pareja_ids)
+        ).delete(synchronize_session=False)
+        marcar_modificado(self.db, campeonato_id)
+
+        filas = self._agregar_resultados(
+            Resultado.campeonato_id == campeonato_id,
+            Resultado.id_pareja.in_(pareja_ids)
+        )
+        if filas:
+            self.db.execute(insert(Clasificacion), filas)
+
+    def actualizar_gb(self, campeonato_id: int, pareja_id: int, gb: str) -> None:
+        """
+        Cambia el grupo vigente de una pareja en la clasificación.
+
+        Args:
+            campeonato_id: ID del campeonato
+            pareja_id: ID de la pareja
+            gb: Nuevo grupo ('A' o 'B')
+        """
+        self.db.query(Clasificacion).filter(
+            Clasificacion.campeonato_id == campeonato_id,
+            Clasificacion.id_pareja == pareja_id
+        ).update({"GB": gb}, synchronize_session=False)
+        marcar_modificado(self.db, campeonato_id)
+
+    def dividir_grupos(self, campeonato_id: int, partida: int) -> None:
+        """
+        Reparte las parejas activas del campeonato en los grupos A y B según la clasificación.
+
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Partida que se cierra; sus resultados y los posteriores
+                     toman el nuevo grupo de cada pareja
+
+        Note:
+            - La primera mitad (PORCENTAJE_GRUPO_B) de la clasificación, en el
+              orden del ranking (PG y PP descendentes), queda en el grupo A y
+              el resto en el B; con menos de 2 * MINIMO_PAREJAS_GRUPO_B parejas
+              todas quedan en el A (la regla de grupo_clasificacion)
+            - Un único UPDATE ... FROM con las posiciones calculadas por una
+              función de ventana: no carga las parejas ni sus resultados
+            - Copia el grupo a los resultados desde la partida indicada, como
+              ResultadoService.actualizar_gb; reconstruir() toma el grupo del
+              último resultado de cada pareja y sin esta copia desharía el reparto
+            - No realiza commit
+        """
+        orden = select(
+            Clasificacion.id,
+            func.row_number().over(
+                order_by=(Clasificacion.PG.desc(), Clasificacion.PP.desc(), Clasificacion.id_pareja)
+            ).label('posicion'),
+            func.count().over().label('total')
+        ).join(
+            Pareja, Pareja.id == Clasificacion.id_pareja
+        ).where(
+            Clasificacion.campeonato_id == campeonato_id,
+            Pareja.activa == True
+        ).subquery()
+
+        grupo = case(
+            (
+                or_(
+                    orden.c.total < MINIMO_PAREJAS_GRUPO_B * 2,
+                    orden.c.posicion <= orden.c.total * PORCENTAJE_GRUPO_B
+                ),
+                GrupoJuego.A.value
+            ),
+            else_=GrupoJuego.B.value
+        )
+        self.db.execute(
+            update(Clasificacion).where(Clasificacion.id == orden.c.id).values(GB=grupo),
+            execution_options={"synchronize_session": False}
+        )
+
+        grupo_clasificacion = select(Clasificacion.GB).where(
+            Clasificacion.campeonato_id == Resultado.campeonato_id,
+            Clasificacion.id_pareja == Resultado.id_pareja
+        ).scalar_subquery()
+        self.db.execute(
+            update(Resultado).where(
+                Resultado.campeonato_id == campeonato_id,
+                Resultado.partida >= partida
+            ).values(GB=func.coalesce(grupo_clasificacion, Resultado.GB)),
+            execution_options={"synchronize_session": False}
+        )
+        marcar_modificado(self.db, campeonato_id)
+
+    def eliminar_campeonato(self, campeonato_id: int) -> None:
+        """
+        Elimina todas las filas de clasificación de un campeonato.
+
+        Args:
+            campeonato_id: ID del campeonato
+        """
+        self.db.query(Clasificacion).filter(
+            Clasificacion.campeonato_id == campeonato_id
+        ).delete(synchronize_session=False)
+        marcar_modificado(self.db, campeonato_id)
+
+    def reconstruir(self, campeonato_id: Optional[int] = None) -> int:
+        """
+        Reconstruye la tabla de clasificaciones a partir de los resultados.
+
+        Args:
+            campeonato_id: ID del campeonato a reconstruir (todos si es None)
+
+        Returns:
+            Número de filas de clasificación generadas
+        """
+        borrado = self.db.query(Clasificacion)
+        filtros = []
+        if campeonato_id is not None:
+            borrado = borrado.filter(Clasificacion.campeonato_id == campeonato_id)
+            filtros.append(Resultado.campeonato_id == campeonato_id)
+        borrado.delete(synchronize_session=False)
+        marcar_modificado(self.db, campeonato_id)
+
+        filas = self._agregar_resultados(*filtros)
+        if filas:
+            self.db.execute(insert(Clasificacion), filas)
+        self.db.commit()
+        return len(filas)
+
+    def _agregar_resultados(self, *filtros) -> List[Dict[str, Any]]:
+        """
+        Agrega los resultados que cumplen los filtros en filas de clasificación.
+
+        Args:
+            *filtros: Condiciones SQLAlchemy sobre la tabla de resultados
+
+        Returns:
+            Lista de diccionarios listos para insertar en clasificaciones
+        """
+        totales = self.db.query(
+            Resultado.campeonato_id,
+            Resultado.id_pareja,
+            func.sum(Resultado.PG).label('PG'),
+            func.sum(Resultado.PP).label('PP'),
+            func.sum(Resultado.RP).label('RP'),
+            func.count(Resultado.id).label('partidas_jugadas'),
+            func.max(Resultado.partida).label('ultima_partida')
+        ).filter(*filtros).group_by(
+            Resultado.campeonato_id,
+            Resultado.id_pareja
+        ).subquery()
+
+        # El grupo vigente es el del resultado de la última partida de cada pareja
+        filas = self.db.query(
+            totales,
+            func.max(Resultado.GB).label('GB')
+        ).join(
+            Resultado,
+            (Resultado.campeonato_id == totales.c.campeonato_id) &
+            (Resultado.id_pareja == totales.c.id_pareja) &
+            (Resultado.partida == totales.c.ultima_partida)
+        ).group_by(*totales.c).all()
+
+        return [
+            {
+                'campeonato_id': f.campeonato_id,
+                'id_pareja': f.id_pareja,
+                'GB': f.GB or 'A',
+                'PG': int(f.PG or 0),
+                'PP': int(f.PP or 0),
+                'RP': int(f.RP or 0),
+                'partidas_jugadas': int(f.partidas_jugadas),
+                'ultima_partida': int(f.ultima_partida or 0)
+            }
+            for f in filas
+        ]
+
+    def consulta_clasificacion(self, campeonato_id: int, por_grupo: bool = False):
+        """
+        Construye la consulta ordenada de la clasificación de un campeonato.
+
+        Args:
+            campeonato_id: ID del campeonato
+            por_grupo: Si es True ordena primero por grupo (A antes que B)
+
+        Returns:
+            Query con los campos de Clasificacion y numero, nombre y club de la
+            pareja, ordenada por PG y PP descendentes (sin ejecutar)
+
+        Note:
+            La ordenación se resuelve con los índices ix_clasificaciones_ranking*,
+            por lo que el coste no depende del número de partidas jugadas
+        """
+        orden = [Clasificacion.PG.desc(), Clasificacion.PP.desc()]
+        if por_grupo:
+            orden.insert(0, Clasificacion.GB)
+
+        return self.db.query(
+            Clasificacion.id_pareja,
+            Clasificacion.GB,
+            Clasificacion.PG,
+            Clasificacion.PP,
+            Clasificacion.RP,
+            Clasificacion.partidas_jugadas,
+            Clasificacion.ultima_partida,
+            Pareja.numero,
+            Pareja.nombre,
+            Pareja.club
+        ).join(
+            Pareja,
+            Clasificacion.id_pareja == Pareja.id
+        ).filter(
+            Clasificacion.campeonato_id == campeonato_id
+        ).order_by(*orden, Clasificacion.id_pareja)
+
+    def get_clasificacion(
+        self,
+        campeonato_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        por_grupo: bool = False
+    ) -> List[Any]:
+        """
+        Lee la clasificación ordenada de un campeonato junto con los datos de cada pareja.
+
+        Args:
+            campeonato_id: ID del campeonato
+            skip: Número de filas a saltar (para paginación)
+            limit: Número máximo de filas a devolver (todas si es None)
+            por_grupo: Si es True ordena primero por grupo (A antes que B)
+
+        Returns:
+            Lista de filas de consulta_clasificacion
+        """
+        query = self.consulta_clasificacion(campeonato_id, por_grupo).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
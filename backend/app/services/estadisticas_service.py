@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import and_, func, case
+from app.models.pareja import Pareja
 from app.models.resultado import Resultado
 from app.schemas.resultado import ResultadoEstadisticas
+from app.services.ranking_service import RankingService
+from typing import Any, Dict, List, Tuple
 
 class EstadisticasService:
     """
@@ -12,65 +15,114 @@ class EstadisticasService:
     def __init__(self, db: Session):
         """
         Constructor del servicio de estadísticas.
-        
+
         Args:
             db: Sesión de SQLAlchemy para interactuar con la base de datos
         """
         self.db = db
 
+    def get_estadisticas_campeonato(self, campeonato_id: int) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Obtiene las estadísticas de todas las parejas de un campeonato.
+
+        Args:
+            campeonato_id: ID del campeonato
+
+        Returns:
+            Tuple[List[dict], str]: Estadísticas de cada pareja (campos de
+            EstadisticasPareja), ordenadas por número, y su ETag
+
+        Note:
+            Se calculan con una única consulta agregada y se guardan en la caché
+            de rankings, que se invalida con cada escritura de resultados
+        """
+        return RankingService(self.db).get_ranking_cacheado(
+            'estadisticas',
+            campeonato_id,
+            lambda: self._calcular_estadisticas(campeonato_id)
+        )
+
     def get_estadisticas_pareja(self, pareja_id: int, campeonato_id: int) -> ResultadoEstadisticas:
         """
         Calcula y devuelve las estadísticas completas de una pareja en un campeonato específico.
-        
+
         Args:
             pareja_id: ID de la pareja a analizar
             campeonato_id: ID del campeonato del que se quieren las estadísticas
-        
+
         Returns:
             ResultadoEstadisticas: Objeto con todas las estadísticas calculadas
-            
+
         Note:
-            Si no hay resultados, devuelve un objeto con valores por defecto (0)
+            - Es una búsqueda en las estadísticas de todo el campeonato: la
+              primera consulta las calcula para todas las parejas y las
+              siguientes las leen de la caché
+            - Si no hay resultados, devuelve un objeto con valores por defecto (0)
         """
-        # Obtener todos los resultados de la pareja en el campeonato
-        resultados = self.db.query(Resultado).filter(
-            Resultado.id_pareja == pareja_id,
-            Resultado.campeonato_id == campeonato_id
-        ).all()
+        estadisticas, _ = self.get_estadisticas_campeonato(campeonato_id)
+        for fila in estadisticas:
+            if fila['pareja_id'] == pareja_id:
+                return ResultadoEstadisticas(**fila)
+        return ResultadoEstadisticas()
+
+    def _calcular_estadisticas(self, campeonato_id: int) -> List[Dict[str, Any]]:
+        """
+        Agrega los resultados de todas las parejas del campeonato en una consulta.
+
+        Args:
+            campeonato_id: ID del campeonato
 
-        # Si no hay resultados, devolver estadísticas con valores por defecto
-        if not resultados:
-            return ResultadoEstadisticas(
-                total_partidas=0,
-                victorias=0,
-                derrotas=0,
-                promedio_PP=0.0,
-                mejor_resultado=0,
-                peor_resultado=0,
-                resultados_por_grupo={'A': 0, 'B': 0}
+        Returns:
+            Lista de diccionarios con los campos de EstadisticasPareja
+
+        Note:
+            El LEFT JOIN incluye las parejas sin resultados, con valores 0.
+            Usa el índice (campeonato_id, id_pareja) de resultados
+        """
+        filas = self.db.query(
+            Pareja.id,
+            Pareja.numero,
+            Pareja.nombre,
+            func.count(Resultado.id).label('total_partidas'),
+            func.sum(case((Resultado.PG > 0, 1), else_=0)).label('victorias'),
+            func.avg(Resultado.PP).label('promedio_PP'),
+            func.max(Resultado.RP).label('mejor_resultado'),
+            func.min(Resultado.RP).label('peor_resultado'),
+            func.sum(case((Resultado.GB == 'A', 1), else_=0)).label('grupo_A'),
+            func.sum(case((Resultado.GB == 'B', 1), else_=0)).label('grupo_B')
+        ).outerjoin(
+            Resultado,
+            and_(
+                Resultado.id_pareja == Pareja.id,
+                Resultado.campeonato_id == campeonato_id
             )
+        ).filter(
+            Pareja.campeonato_id == campeonato_id
+        ).group_by(
+            Pareja.id,
+            Pareja.numero,
+            Pareja.nombre
+        ).order_by(
+            Pareja.numero,
+            Pareja.id
+        ).all()
 
-        # Cálculo de estadísticas básicas
-        total_partidas = len(resultados)                                    # Total de partidas jugadas
-        victorias = sum(1 for r in resultados if r.PG > 0)                 # Número de victorias
-        derrotas = total_partidas - victorias                              # Número de derrotas
-        promedio_PP = sum(r.PP for r in resultados) / total_partidas      # Promedio de puntos perdidos
-        mejor_resultado = max(r.RP for r in resultados)                    # Mejor resultado obtenido
-        peor_resultado = min(r.RP for r in resultados)                    # Peor resultado obtenido
-        
-        # Conteo de resultados por grupo (A y B)
-        resultados_por_grupo = {
-            'A': sum(1 for r in resultados if r.GB == 'A'),               # Resultados en grupo A
-            'B': sum(1 for r in resultados if r.GB == 'B')                # Resultados en grupo B
-        }
-
-        # Construcción y retorno del objeto de estadísticas
-        return ResultadoEstadisticas(
-            total_partidas=total_partidas,
-            victorias=victorias,
-            derrotas=derrotas,
-            promedio_PP=promedio_PP,
-            mejor_resultado=mejor_resultado,
-            peor_resultado=peor_resultado,
-            resultados_por_grupo=resultados_por_grupo
-        ) 
\ No newline at end of file
+        return [
+            {
+                'pareja_id': f.id,
+                'numero': f.numero,
+                'nombre': f.nombre,
+                'total_partidas': f.total_partidas,
+                'victorias': int(f.victorias or 0),
+                'derrotas': f.total_partidas - int(f.victorias or 0),
+                # AVG devuelve NUMERIC en PostgreSQL
+                'promedio_PP': float(f.promedio_PP or 0),
+                'mejor_resultado': int(f.mejor_resultado or 0),
+                'peor_resultado': int(f.peor_resultado or 0),
+                'resultados_por_grupo': {
+                    'A': int(f.grupo_A or 0),
+                    'B': int(f.grupo_B or 0)
+                }
+            }
+            for f in filas
+        ]
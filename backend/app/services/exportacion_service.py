@@ -1,273 +1,555 @@
+import csv
+import io
+import tempfile
+from itertools import groupby
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-import pandas as pd
 from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+from openpyxl import Workbook
+from app.core.artefactos import almacen_exportaciones, clave_artefacto
+from app.core.config import settings
+from app.core.constants import (
+    ERRORES,
+    TAMANO_BLOQUE_DESCARGA,
+    TAMANO_LOTE_EXPORTACION,
+    FormatoExportacion,
+    InformeExportacion
+)
+from app.core.pdf import renderizar_en_proceso
+from app.core.trabajos import Trabajo, registro_trabajos
+from app.db.session import SessionLocal
+from app.db.version_datos import version_datos
+from app.models.campeonato import Campeonato
+from app.models.mesa import Mesa
 from app.models.resultado import Resultado
 from app.models.pareja import Pareja
-from typing import Tuple, BinaryIO
+from app.services.clasificacion_service import ClasificacionService
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, BinaryIO
+
+# Cabeceras de las exportaciones
+CABECERA_RANKING = ['Posición', 'Número', 'Pareja', 'Club', 'PG', 'PP', 'RP', 'Grupo']
+CABECERA_RESULTADOS = ['Partida', 'Mesa', 'Pareja', 'RP', 'PG', 'PP', 'Grupo']
+
+# Función que, dada una sesión y un campeonato, genera las filas a exportar
+GeneradorFilas = Callable[[Session, int], Iterator[list]]
+
+def filas_ranking(db: Session, campeonato_id: int) -> Iterator[list]:
+    """
+    Genera las filas del ranking leyendo la clasificación por lotes.
+
+    Args:
+        db: Sesión de base de datos
+        campeonato_id: ID del campeonato
+
+    Yields:
+        list: Fila con los valores de CABECERA_RANKING
+    """
+    consulta = ClasificacionService(db).consulta_clasificacion(campeonato_id, por_grupo=True)
+    for posicion, f in enumerate(consulta.yield_per(TAMANO_LOTE_EXPORTACION), 1):
+        yield [posicion, f.numero, f.nombre, f.club or '', f.PG, f.PP, f.RP, f.GB]
+
+def filas_resultados(db: Session, campeonato_id: int) -> Iterator[list]:
+    """
+    Genera las filas de resultados detallados leyendo por lotes.
+
+    Args:
+        db: Sesión de base de datos
+        campeonato_id: ID del campeonato
+
+    Yields:
+        list: Fila con los valores de CABECERA_RESULTADOS, por partida y mesa
+
+    Note:
+        yield_per abre un cursor de servidor en PostgreSQL, de modo que nunca
+        hay más de TAMANO_LOTE_EXPORTACION filas en memoria
+    """
+    consulta = db.query(
+        Resultado.partida,
+        Mesa.numero,
+        Pareja.nombre,
+        Resultado.RP,
+        Resultado.PG,
+        Resultado.PP,
+        Resultado.GB
+    ).join(
+        Mesa,
+        Resultado.mesa_id == Mesa.id
+    ).join(
+        Pareja,
+        Resultado.id_pareja == Pareja.id
+    ).filter(
+        Resultado.campeonato_id == campeonato_id
+    ).order_by(
+        Resultado.partida,
+        Mesa.numero,
+        Resultado.id
+    )
+    for f in consulta.yield_per(TAMANO_LOTE_EXPORTACION):
+        yield list(f)
+
+def generar_csv(
+    generador: GeneradorFilas,
+    campeonato_id: int,
+    cabecera: List[str]
+) -> Iterator[bytes]:
+    """
+    Escribe un CSV de forma incremental, enviando bloques a medida que se leen filas.
+
+    Args:
+        generador: Función que produce las filas a exportar
+        campeonato_id: ID del campeonato
+        cabecera: Nombres de las columnas
+
+    Yields:
+        bytes: Bloques de unos TAMANO_BLOQUE_DESCARGA bytes del CSV en UTF-8
+
+    Note:
+        Abre su propia sesión porque se ejecuta mientras se envía la respuesta,
+        después de que la sesión de la petición haya terminado su trabajo.
+        Empieza con BOM para que Excel reconozca la codificación
+    """
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')
+        writer.writerow(cabecera)
+        for fila in generador(db, campeonato_id):
+            writer.writerow(fila)
+            if buffer.tell() >= TAMANO_BLOQUE_DESCARGA:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+    finally:
+        db.close()
+
+def generar_xlsx(
+    generador: GeneradorFilas,
+    campeonato_id: int,
+    cabecera: List[str],
+    hoja: str
+) -> Iterator[bytes]:
+    """
+    Genera un XLSX con el modo de solo escritura de openpyxl y lo envía por bloques.
+
+    Args:
+        generador: Función que produce las filas a exportar
+        campeonato_id: ID del campeonato
+        cabecera: Nombres de las columnas
+        hoja: Nombre de la hoja de cálculo
+
+    Yields:
+        bytes: Bloques de TAMANO_BLOQUE_DESCARGA bytes del archivo XLSX
+
+    Note:
+        En modo write_only las filas se vuelcan a un fichero temporal a medida
+        que se añaden, y el libro comprimido se escribe también en disco, por lo
+        que la memoria no crece con el número de partidas. El formato ZIP obliga
+        a terminar el libro antes de enviar el primer byte
+    """
+    db = SessionLocal()
+    try:
+        libro = Workbook(write_only=True)
+        hoja_calculo = libro.create_sheet(hoja)
+        hoja_calculo.append(cabecera)
+        for fila in generador(db, campeonato_id):
+            hoja_calculo.append(fila)
+    finally:
+        db.close()
+
+    with tempfile.TemporaryFile() as fichero:
+        libro.save(fichero)
+        fichero.seek(0)
+        while bloque := fichero.read(TAMANO_BLOQUE_DESCARGA):
+            yield bloque
 
 class ExportacionService:
     """
     Servicio que maneja la exportación de datos del campeonato a diferentes formatos.
-    Proporciona funcionalidades para exportar rankings y resultados a Excel y PDF.
+    Proporciona funcionalidades para exportar rankings y resultados a Excel, CSV y PDF.
     """
 
     def __init__(self, db: Session):
         """
         Constructor del servicio de exportación.
-        
+
         Args:
             db: Sesión de SQLAlchemy para interactuar con la base de datos
         """
         self.db = db
 
-    def exportar_ranking_excel(self, campeonato_id: int) -> Tuple[BinaryIO, str]:
+    def exportar(
+        self,
+        campeonato_id: int,
+        informe: InformeExportacion,
+        formato: FormatoExportacion
+    ) -> Tuple[Optional[Iterable[bytes]], str, Optional[str]]:
+        """
+        Exporta un informe reutilizando el archivo guardado si los datos no han cambiado.
+
+        Args:
+            campeonato_id: ID del campeonato
+            informe: Ranking o resultados
+            formato: Excel, CSV o PDF
+
+        Returns:
+            Tuple: (contenido, nombre sugerido, ruta). Si ya hay un archivo para
+            la versión actual de los datos, contenido es None y ruta apunta al
+            archivo; si no, contenido genera el archivo por bloques y lo guarda
+            a medida que se envía, y ruta es None
+
+        Raises:
+            HTTPException: 404 si el campeonato no existe
+
+        Note:
+            La versión se lee antes que los datos: si cambian durante la
+            generación, el archivo contiene datos más nuevos que su clave y la
+            siguiente versión simplemente no lo encuentra y lo vuelve a generar
+        """
+        clave = self._clave(campeonato_id, informe, formato)
+        guardado = almacen_exportaciones.obtener(clave)
+        if guardado:
+            return None, guardado["nombre"], guardado["ruta"]
+
+        contenido, nombre = self._generar(campeonato_id, informe, formato)
+        return almacen_exportaciones.guardar(clave, nombre, contenido), nombre, None
+
+    def generar_artefacto(
+        self,
+        campeonato_id: int,
+        informe: InformeExportacion,
+        formato: FormatoExportacion
+    ) -> Dict[str, Any]:
+        """
+        Genera y guarda un informe sin enviarlo (trabajos en segundo plano).
+
+        Args:
+            campeonato_id: ID del campeonato
+            informe: Ranking o resultados
+            formato: Excel, CSV o PDF
+
+        Returns:
+            dict: Clave, nombre, sha256 y tamaño del archivo guardado
+
+        Raises:
+            HTTPException: 404 si el campeonato no existe; 409 si los datos han
+                           cambiado y el archivo ya se ha sustituido
+        """
+        clave = self._clave(campeonato_id, informe, formato)
+        if not almacen_exportaciones.obtener(clave):
+            contenido, nombre = self._generar(campeonato_id, informe, formato)
+            for _ in almacen_exportaciones.guardar(clave, nombre, contenido):
+                pass
+        guardado = almacen_exportaciones.obtener(clave)
+        if not guardado:
+            # Se ha guardado entretanto una versión más nueva que retira esta
+            raise HTTPException(status_code=409, detail="Los datos han cambiado durante la exportación")
+        return {
+            "clave": clave,
+            "nombre": guardado["nombre"],
+            "sha256": guardado["sha256"],
+            "tamano": guardado["tamano"]
+        }
+
+    def solicitar_exportacion(
+        self,
+        campeonato_id: int,
+        informe: InformeExportacion,
+        formato: FormatoExportacion
+    ) -> Trabajo:
+        """
+        Lanza la generación de un informe en segundo plano.
+
+        Args:
+            campeonato_id: ID del campeonato
+            informe: Ranking o resultados
+            formato: Excel, CSV o PDF
+
+        Returns:
+            Trabajo: Trabajo de exportación lanzado, para consultar su estado
+
+        Raises:
+            HTTPException: 404 si el campeonato no existe
         """
-        Exporta el ranking del campeonato a un archivo Excel.
-        
+        self._verificar_campeonato(campeonato_id)
+        return registro_trabajos.lanzar(
+            "exportacion",
+            generar_exportacion,
+            campeonato_id=campeonato_id,
+            informe=informe.value,
+            formato=formato.value
+        )
+
+    def _clave(self, campeonato_id: int, informe: InformeExportacion, formato: FormatoExportacion) -> str:
+        """Clave del archivo con la versión actual de los datos; 404 si el campeonato no existe."""
+        version = version_datos(self.db, campeonato_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail=ERRORES["CAMPEONATO_NO_ENCONTRADO"])
+        return clave_artefacto(campeonato_id, informe.value, formato.value, version)
+
+    def _generar(
+        self,
+        campeonato_id: int,
+        informe: InformeExportacion,
+        formato: FormatoExportacion
+    ) -> Tuple[Iterable[bytes], str]:
+        """Genera un informe con el método de su formato; devuelve bloques y nombre."""
+        metodos = {
+            (InformeExportacion.RANKING, FormatoExportacion.EXCEL): self.exportar_ranking_excel,
+            (InformeExportacion.RANKING, FormatoExportacion.CSV): self.exportar_ranking_csv,
+            (InformeExportacion.RANKING, FormatoExportacion.PDF): self.exportar_ranking_pdf,
+            (InformeExportacion.RESULTADOS, FormatoExportacion.EXCEL): self.exportar_resultados_excel,
+            (InformeExportacion.RESULTADOS, FormatoExportacion.CSV): self.exportar_resultados_csv,
+            (InformeExportacion.RESULTADOS, FormatoExportacion.PDF): self.exportar_resultados_pdf,
+        }
+        contenido, nombre = metodos[(informe, formato)](campeonato_id)
+        if isinstance(contenido, BytesIO):
+            # Los PDF ya están en memoria: un único bloque
+            contenido = [contenido.getvalue()]
+        return contenido, nombre
+
+    def _verificar_campeonato(self, campeonato_id: int) -> str:
+        """
+        Comprueba que el campeonato existe antes de empezar a enviar el archivo.
+
+        Returns:
+            str: Nombre del campeonato (título de los PDF)
+
+        Raises:
+            HTTPException: 404 si el campeonato no existe
+        """
+        campeonato = self.db.query(Campeonato.nombre).filter(Campeonato.id == campeonato_id).first()
+        if not campeonato:
+            raise HTTPException(status_code=404, detail=ERRORES["CAMPEONATO_NO_ENCONTRADO"])
+        return campeonato.nombre
+
+    def exportar_ranking_excel(self, campeonato_id: int) -> Tuple[Iterator[bytes], str]:
+        """
+        Exporta el ranking del campeonato a un archivo Excel en streaming.
+
         Args:
             campeonato_id: ID del campeonato a exportar
-        
+
         Returns:
-            Tuple[BinaryIO, str]: Buffer con el archivo Excel y nombre sugerido
-            
+            Tuple[Iterator[bytes], str]: Generador de bloques del archivo y nombre sugerido
+
         Raises:
-            HTTPException: Si hay error en la exportación
-            
+            HTTPException: Si el campeonato no existe
+
         Note:
-            El archivo Excel incluye: ID pareja, nombre, club, PG, PP y GB
+            El archivo Excel incluye: posición, número, pareja, club, PG, PP, RP y grupo
         """
-        try:
-            # Consulta SQL para obtener los datos del ranking
-            ranking = self.db.query(
-                Resultado.id_pareja,
-                Pareja.nombre.label('nombre_pareja'),
-                Pareja.club,
-                Resultado.PG.label('PG'),
-                Resultado.PP.label('PP'),
-                Resultado.GB.label('GB')
-            ).join(
-                Pareja,
-                Resultado.id_pareja == Pareja.id
-            ).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).all()
-
-            # Crear DataFrame de pandas con los resultados
-            df = pd.DataFrame(ranking)
-            
-            # Generar archivo Excel en memoria
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Ranking')
-            
-            output.seek(0)
-            return output, f"ranking_{campeonato_id}.xlsx"
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        self._verificar_campeonato(campeonato_id)
+        return (
+            generar_xlsx(filas_ranking, campeonato_id, CABECERA_RANKING, 'Ranking'),
+            f"ranking_{campeonato_id}.xlsx"
+        )
+
+    def exportar_ranking_csv(self, campeonato_id: int) -> Tuple[Iterator[bytes], str]:
+        """
+        Exporta el ranking del campeonato a CSV en streaming.
+
+        Args:
+            campeonato_id: ID del campeonato a exportar
+
+        Returns:
+            Tuple[Iterator[bytes], str]: Generador de bloques del archivo y nombre sugerido
+
+        Raises:
+            HTTPException: Si el campeonato no existe
+        """
+        self._verificar_campeonato(campeonato_id)
+        return (
+            generar_csv(filas_ranking, campeonato_id, CABECERA_RANKING),
+            f"ranking_{campeonato_id}.csv"
+        )
 
     def exportar_ranking_pdf(self, campeonato_id: int) -> Tuple[BinaryIO, str]:
         """
         Exporta el ranking del campeonato a un archivo PDF.
-        
+
         Args:
             campeonato_id: ID del campeonato a exportar
-        
+
         Returns:
             Tuple[BinaryIO, str]: Buffer con el archivo PDF y nombre sugerido
-            
+
         Raises:
             HTTPException: Si hay error en la exportación
-            
+
         Note:
-            El PDF incluye una tabla formateada con estilos profesionales
+            Una sección por grupo, con la posición dentro del grupo. El PDF se
+            genera en el pool de procesos de renderizado
         """
+        nombre = self._verificar_campeonato(campeonato_id)
         try:
-            # Consulta SQL para obtener los datos del ranking
-            ranking = self.db.query(
-                Resultado.id_pareja,
-                Pareja.nombre.label('nombre_pareja'),
-                Pareja.club,
-                Resultado.PG.label('PG'),
-                Resultado.PP.label('PP'),
-                Resultado.GB.label('GB')
-            ).join(
-                Pareja,
-                Resultado.id_pareja == Pareja.id
-            ).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).all()
-
-            # Crear buffer para el PDF en memoria
-            buffer = BytesIO()
-            
-            # Configurar documento PDF
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = []
-
-            # Preparar datos para la tabla
-            data = [['Pareja', 'Club', 'PG', 'PP', 'Grupo']]  # Encabezados
-            for r in ranking:
-                data.append([
-                    r.nombre_pareja,
-                    r.club or '',
-                    str(r.PG),
-                    str(r.PP),
-                    r.GB
+            # Filas de la clasificación materializada, ordenadas por grupo
+            secciones = [
+                (f"Grupo {grupo}", [
+                    [posicion, numero, pareja, club, pg, pp, rp]
+                    for posicion, (_, numero, pareja, club, pg, pp, rp, _) in enumerate(filas, 1)
                 ])
-
-            # Crear y estilizar la tabla
-            t = Table(data)
-            t.setStyle(TableStyle([
-                # Estilo del encabezado
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                # Estilo del contenido
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            elements.append(t)
-            doc.build(elements)
-            
-            buffer.seek(0)
-            return buffer, f"ranking_{campeonato_id}.pdf"
+                for grupo, filas in groupby(filas_ranking(self.db, campeonato_id), key=lambda f: f[7])
+            ]
+            if len(secciones) == 1:
+                secciones[0] = ("Clasificación general", secciones[0][1])
+            contenido = renderizar_en_proceso(f"Ranking - {nombre}", CABECERA_RANKING[:-1], secciones)
+            return BytesIO(contenido), f"ranking_{campeonato_id}.pdf"
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    def exportar_resultados_excel(self, campeonato_id: int) -> Tuple[BinaryIO, str]:
+    def exportar_resultados_excel(self, campeonato_id: int) -> Tuple[Iterator[bytes], str]:
         """
-        Exporta los resultados detallados del campeonato a Excel.
-        
+        Exporta los resultados detallados del campeonato a Excel en streaming.
+
         Args:
             campeonato_id: ID del campeonato a exportar
-        
+
         Returns:
-            Tuple[BinaryIO, str]: Buffer con el archivo Excel y nombre sugerido
-            
+            Tuple[Iterator[bytes], str]: Generador de bloques del archivo y nombre sugerido
+
         Raises:
-            HTTPException: Si hay error en la exportación
-            
+            HTTPException: Si el campeonato no existe
+
         Note:
             Incluye: Partida, Mesa, Pareja, RP, PG, PP y GB
         """
-        try:
-            # Consulta SQL para obtener todos los resultados
-            resultados = self.db.query(
-                Resultado.P.label('Partida'),
-                Resultado.M.label('Mesa'),
-                Pareja.nombre.label('Pareja'),
-                Resultado.RP.label('RP'),
-                Resultado.PG.label('PG'),
-                Resultado.PP.label('PP'),
-                Resultado.GB.label('GB')
-            ).join(
-                Pareja,
-                Resultado.id_pareja == Pareja.id
-            ).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).order_by(
-                Resultado.P,
-                Resultado.M
-            ).all()
-
-            # Crear DataFrame y exportar a Excel
-            df = pd.DataFrame(resultados)
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Resultados')
-            
-            output.seek(0)
-            return output, f"resultados_{campeonato_id}.xlsx"
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        self._verificar_campeonato(campeonato_id)
+        return (
+            generar_xlsx(filas_resultados, campeonato_id, CABECERA_RESULTADOS, 'Resultados'),
+            f"resultados_{campeonato_id}.xlsx"
+        )
+
+    def exportar_resultados_csv(self, campeonato_id: int) -> Tuple[Iterator[bytes], str]:
+        """
+        Exporta los resultados detallados del campeonato a CSV en streaming.
+
+        Args:
+            campeonato_id: ID del campeonato a exportar
+
+        Returns:
+            Tuple[Iterator[bytes], str]: Generador de bloques del archivo y nombre sugerido
+
+        Raises:
+            HTTPException: Si el campeonato no existe
+
+        Note:
+            Los primeros bytes se envían en cuanto se han leído las primeras filas
+        """
+        self._verificar_campeonato(campeonato_id)
+        return (
+            generar_csv(filas_resultados, campeonato_id, CABECERA_RESULTADOS),
+            f"resultados_{campeonato_id}.csv"
+        )
 
     def exportar_resultados_pdf(self, campeonato_id: int) -> Tuple[BinaryIO, str]:
         """
         Exporta los resultados detallados del campeonato a PDF.
-        
+
         Args:
             campeonato_id: ID del campeonato a exportar
-        
+
         Returns:
             Tuple[BinaryIO, str]: Buffer con el archivo PDF y nombre sugerido
-            
+
         Raises:
             HTTPException: Si hay error en la exportación
-            
+
         Note:
-            Genera un PDF con tabla formateada de todos los resultados
+            Una sección por partida, troceada en tablas con la cabecera
+            repetida. El PDF se genera en el pool de procesos de renderizado
         """
+        nombre = self._verificar_campeonato(campeonato_id)
         try:
-            # Consulta SQL para obtener todos los resultados
-            resultados = self.db.query(
-                Resultado.P.label('Partida'),
-                Resultado.M.label('Mesa'),
-                Pareja.nombre.label('Pareja'),
-                Resultado.RP.label('RP'),
-                Resultado.PG.label('PG'),
-                Resultado.PP.label('PP'),
-                Resultado.GB.label('GB')
-            ).join(
-                Pareja,
-                Resultado.id_pareja == Pareja.id
-            ).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).order_by(
-                Resultado.P,
-                Resultado.M
-            ).all()
-
-            # Crear buffer y documento PDF
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            elements = []
-
-            # Preparar datos para la tabla
-            data = [['Partida', 'Mesa', 'Pareja', 'RP', 'PG', 'PP', 'Grupo']]
-            for r in resultados:
-                data.append([
-                    str(r.Partida),
-                    str(r.Mesa),
-                    r.Pareja,
-                    str(r.RP),
-                    str(r.PG),
-                    str(r.PP),
-                    r.GB
-                ])
-
-            # Crear y estilizar la tabla
-            t = Table(data)
-            t.setStyle(TableStyle([
-                # Estilo del encabezado
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                # Estilo del contenido
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            elements.append(t)
-            doc.build(elements)
-            
-            buffer.seek(0)
-            return buffer, f"resultados_{campeonato_id}.pdf"
+            # Resultados ordenados por partida y mesa; la partida es el título de la sección
+            secciones = [
+                (f"Partida {partida}", [fila[1:] for fila in filas])
+                for partida, filas in groupby(filas_resultados(self.db, campeonato_id), key=lambda f: f[0])
+            ]
+            contenido = renderizar_en_proceso(f"Resultados - {nombre}", CABECERA_RESULTADOS[1:], secciones)
+            return BytesIO(contenido), f"resultados_{campeonato_id}.pdf"
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
+
+def generar_exportacion(trabajo: Trabajo, campeonato_id: int, informe: str, formato: str) -> Dict[str, Any]:
+    """
+    Genera un informe en segundo plano y lo deja en el almacén de exportaciones.
+
+    Args:
+        trabajo: Trabajo en curso
+        campeonato_id: ID del campeonato
+        informe: 'ranking' o 'resultados'
+        formato: 'excel', 'csv' o 'pdf'
+
+    Returns:
+        dict: Datos del archivo guardado y ruta de descarga
+
+    Note:
+        Se ejecuta en un hilo de fondo con su propia sesión
+    """
+    db = SessionLocal()
+    try:
+        guardado = ExportacionService(db).generar_artefacto(
+            campeonato_id,
+            InformeExportacion(informe),
+            FormatoExportacion(formato)
+        )
+        return {**guardado, "url": f"/api/exportar/trabajos/{trabajo.id}/archivo"}
+    finally:
+        db.close()
+
+def pregenerar_exportaciones(trabajo: Trabajo, campeonato_id: int) -> Dict[str, str]:
+    """
+    Genera todos los informes de un campeonato en todos los formatos.
+
+    Args:
+        trabajo: Trabajo en curso; su progreso se actualiza tras cada archivo
+        campeonato_id: ID del campeonato
+
+    Returns:
+        dict: Clave del archivo guardado para cada informe y formato
+
+    Note:
+        Los informes que ya existen para la versión actual de los datos no se
+        vuelven a generar
+    """
+    combinaciones = [(i, f) for i in InformeExportacion for f in FormatoExportacion]
+    trabajo.progreso = {"total": len(combinaciones), "generados": 0}
+    claves = {}
+
+    db = SessionLocal()
+    try:
+        exportacion_service = ExportacionService(db)
+        for informe, formato in combinaciones:
+            guardado = exportacion_service.generar_artefacto(campeonato_id, informe, formato)
+            # Cerrar la transacción de lectura antes del siguiente informe
+            db.rollback()
+            claves[f"{informe.value}_{formato.value}"] = guardado["clave"]
+            trabajo.progreso["generados"] += 1
+        return claves
+    finally:
+        db.close()
+
+def programar_pregeneracion(campeonato_id: int) -> Optional[Trabajo]:
+    """
+    Lanza en segundo plano la generación de todas las exportaciones de un campeonato.
+
+    Args:
+        campeonato_id: ID del campeonato
+
+    Returns:
+        Trabajo: Trabajo lanzado, o None si la pregeneración está desactivada
+                 (EXPORTACIONES_PREGENERAR)
+
+    Note:
+        Se llama al cerrar una partida: es cuando los clubes descargan la
+        clasificación, y así esas descargas se sirven leyendo un archivo
+    """
+    if not settings.EXPORTACIONES_PREGENERAR:
+        return None
+    return registro_trabajos.lanzar(
+        "pregenerar_exportaciones",
+        pregenerar_exportaciones,
+        campeonato_id=campeonato_id
+    )
@@ -1,22 +1,24 @@
 # Importaciones necesarias para el servicio de historial
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_
+from app.models.enfrentamiento import Enfrentamiento
 from app.models.resultado import Resultado
 from app.models.mesa import Mesa
 from app.models.pareja import Pareja
-from app.schemas.resultado import ResultadoHistorico
-from typing import List
+from app.schemas.resultado import CaraACara, ResultadoHistorico
+from typing import List, Optional
 
 class HistorialService:
     """
     Servicio que maneja el historial de resultados de las parejas en el campeonato.
-    Proporciona funcionalidad para obtener el historial completo de una pareja.
+    Proporciona el historial completo de una pareja y su balance contra un rival,
+    ambos leídos del índice de enfrentamientos.
     """
 
     def __init__(self, db: Session):
         """
         Constructor del servicio de historial.
-        
+
         Args:
             db: Sesión de SQLAlchemy para interactuar con la base de datos
         """
@@ -25,54 +27,116 @@ class HistorialService:
     def get_historial_pareja(self, pareja_id: int, campeonato_id: int) -> List[ResultadoHistorico]:
         """
         Obtiene el historial completo de resultados de una pareja en un campeonato específico.
-        
+
         Args:
             pareja_id: ID de la pareja
             campeonato_id: ID del campeonato
-            
+
+        Returns:
+            Lista de ResultadoHistorico con todas las mesas de la pareja,
+            ordenada por número de partida
+
+        Note:
+            - Incluye las mesas sorteadas todavía sin resultado (con PG, PP y
+              RP a None) y las mesas libres (sin rival)
+            - Cada partida es una fila del índice (campeonato_id, pareja_id,
+              partida): el coste crece con las partidas jugadas, no con el
+              tamaño del campeonato
+        """
+        return self._consultar_enfrentamientos(campeonato_id, pareja_id)
+
+    def get_cara_a_cara(self, campeonato_id: int, pareja_id: int, rival_id: int) -> CaraACara:
+        """
+        Obtiene el balance de una pareja contra un rival concreto.
+
+        Args:
+            campeonato_id: ID del campeonato
+            pareja_id: ID de la pareja
+            rival_id: ID de la pareja rival
+
         Returns:
-            Lista de ResultadoHistorico con todos los resultados de la pareja
-            
+            CaraACara con el número de enfrentamientos, victorias, derrotas,
+            puntos de cada pareja y el detalle de cada partida
+
         Note:
-            La consulta incluye:
-            - Información de la mesa donde jugó
-            - Nombre del rival
-            - Resultado del rival
-            Los resultados se ordenan por número de partida
+            Las victorias y derrotas solo cuentan enfrentamientos con
+            resultado registrado
+        """
+        partidas = self._consultar_enfrentamientos(campeonato_id, pareja_id, rival_id)
+        con_resultado = [p for p in partidas if p.PG is not None]
+        return CaraACara(
+            pareja_id=pareja_id,
+            rival_id=rival_id,
+            enfrentamientos=len(partidas),
+            victorias=sum(1 for p in con_resultado if p.PG > 0),
+            derrotas=sum(1 for p in con_resultado if p.PG == 0),
+            PP=sum(p.PP or 0 for p in con_resultado),
+            rival_PP=sum(p.rival_PP or 0 for p in con_resultado),
+            partidas=partidas
+        )
+
+    def _consultar_enfrentamientos(
+        self,
+        campeonato_id: int,
+        pareja_id: int,
+        rival_id: Optional[int] = None
+    ) -> List[ResultadoHistorico]:
+        """
+        Lee las mesas de una pareja con sus resultados y los de su rival.
+
+        Args:
+            campeonato_id: ID del campeonato
+            pareja_id: ID de la pareja
+            rival_id: Si se indica, solo las mesas contra ese rival
+
+        Returns:
+            Lista de ResultadoHistorico ordenada por partida
         """
-        # Consulta compleja que obtiene todos los resultados de la pareja
-        # junto con la información de la mesa y el rival
-        resultados = (
+        Rival = aliased(Pareja)
+        ResultadoPropio = aliased(Resultado)
+        ResultadoRival = aliased(Resultado)
+
+        consulta = (
             self.db.query(
-                Resultado,                                    # Resultado principal
-                Mesa,                                        # Información de la mesa
-                Pareja.nombre.label('rival_nombre'),         # Nombre del rival
-                Resultado.RP.label('rival_resultado')        # Puntos del rival
+                Enfrentamiento.partida,
+                Enfrentamiento.mesa_id,
+                Mesa.numero.label('mesa_numero'),
+                Enfrentamiento.rival_id,
+                Rival.numero.label('rival_numero'),
+                Rival.nombre.label('rival_nombre'),
+                ResultadoPropio.GB,
+                ResultadoPropio.PG,
+                ResultadoPropio.PP,
+                ResultadoPropio.RP,
+                ResultadoRival.PP.label('rival_PP'),
+                ResultadoRival.RP.label('rival_resultado')
+            )
+            .join(Mesa, Mesa.id == Enfrentamiento.mesa_id)
+            .outerjoin(Rival, Rival.id == Enfrentamiento.rival_id)
+            # Los resultados se buscan por (mesa_id, id_pareja), su clave única
+            .outerjoin(
+                ResultadoPropio,
+                and_(
+                    ResultadoPropio.mesa_id == Enfrentamiento.mesa_id,
+                    ResultadoPropio.id_pareja == Enfrentamiento.pareja_id
+                )
             )
-            .join(Mesa, (Mesa.id == Resultado.M) & (Mesa.partida == Resultado.P))  # Join con mesa
-            .outerjoin(                                      # Join con pareja rival
-                Pareja,
-                case(
-                    (Mesa.pareja1_id == pareja_id, Mesa.pareja2_id),  # Si es pareja1, buscar pareja2
-                    else_=Mesa.pareja1_id                              # Si no, buscar pareja1
-                ) == Pareja.id
+            .outerjoin(
+                ResultadoRival,
+                and_(
+                    ResultadoRival.mesa_id == Enfrentamiento.mesa_id,
+                    ResultadoRival.id_pareja == Enfrentamiento.rival_id
+                )
             )
-            .filter(                                         # Filtros de búsqueda
-                Resultado.id_pareja == pareja_id,
-                Resultado.campeonato_id == campeonato_id
+            .filter(
+                Enfrentamiento.campeonato_id == campeonato_id,
+                Enfrentamiento.pareja_id == pareja_id
             )
-            .order_by(Resultado.P)                          # Ordenar por número de partida
-            .all()
         )
+        if rival_id is not None:
+            consulta = consulta.filter(Enfrentamiento.rival_id == rival_id)
 
-        # Transformar los resultados al formato de respuesta esperado
         return [
-            ResultadoHistorico(
-                **resultado[0].to_dict(),                    # Datos del resultado principal
-                fecha=resultado[1].fecha_creacion,           # Fecha de la mesa
-                mesa_numero=resultado[1].numero,             # Número de mesa
-                rival_nombre=resultado[2],                   # Nombre del rival
-                rival_resultado=resultado[3]                 # Resultado del rival
-            )
-            for resultado in resultados
-        ] 
\ No newline at end of file
+            ResultadoHistorico(**fila._asdict())
+            for fila in consulta.order_by(Enfrentamiento.partida).all()
+        ]
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.core.constants import PAGINA_POR_DEFECTO
+from app.core.paginacion import Pagina, paginar
+from app.db.proyeccion import proyectar
 from app.models.jugador import Jugador
-from app.schemas.jugador import JugadorCreate, JugadorUpdate
+from app.schemas.jugador import JugadorCreate, JugadorResponse, JugadorUpdate
 from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 
@@ -22,25 +25,28 @@ class JugadorService:
 
     def get_jugadores(
         self,
-        skip: int = 0,
-        limit: int = 100,
-        campeonato_id: Optional[int] = None
-    ) -> List[Jugador]:
+        cursor: Optional[str] = None,
+        limite: int = PAGINA_POR_DEFECTO,
+        campeonato_id: Optional[int] = None,
+        con_total: bool = False
+    ) -> Pagina:
         """
-        Obtiene una lista paginada de jugadores, opcionalmente filtrada por campeonato.
+        Obtiene una página de jugadores, opcionalmente filtrada por campeonato.
         
         Args:
-            skip: Número de registros a saltar (para paginación)
-            limit: Número máximo de registros a devolver
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limite: Número máximo de registros a devolver
             campeonato_id: ID del campeonato para filtrar (opcional)
+            con_total: Si True, incluye el número total de jugadores
             
         Returns:
-            Lista de objetos Jugador que cumplen los criterios
+            Página con los jugadores ordenados por ID (solo las columnas de
+            JugadorResponse)
         """
-        query = self.db.query(Jugador)
+        query = proyectar(self.db, Jugador, JugadorResponse)
         if campeonato_id:
             query = query.filter(Jugador.campeonato_id == campeonato_id)
-        return query.offset(skip).limit(limit).all()
+        return paginar(query, [(Jugador.id, False)], cursor=cursor, limite=limite, con_total=con_total)
 
     def get_jugador(self, jugador_id: int) -> Optional[Jugador]:
         """
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.db.version_datos import marcar_modificado
+from app.models.contador_partida import ContadorPartida
+from app.models.enfrentamiento import Enfrentamiento
 from app.models.mesa import Mesa
 from app.models.pareja import Pareja
 from app.models.resultado import Resultado
@@ -270,9 +273,17 @@ class MesaService:
             HTTPException: Si hay error en la eliminación
         """
         try:
+            # Primero el índice de rivales y los contadores de esas mesas
+            self.db.query(Enfrentamiento).filter(
+                Enfrentamiento.campeonato_id == campeonato_id
+            ).delete(synchronize_session=False)
+            self.db.query(ContadorPartida).filter(
+                ContadorPartida.campeonato_id == campeonato_id
+            ).delete(synchronize_session=False)
             self.db.query(Mesa).filter(
                 Mesa.campeonato_id == campeonato_id
             ).delete()
+            marcar_modificado(self.db, campeonato_id)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from sqlalchemy import insert, tuple_, update
+from app.core.constants import ERRORES, PAGINA_POR_DEFECTO
+from app.core.paginacion import Pagina, paginar
+from app.db.version_datos import marcar_modificado
+from app.models.campeonato import Campeonato
 from app.models.pareja import Pareja
 from app.models.jugador import Jugador
 from app.schemas.pareja import ParejaCreate, ParejaUpdate
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.exc import IntegrityError
 
 class ParejaService:
@@ -24,20 +29,27 @@ class ParejaService:
 
     def get_parejas(
         self,
-        skip: int = 0,
-        limit: int = 100,
-        campeonato_id: int = None
-    ) -> List[dict]:
+        cursor: Optional[str] = None,
+        limite: int = PAGINA_POR_DEFECTO,
+        campeonato_id: int = None,
+        con_total: bool = False
+    ) -> Pagina:
         """
-        Obtiene una lista paginada de parejas, opcionalmente filtrada por campeonato.
+        Obtiene una página de parejas, opcionalmente filtrada por campeonato.
         
         Args:
-            skip: Número de registros a saltar (para paginación)
-            limit: Número máximo de registros a devolver
+            cursor: Cursor devuelto por la página anterior (None para la primera)
+            limite: Número máximo de registros a devolver
             campeonato_id: ID del campeonato para filtrar (opcional)
+            con_total: Si True, incluye el número total de parejas
             
         Returns:
-            Lista de diccionarios con información de las parejas
+            Página cuyas filas son diccionarios con información de las parejas
+            
+        Note:
+            Se ordena por ID descendente: los números se reservan en orden de
+            creación, así que equivale al orden por número descendente sin
+            depender de una columna que admite NULL
         """
         # Construir la consulta base
         query = self.db.query(Pareja)
@@ -46,12 +58,10 @@ class ParejaService:
         if campeonato_id:
             query = query.filter(Pareja.campeonato_id == campeonato_id)
         
-        # Ordenar por número descendente y aplicar paginación
-        query = query.order_by(Pareja.numero.desc())
-        parejas = query.offset(skip).limit(limit).all()
+        pagina = paginar(query, [(Pareja.id, True)], cursor=cursor, limite=limite, con_total=con_total)
         
         # Convertir resultados a diccionarios con la información necesaria
-        return [
+        pagina.filas = [
             {
                 "id": p.id,
                 "numero": p.numero,
@@ -60,8 +70,9 @@ class ParejaService:
                 "activa": p.activa,
                 "campeonato_id": p.campeonato_id
             }
-            for p in parejas
+            for p in pagina.filas
         ]
+        return pagina
 
     def get_pareja(self, pareja_id: int) -> Optional[Pareja]:
         """
@@ -75,6 +86,42 @@ class ParejaService:
         """
         return self.db.query(Pareja).filter(Pareja.id == pareja_id).first()
 
+    def reservar_numeros(self, campeonato_id: int, cantidad: int = 1) -> int:
+        """
+        Reserva números de pareja consecutivos en un campeonato.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            cantidad: Cantidad de números a reservar
+            
+        Returns:
+            int: Primer número reservado; los reservados son
+                 [primero, primero + cantidad)
+            
+        Raises:
+            HTTPException: Si el campeonato no existe
+            
+        Note:
+            - Incrementa el contador Campeonato.ultimo_numero_pareja con un único
+              UPDATE ... RETURNING, por lo que dos inscripciones simultáneas nunca
+              reciben el mismo número
+            - El bloqueo de la fila del campeonato dura hasta el commit de la
+              transacción que llama, serializando solo las altas de ese campeonato
+        """
+        ultimo = self.db.execute(
+            update(Campeonato)
+            .where(Campeonato.id == campeonato_id)
+            .values(ultimo_numero_pareja=Campeonato.ultimo_numero_pareja + cantidad)
+            .returning(Campeonato.ultimo_numero_pareja)
+        ).scalar()
+
+        if ultimo is None:
+            raise HTTPException(
+                status_code=404,
+                detail=ERRORES["CAMPEONATO_NO_ENCONTRADO"]
+            )
+        return ultimo - cantidad + 1
+
     def create_pareja(self, pareja: ParejaCreate) -> Pareja:
         """
         Crea una nueva pareja con sus jugadores asociados.
@@ -92,13 +139,8 @@ class ParejaService:
             - Asigna automáticamente el siguiente número disponible en el campeonato
             - Crea los dos jugadores asociados a la pareja
         """
-        # Obtener el último número de pareja para este campeonato
-        ultimo_numero = self.db.query(Pareja).filter(
-            Pareja.campeonato_id == pareja.campeonato_id
-        ).order_by(Pareja.numero.desc()).first()
-
-        # Asignar el siguiente número
-        nuevo_numero = 1 if not ultimo_numero else ultimo_numero.numero + 1
+        # Reservar el siguiente número de forma atómica
+        nuevo_numero = self.reservar_numeros(pareja.campeonato_id)
 
         # Crear la pareja con el nuevo número
         db_pareja = Pareja(
@@ -142,6 +184,113 @@ class ParejaService:
             self.db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
 
+    def importar_parejas(
+        self,
+        campeonato_id: int,
+        inscripciones: List[Dict[str, str]]
+    ) -> List[Dict]:
+        """
+        Inscribe de una vez muchas parejas con sus jugadores en una sola transacción.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            inscripciones: Filas leídas con core.importacion.leer_inscripciones
+            
+        Returns:
+            Lista de parejas creadas con id, numero y nombre, en el orden del archivo
+            
+        Raises:
+            HTTPException: 400 si algún jugador está repetido en el archivo o ya
+                           inscrito en el campeonato; 404 si el campeonato no existe
+            
+        Note:
+            - Reserva todos los números con un único incremento del contador
+            - Inserta las parejas con un INSERT ... RETURNING de varias filas y
+              los jugadores con un único INSERT de varias filas
+        """
+        if not inscripciones:
+            return []
+
+        # Detectar jugadores repetidos en el archivo y ya inscritos (una consulta)
+        errores = []
+        vistos = {}
+        for inscripcion in inscripciones:
+            for n in ("1", "2"):
+                clave = (inscripcion[f"jugador{n}_nombre"], inscripcion[f"jugador{n}_apellido"])
+                if clave in vistos:
+                    errores.append(
+                        f"Fila {inscripcion['fila']}: {clave[0]} {clave[1]} ya aparece en la fila {vistos[clave]}"
+                    )
+                vistos.setdefault(clave, inscripcion["fila"])
+
+        inscritos = self.db.query(Jugador.nombre, Jugador.apellido).filter(
+            Jugador.campeonato_id == campeonato_id,
+            tuple_(Jugador.nombre, Jugador.apellido).in_(list(vistos))
+        ).all()
+        for nombre, apellido in inscritos:
+            errores.append(
+                f"Fila {vistos[(nombre, apellido)]}: {nombre} {apellido} ya está inscrito en el campeonato"
+            )
+
+        if errores:
+            raise HTTPException(status_code=400, detail=errores)
+
+        try:
+            primero = self.reservar_numeros(campeonato_id, len(inscripciones))
+
+            filas = self.db.execute(
+                insert(Pareja).returning(Pareja.id, Pareja.numero, Pareja.nombre),
+                [
+                    {
+                        "nombre": (
+                            f"{i['jugador1_nombre']} {i['jugador1_apellido']} Y "
+                            f"{i['jugador2_nombre']} {i['jugador2_apellido']}"
+                        ),
+                        "club": i.get("club") or None,
+                        "activa": True,
+                        "campeonato_id": campeonato_id,
+                        "numero": primero + posicion
+                    }
+                    for posicion, i in enumerate(inscripciones)
+                ]
+            ).all()
+
+            # El número identifica cada fila devuelta, sin depender del orden del RETURNING
+            parejas = sorted(filas, key=lambda p: p.numero)
+
+            self.db.execute(
+                insert(Jugador),
+                [
+                    {
+                        "nombre": i[f"jugador{n}_nombre"],
+                        "apellido": i[f"jugador{n}_apellido"],
+                        "pareja_id": pareja.id,
+                        "campeonato_id": campeonato_id
+                    }
+                    for pareja, i in zip(parejas, inscripciones)
+                    for n in ("1", "2")
+                ]
+            )
+            marcar_modificado(self.db, campeonato_id)
+            self.db.commit()
+
+            return [
+                {"id": p.id, "numero": p.numero, "nombre": p.nombre}
+                for p in parejas
+            ]
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except IntegrityError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=ERRORES["ERROR_INTEGRIDAD"]
+            )
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
     def update_pareja(self, pareja_id: int, pareja: ParejaUpdate) -> Optional[Pareja]:
         """
         Actualiza los datos de una pareja existente.
@@ -187,11 +336,15 @@ class ParejaService:
             HTTPException: Si hay errores durante la eliminación
         """
         try:
+            campeonato_id = self.db.query(Pareja.campeonato_id).filter(Pareja.id == pareja_id).scalar()
+
             # Primero eliminamos los jugadores asociados
             self.db.query(Jugador).filter(Jugador.pareja_id == pareja_id).delete()
             
             # Luego eliminamos la pareja
             result = self.db.query(Pareja).filter(Pareja.id == pareja_id).delete()
+            if result:
+                marcar_modificado(self.db, campeonato_id)
             
             self.db.commit()
             return result > 0
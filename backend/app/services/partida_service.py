@@ -1,13 +1,52 @@
 # Importaciones necesarias para el servicio de partidas
 from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, case, func, insert, literal, or_, select, update
 from fastapi import HTTPException
+from app.core.cache import cache_ranking
+from app.core.constants import EstadoPartida
+from app.core.emparejamiento import (
+    clave_enfrentamiento,
+    emparejar_suizo,
+    ordenar_por_clasificacion
+)
+from app.core.eventos import broker_eventos, EVENTO_PARTIDA, EVENTO_SORTEO
+from app.db.bloqueos import bloquear_campeonato
+from app.db.version_datos import marcar_modificado
 from app.models.campeonato import Campeonato
+from app.models.clasificacion import Clasificacion
+from app.models.contador_partida import ContadorPartida
+from app.models.enfrentamiento import Enfrentamiento, filas_enfrentamientos
 from app.models.mesa import Mesa
 from app.models.pareja import Pareja
 from app.models.resultado import Resultado
-from typing import List, Dict, Any
+from app.services.clasificacion_service import ClasificacionService
+from app.services.exportacion_service import programar_pregeneracion
+from typing import Iterable, List, Dict, Any, Optional, Set, Tuple
 import random
 
+def mesa_pendiente():
+    """
+    Condición SQL que se cumple si a una mesa le falta el resultado de alguna de sus parejas.
+
+    Returns:
+        Expresión booleana sobre Mesa para usar en filtros y agregados
+
+    Note:
+        Compara las parejas sentadas con una subconsulta correlacionada que
+        cuenta sus resultados por la clave única (mesa_id, id_pareja): cada
+        mesa es una búsqueda en el índice. Con NOT EXISTS unidos por OR,
+        PostgreSQL recorre la tabla de resultados entera
+    """
+    registrados = select(func.count()).select_from(Resultado).where(
+        Resultado.mesa_id == Mesa.id,
+        Resultado.id_pareja.in_([Mesa.pareja1_id, Mesa.pareja2_id])
+    ).correlate(Mesa).scalar_subquery()
+    sentadas = (
+        case((Mesa.pareja1_id.isnot(None), 1), else_=0) +
+        case((Mesa.pareja2_id.isnot(None), 1), else_=0)
+    )
+    return registrados < sentadas
+
 class PartidaService:
     """
     Servicio que maneja todas las operaciones relacionadas con las partidas de un campeonato.
@@ -36,6 +75,10 @@ class PartidaService:
         Raises:
             HTTPException: Si el campeonato no existe o ya ha finalizado
         """
+        # Bloquear el campeonato hasta el commit para no cruzarse con otra
+        # operación sobre él (sorteo, cierre o borrado)
+        bloquear_campeonato(self.db, campeonato_id)
+
         # Verificar existencia del campeonato
         campeonato = self.db.query(Campeonato).filter(
             Campeonato.id == campeonato_id
@@ -59,6 +102,10 @@ class PartidaService:
 
         try:
             self.db.commit()
+            broker_eventos.publicar(campeonato_id, EVENTO_PARTIDA, {
+                "partida_actual": campeonato.partida_actual,
+                "estado": EstadoPartida.EN_CURSO.value
+            })
             return {
                 "message": "Partida iniciada correctamente",
                 "partida_actual": campeonato.partida_actual
@@ -80,6 +127,9 @@ class PartidaService:
         Raises:
             HTTPException: Si el campeonato no existe o faltan resultados
         """
+        # Bloquear el campeonato hasta el commit
+        bloquear_campeonato(self.db, campeonato_id)
+
         # Verificar existencia del campeonato
         campeonato = self.db.query(Campeonato).filter(
             Campeonato.id == campeonato_id
@@ -103,6 +153,11 @@ class PartidaService:
 
         try:
             self.db.commit()
+            broker_eventos.publicar(campeonato_id, EVENTO_PARTIDA, {
+                "partida_actual": campeonato.partida_actual,
+                "estado": EstadoPartida.FINALIZADA.value
+            })
+            programar_pregeneracion(campeonato_id)
             return {
                 "message": "Partida finalizada correctamente",
                 "partida_actual": campeonato.partida_actual
@@ -127,34 +182,397 @@ class PartidaService:
             bool: True si todos los resultados están registrados, False en caso contrario
             
         Note:
-            Verifica que cada mesa tenga el número correcto de resultados según
-            si tiene una o dos parejas asignadas
+            Comprueba con una sola consulta agregada que cada mesa tenga el
+            resultado de todas sus parejas (una o dos). No usa el contador de
+            la partida, para que el cierre no dependa de él
         """
-        # Obtener todas las mesas de la partida
-        mesas = self.db.query(Mesa).filter(
+        mesas, pendientes = self.contar_mesas(campeonato_id, partida)
+        return mesas > 0 and pendientes == 0
+
+    def contar_mesas(self, campeonato_id: int, partida: int) -> Tuple[int, int]:
+        """
+        Cuenta las mesas de una partida y las que tienen resultados pendientes.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Número de la partida
+            
+        Returns:
+            Tupla (mesas sorteadas, mesas pendientes)
+        """
+        mesas, pendientes = self.db.query(
+            func.count(Mesa.id),
+            func.sum(case((mesa_pendiente(), 1), else_=0))
+        ).filter(
             Mesa.campeonato_id == campeonato_id,
             Mesa.partida == partida
-        ).all()
+        ).one()
+        return mesas, int(pendientes or 0)
 
-        if not mesas:
-            return False
+    def recalcular_contador(self, campeonato_id: int, partida: int) -> ContadorPartida:
+        """
+        Crea o rehace el contador de mesas pendientes de una partida.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Número de la partida
+            
+        Returns:
+            ContadorPartida actualizado
+            
+        Note:
+            Se llama al sortear la partida, con las mesas añadidas a la sesión
+            (se envían antes de contarlas). No realiza commit: el llamador
+            confirma junto con las mesas
+        """
+        self.db.flush()
+        mesas, pendientes = self.contar_mesas(campeonato_id, partida)
+        contador = self.db.query(ContadorPartida).filter(
+            ContadorPartida.campeonato_id == campeonato_id,
+            ContadorPartida.partida == partida
+        ).first()
+        if contador is None:
+            contador = ContadorPartida(campeonato_id=campeonato_id, partida=partida)
+            self.db.add(contador)
+        contador.mesas = mesas
+        contador.mesas_pendientes = pendientes
+        return contador
 
-        # Verificar resultados para cada mesa
-        for mesa in mesas:
-            resultados = self.db.query(Resultado).filter(
-                Resultado.campeonato_id == campeonato_id,
-                Resultado.P == partida,
-                Resultado.M == mesa.id
+    def descontar_mesas_completadas(self, resultados: Iterable[Resultado]) -> None:
+        """
+        Descuenta del contador de su partida las mesas que completan los resultados recién insertados.
+        
+        Args:
+            resultados: Resultados ya enviados a la base de datos
+            
+        Note:
+            - Una sentencia UPDATE por partida, que cuenta en la propia base
+              de datos cuáles de esas mesas ya tienen todos sus resultados
+            - Solo cuentan las mesas en las que se sienta alguna de las
+              parejas insertadas: la clave única (mesa_id, id_pareja) garantiza
+              que antes estaban pendientes
+            - No realiza commit: el llamador confirma junto con los resultados
+        """
+        por_partida: Dict[Tuple[int, int], List[Resultado]] = {}
+        for r in resultados:
+            por_partida.setdefault((r.campeonato_id, r.partida), []).append(r)
+
+        for (campeonato_id, partida), lote in por_partida.items():
+            mesa_ids = {r.mesa_id for r in lote}
+            pareja_ids = {r.id_pareja for r in lote}
+            completadas = self.db.query(func.count(Mesa.id)).filter(
+                Mesa.id.in_(mesa_ids),
+                or_(Mesa.pareja1_id.in_(pareja_ids), Mesa.pareja2_id.in_(pareja_ids)),
+                ~mesa_pendiente()
+            ).scalar_subquery()
+            self.db.execute(
+                update(ContadorPartida).where(
+                    ContadorPartida.campeonato_id == campeonato_id,
+                    ContadorPartida.partida == partida
+                ).values(mesas_pendientes=ContadorPartida.mesas_pendientes - completadas),
+                execution_options={"synchronize_session": False}
+            )
+
+    def get_progreso_partida(self, campeonato_id: int, partida: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Indica cuántas mesas de una partida siguen sin resultados.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Número de la partida (la actual si es None)
+            
+        Returns:
+            Dict con la partida, las mesas sorteadas, las pendientes y si la
+            partida puede cerrarse
+            
+        Raises:
+            HTTPException: Si el campeonato no existe
+            
+        Note:
+            Lee el contador de la partida junto con el campeonato en una sola
+            consulta de una fila, sin recorrer mesas ni resultados
+        """
+        numero = Campeonato.partida_actual if partida is None else literal(partida, Integer)
+        fila = self.db.query(
+            numero,
+            ContadorPartida.mesas,
+            ContadorPartida.mesas_pendientes
+        ).select_from(Campeonato).outerjoin(
+            ContadorPartida,
+            and_(
+                ContadorPartida.campeonato_id == Campeonato.id,
+                ContadorPartida.partida == numero
+            )
+        ).filter(Campeonato.id == campeonato_id).first()
+
+        if not fila:
+            raise HTTPException(
+                status_code=404,
+                detail="Campeonato no encontrado"
+            )
+
+        mesas = fila[1] or 0
+        pendientes = fila[2] or 0
+        return {
+            "campeonato_id": campeonato_id,
+            "partida": fila[0],
+            "mesas": mesas,
+            "mesas_pendientes": pendientes,
+            "completa": mesas > 0 and pendientes == 0
+        }
+
+    def _historial_enfrentamientos(
+        self,
+        campeonato_id: int,
+        partida_destino: int
+    ) -> Tuple[Set[Tuple[int, int]], Set[int]]:
+        """
+        Reconstruye los enfrentamientos ya jugados en el campeonato.
+
+        Args:
+            campeonato_id: ID del campeonato
+            partida_destino: Partida que se va a sortear (se excluye del historial)
+
+        Returns:
+            Tupla con el conjunto de enfrentamientos (claves de pareja ordenadas)
+            y el conjunto de parejas que ya tuvieron mesa libre
+        """
+        historial = set()
+        con_mesa_libre = set()
+        # Índice de rivales: de cada mesa basta la fila de la pareja con menor ID
+        # (o la única fila, si fue mesa libre)
+        enfrentamientos = self.db.query(Enfrentamiento.pareja_id, Enfrentamiento.rival_id).filter(
+            Enfrentamiento.campeonato_id == campeonato_id,
+            Enfrentamiento.partida < partida_destino,
+            or_(
+                Enfrentamiento.rival_id.is_(None),
+                Enfrentamiento.pareja_id < Enfrentamiento.rival_id
+            )
+        )
+        for pareja_id, rival_id in enfrentamientos:
+            if rival_id is None:
+                con_mesa_libre.add(pareja_id)
+            else:
+                historial.add(clave_enfrentamiento(pareja_id, rival_id))
+        return historial, con_mesa_libre
+
+    def sortear_mesas(self, campeonato_id: int, partida: int) -> int:
+        """
+        Sortea las parejas activas por sistema suizo y crea las mesas de una partida.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Partida que se sortea (no debe tener mesas)
+            
+        Returns:
+            int: Número de mesas creadas
+            
+        Note:
+            - Para la primera partida realiza un sorteo aleatorio; para las
+              siguientes ordena por la clasificación acumulada
+            - Evita repetir rivales y reparte la mesa libre entre las parejas
+              que aún no la han tenido
+            - Inserta las mesas con una sola sentencia masiva y, con ellas, su
+              índice de rivales y el contador de la partida
+            - El llamador debe tener bloqueado el campeonato. No realiza commit
+        """
+        # 1. Obtener los IDs de todas las parejas activas
+        parejas = [
+            pareja_id for (pareja_id,) in self.db.query(Pareja.id).filter(
+                Pareja.campeonato_id == campeonato_id,
+                Pareja.activa == True
             ).all()
+        ]
+
+        # 2. Verificar si hay resultados previos para determinar si es la primera partida
+        resultados_previos = self.db.query(Resultado.id).filter(
+            Resultado.campeonato_id == campeonato_id,
+            (Resultado.PG != 0) | (Resultado.PP != 0) | (Resultado.RP != 0)
+        ).first()
+
+        # Si no hay resultados previos, hacer sorteo aleatorio
+        if not resultados_previos:
+            print("Primera partida: realizando sorteo aleatorio")
+            parejas_ordenadas = list(parejas)
+            random.shuffle(parejas_ordenadas)
+        else:
+            print("Partida posterior: ordenando por ranking")
+            # Para siguientes partidas, ordenar por la clasificación acumulada
+            totales = {
+                f.id_pareja: (f.PG, f.PP)
+                for f in self.db.query(
+                    Clasificacion.id_pareja,
+                    Clasificacion.PG,
+                    Clasificacion.PP
+                ).filter(Clasificacion.campeonato_id == campeonato_id)
+            }
+            parejas_ordenadas = ordenar_por_clasificacion(parejas, totales)
+
+        # 3. Emparejar las parejas por sistema suizo sin repetir rivales
+        historial, con_mesa_libre = self._historial_enfrentamientos(campeonato_id, partida)
+        parejas_emparejadas = emparejar_suizo(
+            parejas_ordenadas,
+            historial,
+            con_mesa_libre
+        )
+        if not parejas_emparejadas:
+            return 0
+
+        # 4. Crear las mesas con un INSERT masivo que devuelve sus IDs
+        filas = [
+            {
+                "numero": numero,
+                "campeonato_id": campeonato_id,
+                "partida": partida,
+                "pareja1_id": pareja1_id,
+                "pareja2_id": pareja2_id
+            }
+            for numero, (pareja1_id, pareja2_id) in enumerate(parejas_emparejadas, 1)
+        ]
+        # Los IDs se asocian por número de mesa (único en la partida): exigir
+        # el orden de los parámetros haría insertar las filas de una en una
+        mesa_ids = dict(
+            (numero, mesa_id) for mesa_id, numero in self.db.execute(
+                insert(Mesa).returning(Mesa.id, Mesa.numero),
+                filas
+            )
+        )
+
+        # La inserción masiva no pasa por el flush: el índice de rivales se rellena aquí
+        self.db.execute(insert(Enfrentamiento), [
+            fila
+            for mesa in filas
+            for fila in filas_enfrentamientos(
+                mesa_ids[mesa["numero"]], campeonato_id, partida, mesa["pareja1_id"], mesa["pareja2_id"]
+            )
+        ])
+        marcar_modificado(self.db, campeonato_id)
+
+        # Todas las mesas de la partida empiezan pendientes de resultados
+        self.recalcular_contador(campeonato_id, partida)
+        return len(filas)
+
+    def cerrar_partida(self, campeonato_id: int, partida: int, dividir_grupos: bool = True) -> Dict[str, Any]:
+        """
+        Cierra una partida y pasa a la siguiente en una sola transacción.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            partida: Partida que se quiere cerrar (debe ser la actual)
+            dividir_grupos: Si es False no se reparten los grupos aunque el
+                            campeonato tenga grupo B; con True se reparten
+                            solo si el campeonato lo tiene (grupo_b)
+            
+        Returns:
+            Dict con la partida cerrada, la nueva partida actual, las mesas
+            sorteadas y si la petición repetía un cierre ya hecho
+            
+        Raises:
+            HTTPException: 404 si el campeonato no existe; 400 si faltan
+                           resultados o la partida no existe; 409 si la
+                           partida indicada no es la actual
+            
+        Note:
+            - Comprueba los resultados, divide los grupos con un único UPDATE
+              (solo en campeonatos con grupo B), incrementa partida_actual y
+              sortea la siguiente partida; todo o nada, con el campeonato
+              bloqueado
+            - La última partida se cierra igual pero sin repartir grupos ni
+              sortear: partida_actual no cambia y mesas es 0
+            - Es idempotente: si un reintento llega cuando la partida ya se
+              cerró (la actual es la siguiente y ya tiene mesas), devuelve el
+              mismo resumen sin volver a sortear
+        """
+        # Bloquear el campeonato hasta el commit: dos cierres simultáneos se serializan
+        bloquear_campeonato(self.db, campeonato_id)
 
-            # Mesa con dos parejas debe tener dos resultados
-            if mesa.pareja2_id and len(resultados) != 2:
-                return False
-            # Mesa con una pareja debe tener un resultado
-            elif not mesa.pareja2_id and len(resultados) != 1:
-                return False
+        campeonato = self.db.query(Campeonato).filter(
+            Campeonato.id == campeonato_id
+        ).first()
+
+        if not campeonato:
+            raise HTTPException(
+                status_code=404,
+                detail="Campeonato no encontrado"
+            )
+
+        siguiente = partida + 1
+        if campeonato.partida_actual == siguiente:
+            mesas, _ = self.contar_mesas(campeonato_id, siguiente)
+            if mesas:
+                return {
+                    "message": "La partida ya estaba cerrada",
+                    "partida_cerrada": partida,
+                    "partida_actual": siguiente,
+                    "mesas": mesas,
+                    "repetida": True
+                }
+
+        if campeonato.partida_actual != partida:
+            raise HTTPException(
+                status_code=409,
+                detail=f"La partida actual es la {campeonato.partida_actual}"
+            )
+
+        if partida > campeonato.numero_partidas:
+            raise HTTPException(
+                status_code=400,
+                detail=f"El campeonato solo tiene {campeonato.numero_partidas} partidas"
+            )
+        ultima = partida == campeonato.numero_partidas
 
-        return True
+        mesas, pendientes = self.contar_mesas(campeonato_id, partida)
+        if not mesas or pendientes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Faltan resultados en {pendientes} mesas de la partida {partida}"
+                if mesas else f"La partida {partida} no tiene mesas sorteadas"
+            )
+
+        if ultima:
+            # Fin del campeonato: no hay grupos que repartir ni partida que
+            # sortear; el commit solo libera el bloqueo
+            self.db.commit()
+            broker_eventos.publicar(campeonato_id, EVENTO_PARTIDA, {
+                "partida_actual": partida,
+                "estado": EstadoPartida.FINALIZADA.value
+            })
+            programar_pregeneracion(campeonato_id)
+            return {
+                "message": "Última partida cerrada: campeonato terminado",
+                "partida_cerrada": partida,
+                "partida_actual": partida,
+                "mesas": 0,
+                "repetida": False
+            }
+
+        try:
+            if dividir_grupos and campeonato.grupo_b:
+                ClasificacionService(self.db).dividir_grupos(campeonato_id, partida)
+            campeonato.partida_actual = siguiente
+            mesas_siguiente = self.sortear_mesas(campeonato_id, siguiente)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+
+        cache_ranking.invalidar(campeonato_id)
+        broker_eventos.publicar(campeonato_id, EVENTO_PARTIDA, {
+            "partida_actual": partida,
+            "estado": EstadoPartida.FINALIZADA.value
+        })
+        broker_eventos.publicar(campeonato_id, EVENTO_SORTEO, {
+            "partida": siguiente,
+            "mesas": mesas_siguiente
+        })
+        programar_pregeneracion(campeonato_id)
+        return {
+            "message": "Partida cerrada y siguiente partida sorteada",
+            "partida_cerrada": partida,
+            "partida_actual": siguiente,
+            "mesas": mesas_siguiente,
+            "repetida": False
+        }
 
     def get_mesas_asignadas(self, campeonato_id: int) -> List[Dict[str, Any]]:
         """
@@ -228,6 +646,9 @@ class PartidaService:
             - Mezcla aleatoriamente las parejas activas
             - Maneja el caso de número impar de parejas
         """
+        # Bloquear el campeonato para no duplicar el sorteo
+        bloquear_campeonato(self.db, campeonato_id)
+
         # Obtener parejas activas
         parejas = self.db.query(Pareja).filter(
             Pareja.campeonato_id == campeonato_id,
@@ -261,6 +682,9 @@ class PartidaService:
 
         try:
             self.db.commit()
+            broker_eventos.publicar(campeonato_id, EVENTO_SORTEO, {
+                "mesas": len(mesas_creadas)
+            })
             return mesas_creadas
         except Exception as e:
             self.db.rollback()
@@ -3,8 +3,9 @@ from fastapi import HTTPException
 from app.models.resultado import Resultado
 from app.models.pareja import Pareja
 from app.models.campeonato import Campeonato
-from sqlalchemy import func, case
-from typing import List, Dict, Any
+from app.core.cache import cache_ranking
+from app.services.clasificacion_service import ClasificacionService
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 class RankingService:
     """
@@ -21,16 +22,23 @@ class RankingService:
         """
         self.db = db
 
-    def get_ranking(self, campeonato_id: int) -> List[Dict[str, Any]]:
+    def get_ranking(
+        self,
+        campeonato_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Obtiene el ranking actual del campeonato.
         
         Args:
             campeonato_id: ID del campeonato
+            skip: Número de posiciones a saltar (para paginación)
+            limit: Número máximo de posiciones a devolver (todas si es None)
             
         Returns:
             Lista de diccionarios con las estadísticas de cada pareja,
-            ordenada por PG (descendente) y PP (ascendente)
+            ordenada por PG (descendente) y PP (descendente)
             
         Raises:
             HTTPException: Si el campeonato no existe
@@ -48,45 +56,67 @@ class RankingService:
                 detail="Campeonato no encontrado"
             )
 
-        # Obtener los resultados agrupados por pareja
-        # Calcula totales de PG, PP y determina el grupo (A/B)
-        resultados = self.db.query(
-            Resultado.id_pareja,
-            Pareja.nombre.label('nombre_pareja'),
-            Pareja.club,
-            func.sum(Resultado.PG).label('total_PG'),
-            func.sum(Resultado.PP).label('total_PP'),
-            func.max(case(
-                (Resultado.GB == 'B', 'B'),
-                else_='A'
-            )).label('GB')
-        ).join(
-            Pareja,
-            Resultado.id_pareja == Pareja.id
-        ).filter(
-            Resultado.campeonato_id == campeonato_id
-        ).group_by(
-            Resultado.id_pareja,
-            Pareja.nombre,
-            Pareja.club
-        ).all()
+        # Leer la clasificación materializada, ya ordenada por PG y PP
+        filas = ClasificacionService(self.db).get_clasificacion(
+            campeonato_id,
+            skip=skip,
+            limit=limit
+        )
 
-        # Convertir los resultados a diccionarios y ordenarlos
-        ranking = [
+        # Convertir las filas a diccionarios
+        return [
             {
-                'pareja_id': r.id_pareja,
-                'nombre_pareja': r.nombre_pareja,
-                'club': r.club,
-                'PG': r.total_PG,
-                'PP': r.total_PP,
-                'GB': r.GB
+                'pareja_id': f.id_pareja,
+                'nombre_pareja': f.nombre,
+                'club': f.club,
+                'PG': f.PG,
+                'PP': f.PP,
+                'GB': f.GB
             }
-            for r in resultados
+            for f in filas
         ]
+
+    def get_ranking_cacheado(
+        self,
+        vista: str,
+        campeonato_id: int,
+        calcular: Callable[[], Any],
+        *parametros: Any
+    ) -> Tuple[Any, str]:
+        """
+        Obtiene un ranking a través de la caché en memoria.
         
-        # Ordenar por PG (descendente) y PP (ascendente)
-        ranking.sort(key=lambda x: (-x['PG'], x['PP']))
-        return ranking
+        Args:
+            vista: Nombre del formato de ranking (distingue endpoints con distinta forma)
+            campeonato_id: ID del campeonato
+            calcular: Función que calcula el ranking si no está en caché
+            *parametros: Parámetros adicionales que forman parte de la clave (paginación)
+            
+        Returns:
+            Tuple[Any, str]: Ranking y su ETag
+            
+        Note:
+            La clave incluye la partida actual y la versión de los datos del
+            campeonato guardada en la base de datos, que sube en cada commit
+            que toca sus parejas, mesas, resultados o clasificación; así toda
+            escritura deja obsoletas las entradas en todos los workers. La
+            versión en memoria de la caché se mantiene para las invalidaciones
+            explícitas del proceso
+        """
+        campeonato = self.db.query(
+            Campeonato.partida_actual,
+            Campeonato.version_datos
+        ).filter(Campeonato.id == campeonato_id).first()
+        partida_actual, version = campeonato if campeonato else (None, None)
+        clave = (
+            vista,
+            campeonato_id,
+            partida_actual,
+            version,
+            cache_ranking.version(campeonato_id),
+            *parametros
+        )
+        return cache_ranking.obtener_o_calcular(clave, calcular)
 
     def get_ranking_final(self, campeonato_id: int) -> List[Dict[str, Any]]:
         """
@@ -122,7 +152,8 @@ class RankingService:
 
     def actualizar_ranking(self, campeonato_id: int) -> Dict[str, str]:
         """
-        Actualiza el ranking del campeonato.
+        Actualiza el ranking del campeonato reconstruyendo su clasificación
+        materializada a partir de los resultados registrados.
         
         Args:
             campeonato_id: ID del campeonato
@@ -134,11 +165,11 @@ class RankingService:
             HTTPException: Si hay error en la actualización
         """
         try:
-            # Aquí podrías agregar lógica adicional para actualizar el ranking
-            # Por ejemplo, recalcular posiciones o actualizar estadísticas
-            
+            ClasificacionService(self.db).reconstruir(campeonato_id)
+            cache_ranking.invalidar(campeonato_id)
             return {"message": "Ranking actualizado correctamente"}
         except Exception as e:
+            self.db.rollback()
             raise HTTPException(
                 status_code=500,
                 detail=f"Error al actualizar el ranking: {str(e)}"
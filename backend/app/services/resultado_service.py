@@ -1,10 +1,26 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.models.resultado import Resultado
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.core.cache import cache_ranking
+from app.core.eventos import broker_eventos, EVENTO_RESULTADO, EVENTO_RESULTADO_ELIMINADO, EVENTO_GB
+from app.core.utils import validar_resultados_mesa
+from app.db.version_datos import marcar_modificado
+from app.models.mesa import Mesa
+from app.models.resultado import Resultado, calcular_pg
 from app.models.pareja import Pareja
-from app.schemas.resultado import ResultadoCreate, ResultadoResponse
-from sqlalchemy import func, case
-from typing import List, Dict, Any
+from app.schemas.resultado import (
+    ResultadoCreate,
+    ResultadoResponse,
+    ResultadoPareja,
+    ResultadoMesa,
+    ResultadoLoteCreate,
+    ResultadoLoteResponse,
+    ErrorResultadoMesa
+)
+from app.services.clasificacion_service import ClasificacionService
+from app.services.partida_service import PartidaService
+from typing import List, Dict, Any, Optional
 
 class ResultadoService:
     """
@@ -21,6 +37,27 @@ class ResultadoService:
         """
         self.db = db
 
+    @staticmethod
+    def _resultado_pareja(resultado: Optional[Resultado]) -> Optional[ResultadoPareja]:
+        """
+        Convierte un Resultado de la base de datos al esquema de respuesta por pareja.
+        
+        Args:
+            resultado: Resultado persistido (o None en mesa libre)
+            
+        Returns:
+            ResultadoPareja identificado por el ID de la pareja, o None
+        """
+        if resultado is None:
+            return None
+        return ResultadoPareja(
+            id=resultado.id_pareja,
+            RP=resultado.RP,
+            PG=resultado.PG,
+            PP=resultado.PP,
+            GB=resultado.GB
+        )
+
     def create_resultado(self, resultado: ResultadoCreate) -> ResultadoResponse:
         """
         Crea nuevos resultados para una partida.
@@ -32,7 +69,8 @@ class ResultadoService:
             ResultadoResponse con los resultados creados
             
         Raises:
-            HTTPException: Si hay error en la creación de los resultados
+            HTTPException: 409 si la mesa ya tiene resultados; 500 si hay otro
+                           error en la creación de los resultados
             
         Note:
             Crea resultados para ambas parejas si es una mesa completa,
@@ -67,13 +105,33 @@ class ResultadoService:
                 )
                 self.db.add(db_resultado2)
             
+            # Enviar los resultados para que se calculen sus campos (PG) y
+            # acumularlos en la clasificación dentro de la misma transacción
+            self.db.flush()
+            insertados = [r for r in (db_resultado1, db_resultado2) if r is not None]
+            ClasificacionService(self.db).aplicar_resultados(insertados)
+            PartidaService(self.db).descontar_mesas_completadas(insertados)
             self.db.commit()
+            cache_ranking.invalidar(resultado.campeonato_id)
             
-            return ResultadoResponse(
-                pareja1=db_resultado1,
-                pareja2=db_resultado2
+            respuesta = ResultadoResponse(
+                pareja1=self._resultado_pareja(db_resultado1),
+                pareja2=self._resultado_pareja(db_resultado2)
             )
+            broker_eventos.publicar(resultado.campeonato_id, EVENTO_RESULTADO, {
+                "partida": resultado.partida,
+                "mesas": [{"mesa_id": resultado.mesa_id, **respuesta.model_dump()}]
+            })
+            return respuesta
             
+        except IntegrityError as e:
+            # Clave única (mesa_id, id_pareja): la mesa ya tenía resultados
+            # (p. ej. el mismo envío repetido)
+            self.db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="La mesa ya tiene resultados registrados"
+            )
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -81,6 +139,296 @@ class ResultadoService:
                 detail="Error al crear resultado"
             )
 
+    def _validar_mesa_lote(
+        self,
+        entrada: ResultadoMesa,
+        mesa: Optional[Mesa],
+        con_resultados: set
+    ) -> Optional[str]:
+        """
+        Valida los resultados de una mesa de un envío por lotes.
+        
+        Args:
+            entrada: Resultados enviados para la mesa
+            mesa: Mesa de la partida con ese ID (None si no pertenece a la partida)
+            con_resultados: IDs de mesas que ya tienen resultados registrados
+            
+        Returns:
+            Descripción del error, o None si los resultados son válidos
+        """
+        if mesa is None:
+            return "La mesa no pertenece a esta partida del campeonato"
+        if mesa.id in con_resultados:
+            return "La mesa ya tiene resultados registrados"
+
+        enviadas = {entrada.pareja1.id, entrada.pareja2.id if entrada.pareja2 else None}
+        if enviadas != {mesa.pareja1_id, mesa.pareja2_id}:
+            return "Las parejas no coinciden con las asignadas a la mesa"
+
+        if not validar_resultados_mesa(entrada.pareja1, entrada.pareja2):
+            return "Los resultados de la mesa no son válidos"
+        return None
+
+    def create_resultados_lote(self, lote: ResultadoLoteCreate) -> ResultadoLoteResponse:
+        """
+        Registra los resultados de varias mesas de una partida en una sola transacción.
+        
+        Args:
+            lote: Resultados de las mesas y modo de envío (parcial o completo)
+            
+        Returns:
+            ResultadoLoteResponse con las mesas registradas y los errores por mesa
+            
+        Raises:
+            HTTPException: 400 con la lista de errores si alguna mesa no es válida
+                           y no se ha pedido el modo parcial; 409 si otro envío
+                           registra alguna mesa a la vez; 500 si falla la inserción
+            
+        Note:
+            - Valida cada mesa con las reglas de core.utils.validar_resultados_mesa
+            - Inserta todos los resultados con un único INSERT masivo, actualiza la
+              clasificación y el contador de mesas pendientes y confirma una sola vez
+        """
+        mesa_ids = [entrada.mesa_id for entrada in lote.resultados]
+
+        # Cargar las mesas de la partida y las que ya tienen resultados (dos consultas)
+        mesas = {
+            mesa.id: mesa
+            for mesa in self.db.query(Mesa).filter(
+                Mesa.id.in_(mesa_ids),
+                Mesa.campeonato_id == lote.campeonato_id,
+                Mesa.partida == lote.partida
+            )
+        }
+        con_resultados = {
+            mesa_id for (mesa_id,) in self.db.query(Resultado.mesa_id).filter(
+                Resultado.mesa_id.in_(mesa_ids)
+            ).distinct()
+        }
+
+        respuesta = ResultadoLoteResponse()
+        filas = []
+        validas = []
+        vistas = set()
+        for entrada in lote.resultados:
+            if entrada.mesa_id in vistas:
+                error = "La mesa aparece más de una vez en el envío"
+            else:
+                error = self._validar_mesa_lote(entrada, mesas.get(entrada.mesa_id), con_resultados)
+            vistas.add(entrada.mesa_id)
+
+            if error:
+                respuesta.errores.append(ErrorResultadoMesa(mesa_id=entrada.mesa_id, detail=error))
+                continue
+
+            respuesta.registradas.append(entrada.mesa_id)
+            validas.append(entrada)
+            for pareja in (entrada.pareja1, entrada.pareja2):
+                if pareja is None:
+                    continue
+                filas.append({
+                    "campeonato_id": lote.campeonato_id,
+                    "partida": lote.partida,
+                    "mesa_id": entrada.mesa_id,
+                    "id_pareja": pareja.id,
+                    "RP": pareja.RP,
+                    # La inserción masiva no dispara el evento calcular_campos
+                    "PG": calcular_pg(pareja.PP),
+                    "PP": pareja.PP,
+                    "GB": pareja.GB
+                })
+
+        if respuesta.errores and not lote.parcial:
+            raise HTTPException(
+                status_code=400,
+                detail=[e.model_dump() for e in respuesta.errores]
+            )
+
+        if not filas:
+            return respuesta
+
+        try:
+            self.db.execute(insert(Resultado), filas)
+            marcar_modificado(self.db, lote.campeonato_id)
+            insertados = [Resultado(**fila) for fila in filas]
+            ClasificacionService(self.db).aplicar_resultados(insertados)
+            PartidaService(self.db).descontar_mesas_completadas(insertados)
+            self.db.commit()
+            cache_ranking.invalidar(lote.campeonato_id)
+            broker_eventos.publicar(lote.campeonato_id, EVENTO_RESULTADO, {
+                "partida": lote.partida,
+                "mesas": [entrada.model_dump() for entrada in validas]
+            })
+            return respuesta
+        except IntegrityError as e:
+            # Otro envío ha registrado alguna de las mesas después de validarlas
+            self.db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="Alguna mesa del lote ya tiene resultados registrados"
+            )
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail="Error al crear resultados"
+            )
+
+    def _obtener_mesa(self, mesa_id: int) -> Mesa:
+        """
+        Carga una mesa comprobando que existe.
+
+        Args:
+            mesa_id: ID de la mesa
+
+        Returns:
+            Mesa encontrada
+
+        Raises:
+            HTTPException: 404 si la mesa no existe
+        """
+        mesa = self.db.query(Mesa).filter(Mesa.id == mesa_id).first()
+        if mesa is None:
+            raise HTTPException(status_code=404, detail="Mesa no encontrada")
+        return mesa
+
+    def _recalcular_mesa(self, mesa: Mesa) -> None:
+        """
+        Rehace la clasificación de las parejas de una mesa y el contador de su partida.
+
+        Args:
+            mesa: Mesa cuyos resultados se han editado o borrado
+
+        Note:
+            Tras editar o borrar no basta con sumar: se recalculan desde sus
+            resultados solo las dos parejas de la mesa. No realiza commit
+        """
+        # Los resultados nuevos deben estar en la base de datos antes de agregarlos
+        self.db.flush()
+        parejas = [p for p in (mesa.pareja1_id, mesa.pareja2_id) if p is not None]
+        ClasificacionService(self.db).recalcular_parejas(mesa.campeonato_id, parejas)
+        PartidaService(self.db).recalcular_contador(mesa.campeonato_id, mesa.partida)
+
+    def actualizar_resultados_mesa(self, mesa_id: int, entrada: ResultadoMesa) -> ResultadoResponse:
+        """
+        Sustituye los resultados registrados de una mesa (corrección de un acta).
+
+        Args:
+            mesa_id: ID de la mesa
+            entrada: Nuevos resultados de las parejas de la mesa
+
+        Returns:
+            ResultadoResponse con los resultados guardados
+
+        Raises:
+            HTTPException: 404 si la mesa no existe o no tiene resultados; 400
+                           si las parejas o los resultados no son válidos
+
+        Note:
+            Borra los resultados anteriores, inserta los nuevos y recalcula la
+            clasificación de las dos parejas y el contador de la partida, todo
+            en una transacción
+        """
+        if entrada.mesa_id != mesa_id:
+            raise HTTPException(status_code=400, detail="El ID de la mesa no coincide con el de la ruta")
+
+        mesa = self._obtener_mesa(mesa_id)
+        anteriores = self.db.query(Resultado).filter(Resultado.mesa_id == mesa_id).all()
+        if not anteriores:
+            raise HTTPException(status_code=404, detail="La mesa no tiene resultados registrados")
+
+        error = self._validar_mesa_lote(entrada, mesa, set())
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+        try:
+            for anterior in anteriores:
+                self.db.delete(anterior)
+            # Borrar antes de insertar: la clave única (mesa_id, id_pareja) se repetiría
+            self.db.flush()
+
+            nuevos = [
+                Resultado(
+                    campeonato_id=mesa.campeonato_id,
+                    partida=mesa.partida,
+                    mesa_id=mesa_id,
+                    id_pareja=pareja.id,
+                    RP=pareja.RP,
+                    PG=pareja.PG,
+                    PP=pareja.PP,
+                    GB=pareja.GB
+                )
+                for pareja in (entrada.pareja1, entrada.pareja2)
+                if pareja is not None
+            ]
+            self.db.add_all(nuevos)
+            self._recalcular_mesa(mesa)
+            self.db.commit()
+            cache_ranking.invalidar(mesa.campeonato_id)
+
+            respuesta = ResultadoResponse(
+                pareja1=self._resultado_pareja(nuevos[0]),
+                pareja2=self._resultado_pareja(nuevos[1]) if len(nuevos) > 1 else None
+            )
+            # correccion indica a los clientes que los valores sustituyen a
+            # los anteriores en lugar de sumarse a la clasificación
+            broker_eventos.publicar(mesa.campeonato_id, EVENTO_RESULTADO, {
+                "partida": mesa.partida,
+                "mesas": [{"mesa_id": mesa_id, **respuesta.model_dump()}],
+                "correccion": True
+            })
+            return respuesta
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail="Error al actualizar resultados"
+            )
+
+    def eliminar_resultados_mesa(self, mesa_id: int) -> Dict[str, str]:
+        """
+        Borra los resultados registrados de una mesa, que vuelve a quedar pendiente.
+
+        Args:
+            mesa_id: ID de la mesa
+
+        Returns:
+            Mensaje de confirmación
+
+        Raises:
+            HTTPException: 404 si la mesa no existe o no tiene resultados
+
+        Note:
+            Recalcula la clasificación de las dos parejas y el contador de
+            mesas pendientes de la partida en la misma transacción
+        """
+        mesa = self._obtener_mesa(mesa_id)
+        try:
+            borrados = self.db.query(Resultado).filter(
+                Resultado.mesa_id == mesa_id
+            ).delete(synchronize_session=False)
+            if not borrados:
+                raise HTTPException(status_code=404, detail="La mesa no tiene resultados registrados")
+            marcar_modificado(self.db, mesa.campeonato_id)
+            self._recalcular_mesa(mesa)
+            self.db.commit()
+        except HTTPException:
+            self.db.rollback()
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail="Error al eliminar resultados"
+            )
+
+        cache_ranking.invalidar(mesa.campeonato_id)
+        broker_eventos.publicar(mesa.campeonato_id, EVENTO_RESULTADO_ELIMINADO, {
+            "partida": mesa.partida,
+            "mesa_id": mesa_id
+        })
+        return {"message": "Resultados eliminados correctamente"}
+
     def get_resultados(
         self,
         mesa_id: int,
@@ -115,80 +463,57 @@ class ResultadoService:
             )
         
         return ResultadoResponse(
-            pareja1=resultados[0] if resultados else None,
-            pareja2=resultados[1] if len(resultados) > 1 else None
+            pareja1=self._resultado_pareja(resultados[0]),
+            pareja2=self._resultado_pareja(resultados[1]) if len(resultados) > 1 else None
         )
 
-    def obtener_ranking(self, campeonato_id: int) -> List[Dict]:
+    def obtener_ranking(
+        self,
+        campeonato_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
         """
         Obtiene el ranking actual del campeonato.
+        
+        Args:
+            campeonato_id: ID del campeonato
+            skip: Número de posiciones a saltar (para paginación)
+            limit: Número máximo de posiciones a devolver (todas si es None)
+            
+        Returns:
+            Lista de parejas ordenada por grupo, PG y PP
+            
+        Note:
+            - Se lee de la tabla materializada de clasificaciones, por lo que el
+              coste no depende del número de partidas jugadas
+            - Devuelve una fila por pareja con PG y PP acumulados en todo el
+              campeonato. Antes devolvía una fila por resultado con el PP de
+              esa partida, y el cliente los sumaba; sumar una sola fila por
+              pareja da los mismos totales
         """
         try:
-            # Subconsulta para obtener la última partida de cada pareja
-            ultima_partida_subquery = (
-                self.db.query(
-                    Resultado.id_pareja,
-                    func.max(Resultado.partida).label('ultima_partida')
-                )
-                .filter(Resultado.campeonato_id == campeonato_id)
-                .group_by(Resultado.id_pareja)
-                .subquery()
+            filas = ClasificacionService(self.db).get_clasificacion(
+                campeonato_id,
+                skip=skip,
+                limit=limit,
+                por_grupo=True
             )
 
-            # Consulta principal
-            resultados = self.db.query(
-                Resultado.id_pareja,
-                Pareja.nombre,
-                Pareja.club,
-                Pareja.numero,
-                func.sum(Resultado.PG).label('PG'),
-                func.first_value(Resultado.PP).over(
-                    partition_by=Resultado.id_pareja,
-                    order_by=Resultado.partida.desc()
-                ).label('PP'),
-                Resultado.GB,
-                ultima_partida_subquery.c.ultima_partida
-            ).join(
-                Pareja, Resultado.id_pareja == Pareja.id
-            ).join(
-                ultima_partida_subquery,
-                Resultado.id_pareja == ultima_partida_subquery.c.id_pareja
-            ).filter(
-                Resultado.campeonato_id == campeonato_id
-            ).group_by(
-                Resultado.id_pareja,
-                Pareja.nombre,
-                Pareja.club,
-                Pareja.numero,
-                Resultado.PP,
-                Resultado.GB,
-                ultima_partida_subquery.c.ultima_partida,
-                Resultado.partida
-            ).all()
-
             # Convertir resultados a formato de respuesta
-            ranking = []
-            for r in resultados:
-                ranking.append({
-                    'pareja_id': r.id_pareja,
-                    'nombre': r.nombre,
-                    'club': r.club,
-                    'numero': r.numero,
-                    'PG': r.PG or 0,
-                    'PP': r.PP,
-                    'GB': r.GB,
-                    'ultima_partida': r.ultima_partida
-                })
-
-            # Ordenar según los criterios especificados
-            return sorted(
-                ranking,
-                key=lambda x: (
-                    x['GB'],
-                    -(x['PG'] or 0),
-                    -(x['PP'] or 0)
-                )
-            )
+            return [
+                {
+                    'pareja_id': f.id_pareja,
+                    'nombre': f.nombre,
+                    'club': f.club,
+                    'numero': f.numero,
+                    'PG': f.PG,
+                    'PP': f.PP,
+                    'GB': f.GB,
+                    'ultima_partida': f.ultima_partida
+                }
+                for f in filas
+            ]
 
         except Exception as e:
             raise HTTPException(
@@ -223,10 +548,20 @@ class ResultadoService:
             self.db.query(Resultado).filter(
                 Resultado.campeonato_id == campeonato_id,
                 Resultado.id_pareja == pareja_id,
-                Resultado.P >= partida_actual
+                Resultado.partida >= partida_actual
             ).update({"GB": gb})
+            marcar_modificado(self.db, campeonato_id)
+            
+            # Mantener el grupo vigente de la clasificación en la misma transacción
+            ClasificacionService(self.db).actualizar_gb(campeonato_id, pareja_id, gb)
             
             self.db.commit()
+            cache_ranking.invalidar(campeonato_id)
+            broker_eventos.publicar(campeonato_id, EVENTO_GB, {
+                "pareja_id": pareja_id,
+                "GB": gb,
+                "partida": partida_actual
+            })
             return {"message": "GB actualizado correctamente"}
         except Exception as e:
             self.db.rollback()
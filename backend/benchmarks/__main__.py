@@ -0,0 +1,178 @@
+# Línea de comandos del banco de pruebas de la jornada de torneo
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+def _formato_historico(valor: str) -> Tuple[int, int]:
+    """Interpreta un torneo histórico con el formato PAREJASxPARTIDAS (p. ej. 2000x12)."""
+    try:
+        parejas, partidas = (int(parte) for parte in valor.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Formato no válido '{valor}', se esperaba PAREJASxPARTIDAS")
+    if parejas < 2 or partidas < 1:
+        raise argparse.ArgumentTypeError(f"Torneo histórico no válido '{valor}'")
+    return parejas, partidas
+
+def _argumentos() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Reproduce una jornada de torneo y mide latencia y consultas por endpoint"
+    )
+    parser.add_argument(
+        "--url",
+        help="URL de la base de datos (por defecto un archivo SQLite temporal nuevo). "
+             "ADVERTENCIA: utilizar solo contra una base de datos de pruebas"
+    )
+    parser.add_argument(
+        "--historico",
+        type=_formato_historico,
+        action="append",
+        default=[],
+        help="Torneo ya jugado a sembrar antes de la jornada, PAREJASxPARTIDAS; se puede repetir"
+    )
+    parser.add_argument("--parejas", type=int, default=200, help="Parejas inscritas en la jornada")
+    parser.add_argument("--partidas", type=int, default=6, help="Partidas jugadas en la jornada")
+    parser.add_argument("--sondeo-cada", type=int, default=10, help="Resultados entre dos sondeos del ranking")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla aleatoria")
+    parser.add_argument("--guardar", help="Guarda la línea base en este archivo JSON")
+    parser.add_argument("--comparar", help="Compara con la línea base de este archivo JSON")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="Empeoramiento relativo admitido en p50/p99")
+    parser.add_argument("--margen-ms", type=float, default=2.0, help="Diferencia mínima de latencia a considerar")
+    parser.add_argument("--conservar", action="store_true", help="No borra los campeonatos creados")
+    return parser.parse_args()
+
+def _imprimir_tabla(resumen: Dict[str, Dict[str, Any]]) -> None:
+    ancho = max(len(endpoint) for endpoint in resumen)
+    print(f"{'endpoint':<{ancho}} {'peticiones':>10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'consultas':>10} {'máx':>5}")
+    for endpoint, datos in resumen.items():
+        print(
+            f"{endpoint:<{ancho}} {datos['peticiones']:>10} {datos['p50_ms']:>9.2f} "
+            f"{datos['p99_ms']:>9.2f} {datos['max_ms']:>9.2f} "
+            f"{datos['consultas_media']:>10.2f} {datos['consultas_max']:>5}"
+        )
+
+def main() -> int:
+    args = _argumentos()
+
+    archivo_temporal = None
+    url = args.url
+    if url is None:
+        archivo_temporal = os.path.join(tempfile.gettempdir(), "benchmark_jornada.db")
+        if os.path.exists(archivo_temporal):
+            os.remove(archivo_temporal)
+        url = f"sqlite:///{archivo_temporal}"
+
+    # El engine de la aplicación se crea al importar app.db.session a partir de
+    # la configuración, así que la URL debe fijarse antes de importar la app
+    os.environ["SQLALCHEMY_DATABASE_URI"] = url
+    # Las exportaciones pregeneradas al cerrar cada partida se ejecutan en
+    # hilos de fondo: sus consultas se contarían en las peticiones medidas
+    os.environ.setdefault("EXPORTACIONES_PREGENERAR", "false")
+    # Almacén de exportaciones propio: las claves (campeonato y versión de los
+    # datos) de una base recién creada coincidirían con las de otra ejecución
+    directorio_exportaciones = tempfile.mkdtemp(prefix="benchmark_exportaciones_")
+    os.environ["EXPORTACIONES_DIRECTORIO"] = directorio_exportaciones
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.main import app
+    from app.models import Campeonato
+    from benchmarks.escenarios import jornada_torneo
+    from benchmarks.generador import contar_filas, generar_torneo
+    from benchmarks.medicion import ClienteMedido, Medidor, comparar
+
+    Base.metadata.create_all(engine)
+    campeonatos: List[int] = []
+    try:
+        for i, (parejas, partidas) in enumerate(args.historico, 1):
+            inicio = time.perf_counter()
+            sembrado = generar_torneo(
+                engine,
+                parejas,
+                partidas,
+                semilla=args.semilla + i,
+                nombre=f"Histórico benchmark {i}"
+            )
+            campeonatos.append(sembrado["campeonato_id"])
+            print(
+                f"Sembrado histórico {parejas}x{partidas}: {sembrado['mesas']} mesas y "
+                f"{sembrado['resultados']} resultados en {time.perf_counter() - inicio:.1f} s"
+            )
+        filas = contar_filas(engine)
+
+        # Recoger la basura de la siembra antes de medir: si no, la primera
+        # recolección completa cae dentro de alguna petición de la jornada
+        gc.collect()
+        medidor = Medidor(engine)
+        with TestClient(app) as cliente:
+            inicio = time.perf_counter()
+            jornada = jornada_torneo(
+                ClienteMedido(cliente, medidor),
+                args.parejas,
+                args.partidas,
+                sondeo_cada=args.sondeo_cada,
+                semilla=args.semilla
+            )
+            duracion = time.perf_counter() - inicio
+        medidor.cerrar()
+        campeonatos.append(jornada["campeonato_id"])
+        resumen = medidor.resumen()
+
+        print(f"\nJornada de {args.parejas} parejas y {args.partidas} partidas en {engine.dialect.name}: "
+              f"{jornada['peticiones']} peticiones en {duracion:.1f} s\n")
+        _imprimir_tabla(resumen)
+
+        linea_base = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "motor": engine.dialect.name,
+            "parametros": {
+                "parejas": args.parejas,
+                "partidas": args.partidas,
+                "sondeo_cada": args.sondeo_cada,
+                "semilla": args.semilla,
+                "historico": [f"{parejas}x{partidas}" for parejas, partidas in args.historico]
+            },
+            "filas": filas,
+            "duracion_s": round(duracion, 2),
+            "endpoints": resumen
+        }
+        if args.guardar:
+            with open(args.guardar, "w", encoding="utf-8") as archivo:
+                json.dump(linea_base, archivo, indent=2, ensure_ascii=False)
+                archivo.write("\n")
+            print(f"\nLínea base guardada en {args.guardar}")
+
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as archivo:
+                anterior = json.load(archivo)
+            if anterior.get("motor") != linea_base["motor"] or anterior.get("parametros") != linea_base["parametros"]:
+                print("\nAVISO: la línea base se midió con otro motor o parámetros; la comparación es orientativa")
+            regresiones = comparar(resumen, anterior["endpoints"], args.tolerancia, args.margen_ms)
+            if regresiones:
+                print(f"\nRegresiones respecto a {args.comparar}:")
+                for regresion in regresiones:
+                    print(f"  - {regresion}")
+                return 1
+            print(f"\nSin regresiones respecto a {args.comparar}")
+        return 0
+    finally:
+        shutil.rmtree(directorio_exportaciones, ignore_errors=True)
+        if archivo_temporal is not None:
+            engine.dispose()
+            if not args.conservar and os.path.exists(archivo_temporal):
+                os.remove(archivo_temporal)
+        elif campeonatos and not args.conservar:
+            # Las claves foráneas en cascada borran parejas, mesas y resultados
+            with engine.begin() as conexion:
+                conexion.execute(delete(Campeonato).where(Campeonato.id.in_(campeonatos)))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# Escenarios que reproducen una jornada de torneo a través de los routers reales
+import csv
+import io
+import random
+from datetime import date
+from typing import Any, Dict
+from app.core.constants import FormatoExportacion, PUNTOS_VICTORIA_MESA_LIBRE
+from benchmarks.medicion import ClienteMedido
+
+def _archivo_inscripciones(inicio: int, cantidad: int) -> bytes:
+    """Genera el CSV de inscripciones que entregan los clubes antes de la jornada."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(["jugador1_nombre", "jugador1_apellido", "jugador2_nombre", "jugador2_apellido", "club"])
+    for n in range(inicio, inicio + cantidad):
+        escritor.writerow([f"Jugador {n}A", f"Apellido {n}", f"Jugador {n}B", f"Apellido {n}", f"Club {n % 40}"])
+    return buffer.getvalue().encode("utf-8")
+
+def _resultado_mesa(mesa: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Construye el envío de resultados de una mesa con una puntuación aleatoria."""
+    cuerpo = {
+        "mesa_id": mesa["id"],
+        "campeonato_id": mesa["campeonato_id"],
+        "partida": mesa["partida"],
+    }
+    if mesa["pareja2"] is None:
+        cuerpo["pareja1"] = {
+            "id": mesa["pareja1"]["id"],
+            "RP": PUNTOS_VICTORIA_MESA_LIBRE,
+            "PG": 1,
+            "PP": PUNTOS_VICTORIA_MESA_LIBRE,
+            "GB": "A"
+        }
+        return cuerpo
+    perdedora = rng.randint(0, 300)
+    ganadora = perdedora + rng.randint(1, 50)
+    if rng.random() < 0.5:
+        ganadora, perdedora = perdedora, ganadora
+    cuerpo["pareja1"] = {
+        "id": mesa["pareja1"]["id"],
+        "RP": ganadora,
+        "PG": int(ganadora > perdedora),
+        "PP": ganadora - perdedora,
+        "GB": "A"
+    }
+    cuerpo["pareja2"] = {
+        "id": mesa["pareja2"]["id"],
+        "RP": perdedora,
+        "PG": int(perdedora > ganadora),
+        "PP": perdedora - ganadora,
+        "GB": "A"
+    }
+    return cuerpo
+
+def registro(cliente: ClienteMedido, parejas: int, partidas: int, proporcion_importada: float = 0.8) -> int:
+    """
+    Crea el campeonato e inscribe las parejas como el día del torneo.
+
+    Args:
+        cliente: Cliente medido
+        parejas: Parejas inscritas
+        partidas: Partidas programadas
+        proporcion_importada: Parte de las parejas que llega en el archivo de
+                              inscripciones; el resto se inscribe una a una en mesa
+
+    Returns:
+        int: ID del campeonato creado
+    """
+    campeonato = cliente.llamar("POST", "/api/campeonatos/", json={
+        "nombre": "Jornada benchmark",
+        "fecha_inicio": date.today().isoformat(),
+        "dias_duracion": 1,
+        "numero_partidas": partidas
+    }).json()
+    campeonato_id = campeonato["id"]
+    ruta = {"campeonato_id": campeonato_id}
+
+    importadas = int(parejas * proporcion_importada)
+    if importadas:
+        cliente.llamar(
+            "POST",
+            "/api/parejas/importar/{campeonato_id}",
+            ruta,
+            files={"archivo": ("inscripciones.csv", _archivo_inscripciones(1, importadas), "text/csv")}
+        )
+    for n in range(importadas + 1, parejas + 1):
+        cliente.llamar("POST", "/api/jugadores/parejas", json={
+            "campeonato_id": campeonato_id,
+            "club": f"Club {n % 40}",
+            "jugador1": {"nombre": f"Jugador {n}A", "apellido": f"Apellido {n}"},
+            "jugador2": {"nombre": f"Jugador {n}B", "apellido": f"Apellido {n}"}
+        })
+        # La mesa de inscripción refresca la lista tras cada alta
+        if n % 10 == 0:
+            cliente.llamar("GET", "/api/jugadores/parejas/campeonato/{campeonato_id}", ruta)
+
+    cliente.llamar("GET", "/api/jugadores/parejas/campeonato/{campeonato_id}", ruta)
+    cliente.llamar("GET", "/api/campeonatos/")
+    return campeonato_id
+
+def partida(
+    cliente: ClienteMedido,
+    campeonato_id: int,
+    numero: int,
+    sondeo_cada: int,
+    rng: random.Random
+) -> None:
+    """
+    Juega una partida: inicio, sorteo, ráfaga de resultados y sondeos del ranking.
+
+    Args:
+        cliente: Cliente medido
+        campeonato_id: ID del campeonato
+        numero: Número de la partida
+        sondeo_cada: Resultados entre dos sondeos de las pantallas de ranking y mesas
+        rng: Generador aleatorio del escenario
+    """
+    ruta = {"campeonato_id": campeonato_id}
+    cliente.llamar("PUT", "/api/campeonatos/{campeonato_id}", ruta, json={"partida_actual": numero})
+    cliente.llamar("POST", "/api/partidas/sortear-parejas/{campeonato_id}", ruta)
+    mesas = cliente.llamar("GET", "/api/partidas/{campeonato_id}/mesas", ruta).json()
+
+    # Las mesas entregan sus actas en orden aleatorio mientras las pantallas
+    # de la sala consultan el ranking y el estado de las mesas
+    rng.shuffle(mesas)
+    for i, mesa in enumerate(mesas, 1):
+        cliente.llamar("POST", "/api/resultados/", json=_resultado_mesa(mesa, rng))
+        if i % sondeo_cada == 0:
+            cliente.llamar("GET", "/api/ranking/{campeonato_id}/final", ruta)
+            cliente.llamar("GET", "/api/resultados/ranking/{campeonato_id}", ruta)
+            cliente.llamar("GET", "/api/partidas/{campeonato_id}/mesas", ruta)
+
+    cliente.llamar("GET", "/api/ranking/{campeonato_id}/final", ruta)
+    cliente.llamar("GET", "/api/resultados/ranking/{campeonato_id}", ruta)
+
+def exportaciones(cliente: ClienteMedido, campeonato_id: int) -> None:
+    """Descarga el ranking y los resultados en todos los formatos al cerrar la jornada."""
+    ruta = {"campeonato_id": campeonato_id}
+    for formato in FormatoExportacion:
+        cliente.llamar("GET", "/api/exportar/ranking/{campeonato_id}", ruta, params={"formato": formato.value})
+        cliente.llamar("GET", "/api/exportar/resultados/{campeonato_id}", ruta, params={"formato": formato.value})
+
+def jornada_torneo(
+    cliente: ClienteMedido,
+    parejas: int,
+    partidas: int,
+    sondeo_cada: int = 10,
+    semilla: int = 1
+) -> Dict[str, Any]:
+    """
+    Reproduce una jornada completa: inscripción, partidas y exportaciones.
+
+    Args:
+        cliente: Cliente medido
+        parejas: Parejas inscritas
+        partidas: Partidas jugadas
+        sondeo_cada: Resultados entre dos sondeos de las pantallas
+        semilla: Semilla aleatoria (misma semilla, misma jornada)
+
+    Returns:
+        dict: ID del campeonato jugado y número total de peticiones
+    """
+    rng = random.Random(semilla)
+    campeonato_id = registro(cliente, parejas, partidas)
+    for numero in range(1, partidas + 1):
+        partida(cliente, campeonato_id, numero, sondeo_cada, rng)
+    exportaciones(cliente, campeonato_id)
+
+    peticiones = sum(datos["peticiones"] for datos in cliente.medidor.resumen().values())
+    return {"campeonato_id": campeonato_id, "peticiones": peticiones}
@@ -0,0 +1,258 @@
+# Generador de torneos sintéticos para los benchmarks
+import csv
+from collections import Counter
+import io
+import random
+from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from app.core.constants import PUNTOS_VICTORIA_MESA_LIBRE
+from app.core.emparejamiento import (
+    clave_enfrentamiento,
+    emparejar_suizo,
+    ordenar_por_clasificacion
+)
+from app.models import Campeonato, Clasificacion, ContadorPartida, Enfrentamiento, Jugador, Mesa, Pareja, Resultado
+from app.models.enfrentamiento import filas_enfrentamientos
+
+def _reservar_ids(conexion: Connection, tabla: str, cantidad: int) -> List[int]:
+    """
+    Reserva IDs consecutivos para insertar filas con la clave ya asignada.
+
+    Args:
+        conexion: Conexión con la transacción de la siembra
+        tabla: Nombre de la tabla
+        cantidad: Número de IDs a reservar
+
+    Returns:
+        list: IDs reservados
+
+    Note:
+        En PostgreSQL se toman de la secuencia de la tabla, de modo que las
+        inserciones posteriores de la aplicación no colisionan con ellos. En
+        otros motores se continúa desde el máximo actual
+    """
+    if cantidad == 0:
+        return []
+    if conexion.dialect.name == "postgresql":
+        return list(conexion.execute(
+            text("SELECT nextval(pg_get_serial_sequence(:tabla, 'id')) FROM generate_series(1, :cantidad)"),
+            {"tabla": tabla, "cantidad": cantidad}
+        ).scalars())
+    maximo = conexion.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}")).scalar()
+    return list(range(maximo + 1, maximo + cantidad + 1))
+
+def _insertar_masivo(conexion: Connection, modelo, columnas: Sequence[str], filas: List[Tuple]) -> None:
+    """
+    Inserta muchas filas en una tabla de la forma más rápida que admita el motor.
+
+    Args:
+        conexion: Conexión con la transacción de la siembra
+        modelo: Modelo SQLAlchemy de la tabla
+        columnas: Nombres de las columnas, en el orden de las tuplas
+        filas: Filas a insertar
+
+    Note:
+        En PostgreSQL usa COPY FROM STDIN en formato CSV (un campo vacío sin
+        comillas es NULL); en el resto, un único INSERT con executemany
+    """
+    if not filas:
+        return
+    tabla = modelo.__tablename__
+    if conexion.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            escritor.writerow(["" if valor is None else valor for valor in fila])
+        buffer.seek(0)
+        nombres = ", ".join(f'"{columna}"' for columna in columnas)
+        cursor = conexion.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {tabla} ({nombres}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        return
+    conexion.execute(insert(modelo), [dict(zip(columnas, fila)) for fila in filas])
+
+def _puntuacion_mesa(rng: random.Random) -> Tuple[int, int]:
+    """Devuelve los puntos de la pareja ganadora y de la perdedora de una mesa."""
+    perdedora = rng.randint(0, 300)
+    return perdedora + rng.randint(1, 50), perdedora
+
+def generar_torneo(
+    engine: Engine,
+    parejas: int,
+    partidas: int,
+    semilla: int = 1,
+    nombre: str = "Torneo sintético"
+) -> Dict[str, Any]:
+    """
+    Siembra un campeonato completo: parejas, jugadores, mesas de cada partida,
+    resultados y clasificación materializada.
+
+    Args:
+        engine: Engine de la base de datos destino
+        parejas: Número de parejas inscritas
+        partidas: Número de partidas ya jugadas
+        semilla: Semilla aleatoria (misma semilla, mismos datos)
+        nombre: Nombre del campeonato
+
+    Returns:
+        dict: ID del campeonato y filas insertadas en cada tabla
+
+    Note:
+        - Las mesas se sortean con el mismo sistema suizo que la aplicación, así
+          que la distribución de rivales y mesas libres es la real
+        - Todo se inserta en una única transacción
+    """
+    rng = random.Random(semilla)
+    with engine.begin() as conexion:
+        campeonato_id = conexion.execute(
+            insert(Campeonato).returning(Campeonato.id),
+            {
+                "nombre": nombre,
+                "fecha_inicio": date.today(),
+                "dias_duracion": 1,
+                "numero_partidas": partidas,
+                "grupo_b": False,
+                "partida_actual": partidas,
+                "ultimo_numero_pareja": parejas,
+                "en_eliminacion": False
+            }
+        ).scalar_one()
+
+        # Parejas y sus dos jugadores
+        ids_parejas = _reservar_ids(conexion, Pareja.__tablename__, parejas)
+        _insertar_masivo(
+            conexion,
+            Pareja,
+            ("id", "nombre", "club", "activa", "numero", "campeonato_id"),
+            [
+                (pareja_id, f"Jugador {n}A y Jugador {n}B", f"Club {n % 40}", True, n, campeonato_id)
+                for n, pareja_id in enumerate(ids_parejas, 1)
+            ]
+        )
+        ids_jugadores = iter(_reservar_ids(conexion, Jugador.__tablename__, 2 * parejas))
+        _insertar_masivo(
+            conexion,
+            Jugador,
+            ("id", "nombre", "apellido", "pareja_id", "campeonato_id"),
+            [
+                (next(ids_jugadores), f"Jugador {n}{letra}", f"Apellido {n}", pareja_id, campeonato_id)
+                for n, pareja_id in enumerate(ids_parejas, 1)
+                for letra in ("A", "B")
+            ]
+        )
+
+        # Partidas: sorteo suizo, mesas y resultados
+        totales = {pareja_id: [0, 0, 0, 0] for pareja_id in ids_parejas}  # PG, PP, RP, jugadas
+        historial = set()
+        con_mesa_libre = set()
+        mesas: List[Tuple] = []
+        resultados: List[Tuple] = []
+        # Cada partida tiene una mesa por cada dos parejas más la mesa libre si son impares
+        ids_mesas = iter(_reservar_ids(conexion, Mesa.__tablename__, partidas * ((parejas + 1) // 2)))
+        for partida in range(1, partidas + 1):
+            if partida == 1:
+                orden = list(ids_parejas)
+                rng.shuffle(orden)
+            else:
+                orden = ordenar_por_clasificacion(
+                    ids_parejas,
+                    {p: (t[0], t[1]) for p, t in totales.items()}
+                )
+            sorteo = emparejar_suizo(orden, historial, con_mesa_libre)
+
+            for numero, (pareja1_id, pareja2_id) in enumerate(sorteo, 1):
+                mesa_id = next(ids_mesas)
+                mesas.append((mesa_id, numero, campeonato_id, partida, pareja1_id, pareja2_id))
+                if pareja2_id is None:
+                    con_mesa_libre.add(pareja1_id)
+                    puntuaciones = [(pareja1_id, 1, PUNTOS_VICTORIA_MESA_LIBRE, PUNTOS_VICTORIA_MESA_LIBRE)]
+                else:
+                    historial.add(clave_enfrentamiento(pareja1_id, pareja2_id))
+                    ganadora, perdedora = _puntuacion_mesa(rng)
+                    if rng.random() < 0.5:
+                        pareja1_id, pareja2_id = pareja2_id, pareja1_id
+                    puntuaciones = [
+                        (pareja1_id, 1, ganadora - perdedora, ganadora),
+                        (pareja2_id, 0, perdedora - ganadora, perdedora)
+                    ]
+                for pareja_id, pg, pp, rp in puntuaciones:
+                    resultados.append((mesa_id, campeonato_id, partida, pareja_id, "A", pg, pp, rp))
+                    total = totales[pareja_id]
+                    total[0] += pg
+                    total[1] += pp
+                    total[2] += rp
+                    total[3] += 1
+
+        _insertar_masivo(
+            conexion,
+            Mesa,
+            ("id", "numero", "campeonato_id", "partida", "pareja1_id", "pareja2_id"),
+            mesas
+        )
+        # Las inserciones masivas no pasan por el ORM: el índice de rivales se rellena aquí
+        enfrentamientos = [
+            (fila["campeonato_id"], fila["partida"], fila["mesa_id"], fila["pareja_id"], fila["rival_id"])
+            for mesa_id, _, campeonato, partida, pareja1_id, pareja2_id in mesas
+            for fila in filas_enfrentamientos(mesa_id, campeonato, partida, pareja1_id, pareja2_id)
+        ]
+        _insertar_masivo(
+            conexion,
+            Enfrentamiento,
+            ("campeonato_id", "partida", "mesa_id", "pareja_id", "rival_id"),
+            enfrentamientos
+        )
+        _insertar_masivo(
+            conexion,
+            Resultado,
+            ("mesa_id", "campeonato_id", "partida", "id_pareja", "GB", "PG", "PP", "RP"),
+            resultados
+        )
+        # Todas las partidas generadas tienen ya sus resultados: ninguna mesa pendiente
+        mesas_por_partida = Counter(partida for _, _, _, partida, _, _ in mesas)
+        _insertar_masivo(
+            conexion,
+            ContadorPartida,
+            ("campeonato_id", "partida", "mesas", "mesas_pendientes"),
+            [(campeonato_id, partida, total, 0) for partida, total in sorted(mesas_por_partida.items())]
+        )
+        _insertar_masivo(
+            conexion,
+            Clasificacion,
+            ("campeonato_id", "id_pareja", "GB", "PG", "PP", "RP", "partidas_jugadas", "ultima_partida"),
+            [
+                (campeonato_id, pareja_id, "A", pg, pp, rp, jugadas, partidas)
+                for pareja_id, (pg, pp, rp, jugadas) in totales.items()
+            ]
+        )
+
+        # Actualizar las estadísticas del planificador tras la carga masiva,
+        # como haría autovacuum antes de la jornada real
+        if conexion.dialect.name == "postgresql":
+            conexion.execute(text("ANALYZE"))
+
+    return {
+        "campeonato_id": campeonato_id,
+        "parejas": parejas,
+        "jugadores": 2 * parejas,
+        "mesas": len(mesas),
+        "enfrentamientos": len(enfrentamientos),
+        "resultados": len(resultados),
+        "clasificaciones": len(totales)
+    }
+
+def contar_filas(engine: Engine) -> Dict[str, int]:
+    """
+    Cuenta las filas de las tablas principales.
+
+    Returns:
+        dict: Filas de cada tabla, para registrar el tamaño de la base de datos medida
+    """
+    with engine.connect() as conexion:
+        return {
+            modelo.__tablename__: conexion.execute(select(func.count()).select_from(modelo)).scalar()
+            for modelo in (Campeonato, Pareja, Jugador, Mesa, Enfrentamiento, ContadorPartida, Resultado, Clasificacion)
+        }
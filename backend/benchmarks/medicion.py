@@ -0,0 +1,167 @@
+# Medición de latencias y consultas SQL por endpoint
+import statistics
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Peticiones necesarias para que el p99 de un endpoint sea comparable entre ejecuciones
+PETICIONES_MINIMAS_P99 = 50
+
+def percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+class Medidor:
+    """
+    Acumula, por endpoint, la latencia y el número de consultas SQL de cada petición.
+
+    Note:
+        Cuenta las sentencias que pasan por el engine indicado con el evento
+        before_cursor_execute. Las peticiones se reproducen de una en una, así
+        que todas las consultas contadas durante una petición son suyas
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._consultas = 0
+        self._latencias: Dict[str, List[float]] = defaultdict(list)
+        self._num_consultas: Dict[str, List[int]] = defaultdict(list)
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self._consultas += 1
+
+    def cerrar(self) -> None:
+        """Deja de escuchar las consultas del engine."""
+        event.remove(self.engine, "before_cursor_execute", self._contar)
+
+    def registrar(self, endpoint: str, latencia_ms: float, consultas: int) -> None:
+        """Añade una petición medida al endpoint indicado."""
+        self._latencias[endpoint].append(latencia_ms)
+        self._num_consultas[endpoint].append(consultas)
+
+    def consultas(self) -> int:
+        """Devuelve el contador de consultas ejecutadas desde que se creó el medidor."""
+        return self._consultas
+
+    def resumen(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resume las mediciones de cada endpoint.
+
+        Returns:
+            dict: Por endpoint, número de peticiones, p50, p99 y máximo en
+                  milisegundos, y consultas SQL medias y máximas por petición
+        """
+        return {
+            endpoint: {
+                "peticiones": len(latencias),
+                "p50_ms": round(percentil(latencias, 50), 3),
+                "p99_ms": round(percentil(latencias, 99), 3),
+                "max_ms": round(max(latencias), 3),
+                "consultas_media": round(statistics.mean(self._num_consultas[endpoint]), 2),
+                "consultas_max": max(self._num_consultas[endpoint])
+            }
+            for endpoint, latencias in sorted(self._latencias.items())
+        }
+
+class ClienteMedido:
+    """
+    Cliente HTTP que mide cada petición y la agrupa por la plantilla de su ruta.
+
+    Attributes:
+        cliente: Cliente de pruebas de FastAPI (o cualquier cliente httpx)
+        medidor (Medidor): Donde se acumulan las mediciones
+    """
+
+    def __init__(self, cliente, medidor: Medidor):
+        self.cliente = cliente
+        self.medidor = medidor
+
+    def llamar(
+        self,
+        metodo: str,
+        plantilla: str,
+        ruta: Optional[Dict[str, Any]] = None,
+        esperado: Iterable[int] = (200,),
+        **opciones
+    ):
+        """
+        Realiza una petición y registra su latencia y sus consultas.
+
+        Args:
+            metodo: Método HTTP
+            plantilla: Ruta con parámetros entre llaves, p. ej.
+                       '/api/partidas/{campeonato_id}/mesas'; identifica el endpoint
+            ruta: Valores de los parámetros de la ruta
+            esperado: Códigos de estado válidos
+            **opciones: Argumentos de la petición (json, params, files...)
+
+        Returns:
+            Respuesta HTTP, con el cuerpo ya leído
+
+        Raises:
+            RuntimeError: Si el código de estado no es uno de los esperados
+        """
+        url = plantilla.format(**(ruta or {}))
+        consultas = self.medidor.consultas()
+        inicio = time.perf_counter()
+        respuesta = self.cliente.request(metodo, url, **opciones)
+        latencia = (time.perf_counter() - inicio) * 1000
+        self.medidor.registrar(
+            f"{metodo} {plantilla}",
+            latencia,
+            self.medidor.consultas() - consultas
+        )
+        if respuesta.status_code not in esperado:
+            raise RuntimeError(f"{metodo} {url}: {respuesta.status_code} {respuesta.text[:200]}")
+        return respuesta
+
+def comparar(
+    actual: Dict[str, Dict[str, Any]],
+    base: Dict[str, Dict[str, Any]],
+    tolerancia: float,
+    margen_ms: float
+) -> List[str]:
+    """
+    Compara el resumen de una ejecución con una línea base guardada.
+
+    Args:
+        actual: Resumen por endpoint de la ejecución actual
+        base: Resumen por endpoint de la línea base
+        tolerancia: Empeoramiento relativo admitido en p50 y p99 (0.25 = 25 %)
+        margen_ms: Diferencia absoluta mínima para considerar una regresión de
+                   latencia (evita falsos positivos en endpoints de pocos ms)
+
+    Returns:
+        list: Descripción de cada regresión; vacía si no hay ninguna
+
+    Note:
+        - El p99 solo se compara en endpoints con al menos PETICIONES_MINIMAS_P99
+          peticiones; con menos es el máximo de unas pocas muestras y solo mide ruido
+        - El número de consultas es determinista para una misma semilla, así que
+          cualquier aumento de la media se considera una regresión
+    """
+    regresiones = []
+    for endpoint, datos in actual.items():
+        anterior = base.get(endpoint)
+        if anterior is None:
+            continue
+        metricas = ["p50_ms"]
+        if datos["peticiones"] >= PETICIONES_MINIMAS_P99:
+            metricas.append("p99_ms")
+        for metrica in metricas:
+            diferencia = datos[metrica] - anterior[metrica]
+            if diferencia > margen_ms and datos[metrica] > anterior[metrica] * (1 + tolerancia):
+                regresiones.append(
+                    f"{endpoint}: {metrica} {anterior[metrica]:.2f} -> {datos[metrica]:.2f} ms"
+                )
+        if datos["consultas_media"] > anterior["consultas_media"] + 0.01:
+            regresiones.append(
+                f"{endpoint}: consultas por petición "
+                f"{anterior['consultas_media']} -> {datos['consultas_media']}"
+            )
+    return regresiones
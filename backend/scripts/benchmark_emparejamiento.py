@@ -0,0 +1,104 @@
+"""
+Mide el sorteo suizo de app/core/emparejamiento sin base de datos.
+
+Simula un campeonato completo: en cada partida ordena la clasificación, sortea
+las mesas, genera resultados aleatorios y acumula el historial de rivales.
+Muestra el tiempo de cada sorteo, las repeticiones de rival y las mesas libres
+repetidas. Con --comparar mide también el algoritmo anterior del router, que
+recorría todos los resultados por cada pareja.
+
+Uso (desde el directorio backend):
+    python -m scripts.benchmark_emparejamiento --parejas 2000 --partidas 12
+"""
+import argparse
+import random
+import statistics
+import time
+from app.core.emparejamiento import (
+    clave_enfrentamiento,
+    emparejar_suizo,
+    ordenar_por_clasificacion
+)
+
+def orden_anterior(parejas, resultados):
+    """
+    Reproduce la ordenación previa de sortear_parejas: por cada pareja busca
+    linealmente su primer resultado, con coste O(parejas · resultados).
+    """
+    return sorted(
+        parejas,
+        key=lambda p: next(
+            (r[1] * 1000 + r[2] for r in resultados if r[0] == p),
+            0
+        ),
+        reverse=True
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del sorteo suizo")
+    parser.add_argument("--parejas", type=int, default=2000, help="Número de parejas")
+    parser.add_argument("--partidas", type=int, default=12, help="Número de partidas")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla aleatoria")
+    parser.add_argument("--comparar", action="store_true", help="Medir también el algoritmo anterior")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    parejas = list(range(1, args.parejas + 1))
+    totales = {}
+    historial = set()
+    con_mesa_libre = set()
+    resultados = []
+    tiempos = []
+    repeticiones = 0
+    mesas_libres_repetidas = 0
+
+    for partida in range(1, args.partidas + 1):
+        inicio = time.perf_counter()
+        if partida == 1:
+            orden = list(parejas)
+            rng.shuffle(orden)
+        else:
+            orden = ordenar_por_clasificacion(parejas, totales)
+        mesas = emparejar_suizo(orden, historial, con_mesa_libre)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+        if args.comparar and partida > 1:
+            inicio = time.perf_counter()
+            orden_anterior(parejas, resultados)
+            anterior = (time.perf_counter() - inicio) * 1000
+            print(f"Partida {partida}: sorteo {tiempos[-1]:.1f} ms, ordenación anterior {anterior:.1f} ms")
+
+        for pareja1, pareja2 in mesas:
+            if pareja2 is None:
+                if pareja1 in con_mesa_libre:
+                    mesas_libres_repetidas += 1
+                con_mesa_libre.add(pareja1)
+                pg, pp = totales.get(pareja1, (0, 0))
+                totales[pareja1] = (pg + 1, pp + 150)
+                resultados.append((pareja1, 1, 150))
+                continue
+
+            clave = clave_enfrentamiento(pareja1, pareja2)
+            if clave in historial:
+                repeticiones += 1
+            historial.add(clave)
+
+            diferencia = rng.randint(1, 150)
+            ganadora, perdedora = (pareja1, pareja2) if rng.random() < 0.5 else (pareja2, pareja1)
+            pg, pp = totales.get(ganadora, (0, 0))
+            totales[ganadora] = (pg + 1, pp + diferencia)
+            pg, pp = totales.get(perdedora, (0, 0))
+            totales[perdedora] = (pg, pp - diferencia)
+            resultados.append((ganadora, 1, diferencia))
+            resultados.append((perdedora, 0, -diferencia))
+
+    print(f"Parejas: {args.parejas}, partidas: {args.partidas}")
+    print(
+        f"Sorteo: mediana {statistics.median(tiempos):.2f} ms, "
+        f"máximo {max(tiempos):.2f} ms"
+    )
+    print(f"Enfrentamientos repetidos: {repeticiones}")
+    print(f"Mesas libres repetidas: {mesas_libres_repetidas}")
+
+if __name__ == "__main__":
+    main()
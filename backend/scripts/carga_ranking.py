@@ -0,0 +1,72 @@
+"""
+Prueba de carga de las lecturas concurrentes del ranking.
+
+Lanza primero las peticiones de una en una (línea base) y después con varios
+clientes a la vez contra un servidor en marcha. Si los manejadores bloquean el
+bucle de eventos, las peticiones concurrentes se atienden en serie y el
+paralelismo efectivo (suma de latencias / tiempo total) se queda cerca de 1;
+con los manejadores síncronos ejecutados en el threadpool debe acercarse al
+número de clientes (limitado por el pool de conexiones de la base de datos).
+
+Uso (desde el directorio backend, con el servidor arrancado):
+    python -m scripts.carga_ranking --url http://localhost:8000 --campeonato 1
+"""
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+def _peticion(url: str) -> float:
+    """Realiza una petición GET y devuelve su latencia en milisegundos."""
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(url) as respuesta:
+        respuesta.read()
+    return (time.perf_counter() - inicio) * 1000
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+def medir(url: str, peticiones: int, concurrencia: int) -> None:
+    """
+    Lanza las peticiones con el número de clientes indicado y muestra el resumen.
+
+    Args:
+        url: URL completa del endpoint a medir
+        peticiones: Número total de peticiones
+        concurrencia: Número de clientes simultáneos
+    """
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        latencias = list(pool.map(_peticion, [url] * peticiones))
+    total = (time.perf_counter() - inicio) * 1000
+
+    print(
+        f"Clientes {concurrencia:>3}: total {total:8.1f} ms, "
+        f"p50 {statistics.median(latencias):7.1f} ms, "
+        f"p99 {_percentil(latencias, 99):7.1f} ms, "
+        f"paralelismo efectivo {sum(latencias) / total:5.1f}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga de las lecturas del ranking")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del servidor")
+    parser.add_argument("--campeonato", type=int, required=True, help="ID del campeonato")
+    parser.add_argument("--peticiones", type=int, default=200, help="Peticiones por medida")
+    parser.add_argument("--concurrencia", type=int, default=20, help="Clientes simultáneos")
+    args = parser.parse_args()
+
+    url = f"{args.url.rstrip('/')}/api/ranking/{args.campeonato}/final"
+
+    # Calentar conexiones del pool antes de medir
+    _peticion(url)
+
+    medir(url, args.peticiones, 1)
+    medir(url, args.peticiones, args.concurrencia)
+
+if __name__ == "__main__":
+    main()
@@ -14,13 +14,7 @@ dropdb --if-exists $DB_NAME -U $DB_USER
 echo "Creando nueva base de datos..."
 createdb $DB_NAME -U $DB_USER
 
-echo "Eliminando migraciones existentes..."
-rm -rf alembic/versions/*
-
-echo "Creando nueva migración inicial..."
-alembic revision --autogenerate -m "initial migration"
-
-echo "Aplicando migración..."
+echo "Aplicando migraciones..."
 alembic upgrade head
 
 echo "Base de datos inicializada correctamente!" 
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Reconstruye la tabla materializada de clasificaciones a partir de los resultados.
+
+Uso (desde el directorio backend):
+    python -m scripts.reconstruir_clasificacion              # todos los campeonatos
+    python -m scripts.reconstruir_clasificacion --campeonato 3
+"""
+import argparse
+from app.db.session import SessionLocal
+from app.services.clasificacion_service import ClasificacionService
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reconstruye la clasificación materializada")
+    parser.add_argument(
+        "--campeonato",
+        type=int,
+        default=None,
+        help="ID del campeonato a reconstruir (por defecto, todos)"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        filas = ClasificacionService(db).reconstruir(args.campeonato)
+        print(f"Clasificación reconstruida: {filas} filas")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Prueba de concurrencia con varios campeonatos jugándose a la vez.
+
+Cada torneo se juega completo contra un servidor en marcha: alta del
+campeonato, inscripción de parejas, y en cada partida dos sorteos simultáneos,
+registro de resultados por lotes y paso a la siguiente partida; al final se
+elimina el campeonato. Los torneos se juegan primero de uno en uno y después
+todos a la vez.
+
+Se comprueba que:
+    - De los dos sorteos simultáneos de una partida exactamente uno crea las
+      mesas y el otro recibe 409 (el bloqueo por campeonato serializa el sorteo)
+    - Cada partida tiene sus mesas completas y ninguna pareja sentada dos veces
+    - El borrado de un campeonato se acepta (202) sin esperar a la purga
+    - Mientras un campeonato está bloqueado, las operaciones de otro campeonato
+      no esperan y las del bloqueado sí (comprobación de aislamiento, que toma
+      el bloqueo directamente en la base de datos)
+
+Con bloqueos por campeonato los torneos no compiten entre sí: el tiempo total
+en paralelo solo queda limitado por la CPU del servidor y el pool de
+conexiones, nunca por esperas de bloqueo entre torneos distintos.
+
+Uso (desde el directorio backend, con el servidor arrancado sobre PostgreSQL):
+    python -m scripts.torneos_paralelos --url http://localhost:8000 --torneos 8
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+def _llamar(metodo: str, url: str, cuerpo: Optional[Dict[str, Any]] = None) -> Tuple[int, Any, float]:
+    """
+    Realiza una petición JSON.
+
+    Returns:
+        Tuple[int, Any, float]: Código de estado, cuerpo decodificado y latencia en ms
+    """
+    datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else None
+    peticion = urllib.request.Request(
+        url,
+        data=datos,
+        method=metodo,
+        headers={"Content-Type": "application/json"}
+    )
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(peticion) as respuesta:
+            estado, contenido = respuesta.status, respuesta.read()
+    except urllib.error.HTTPError as e:
+        estado, contenido = e.code, e.read()
+    latencia = (time.perf_counter() - inicio) * 1000
+    return estado, json.loads(contenido) if contenido else None, latencia
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(percentil / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+def _resultado_mesa(mesa: Dict[str, Any]) -> Dict[str, Any]:
+    """Genera un resultado aleatorio válido para una mesa."""
+    pareja1, pareja2 = mesa["pareja1"], mesa["pareja2"]
+    if pareja2 is None:
+        return {
+            "mesa_id": mesa["id"],
+            "pareja1": {"id": pareja1["id"], "RP": 150, "PG": 1, "PP": 150, "GB": "A"}
+        }
+    perdedor = random.randint(0, 299)
+    ganador = perdedor + random.randint(1, 100)
+    return {
+        "mesa_id": mesa["id"],
+        "pareja1": {"id": pareja1["id"], "RP": ganador, "PG": 1, "PP": ganador - perdedor, "GB": "A"},
+        "pareja2": {"id": pareja2["id"], "RP": perdedor, "PG": 0, "PP": perdedor - ganador, "GB": "A"}
+    }
+
+def _preparar_campeonato(llamar: Callable, nombre: str, num_parejas: int, num_partidas: int, incidencias: List[str]) -> Optional[int]:
+    """
+    Da de alta un campeonato e inscribe sus parejas.
+
+    Args:
+        llamar: Función (operacion, metodo, ruta, cuerpo) -> (estado, contenido)
+        nombre: Nombre del campeonato
+        num_parejas: Parejas a inscribir
+        num_partidas: Partidas del campeonato
+        incidencias: Lista donde se añaden los errores encontrados
+
+    Returns:
+        ID del campeonato creado, o None si no se pudo crear
+    """
+    estado, campeonato = llamar("crear_campeonato", "POST", "/api/campeonatos/", {
+        "nombre": nombre,
+        "fecha_inicio": time.strftime("%Y-%m-%d"),
+        "dias_duracion": 1,
+        "numero_partidas": num_partidas,
+        "grupo_b": False
+    })
+    if estado != 200:
+        incidencias.append(f"{nombre}: alta del campeonato -> {estado} {campeonato}")
+        return None
+    campeonato_id = campeonato["id"]
+
+    for numero in range(1, num_parejas + 1):
+        estado, contenido = llamar("inscribir_pareja", "POST", "/api/parejas/", {
+            "nombre": f"Pareja {numero}",
+            "campeonato_id": campeonato_id,
+            "jugador1": {"nombre": f"J{numero}a", "apellido": f"C{campeonato_id}"},
+            "jugador2": {"nombre": f"J{numero}b", "apellido": f"C{campeonato_id}"}
+        })
+        if estado != 200:
+            incidencias.append(f"{nombre}: inscripción {numero} -> {estado} {contenido}")
+    return campeonato_id
+
+def jugar_torneo(base: str, indice: int, num_parejas: int, num_partidas: int) -> Tuple[Dict[str, List[float]], List[str]]:
+    """
+    Juega un campeonato completo y lo elimina.
+
+    Args:
+        base: URL base de la API
+        indice: Número del torneo dentro de la prueba (para nombres y mensajes)
+        num_parejas: Parejas inscritas
+        num_partidas: Partidas a jugar
+
+    Returns:
+        Tuple: Latencias por operación y lista de incidencias detectadas
+    """
+    latencias: Dict[str, List[float]] = defaultdict(list)
+    incidencias: List[str] = []
+
+    def llamar(operacion: str, metodo: str, ruta: str, cuerpo: Optional[Dict[str, Any]] = None):
+        estado, contenido, latencia = _llamar(metodo, f"{base}{ruta}", cuerpo)
+        latencias[operacion].append(latencia)
+        return estado, contenido
+
+    campeonato_id = _preparar_campeonato(
+        llamar, f"Prueba concurrencia {indice}", num_parejas, num_partidas, incidencias
+    )
+    if campeonato_id is None:
+        return latencias, incidencias
+
+    mesas_esperadas = (num_parejas + 1) // 2
+    for partida in range(num_partidas):
+        if partida > 0:
+            estado, contenido = llamar("cambiar_partida", "PUT", f"/api/campeonatos/{campeonato_id}", {
+                "partida_actual": partida
+            })
+            if estado != 200:
+                incidencias.append(f"Torneo {indice}: paso a la partida {partida} -> {estado} {contenido}")
+
+        # Dos sorteos simultáneos de la misma partida: solo uno debe crear mesas
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            estados = sorted(
+                estado for estado, _ in pool.map(
+                    lambda _: llamar("sortear", "POST", f"/api/partidas/sortear-parejas/{campeonato_id}"),
+                    range(2)
+                )
+            )
+        if estados != [200, 409]:
+            incidencias.append(f"Torneo {indice}, partida {partida}: sorteos simultáneos -> {estados}")
+
+        estado, mesas = llamar("leer_mesas", "GET", f"/api/partidas/{campeonato_id}/mesas")
+        sentadas = [
+            pareja["id"] for mesa in mesas for pareja in (mesa["pareja1"], mesa["pareja2"]) if pareja
+        ]
+        if len(mesas) != mesas_esperadas or len(sentadas) != len(set(sentadas)):
+            incidencias.append(
+                f"Torneo {indice}, partida {partida}: {len(mesas)} mesas "
+                f"(esperadas {mesas_esperadas}), {len(sentadas)} parejas sentadas "
+                f"({len(set(sentadas))} distintas)"
+            )
+
+        estado, contenido = llamar("registrar_resultados", "POST", "/api/resultados/lote", {
+            "campeonato_id": campeonato_id,
+            "partida": partida,
+            "resultados": [_resultado_mesa(mesa) for mesa in mesas]
+        })
+        if estado != 200:
+            incidencias.append(f"Torneo {indice}, partida {partida}: resultados -> {estado} {contenido}")
+
+    estado, contenido = llamar("eliminar_campeonato", "DELETE", f"/api/campeonatos/{campeonato_id}")
+    if estado != 202:
+        incidencias.append(f"Torneo {indice}: borrado -> {estado} {contenido}")
+
+    return latencias, incidencias
+
+def comprobar_aislamiento(base: str, segundos: float) -> List[str]:
+    """
+    Comprueba que el bloqueo de un campeonato no hace esperar a otro.
+
+    Bloquea el campeonato A desde una sesión propia durante los segundos
+    indicados y, mientras tanto, sortea A y sortea, lee y cambia de partida B.
+
+    Args:
+        base: URL base de la API
+        segundos: Tiempo que se mantiene el bloqueo de A
+
+    Returns:
+        Lista de incidencias (vacía si el aislamiento es correcto)
+
+    Note:
+        Necesita acceso a la misma base de datos que el servidor
+        (SQLALCHEMY_DATABASE_URI); en SQLite no hay bloqueos por campeonato y
+        la comprobación se omite
+    """
+    from app.db.bloqueos import bloquear_campeonato
+    from app.db.session import SessionLocal
+
+    incidencias: List[str] = []
+
+    def llamar(operacion: str, metodo: str, ruta: str, cuerpo: Optional[Dict[str, Any]] = None):
+        estado, contenido, _ = _llamar(metodo, f"{base}{ruta}", cuerpo)
+        return estado, contenido
+
+    campeonato_a = _preparar_campeonato(llamar, "Prueba aislamiento A", 8, 2, incidencias)
+    campeonato_b = _preparar_campeonato(llamar, "Prueba aislamiento B", 8, 2, incidencias)
+    if campeonato_a is None or campeonato_b is None:
+        return incidencias
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            print("\nAislamiento: omitido (la base de datos no es PostgreSQL)")
+            return incidencias
+
+        bloquear_campeonato(db, campeonato_a)
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            sorteo_a = pool.submit(_llamar, "POST", f"{base}/api/partidas/sortear-parejas/{campeonato_a}")
+
+            latencias_b = [
+                _llamar("POST", f"{base}/api/partidas/sortear-parejas/{campeonato_b}")[2],
+                _llamar("GET", f"{base}/api/partidas/{campeonato_b}/mesas")[2],
+                _llamar("PUT", f"{base}/api/campeonatos/{campeonato_b}", {"partida_actual": 1})[2]
+            ]
+
+            time.sleep(max(0.0, segundos - (time.perf_counter() - inicio)))
+            db.rollback()
+            estado_a, _, latencia_a = sorteo_a.result()
+    finally:
+        db.close()
+
+    print(
+        f"\nAislamiento: A bloqueado {segundos:.1f} s; "
+        f"operaciones de B {max(latencias_b):.1f} ms como máximo; "
+        f"sorteo de A {latencia_a:.1f} ms (estado {estado_a})"
+    )
+    if max(latencias_b) >= segundos * 1000 / 2:
+        incidencias.append(f"Aislamiento: B ha esperado al bloqueo de A ({max(latencias_b):.1f} ms)")
+    if latencia_a < segundos * 1000 * 0.9 or estado_a != 200:
+        incidencias.append(f"Aislamiento: el sorteo de A no esperó al bloqueo ({latencia_a:.1f} ms, {estado_a})")
+
+    for campeonato_id in (campeonato_a, campeonato_b):
+        llamar("eliminar_campeonato", "DELETE", f"/api/campeonatos/{campeonato_id}")
+    return incidencias
+
+def ejecutar(base: str, torneos: int, concurrencia: int, num_parejas: int, num_partidas: int) -> Tuple[float, Dict[str, List[float]], List[str]]:
+    """
+    Juega los torneos con el número de hilos indicado.
+
+    Returns:
+        Tuple: Tiempo total en ms, latencias agregadas por operación e incidencias
+    """
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        resultados = list(pool.map(
+            lambda indice: jugar_torneo(base, indice, num_parejas, num_partidas),
+            range(1, torneos + 1)
+        ))
+    total = (time.perf_counter() - inicio) * 1000
+
+    latencias: Dict[str, List[float]] = defaultdict(list)
+    incidencias: List[str] = []
+    for latencias_torneo, incidencias_torneo in resultados:
+        for operacion, valores in latencias_torneo.items():
+            latencias[operacion].extend(valores)
+        incidencias.extend(incidencias_torneo)
+    return total, latencias, incidencias
+
+def _mostrar(titulo: str, total: float, latencias: Dict[str, List[float]]) -> None:
+    """Muestra el tiempo total y la latencia de cada operación."""
+    print(f"\n{titulo}: total {total:9.1f} ms")
+    for operacion, valores in latencias.items():
+        print(
+            f"  {operacion:<22} n={len(valores):>5}  "
+            f"p50 {statistics.median(valores):7.1f} ms  "
+            f"p99 {_percentil(valores, 99):7.1f} ms"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de concurrencia entre campeonatos")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base del servidor")
+    parser.add_argument("--torneos", type=int, default=8, help="Campeonatos a jugar")
+    parser.add_argument("--parejas", type=int, default=24, help="Parejas por campeonato")
+    parser.add_argument("--partidas", type=int, default=4, help="Partidas por campeonato")
+    parser.add_argument(
+        "--bloqueo",
+        type=float,
+        default=2.0,
+        help="Segundos que se retiene el bloqueo en la comprobación de aislamiento (0 = omitirla)"
+    )
+    args = parser.parse_args()
+
+    base = args.url.rstrip("/")
+    total_serie, latencias_serie, incidencias_serie = ejecutar(
+        base, args.torneos, 1, args.parejas, args.partidas
+    )
+    total_paralelo, latencias_paralelo, incidencias_paralelo = ejecutar(
+        base, args.torneos, args.torneos, args.parejas, args.partidas
+    )
+
+    _mostrar("En serie", total_serie, latencias_serie)
+    _mostrar(f"En paralelo ({args.torneos} torneos)", total_paralelo, latencias_paralelo)
+    print(f"\nAceleración: {total_serie / total_paralelo:.1f}x")
+
+    incidencias = incidencias_serie + incidencias_paralelo
+    if args.bloqueo > 0:
+        incidencias += comprobar_aislamiento(base, args.bloqueo)
+
+    for incidencia in incidencias:
+        print(f"ERROR: {incidencia}")
+    if incidencias:
+        sys.exit(1)
+    print("Sin incidencias")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Simulador de torneos sin base de datos.
+
+Juega miles de torneos sintéticos con el mismo sorteo suizo y la misma
+ordenación de la clasificación que la aplicación (app/core/emparejamiento) y
+la regla de grupos de app/core/utils, para dimensionar torneos grandes antes
+de jugarlos.
+
+- motor: juega un torneo (resultados y puntuación por partida con NumPy) y
+  resume varios torneos
+- __main__: línea de comandos; reparte los torneos en un pool de procesos y
+  guarda el resumen en JSON
+
+Uso (desde el directorio backend):
+    python -m simulador --parejas 2000 --partidas 12 --torneos 500
+    python -m simulador --parejas 301 --partidas 9 --modo habilidad --grupo-b
+    python -m simulador --parejas 120 --partidas 8 --ventana 4 --guardar simulacion.json
+
+Mide la latencia del sorteo y de la ordenación de la clasificación en cada
+partida y la calidad de los emparejamientos: rivales repetidos, reparto de
+las mesas libres, cambios de grupo y, con --modo habilidad, cuánto se parece
+la clasificación final al nivel real de las parejas.
+"""
@@ -0,0 +1,130 @@
+# Línea de comandos del simulador de torneos
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict
+import numpy as np
+from app.core.constants import (
+    MINIMO_PAREJAS_GRUPO_B,
+    MINIMO_PAREJAS_TORNEO,
+    PORCENTAJE_GRUPO_B,
+    VENTANA_EMPAREJAMIENTO
+)
+from simulador.motor import MODO_ALEATORIO, MODOS, resumir, simular_torneo
+
+def _entero_minimo(minimo: int):
+    """Tipo de argparse para enteros no menores que `minimo`."""
+    def convertir(valor: str) -> int:
+        numero = int(valor)
+        if numero < minimo:
+            raise argparse.ArgumentTypeError(f"Debe ser al menos {minimo}")
+        return numero
+    return convertir
+
+def _argumentos() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m simulador",
+        description="Simula torneos sin base de datos y mide el sorteo, la clasificación y la calidad de los emparejamientos"
+    )
+    parser.add_argument("--parejas", type=_entero_minimo(MINIMO_PAREJAS_TORNEO), default=200, help="Parejas de cada torneo")
+    parser.add_argument("--partidas", type=_entero_minimo(1), default=6, help="Partidas de cada torneo")
+    parser.add_argument("--torneos", type=_entero_minimo(1), default=1000, help="Torneos simulados")
+    parser.add_argument("--procesos", type=_entero_minimo(1), default=os.cpu_count() or 1, help="Procesos que juegan torneos a la vez")
+    parser.add_argument("--modo", choices=MODOS, default=MODO_ALEATORIO, help="Generación de resultados")
+    parser.add_argument("--sesgo", type=float, default=1.0, help="Peso de la diferencia de nivel en el modo habilidad")
+    parser.add_argument("--grupo-b", action="store_true", help="Repartir los grupos A y B al cerrar cada partida")
+    parser.add_argument("--porcentaje-grupo-b", type=float, default=PORCENTAJE_GRUPO_B, help="Fracción de la clasificación que queda en el grupo A")
+    parser.add_argument("--minimo-grupo-b", type=_entero_minimo(1), default=MINIMO_PAREJAS_GRUPO_B, help="Parejas mínimas del grupo B")
+    parser.add_argument("--ventana", type=_entero_minimo(1), default=VENTANA_EMPAREJAMIENTO, help="Posiciones que explora el sorteo suizo")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla aleatoria")
+    parser.add_argument("--guardar", help="Guarda el resumen en este archivo JSON")
+    return parser.parse_args()
+
+def _imprimir_resumen(resumen: Dict[str, Any]) -> None:
+    for nombre in ("sorteo", "ranking"):
+        datos = resumen[nombre]
+        print(f"{nombre:<8} p50 {datos['p50_ms']:>8.3f} ms   p99 {datos['p99_ms']:>8.3f} ms   máx {datos['max_ms']:>8.3f} ms")
+    print(
+        f"\nRivales repetidos: {resumen['repeticiones']} de {resumen['mesas']} mesas "
+        f"({resumen['tasa_repeticion']:.4%}), en {resumen['torneos_con_repeticiones']} torneos "
+        f"(máximo {resumen['repeticiones_max_torneo']} en un torneo)"
+    )
+    print(
+        f"Mesas libres: {resumen['mesas_libres']}, repetidas {resumen['mesas_libres_repetidas']}, "
+        f"máximo por pareja {resumen['max_mesas_libres_pareja']}"
+    )
+    if resumen["parejas_grupo_b"]:
+        print(
+            f"Grupo B: {resumen['parejas_grupo_b']} parejas, "
+            f"{resumen['cambios_grupo_media']} cambios de grupo por torneo"
+        )
+    if resumen["fidelidad_ranking_media"] is not None:
+        print(f"Fidelidad de la clasificación (Spearman con el nivel): {resumen['fidelidad_ranking_media']}")
+
+def main() -> int:
+    args = _argumentos()
+    parametros = {
+        "parejas": args.parejas,
+        "partidas": args.partidas,
+        "modo": args.modo,
+        "sesgo": args.sesgo,
+        "grupo_b": args.grupo_b,
+        "porcentaje_grupo_b": args.porcentaje_grupo_b,
+        "minimo_grupo_b": args.minimo_grupo_b,
+        "ventana": args.ventana
+    }
+    # Una secuencia independiente por torneo: los resultados no dependen del
+    # número de procesos ni del orden en que se juegan los torneos
+    semillas = np.random.SeedSequence(args.semilla).spawn(args.torneos)
+    jugar = partial(simular_torneo, **parametros)
+    procesos = min(args.procesos, args.torneos)
+
+    inicio = time.perf_counter()
+    if procesos == 1:
+        torneos = [jugar(semilla) for semilla in semillas]
+    else:
+        # 'spawn' como el pool de PDF; los torneos se envían por lotes para
+        # no pagar la comunicación entre procesos en cada uno
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            torneos = list(pool.map(jugar, semillas, chunksize=max(1, args.torneos // (procesos * 4))))
+    duracion = time.perf_counter() - inicio
+    resumen = resumir(torneos)
+
+    print(
+        f"{args.torneos} torneos de {args.parejas} parejas y {args.partidas} partidas "
+        f"(modo {args.modo}, {procesos} procesos) en {duracion:.1f} s: "
+        f"{args.torneos / duracion:.1f} torneos/s\n"
+    )
+    _imprimir_resumen(resumen)
+    if procesos > 1:
+        print("\nAVISO: con varios procesos las latencias incluyen la competencia por la CPU; use --procesos 1 para medirlas")
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(
+                {
+                    "fecha": datetime.now().isoformat(timespec="seconds"),
+                    "parametros": {**parametros, "torneos": args.torneos, "semilla": args.semilla},
+                    "procesos": procesos,
+                    "duracion_s": round(duracion, 2),
+                    "resumen": resumen
+                },
+                archivo,
+                indent=2,
+                ensure_ascii=False
+            )
+            archivo.write("\n")
+        print(f"\nResumen guardado en {args.guardar}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# Motor del simulador: juega torneos con el sorteo y la clasificación de la aplicación
+import time
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from app.core.constants import (
+    GrupoJuego,
+    MINIMO_PAREJAS_GRUPO_B,
+    PORCENTAJE_GRUPO_B,
+    PUNTOS_VICTORIA_MESA_LIBRE,
+    VENTANA_EMPAREJAMIENTO
+)
+from app.core.emparejamiento import (
+    MesaSorteada,
+    clave_enfrentamiento,
+    emparejar_suizo,
+    ordenar_por_clasificacion
+)
+from app.core.utils import grupo_clasificacion
+
+# Modos de generación de resultados
+MODO_ALEATORIO = "aleatorio"  # Cada mesa la gana cualquiera de las dos parejas al 50 %
+MODO_HABILIDAD = "habilidad"  # Gana con más probabilidad la pareja de más nivel
+MODOS = (MODO_ALEATORIO, MODO_HABILIDAD)
+
+# Diferencia máxima de puntos de una mesa (la misma que los torneos sembrados por benchmarks)
+DIFERENCIA_MAXIMA = 50
+
+def _ordenar(pareja_ids: List[int], pg: np.ndarray, pp: np.ndarray) -> List[int]:
+    """
+    Ordena las parejas con ordenar_por_clasificacion, como el sorteo de la aplicación.
+
+    Args:
+        pareja_ids: IDs de las parejas (índices de los arrays)
+        pg: Partidas ganadas acumuladas de cada pareja
+        pp: Puntos acumulados de cada pareja
+
+    Returns:
+        Lista de IDs ordenada por PG y PP descendentes
+    """
+    totales = dict(zip(pareja_ids, zip(pg.tolist(), pp.tolist())))
+    return ordenar_por_clasificacion(pareja_ids, totales)
+
+def _puntuar_partida(
+    rng: np.random.Generator,
+    mesas: Sequence[MesaSorteada],
+    habilidad: Optional[np.ndarray],
+    sesgo: float,
+    pg: np.ndarray,
+    pp: np.ndarray,
+    mesas_libres: np.ndarray
+) -> None:
+    """
+    Genera los resultados de todas las mesas de una partida y los acumula.
+
+    Args:
+        rng: Generador aleatorio del torneo
+        mesas: Mesas sorteadas (pareja1, pareja2); pareja2 None es mesa libre
+        habilidad: Nivel de cada pareja, o None en el modo aleatorio
+        sesgo: Peso de la diferencia de nivel en la probabilidad de ganar
+        pg: Partidas ganadas acumuladas (se modifica en el sitio)
+        pp: Puntos acumulados (se modifica en el sitio)
+        mesas_libres: Mesas libres de cada pareja (se modifica en el sitio)
+
+    Note:
+        - Todas las mesas se resuelven a la vez con operaciones vectoriales:
+          probabilidad logística de la diferencia de nivel, ganadora y
+          diferencia de puntos, como en la aplicación (PP positivo para la
+          ganadora y negativo para la perdedora)
+        - Cada pareja juega una sola mesa por partida: los índices no se
+          repiten y basta la suma con índices de NumPy
+    """
+    libres = [pareja1 for pareja1, pareja2 in mesas if pareja2 is None]
+    pares = np.array(
+        [mesa for mesa in mesas if mesa[1] is not None],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    pareja1, pareja2 = pares[:, 0], pares[:, 1]
+
+    if habilidad is None:
+        probabilidad = 0.5
+    else:
+        probabilidad = 1 / (1 + np.exp(-sesgo * (habilidad[pareja1] - habilidad[pareja2])))
+    gana_pareja1 = rng.random(len(pares)) < probabilidad
+    ganadora = np.where(gana_pareja1, pareja1, pareja2)
+    perdedora = np.where(gana_pareja1, pareja2, pareja1)
+    diferencia = rng.integers(1, DIFERENCIA_MAXIMA + 1, len(pares))
+
+    pg[ganadora] += 1
+    pp[ganadora] += diferencia
+    pp[perdedora] -= diferencia
+    pg[libres] += 1
+    pp[libres] += PUNTOS_VICTORIA_MESA_LIBRE
+    mesas_libres[libres] += 1
+
+def simular_torneo(
+    semilla,
+    parejas: int,
+    partidas: int,
+    modo: str = MODO_ALEATORIO,
+    sesgo: float = 1.0,
+    grupo_b: bool = False,
+    porcentaje_grupo_b: float = PORCENTAJE_GRUPO_B,
+    minimo_grupo_b: int = MINIMO_PAREJAS_GRUPO_B,
+    ventana: int = VENTANA_EMPAREJAMIENTO
+) -> Dict[str, Any]:
+    """
+    Juega un torneo completo sin base de datos.
+
+    Args:
+        semilla: Semilla del generador (int o numpy.random.SeedSequence);
+                 misma semilla, mismo torneo
+        parejas: Número de parejas inscritas
+        partidas: Número de partidas del torneo
+        modo: MODO_ALEATORIO o MODO_HABILIDAD
+        sesgo: En MODO_HABILIDAD, peso de la diferencia de nivel (el nivel de
+               cada pareja sigue una normal estándar)
+        grupo_b: Si es True se reparten los grupos A y B al cerrar cada partida
+        porcentaje_grupo_b: Fracción de la clasificación que queda en el grupo A
+        minimo_grupo_b: Parejas mínimas para que haya grupo B (ver grupo_clasificacion)
+        ventana: Posiciones que explora el sorteo suizo para evitar repetir rival
+
+    Returns:
+        dict: Latencias del sorteo y de la ordenación de cada partida (ms) y
+              métricas de calidad: mesas con rival, rivales repetidos, mesas
+              libres, cambios de grupo y, en MODO_HABILIDAD, la correlación de
+              Spearman entre la clasificación final y el nivel real
+
+    Note:
+        Sigue el flujo de la aplicación: la primera partida se sortea en orden
+        aleatorio y, al cerrar cada partida, se ordena la clasificación (y se
+        reparten los grupos, salvo en la última) para sortear la siguiente
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo de simulación no válido: {modo}")
+
+    rng = np.random.default_rng(semilla)
+    pareja_ids = list(range(parejas))
+    habilidad = rng.standard_normal(parejas) if modo == MODO_HABILIDAD else None
+    pg = np.zeros(parejas, dtype=np.int64)
+    pp = np.zeros(parejas, dtype=np.int64)
+    mesas_libres = np.zeros(parejas, dtype=np.int64)
+
+    # El grupo depende solo de la posición: se calcula una vez por posición
+    grupo_b_por_posicion = np.array([
+        grupo_clasificacion(posicion, parejas, porcentaje_grupo_b, minimo_grupo_b) == GrupoJuego.B
+        for posicion in range(1, parejas + 1)
+    ])
+    en_grupo_b: Optional[np.ndarray] = None
+    cambios_grupo = 0
+
+    historial = set()
+    con_mesa_libre = set()
+    sorteo_ms: List[float] = []
+    ranking_ms: List[float] = []
+    mesas_con_rival = 0
+    repeticiones = 0
+
+    orden = rng.permutation(parejas).tolist()
+    for partida in range(1, partidas + 1):
+        inicio = time.perf_counter()
+        mesas = emparejar_suizo(orden, historial, con_mesa_libre, ventana)
+        sorteo_ms.append((time.perf_counter() - inicio) * 1000)
+
+        for pareja1, pareja2 in mesas:
+            if pareja2 is None:
+                con_mesa_libre.add(pareja1)
+                continue
+            clave = clave_enfrentamiento(pareja1, pareja2)
+            if clave in historial:
+                repeticiones += 1
+            historial.add(clave)
+            mesas_con_rival += 1
+
+        _puntuar_partida(rng, mesas, habilidad, sesgo, pg, pp, mesas_libres)
+
+        # Cierre de la partida: clasificación para el siguiente sorteo
+        inicio = time.perf_counter()
+        orden = _ordenar(pareja_ids, pg, pp)
+        ranking_ms.append((time.perf_counter() - inicio) * 1000)
+
+        if grupo_b and partida < partidas:
+            grupos = np.empty(parejas, dtype=bool)
+            grupos[orden] = grupo_b_por_posicion
+            if en_grupo_b is not None:
+                cambios_grupo += int(np.count_nonzero(grupos != en_grupo_b))
+            en_grupo_b = grupos
+
+    fidelidad = None
+    if habilidad is not None and parejas > 1:
+        posicion = np.empty(parejas, dtype=np.int64)
+        posicion[orden] = np.arange(parejas)
+        rango_habilidad = np.argsort(np.argsort(-habilidad))
+        fidelidad = float(np.corrcoef(posicion, rango_habilidad)[0, 1])
+
+    return {
+        "sorteo_ms": sorteo_ms,
+        "ranking_ms": ranking_ms,
+        "mesas": mesas_con_rival,
+        "repeticiones": repeticiones,
+        "mesas_libres": int(mesas_libres.sum()),
+        "mesas_libres_repetidas": int(np.maximum(mesas_libres - 1, 0).sum()),
+        "max_mesas_libres_pareja": int(mesas_libres.max()),
+        "parejas_grupo_b": int(en_grupo_b.sum()) if en_grupo_b is not None else 0,
+        "cambios_grupo": cambios_grupo,
+        "fidelidad_ranking": fidelidad
+    }
+
+def _latencias(valores: List[float]) -> Dict[str, float]:
+    """Percentiles 50 y 99 y máximo de una lista de latencias en milisegundos."""
+    if not valores:
+        return {"p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    p50, p99 = np.percentile(valores, [50, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(max(valores), 3)
+    }
+
+def resumir(torneos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Resume los resultados de varios torneos simulados.
+
+    Args:
+        torneos: Resultados de simular_torneo
+
+    Returns:
+        dict: Latencias del sorteo y de la ordenación (p50, p99 y máximo de
+              todas las partidas), tasa de rivales repetidos, reparto de las
+              mesas libres, cambios de grupo medios y fidelidad media
+    """
+    mesas = sum(t["mesas"] for t in torneos)
+    repeticiones = [t["repeticiones"] for t in torneos]
+    fidelidades = [t["fidelidad_ranking"] for t in torneos if t["fidelidad_ranking"] is not None]
+    return {
+        "torneos": len(torneos),
+        "sorteo": _latencias([ms for t in torneos for ms in t["sorteo_ms"]]),
+        "ranking": _latencias([ms for t in torneos for ms in t["ranking_ms"]]),
+        "mesas": mesas,
+        "repeticiones": sum(repeticiones),
+        "tasa_repeticion": round(sum(repeticiones) / mesas, 6) if mesas else 0.0,
+        "torneos_con_repeticiones": sum(1 for r in repeticiones if r),
+        "repeticiones_max_torneo": max(repeticiones, default=0),
+        "mesas_libres": sum(t["mesas_libres"] for t in torneos),
+        "mesas_libres_repetidas": sum(t["mesas_libres_repetidas"] for t in torneos),
+        "max_mesas_libres_pareja": max((t["max_mesas_libres_pareja"] for t in torneos), default=0),
+        "parejas_grupo_b": max((t["parejas_grupo_b"] for t in torneos), default=0),
+        "cambios_grupo_media": round(float(np.mean([t["cambios_grupo"] for t in torneos])), 2) if torneos else 0.0,
+        "fidelidad_ranking_media": round(float(np.mean(fidelidades)), 4) if fidelidades else None
+    }
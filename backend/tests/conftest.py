@@ -0,0 +1,167 @@
+# Configuración común de las pruebas: base de datos temporal y cliente de la API
+import csv
+import io
+import os
+import random
+import shutil
+import tempfile
+from datetime import date
+from typing import Any, Dict, List
+
+import pytest
+
+_directorio = tempfile.mkdtemp(prefix="tournament_pruebas_")
+
+# El engine de la aplicación se crea al importar app.db.session a partir de la
+# configuración, así que la URL debe fijarse antes de importar la app. Por
+# defecto un archivo SQLite nuevo; TEST_DATABASE_URL permite usar una base de
+# datos PostgreSQL de pruebas (se crean y se borran todas sus tablas)
+os.environ["SQLALCHEMY_DATABASE_URI"] = os.getenv(
+    "TEST_DATABASE_URL",
+    f"sqlite:///{os.path.join(_directorio, 'pruebas.db')}"
+)
+# Sin exportaciones pregeneradas en hilos de fondo al cerrar las partidas
+os.environ["EXPORTACIONES_PREGENERAR"] = "false"
+os.environ["EXPORTACIONES_DIRECTORIO"] = os.path.join(_directorio, "exportaciones")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from app.core.constants import PUNTOS_VICTORIA_MESA_LIBRE  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def esquema():
+    """Crea las tablas al empezar las pruebas y las borra al terminar."""
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+    shutil.rmtree(_directorio, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def client():
+    """Cliente de la API con el ciclo de vida de la aplicación arrancado."""
+    with TestClient(app) as cliente:
+        yield cliente
+
+@pytest.fixture
+def db():
+    """Sesión de la base de datos de pruebas."""
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+
+class ContadorConsultas:
+    """
+    Cuenta las sentencias SQL ejecutadas por el engine de la aplicación.
+
+    Attributes:
+        sentencias (list): Sentencias ejecutadas desde el último reinicio; un
+                           executemany cuenta como una sola
+    """
+
+    def __init__(self):
+        self.sentencias = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.sentencias.append(statement)
+
+    @property
+    def consultas(self) -> int:
+        """Número de sentencias ejecutadas desde el último reinicio."""
+        return len(self.sentencias)
+
+    def reiniciar(self) -> None:
+        """Vuelve a contar desde cero."""
+        self.sentencias = []
+
+@pytest.fixture
+def contador_consultas():
+    """Contador de las consultas SQL de la aplicación durante la prueba."""
+    contador = ContadorConsultas()
+    event.listen(engine, "before_cursor_execute", contador)
+    try:
+        yield contador
+    finally:
+        event.remove(engine, "before_cursor_execute", contador)
+
+def crear_campeonato(client: TestClient, parejas: int, partidas: int = 4, **datos) -> Dict[str, Any]:
+    """
+    Crea un campeonato con sus parejas inscritas mediante la importación masiva.
+
+    Args:
+        client: Cliente de la API
+        parejas: Número de parejas inscritas
+        partidas: Partidas programadas
+        **datos: Otros campos del campeonato (p. ej. grupo_b)
+
+    Returns:
+        dict: Campeonato creado
+    """
+    respuesta = client.post("/api/campeonatos/", json={
+        "nombre": "Campeonato de pruebas",
+        "fecha_inicio": date.today().isoformat(),
+        "dias_duracion": 1,
+        "numero_partidas": partidas,
+        **datos
+    })
+    assert respuesta.status_code == 200, respuesta.text
+    campeonato = respuesta.json()
+
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(["jugador1_nombre", "jugador1_apellido", "jugador2_nombre", "jugador2_apellido", "club"])
+    for n in range(1, parejas + 1):
+        escritor.writerow([f"Jugador {n}A", f"Apellido {n}", f"Jugador {n}B", f"Apellido {n}", f"Club {n % 5}"])
+    respuesta = client.post(
+        f"/api/parejas/importar/{campeonato['id']}",
+        files={"archivo": ("inscripciones.csv", buffer.getvalue().encode("utf-8"), "text/csv")}
+    )
+    assert respuesta.status_code == 200, respuesta.text
+    return campeonato
+
+def resultado_mesa(mesa: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Construye el envío de resultados válido de una mesa con una puntuación aleatoria."""
+    cuerpo = {
+        "mesa_id": mesa["id"],
+        "campeonato_id": mesa["campeonato_id"],
+        "partida": mesa["partida"]
+    }
+    if mesa["pareja2"] is None:
+        cuerpo["pareja1"] = {
+            "id": mesa["pareja1"]["id"],
+            "RP": PUNTOS_VICTORIA_MESA_LIBRE,
+            "PG": 1,
+            "PP": PUNTOS_VICTORIA_MESA_LIBRE,
+            "GB": "A"
+        }
+        return cuerpo
+    perdedora = rng.randint(0, 300)
+    ganadora = perdedora + rng.randint(1, 50)
+    cuerpo["pareja1"] = {"id": mesa["pareja1"]["id"], "RP": ganadora, "PG": 1, "PP": ganadora - perdedora, "GB": "A"}
+    cuerpo["pareja2"] = {"id": mesa["pareja2"]["id"], "RP": perdedora, "PG": 0, "PP": perdedora - ganadora, "GB": "A"}
+    return cuerpo
+
+def sortear(client: TestClient, campeonato_id: int) -> List[Dict[str, Any]]:
+    """Sortea la partida actual y devuelve sus mesas."""
+    respuesta = client.post(f"/api/partidas/sortear-parejas/{campeonato_id}")
+    assert respuesta.status_code == 200, respuesta.text
+    return client.get(f"/api/partidas/{campeonato_id}/mesas").json()
+
+def jugar_partida(client: TestClient, campeonato_id: int, semilla: int = 1) -> List[Dict[str, Any]]:
+    """
+    Registra resultados válidos en todas las mesas de la partida actual.
+
+    Returns:
+        list: Mesas de la partida jugada
+    """
+    rng = random.Random(semilla)
+    mesas = client.get(f"/api/partidas/{campeonato_id}/mesas").json()
+    for mesa in mesas:
+        respuesta = client.post("/api/resultados/", json=resultado_mesa(mesa, rng))
+        assert respuesta.status_code == 200, respuesta.text
+    return mesas
@@ -0,0 +1,95 @@
+# Pruebas de concurrencia: varios campeonatos jugándose a la vez
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.db.bloqueos import bloquear_campeonato
+from app.db.session import engine
+from tests.conftest import crear_campeonato, resultado_mesa, sortear
+
+TORNEOS = 4
+PAREJAS = 9
+PARTIDAS = 3
+
+def _jugar_torneo(client, indice: int) -> dict:
+    """
+    Juega un campeonato completo: sorteo, resultados por lote y cierre de cada partida.
+
+    Returns:
+        dict: Campeonato y mesas de cada partida jugada
+    """
+    rng = random.Random(indice)
+    campeonato = crear_campeonato(client, PAREJAS, partidas=PARTIDAS)
+    mesas_por_partida = {}
+
+    mesas = sortear(client, campeonato["id"])
+    for partida in range(PARTIDAS):
+        mesas_por_partida[partida] = mesas
+        respuesta = client.post("/api/resultados/lote", json={
+            "campeonato_id": campeonato["id"],
+            "partida": partida,
+            "resultados": [
+                {k: v for k, v in resultado_mesa(mesa, rng).items() if k not in ("campeonato_id", "partida")}
+                for mesa in mesas
+            ]
+        })
+        assert respuesta.status_code == 200, respuesta.text
+
+        if partida + 1 < PARTIDAS:
+            respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": partida})
+            assert respuesta.status_code == 200, respuesta.text
+            mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+
+    return {"campeonato": campeonato, "mesas": mesas_por_partida}
+
+def test_torneos_en_paralelo_no_se_mezclan(client):
+    """Varios campeonatos jugados a la vez terminan completos e independientes."""
+    with ThreadPoolExecutor(max_workers=TORNEOS) as pool:
+        torneos = list(pool.map(lambda i: _jugar_torneo(client, i), range(TORNEOS)))
+
+    for torneo in torneos:
+        campeonato_id = torneo["campeonato"]["id"]
+        inscritas = {p["id"] for p in client.get(f"/api/parejas/campeonato/{campeonato_id}").json()}
+        assert len(inscritas) == PAREJAS
+
+        for mesas in torneo["mesas"].values():
+            sentadas = [m[p]["id"] for m in mesas for p in ("pareja1", "pareja2") if m[p]]
+            assert len(mesas) == (PAREJAS + 1) // 2
+            assert sorted(sentadas) == sorted(inscritas)
+
+        ranking = client.get(f"/api/resultados/ranking/{campeonato_id}").json()
+        assert {fila["pareja_id"] for fila in ranking} == inscritas
+        assert all(fila["ultima_partida"] == PARTIDAS - 1 for fila in ranking)
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="SQLite bloquea toda la base de datos: solo PostgreSQL bloquea por campeonato"
+)
+def test_bloqueo_de_un_campeonato_no_detiene_a_otro(client, db):
+    """Con un campeonato bloqueado, otro campeonato sortea sin esperar."""
+    bloqueado = crear_campeonato(client, 4)
+    libre = crear_campeonato(client, 4)
+
+    bloquear_campeonato(db, bloqueado["id"])
+    estados = {}
+    espera = threading.Thread(target=lambda: estados.setdefault(
+        "bloqueado",
+        client.post(f"/api/partidas/sortear-parejas/{bloqueado['id']}").status_code
+    ))
+    espera.start()
+    try:
+        inicio = time.perf_counter()
+        respuesta = client.post(f"/api/partidas/sortear-parejas/{libre['id']}")
+        assert respuesta.status_code == 200, respuesta.text
+        assert time.perf_counter() - inicio < 5
+
+        # El sorteo del campeonato bloqueado sigue esperando al bloqueo
+        espera.join(timeout=0.5)
+        assert espera.is_alive()
+    finally:
+        db.rollback()
+    espera.join()
+    assert estados["bloqueado"] == 200
@@ -0,0 +1,102 @@
+# Pruebas del borrado de campeonatos en segundo plano (purgar_campeonato)
+import threading
+import time
+
+from sqlalchemy import delete, func, select
+
+import app.services.campeonato_service as campeonato_service
+from app.core.constants import EstadoTrabajo
+from app.models.campeonato import Campeonato
+from app.models.mesa import Mesa
+from tests.conftest import crear_campeonato, jugar_partida, sortear
+
+TAMANO_LOTE = 3
+
+def _campeonato_jugado(client) -> dict:
+    """Campeonato con resultados de una partida cerrada y las mesas de la siguiente."""
+    campeonato = crear_campeonato(client, 7, partidas=3)
+    sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"])
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 0})
+    assert respuesta.status_code == 200, respuesta.text
+    return campeonato
+
+def _filas(db, campeonato_id) -> dict:
+    db.rollback()
+    return {
+        Modelo.__tablename__: db.execute(
+            select(func.count(Modelo.id)).where(Modelo.campeonato_id == campeonato_id)
+        ).scalar()
+        for Modelo in campeonato_service.TABLAS_PURGA
+    }
+
+def _esperar(client, respuesta) -> dict:
+    assert respuesta.status_code == 202, respuesta.text
+    url = respuesta.json()["url"]
+    for _ in range(500):
+        trabajo = client.get(url).json()
+        if trabajo["estado"] in (EstadoTrabajo.COMPLETADO, EstadoTrabajo.ERROR):
+            return trabajo
+        time.sleep(0.01)
+    raise AssertionError(f"El trabajo no ha terminado: {trabajo}")
+
+def _listado(client) -> set:
+    return {c["id"] for c in client.get("/api/campeonatos/", params={"limite": 1000}).json()}
+
+def test_eliminar_campeonato_por_lotes(client, db, monkeypatch):
+    campeonato = _campeonato_jugado(client)
+    otro = _campeonato_jugado(client)
+    esperadas = _filas(db, campeonato["id"])
+    assert all(esperadas.values())
+    intactas = _filas(db, otro["id"])
+
+    # La purga espera a que el campeonato se haya comprobado fuera de los listados
+    continuar = threading.Event()
+    purgar = campeonato_service.purgar_campeonato
+    def purgar_retenido(trabajo, campeonato_id):
+        continuar.wait(5)
+        return purgar(trabajo, campeonato_id, tamano_lote=TAMANO_LOTE)
+    monkeypatch.setattr(campeonato_service, "purgar_campeonato", purgar_retenido)
+
+    respuesta = client.delete(f"/api/campeonatos/{campeonato['id']}")
+    try:
+        assert respuesta.status_code == 202
+        assert campeonato["id"] not in _listado(client)
+        assert client.get(f"/api/campeonatos/{campeonato['id']}").status_code == 404
+    finally:
+        continuar.set()
+
+    trabajo = _esperar(client, respuesta)
+    assert trabajo["estado"] == EstadoTrabajo.COMPLETADO, trabajo["error"]
+    assert trabajo["resultado"] == esperadas
+    assert not any(_filas(db, campeonato["id"]).values())
+    assert db.get(Campeonato, campeonato["id"]) is None
+    assert _filas(db, otro["id"]) == intactas
+
+def test_eliminar_de_nuevo_continua_la_purga(client, db, monkeypatch):
+    campeonato = _campeonato_jugado(client)
+    esperadas = _filas(db, campeonato["id"])
+
+    # Primera purga interrumpida al llegar a las mesas: las tablas anteriores
+    # quedan vacías y el resto intactas
+    def delete_interrumpido(Modelo):
+        if Modelo is Mesa:
+            raise RuntimeError("Purga interrumpida")
+        return delete(Modelo)
+    monkeypatch.setattr(campeonato_service, "delete", delete_interrumpido)
+    trabajo = _esperar(client, client.delete(f"/api/campeonatos/{campeonato['id']}"))
+    assert trabajo["estado"] == EstadoTrabajo.ERROR
+
+    pendientes = _filas(db, campeonato["id"])
+    orden = [Modelo.__tablename__ for Modelo in campeonato_service.TABLAS_PURGA]
+    corte = orden.index(Mesa.__tablename__)
+    assert not any(pendientes[tabla] for tabla in orden[:corte])
+    assert all(pendientes[tabla] == esperadas[tabla] for tabla in orden[corte:])
+    assert campeonato["id"] not in _listado(client)
+
+    monkeypatch.undo()
+    trabajo = _esperar(client, client.delete(f"/api/campeonatos/{campeonato['id']}"))
+    assert trabajo["estado"] == EstadoTrabajo.COMPLETADO, trabajo["error"]
+    assert trabajo["resultado"] == pendientes
+    assert not any(_filas(db, campeonato["id"]).values())
+    assert db.get(Campeonato, campeonato["id"]) is None
@@ -0,0 +1,57 @@
+# Pruebas del sorteo suizo (app/core/emparejamiento), sin base de datos
+from app.core.emparejamiento import (
+    clave_enfrentamiento,
+    elegir_mesa_libre,
+    emparejar_suizo,
+    ordenar_por_clasificacion
+)
+
+def _parejas_sentadas(mesas):
+    return [p for mesa in mesas for p in mesa if p is not None]
+
+def test_clave_enfrentamiento_no_depende_del_orden():
+    assert clave_enfrentamiento(7, 3) == clave_enfrentamiento(3, 7) == (3, 7)
+
+def test_ordenar_por_clasificacion():
+    totales = {1: (1, 10), 2: (2, -5), 3: (1, 30), 4: (1, 10)}
+    # PG y PP descendentes, desempate por ID; la pareja 5 no tiene resultados
+    assert ordenar_por_clasificacion([1, 2, 3, 4, 5], totales) == [2, 3, 1, 4, 5]
+
+def test_sin_historial_empareja_por_orden():
+    assert emparejar_suizo([4, 2, 3, 1], set()) == [(4, 2), (3, 1)]
+
+def test_evita_repetir_rival_si_es_posible():
+    mesas = emparejar_suizo([1, 2, 3, 4], {(1, 2)})
+    assert mesas == [(1, 3), (2, 4)]
+
+def test_acepta_la_repeticion_inevitable():
+    assert emparejar_suizo([1, 2], {(1, 2)}) == [(1, 2)]
+
+def test_numero_impar_deja_una_mesa_libre_al_final():
+    orden = [3, 6, 1, 7, 2, 5, 4]
+    mesas = emparejar_suizo(orden, set())
+
+    assert len(mesas) == 4
+    assert mesas[-1] == (4, None)
+    assert all(pareja2 is not None for _, pareja2 in mesas[:-1])
+    assert sorted(_parejas_sentadas(mesas)) == sorted(orden)
+
+def test_mesa_libre_para_la_peor_clasificada_sin_mesa_libre_previa():
+    mesas = emparejar_suizo([1, 2, 3, 4, 5], set(), con_mesa_libre={5, 4})
+    assert mesas[-1] == (3, None)
+    assert sorted(_parejas_sentadas(mesas)) == [1, 2, 3, 4, 5]
+
+def test_mesa_libre_repetida_si_todas_la_tuvieron():
+    assert elegir_mesa_libre([1, 2, 3], {1, 2, 3}) == 3
+
+def test_ventana_agotada_se_repara_intercambiando_rivales():
+    # Con ventana 1 la pareja 3 solo puede mirar a la 4, contra la que ya
+    # jugó; la reparación la intercambia con la mesa anterior
+    historial = {(3, 4)}
+    mesas = emparejar_suizo([1, 2, 3, 4], historial, ventana=1)
+
+    assert mesas == [(1, 3), (2, 4)]
+    assert not any(clave_enfrentamiento(a, b) in historial for a, b in mesas)
+
+def test_sin_parejas():
+    assert emparejar_suizo([], set()) == []
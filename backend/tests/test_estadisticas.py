@@ -0,0 +1,66 @@
+# Pruebas de las estadísticas de las parejas
+from statistics import mean
+
+from app.core.constants import PUNTOS_VICTORIA_MESA_LIBRE
+from app.models.resultado import Resultado
+from tests.conftest import crear_campeonato, jugar_partida, sortear
+
+def _esperadas(resultados) -> dict:
+    """Estadísticas calculadas a mano a partir de los resultados de una pareja."""
+    if not resultados:
+        return {
+            "total_partidas": 0, "victorias": 0, "derrotas": 0, "promedio_PP": 0.0,
+            "mejor_resultado": 0, "peor_resultado": 0, "resultados_por_grupo": {"A": 0, "B": 0}
+        }
+    victorias = sum(1 for r in resultados if r.PG > 0)
+    return {
+        "total_partidas": len(resultados),
+        "victorias": victorias,
+        "derrotas": len(resultados) - victorias,
+        "promedio_PP": mean(r.PP for r in resultados),
+        "mejor_resultado": max(r.RP for r in resultados),
+        "peor_resultado": min(r.RP for r in resultados),
+        "resultados_por_grupo": {g: sum(1 for r in resultados if r.GB == g) for g in ("A", "B")}
+    }
+
+def test_estadisticas_del_campeonato_coinciden_con_las_de_cada_pareja(client, db):
+    campeonato = crear_campeonato(client, 7, partidas=3)
+    mesas = sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"], semilla=3)
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 0})
+    assert respuesta.status_code == 200, respuesta.text
+    jugar_partida(client, campeonato["id"], semilla=4)
+
+    # Pareja inscrita después de jugar: sin resultados
+    respuesta = client.post("/api/parejas/", json={
+        "campeonato_id": campeonato["id"],
+        "jugador1": {"nombre": "Tardía", "apellido": "Uno"},
+        "jugador2": {"nombre": "Tardía", "apellido": "Dos"},
+        "club": "Club"
+    })
+    assert respuesta.status_code == 200, respuesta.text
+    sin_resultados = respuesta.json()["id"]
+
+    respuesta = client.get(f"/api/estadisticas/{campeonato['id']}")
+    assert respuesta.status_code == 200, respuesta.text
+    lote = {fila["pareja_id"]: fila for fila in respuesta.json()}
+    assert len(lote) == 8
+
+    db.rollback()
+    resultados = db.query(Resultado).filter(Resultado.campeonato_id == campeonato["id"]).all()
+    libre = next(m["pareja1"]["id"] for m in mesas if m["pareja2"] is None)
+    for pareja_id, fila in lote.items():
+        propios = [r for r in resultados if r.id_pareja == pareja_id]
+        esperadas = _esperadas(propios)
+
+        individual = client.get(f"/api/estadisticas/{campeonato['id']}/parejas/{pareja_id}")
+        assert individual.status_code == 200, individual.text
+        assert individual.json() == {k: fila[k] for k in esperadas}
+        assert {**individual.json(), "promedio_PP": 0} == {**esperadas, "promedio_PP": 0}
+        assert abs(individual.json()["promedio_PP"] - esperadas["promedio_PP"]) < 1e-9
+
+    # Casos límite cubiertos por el campeonato jugado
+    assert lote[sin_resultados]["total_partidas"] == 0
+    assert lote[libre]["total_partidas"] == 2
+    assert lote[libre]["peor_resultado"] <= PUNTOS_VICTORIA_MESA_LIBRE <= lote[libre]["mejor_resultado"]
+    assert any(fila["mejor_resultado"] != fila["peor_resultado"] for fila in lote.values())
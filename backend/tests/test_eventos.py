@@ -0,0 +1,47 @@
+# Pruebas del distribuidor de eventos en vivo (app/core/eventos)
+import asyncio
+from app.core.eventos import (
+    BrokerEventos,
+    EVENTO_RESINCRONIZAR,
+    EVENTO_RESULTADO,
+    EVENTO_SORTEO
+)
+
+def _tipos(cola: asyncio.Queue):
+    tipos = []
+    while not cola.empty():
+        evento = cola.get_nowait()
+        tipos.append(evento.split("\n")[1].removeprefix("event: "))
+    return tipos
+
+async def _publicar(broker: BrokerEventos, cola: asyncio.Queue, tipos):
+    for tipo in tipos:
+        broker.publicar(1, tipo, {})
+    # Dejar que el bucle ejecute los call_soon_threadsafe pendientes
+    await asyncio.sleep(0)
+    return _tipos(cola)
+
+def test_eventos_en_orden():
+    async def prueba():
+        broker = BrokerEventos(cola_maxima=3)
+        _, cola = broker.suscribir(1)
+        return await _publicar(broker, cola, [EVENTO_SORTEO, EVENTO_RESULTADO])
+
+    assert asyncio.run(prueba()) == [EVENTO_SORTEO, EVENTO_RESULTADO]
+
+def test_cola_llena_se_sustituye_por_resincronizar():
+    async def prueba():
+        broker = BrokerEventos(cola_maxima=3)
+        suscripcion = broker.suscribir(1)
+        _, cola = suscripcion
+        desbordada = await _publicar(broker, cola, [EVENTO_RESULTADO] * 5)
+        # La conexión sigue abierta y recibe los eventos siguientes
+        despues = await _publicar(broker, cola, [EVENTO_RESULTADO])
+        return desbordada, despues, broker.suscriptores(1)
+
+    desbordada, despues, suscriptores = asyncio.run(prueba())
+    # Los eventos que ya no cabían vacían la cola y dejan solo la orden de
+    # recargar, seguida de los que llegan cuando vuelve a haber sitio
+    assert desbordada == [EVENTO_RESINCRONIZAR, EVENTO_RESULTADO]
+    assert despues == [EVENTO_RESULTADO]
+    assert suscriptores == 1
@@ -0,0 +1,101 @@
+# Pruebas del almacén de exportaciones (app/core/artefactos) y de su uso al exportar
+import os
+import random
+
+import app.core.artefactos as artefactos
+from app.core.artefactos import AlmacenArtefactos, almacen_exportaciones, clave_artefacto
+from app.db.version_datos import version_datos
+from app.services.exportacion_service import ExportacionService
+from tests.conftest import crear_campeonato, jugar_partida, resultado_mesa, sortear
+
+def _guardar(almacen, clave, contenido: bytes, nombre="informe.csv"):
+    return b"".join(almacen.guardar(clave, nombre, [contenido[:3], contenido[3:]]))
+
+def _objetos(almacen) -> set:
+    return {
+        sha256
+        for carpeta in os.listdir(almacen._dir_objetos)
+        for sha256 in os.listdir(os.path.join(almacen._dir_objetos, carpeta))
+    }
+
+def test_almacen_guarda_y_retira_versiones(tmp_path, monkeypatch):
+    almacen = AlmacenArtefactos(str(tmp_path))
+    v1 = clave_artefacto(1, "ranking", "csv", 1)
+    v2 = clave_artefacto(1, "ranking", "csv", 2)
+    otro_informe = clave_artefacto(1, "resultados", "csv", 1)
+    otro_campeonato = clave_artefacto(2, "ranking", "csv", 1)
+
+    assert _guardar(almacen, v1, b"version 1") == b"version 1"
+    guardado = almacen.obtener(v1)
+    assert guardado["nombre"] == "informe.csv" and guardado["tamano"] == 9
+    with open(guardado["ruta"], "rb") as f:
+        assert f.read() == b"version 1"
+    _guardar(almacen, otro_informe, b"resultados")
+    _guardar(almacen, otro_campeonato, b"otro campeonato")
+
+    # La versión nueva retira la anterior del mismo informe; su objeto se
+    # conserva durante el periodo de gracia
+    _guardar(almacen, v2, b"version 2")
+    assert almacen.obtener(v1) is None
+    assert almacen.obtener(v2) and almacen.obtener(otro_informe) and almacen.obtener(otro_campeonato)
+    assert guardado["sha256"] in _objetos(almacen)
+
+    # Pasada la gracia, el siguiente guardado borra el objeto huérfano
+    monkeypatch.setattr(artefactos, "ARTEFACTOS_GRACIA", -1)
+    _guardar(almacen, clave_artefacto(1, "ranking", "csv", 3), b"version 3")
+    assert guardado["sha256"] not in _objetos(almacen)
+    assert almacen.obtener(v2) is None
+
+    almacen.eliminar_campeonato(1)
+    assert almacen.obtener(otro_informe) is None
+    assert almacen.obtener(otro_campeonato)
+
+def test_almacen_descarta_archivos_incompletos(tmp_path):
+    almacen = AlmacenArtefactos(str(tmp_path))
+    clave = clave_artefacto(1, "ranking", "csv", 1)
+
+    # Descarga cortada tras el primer bloque
+    bloques = almacen.guardar(clave, "informe.csv", [b"abc", b"def"])
+    next(bloques)
+    bloques.close()
+    assert almacen.obtener(clave) is None
+    assert os.listdir(almacen._dir_tmp) == []
+
+def test_exportar_reutiliza_el_archivo_de_la_misma_version(client, db, monkeypatch):
+    campeonato = crear_campeonato(client, 6)
+    sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"])
+
+    generados = []
+    generar = ExportacionService._generar
+    def contar(self, campeonato_id, informe, formato):
+        generados.append((campeonato_id, informe.value, formato.value))
+        return generar(self, campeonato_id, informe, formato)
+    monkeypatch.setattr(ExportacionService, "_generar", contar)
+
+    url = f"/api/exportar/ranking/{campeonato['id']}"
+    primera = client.get(url, params={"formato": "csv"})
+    segunda = client.get(url, params={"formato": "csv"})
+    assert primera.status_code == segunda.status_code == 200
+    assert segunda.content == primera.content
+    assert generados == [(campeonato["id"], "ranking", "csv")]
+    db.rollback()
+    clave = clave_artefacto(campeonato["id"], "ranking", "csv", version_datos(db, campeonato["id"]))
+    assert almacen_exportaciones.obtener(clave)
+
+    # Corregir un resultado cambia la clave: se genera de nuevo y la versión
+    # anterior deja de estar disponible
+    mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+    respuesta = client.delete(f"/api/resultados/mesa/{mesas[0]['id']}")
+    assert respuesta.status_code == 200, respuesta.text
+    respuesta = client.post("/api/resultados/", json=resultado_mesa(mesas[0], random.Random(99)))
+    assert respuesta.status_code == 200, respuesta.text
+    tercera = client.get(url, params={"formato": "csv"})
+    assert tercera.status_code == 200
+    assert tercera.content != primera.content
+    assert len(generados) == 2
+    db.rollback()
+    nueva = clave_artefacto(campeonato["id"], "ranking", "csv", version_datos(db, campeonato["id"]))
+    assert nueva != clave
+    assert almacen_exportaciones.obtener(nueva)
+    assert almacen_exportaciones.obtener(clave) is None
@@ -0,0 +1,122 @@
+# Pruebas del índice de enfrentamientos y del historial de las parejas
+import random
+
+from app.models.enfrentamiento import Enfrentamiento, filas_enfrentamientos
+from app.models.mesa import Mesa
+from app.services.mesa_service import MesaService
+from tests.conftest import crear_campeonato, resultado_mesa, sortear
+
+def _indice(db, campeonato_id) -> set:
+    """Filas del índice de enfrentamientos del campeonato."""
+    db.expire_all()
+    return {
+        (e.mesa_id, e.partida, e.pareja_id, e.rival_id)
+        for e in db.query(Enfrentamiento).filter(Enfrentamiento.campeonato_id == campeonato_id)
+    }
+
+def _esperado(db, campeonato_id) -> set:
+    """Filas que el índice debe tener según las mesas actuales."""
+    return {
+        (f["mesa_id"], f["partida"], f["pareja_id"], f["rival_id"])
+        for m in db.query(Mesa).filter(Mesa.campeonato_id == campeonato_id)
+        for f in filas_enfrentamientos(m.id, m.campeonato_id, m.partida, m.pareja1_id, m.pareja2_id)
+    }
+
+def test_indice_sigue_a_las_mesas(client, db):
+    campeonato = crear_campeonato(client, 7)
+    otro = crear_campeonato(client, 4)
+    sortear(client, otro["id"])
+    indice_otro = _indice(db, otro["id"])
+
+    # Sorteo por la API (inserción masiva de mesas)
+    mesas = sortear(client, campeonato["id"])
+    assert len(_indice(db, campeonato["id"])) == 7
+    assert _indice(db, campeonato["id"]) == _esperado(db, campeonato["id"])
+
+    # Mesas creadas con el ORM
+    servicio = MesaService(db)
+    servicio.crear_mesas(campeonato["id"], partida=1)
+    assert len(_indice(db, campeonato["id"])) == 14
+    assert _indice(db, campeonato["id"]) == _esperado(db, campeonato["id"])
+
+    # Recolocar parejas: intercambiar rivales y dejar una mesa libre
+    primera, segunda = mesas[0], mesas[1]
+    servicio.asignar_parejas(primera["id"], primera["pareja1"]["id"], segunda["pareja1"]["id"])
+    servicio.asignar_parejas(segunda["id"], primera["pareja2"]["id"], None)
+    assert _indice(db, campeonato["id"]) == _esperado(db, campeonato["id"])
+    assert (segunda["id"], 0, primera["pareja2"]["id"], None) in _indice(db, campeonato["id"])
+
+    # Borrar una mesa con el ORM y después todas por la API
+    db.delete(db.get(Mesa, primera["id"]))
+    db.commit()
+    assert not any(fila[0] == primera["id"] for fila in _indice(db, campeonato["id"]))
+    assert _indice(db, campeonato["id"]) == _esperado(db, campeonato["id"])
+
+    respuesta = client.delete(f"/api/partidas/{campeonato['id']}/mesas")
+    assert respuesta.status_code == 200, respuesta.text
+    assert _indice(db, campeonato["id"]) == set()
+    assert _indice(db, otro["id"]) == indice_otro
+
+def _resultado(mesa, pareja1_rp, pareja2_rp) -> dict:
+    """Envío de resultados de una mesa con las puntuaciones indicadas."""
+    def lado(pareja, rp, rival_rp):
+        return {"id": pareja["id"], "RP": rp, "PG": int(rp > rival_rp), "PP": rp - rival_rp, "GB": "A"}
+    return {
+        "mesa_id": mesa["id"],
+        "campeonato_id": mesa["campeonato_id"],
+        "partida": mesa["partida"],
+        "pareja1": lado(mesa["pareja1"], pareja1_rp, pareja2_rp),
+        "pareja2": lado(mesa["pareja2"], pareja2_rp, pareja1_rp)
+    }
+
+def _cara_a_cara(client, campeonato_id, pareja_id, rival_id) -> dict:
+    respuesta = client.get(f"/api/historial/{campeonato_id}/parejas/{pareja_id}/rivales/{rival_id}")
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+def test_cara_a_cara(client, db):
+    campeonato = crear_campeonato(client, 4, partidas=3)
+    mesas = sortear(client, campeonato["id"])
+
+    # Partida 0: la pareja gana a su rival 150 a 100
+    mesa, otra = mesas
+    pareja, rival = mesa["pareja1"], mesa["pareja2"]
+    client.post("/api/resultados/", json=_resultado(mesa, 150, 100))
+    client.post("/api/resultados/", json=resultado_mesa(otra, random.Random(1)))
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 0})
+    assert respuesta.status_code == 200, respuesta.text
+
+    # Partida 1: el sorteo evita repetir rivales; se recolocan para que
+    # vuelvan a enfrentarse, esta vez con el rival como pareja 1
+    mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+    servicio = MesaService(db)
+    servicio.asignar_parejas(mesas[0]["id"], rival["id"], pareja["id"])
+    servicio.asignar_parejas(mesas[1]["id"], otra["pareja1"]["id"], otra["pareja2"]["id"])
+
+    # Sin resultado, la segunda mesa cuenta como enfrentamiento pero no en el balance
+    balance = _cara_a_cara(client, campeonato["id"], pareja["id"], rival["id"])
+    assert {k: balance[k] for k in ("enfrentamientos", "victorias", "derrotas", "PP", "rival_PP")} == {
+        "enfrentamientos": 2, "victorias": 1, "derrotas": 0, "PP": 50, "rival_PP": -50
+    }
+    assert balance["partidas"][1]["PG"] is None
+
+    # Partida 1: el rival gana 130 a 90
+    mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+    respuesta = client.post("/api/resultados/", json=_resultado(mesas[0], 130, 90))
+    assert respuesta.status_code == 200, respuesta.text
+
+    balance = _cara_a_cara(client, campeonato["id"], pareja["id"], rival["id"])
+    assert {k: balance[k] for k in ("enfrentamientos", "victorias", "derrotas", "PP", "rival_PP")} == {
+        "enfrentamientos": 2, "victorias": 1, "derrotas": 1, "PP": 10, "rival_PP": -10
+    }
+    assert [(p["partida"], p["RP"], p["rival_resultado"]) for p in balance["partidas"]] == [
+        (0, 150, 100), (1, 90, 130)
+    ]
+
+    # Visto desde el rival, el balance es el simétrico
+    inverso = _cara_a_cara(client, campeonato["id"], rival["id"], pareja["id"])
+    assert (inverso["victorias"], inverso["derrotas"], inverso["PP"], inverso["rival_PP"]) == (1, 1, -10, 10)
+
+    # La pareja solo se ha sentado con su rival: con las demás no hay cruces
+    sin_cruce = _cara_a_cara(client, campeonato["id"], pareja["id"], otra["pareja1"]["id"])
+    assert (sin_cruce["enfrentamientos"], sin_cruce["partidas"]) == (0, [])
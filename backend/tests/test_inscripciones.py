@@ -0,0 +1,123 @@
+# Pruebas de la numeración de parejas y de la importación masiva
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl import Workbook
+from sqlalchemy import func, select
+
+import app.services.pareja_service as pareja_service
+from app.models.campeonato import Campeonato
+from app.models.jugador import Jugador
+from app.models.pareja import Pareja
+from tests.conftest import crear_campeonato
+
+COLUMNAS = ["jugador1_nombre", "jugador1_apellido", "jugador2_nombre", "jugador2_apellido", "club"]
+
+def _fila(prefijo: str, n: int) -> list:
+    return [f"{prefijo} {n}A", f"Apellido {n}", f"{prefijo} {n}B", f"Apellido {n}", "Club"]
+
+def _csv(filas) -> tuple:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUMNAS)
+    escritor.writerows(filas)
+    return ("inscripciones.csv", buffer.getvalue().encode("utf-8"), "text/csv")
+
+def _xlsx(filas) -> tuple:
+    libro = Workbook()
+    libro.active.append(COLUMNAS)
+    for fila in filas:
+        libro.active.append(fila)
+    buffer = io.BytesIO()
+    libro.save(buffer)
+    return ("inscripciones.xlsx", buffer.getvalue(), "application/octet-stream")
+
+def _importar(client, campeonato_id, archivo):
+    return client.post(f"/api/parejas/importar/{campeonato_id}", files={"archivo": archivo})
+
+def _inscritas(db, campeonato_id) -> dict:
+    db.rollback()
+    return {
+        "numeros": sorted(db.execute(
+            select(Pareja.numero).where(Pareja.campeonato_id == campeonato_id)
+        ).scalars()),
+        "jugadores": db.execute(
+            select(func.count(Jugador.id)).where(Jugador.campeonato_id == campeonato_id)
+        ).scalar(),
+        "contador": db.get(Campeonato, campeonato_id).ultimo_numero_pareja
+    }
+
+def test_altas_e_importacion_simultaneas_numeran_sin_huecos(client, db):
+    campeonato = crear_campeonato(client, 3)
+
+    def alta(n):
+        respuesta = client.post("/api/parejas/", json={
+            "campeonato_id": campeonato["id"],
+            "jugador1": {"nombre": f"Suelto {n}A", "apellido": f"Apellido {n}"},
+            "jugador2": {"nombre": f"Suelto {n}B", "apellido": f"Apellido {n}"},
+            "club": "Club"
+        })
+        assert respuesta.status_code == 200, respuesta.text
+        return [respuesta.json()["numero"]]
+
+    def importacion(lote):
+        respuesta = _importar(client, campeonato["id"], _csv(_fila(f"Lote {lote}", n) for n in range(5)))
+        assert respuesta.status_code == 200, respuesta.text
+        numeros = [p["numero"] for p in respuesta.json()["parejas"]]
+        # Cada importación recibe un bloque de números consecutivos
+        assert numeros == list(range(numeros[0], numeros[0] + 5))
+        return numeros
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        tareas = [pool.submit(alta, n) for n in range(8)]
+        tareas += [pool.submit(importacion, lote) for lote in range(3)]
+        asignados = [numero for tarea in tareas for numero in tarea.result()]
+
+    total = 3 + 8 + 3 * 5
+    assert sorted(asignados) == list(range(4, total + 1))
+    assert _inscritas(db, campeonato["id"]) == {
+        "numeros": list(range(1, total + 1)),
+        "jugadores": 2 * total,
+        "contador": total
+    }
+
+def test_fila_incompleta_no_inscribe_ninguna_pareja(client, db):
+    campeonato = crear_campeonato(client, 2)
+    antes = _inscritas(db, campeonato["id"])
+
+    filas = [_fila("Nuevo", n) for n in range(4)]
+    filas[2][3] = ""
+    respuesta = _importar(client, campeonato["id"], _csv(filas))
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"] == ["Fila 4: faltan jugador2_apellido"]
+    assert _inscritas(db, campeonato["id"]) == antes
+
+def test_jugador_ya_inscrito_en_xlsx_no_inscribe_ninguna_pareja(client, db):
+    campeonato = crear_campeonato(client, 2)
+    antes = _inscritas(db, campeonato["id"])
+
+    # crear_campeonato inscribe "Jugador 1A Apellido 1"
+    filas = [_fila("Nuevo", 1), _fila("Jugador", 1), _fila("Nuevo", 2)]
+    respuesta = _importar(client, campeonato["id"], _xlsx(filas))
+    assert respuesta.status_code == 400
+    assert len(respuesta.json()["detail"]) == 2
+    assert _inscritas(db, campeonato["id"]) == antes
+
+def test_fallo_a_mitad_de_importacion_deshace_todo(client, db, monkeypatch):
+    campeonato = crear_campeonato(client, 2)
+    antes = _inscritas(db, campeonato["id"])
+
+    # Falla después de reservar números e insertar parejas y jugadores
+    def fallo(*args):
+        raise RuntimeError("Fallo simulado")
+    monkeypatch.setattr(pareja_service, "marcar_modificado", fallo)
+    respuesta = _importar(client, campeonato["id"], _xlsx(_fila("Nuevo", n) for n in range(4)))
+    assert respuesta.status_code == 500
+    assert _inscritas(db, campeonato["id"]) == antes
+
+    # Los números reservados por la importación fallida vuelven a estar libres
+    monkeypatch.undo()
+    respuesta = _importar(client, campeonato["id"], _csv(_fila("Nuevo", n) for n in range(4)))
+    assert respuesta.status_code == 200, respuesta.text
+    assert [p["numero"] for p in respuesta.json()["parejas"]] == [3, 4, 5, 6]
@@ -0,0 +1,25 @@
+# Pruebas de la medición de sentencias SQL por petición (app/core/instrumentacion)
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.instrumentacion import MetricasPeticion, _metricas_actuales, instrumentar_engine
+
+def test_sentencias_fallidas_se_miden_sin_dejar_inicios_pendientes():
+    engine = create_engine("sqlite://")
+    instrumentar_engine(engine)
+    metricas = MetricasPeticion()
+    token = _metricas_actuales.set(metricas)
+    try:
+        with engine.connect() as conexion:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conexion.execute(text("SELECT * FROM tabla_inexistente"))
+            assert conexion.execute(text("SELECT 1")).scalar() == 1
+            assert not conexion.info.get("inicio_consultas")
+    finally:
+        _metricas_actuales.reset(token)
+        engine.dispose()
+
+    assert metricas.consultas == 4
+    assert 0 <= metricas.lenta_ms <= metricas.tiempo_ms
@@ -0,0 +1,71 @@
+# Pruebas de la paginación por cursor (app/core/paginacion)
+import pytest
+
+from app.core.paginacion import CABECERA_SIGUIENTE_CURSOR, CABECERA_TOTAL, codificar_cursor
+from app.services.pareja_service import ParejaService
+from tests.conftest import crear_campeonato
+
+def _recorrer(client, url, limite=2):
+    """Sigue X-Siguiente-Cursor hasta la última página y devuelve los ids y el total."""
+    ids = []
+    total = None
+    parametros = {"limite": limite, "con_total": True}
+    while True:
+        respuesta = client.get(url, params=parametros)
+        assert respuesta.status_code == 200, respuesta.text
+        assert len(respuesta.json()) <= limite
+        ids.extend(fila["id"] for fila in respuesta.json())
+        if total is None:
+            total = int(respuesta.headers[CABECERA_TOTAL])
+        else:
+            assert CABECERA_TOTAL not in respuesta.headers
+        cursor = respuesta.headers.get(CABECERA_SIGUIENTE_CURSOR)
+        if not cursor:
+            return ids, total
+        parametros = {"limite": limite, "cursor": cursor}
+
+@pytest.mark.parametrize("url", ["/api/campeonatos/", "/api/jugadores/parejas"])
+def test_cursor_recorre_todo_sin_huecos_ni_repetidos(client, url):
+    crear_campeonato(client, 5)
+    crear_campeonato(client, 4)
+
+    ids, total = _recorrer(client, url)
+    assert len(ids) == total
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+def test_cursor_descendente(client, db):
+    campeonato = crear_campeonato(client, 7)
+    servicio = ParejaService(db)
+
+    ids = []
+    cursor = None
+    while True:
+        pagina = servicio.get_parejas(cursor=cursor, limite=3, campeonato_id=campeonato["id"], con_total=True)
+        assert pagina.total == 7
+        ids.extend(fila["id"] for fila in pagina.filas)
+        cursor = pagina.siguiente_cursor
+        if not cursor:
+            break
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == 7
+
+def test_total_solo_si_se_pide(client):
+    crear_campeonato(client, 2)
+    respuesta = client.get("/api/campeonatos/", params={"limite": 1})
+    assert CABECERA_TOTAL not in respuesta.headers
+    respuesta = client.get("/api/campeonatos/", params={"limite": 1, "con_total": True})
+    assert int(respuesta.headers[CABECERA_TOTAL]) >= 1
+
+@pytest.mark.parametrize("cursor", [
+    codificar_cursor(["x"]),
+    codificar_cursor([True]),
+    codificar_cursor([1.5]),
+    codificar_cursor([1, 2]),
+    codificar_cursor([]),
+    "no-es-base64!",
+    "e30",
+])
+def test_cursor_no_valido_devuelve_400(client, cursor):
+    respuesta = client.get("/api/campeonatos/", params={"cursor": cursor})
+    assert respuesta.status_code == 400, respuesta.text
@@ -0,0 +1,126 @@
+# Pruebas del router de partidas
+import threading
+import time
+
+from tests.conftest import crear_campeonato, jugar_partida, sortear
+
+def _consultas_tablero(client, contador_consultas, parejas: int) -> int:
+    """Sortea un campeonato de `parejas` parejas y cuenta las consultas del tablero de mesas."""
+    campeonato = crear_campeonato(client, parejas)
+    sortear(client, campeonato["id"])
+
+    contador_consultas.reiniciar()
+    respuesta = client.get(f"/api/partidas/{campeonato['id']}/mesas")
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == parejas // 2
+    return contador_consultas.consultas
+
+def test_tablero_mesas_consultas_constantes(client, contador_consultas):
+    """El tablero de mesas no hace más consultas cuantas más mesas tiene la partida."""
+    assert _consultas_tablero(client, contador_consultas, 6) == \
+        _consultas_tablero(client, contador_consultas, 40)
+
+def test_tablero_mesas_formato(client):
+    """Cada mesa trae sus dos parejas y el indicador de resultados."""
+    campeonato = crear_campeonato(client, 5)
+    mesas = sortear(client, campeonato["id"])
+
+    assert [m["numero"] for m in mesas] == [1, 2, 3]
+    assert all(not m["tieneResultado"] for m in mesas)
+    assert mesas[-1]["pareja2"] is None
+    assert set(mesas[0]["pareja1"]) == {"id", "numero", "nombre", "club"}
+
+def test_sorteos_simultaneos_no_duplican_mesas(client, monkeypatch):
+    """Dos sorteos a la vez de la misma partida: uno sortea y el otro recibe 409."""
+    import app.services.partida_service as partida_service
+
+    campeonato = crear_campeonato(client, 5)
+    emparejar = partida_service.emparejar_suizo
+
+    def emparejar_lento(*args, **kwargs):
+        # Alarga el sorteo para que la otra petición llegue mientras tanto
+        time.sleep(0.3)
+        return emparejar(*args, **kwargs)
+
+    monkeypatch.setattr(partida_service, "emparejar_suizo", emparejar_lento)
+    salida = threading.Barrier(2)
+    estados = []
+
+    def sortear_a_la_vez():
+        salida.wait()
+        estados.append(client.post(f"/api/partidas/sortear-parejas/{campeonato['id']}").status_code)
+
+    hilos = [threading.Thread(target=sortear_a_la_vez) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert sorted(estados) == [200, 409]
+    mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+    assert [m["numero"] for m in mesas] == [1, 2, 3]
+
+def _cerrar_partida(client, **datos):
+    """Juega la partida actual con 10 parejas y la cierra."""
+    campeonato = crear_campeonato(client, 10, **datos)
+    sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"])
+    respuesta = client.post(
+        f"/api/partidas/{campeonato['id']}/cerrar",
+        json={"partida": campeonato["partida_actual"]}
+    )
+    assert respuesta.status_code == 200, respuesta.text
+    return campeonato
+
+def _contar_grupos(client, campeonato):
+    """Cuenta las parejas de cada grupo en el ranking."""
+    grupos = [f["GB"] for f in client.get(f"/api/resultados/ranking/{campeonato['id']}").json()]
+    return {grupo: grupos.count(grupo) for grupo in set(grupos)}
+
+def test_cerrar_partida_divide_grupos_con_grupo_b(client):
+    campeonato = _cerrar_partida(client, grupo_b=True)
+    assert _contar_grupos(client, campeonato) == {"A": 5, "B": 5}
+
+def test_cerrar_partida_sin_grupo_b_no_divide(client):
+    campeonato = _cerrar_partida(client, grupo_b=False)
+    assert _contar_grupos(client, campeonato) == {"A": 10}
+
+def test_reconstruir_conserva_los_grupos_del_cierre(client):
+    """Los resultados guardan el grupo del reparto: reconstruir la clasificación no lo deshace."""
+    campeonato = _cerrar_partida(client, grupo_b=True)
+
+    respuesta = client.post(f"/api/ranking/{campeonato['id']}/reconstruir")
+    assert respuesta.status_code == 200, respuesta.text
+    assert _contar_grupos(client, campeonato) == {"A": 5, "B": 5}
+
+    estadisticas = client.get(f"/api/estadisticas/{campeonato['id']}").json()
+    assert sum(e["resultados_por_grupo"]["B"] for e in estadisticas) == 5
+
+def test_cerrar_ultima_partida_sin_sortear(client, monkeypatch):
+    """La última partida se cierra y se pregeneran sus exportaciones, sin sorteo ni grupos."""
+    import app.services.partida_service as partida_service
+
+    pregeneradas = []
+    monkeypatch.setattr(partida_service, "programar_pregeneracion", pregeneradas.append)
+    campeonato = crear_campeonato(client, 10, partidas=1, grupo_b=True)
+    client.put(f"/api/campeonatos/{campeonato['id']}", json={"partida_actual": 1})
+    sortear(client, campeonato["id"])
+    mesas = client.get(f"/api/partidas/{campeonato['id']}/mesas").json()
+
+    # Con resultados pendientes no se puede cerrar
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 1})
+    assert respuesta.status_code == 400
+
+    jugar_partida(client, campeonato["id"])
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 1})
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json()["partida_actual"] == 1
+    assert respuesta.json()["mesas"] == 0
+    assert pregeneradas == [campeonato["id"]]
+    assert client.get(f"/api/partidas/{campeonato['id']}/mesas").json() == [
+        {**mesa, "tieneResultado": True} for mesa in mesas
+    ]
+    assert _contar_grupos(client, campeonato) == {"A": 10}
+
+    respuesta = client.post(f"/api/partidas/{campeonato['id']}/cerrar", json={"partida": 2})
+    assert respuesta.status_code == 409
@@ -0,0 +1,35 @@
+# Pruebas de la caché del ranking
+from app.models.pareja import Pareja
+from tests.conftest import crear_campeonato, jugar_partida, sortear
+
+def _nombres(client, campeonato_id):
+    respuesta = client.get(f"/api/resultados/ranking/{campeonato_id}")
+    assert respuesta.status_code == 200, respuesta.text
+    return {fila["pareja_id"]: fila["nombre"] for fila in respuesta.json()}
+
+def test_ranking_refleja_la_edicion_de_parejas(client):
+    campeonato = crear_campeonato(client, parejas=4)
+    mesas = sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"])
+    pareja_id = mesas[0]["pareja1"]["id"]
+    assert pareja_id in _nombres(client, campeonato["id"])
+
+    respuesta = client.put(f"/api/parejas/{pareja_id}", json={"nombre": "Pareja renombrada"})
+    assert respuesta.status_code == 200, respuesta.text
+
+    assert _nombres(client, campeonato["id"])[pareja_id] == "Pareja renombrada"
+
+def test_ranking_refleja_escrituras_de_otro_proceso(client, db):
+    # Una escritura hecha con otra sesión no invalida la caché en memoria,
+    # como ocurre con las de otro worker; la versión de datos de la base de
+    # datos deja obsoleta la entrada igualmente
+    campeonato = crear_campeonato(client, parejas=4)
+    mesas = sortear(client, campeonato["id"])
+    jugar_partida(client, campeonato["id"])
+    pareja_id = mesas[0]["pareja2"]["id"]
+    assert pareja_id in _nombres(client, campeonato["id"])
+
+    db.get(Pareja, pareja_id).nombre = "Cambio de otro worker"
+    db.commit()
+
+    assert _nombres(client, campeonato["id"])[pareja_id] == "Cambio de otro worker"
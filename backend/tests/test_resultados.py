@@ -0,0 +1,74 @@
+# Pruebas del registro, la corrección y el borrado de resultados
+import random
+
+from tests.conftest import crear_campeonato, jugar_partida, resultado_mesa, sortear
+
+def _clasificacion(client, campeonato_id):
+    """Ranking del campeonato indexado por ID de pareja."""
+    return {
+        fila["pareja_id"]: fila
+        for fila in client.get(f"/api/resultados/ranking/{campeonato_id}").json()
+    }
+
+def _progreso(client, campeonato_id):
+    return client.get(f"/api/partidas/{campeonato_id}/progreso").json()
+
+def test_editar_resultados_recalcula_clasificacion(client):
+    campeonato = crear_campeonato(client, 4)
+    sortear(client, campeonato["id"])
+    mesa = jugar_partida(client, campeonato["id"])[0]
+    pareja1, pareja2 = mesa["pareja1"]["id"], mesa["pareja2"]["id"]
+
+    # Se corrige el acta: gana la pareja 2 por 30 puntos
+    respuesta = client.put(f"/api/resultados/mesa/{mesa['id']}", json={
+        "mesa_id": mesa["id"],
+        "pareja1": {"id": pareja1, "RP": 100, "PG": 0, "PP": -30, "GB": "A"},
+        "pareja2": {"id": pareja2, "RP": 130, "PG": 1, "PP": 30, "GB": "A"}
+    })
+    assert respuesta.status_code == 200, respuesta.text
+
+    clasificacion = _clasificacion(client, campeonato["id"])
+    assert (clasificacion[pareja1]["PG"], clasificacion[pareja1]["PP"]) == (0, -30)
+    assert (clasificacion[pareja2]["PG"], clasificacion[pareja2]["PP"]) == (1, 30)
+    assert _progreso(client, campeonato["id"])["mesas_pendientes"] == 0
+
+def test_editar_resultados_invalidos(client):
+    campeonato = crear_campeonato(client, 4)
+    sortear(client, campeonato["id"])
+    mesa = jugar_partida(client, campeonato["id"])[0]
+
+    # RP iguales: ninguna pareja gana
+    respuesta = client.put(f"/api/resultados/mesa/{mesa['id']}", json={
+        "mesa_id": mesa["id"],
+        "pareja1": {"id": mesa["pareja1"]["id"], "RP": 100, "PG": 1, "PP": 0, "GB": "A"},
+        "pareja2": {"id": mesa["pareja2"]["id"], "RP": 100, "PG": 0, "PP": 0, "GB": "A"}
+    })
+    assert respuesta.status_code == 400
+
+def test_eliminar_resultados_deja_la_mesa_pendiente(client):
+    campeonato = crear_campeonato(client, 4)
+    sortear(client, campeonato["id"])
+    mesa = jugar_partida(client, campeonato["id"])[0]
+
+    respuesta = client.delete(f"/api/resultados/mesa/{mesa['id']}")
+    assert respuesta.status_code == 200, respuesta.text
+
+    clasificacion = _clasificacion(client, campeonato["id"])
+    assert mesa["pareja1"]["id"] not in clasificacion
+    assert mesa["pareja2"]["id"] not in clasificacion
+    assert _progreso(client, campeonato["id"])["mesas_pendientes"] == 1
+    assert client.delete(f"/api/resultados/mesa/{mesa['id']}").status_code == 404
+
+def test_envio_repetido_devuelve_409(client):
+    """Repetir el envío de una mesa (p. ej. doble clic) no duplica ni suma dos veces."""
+    campeonato = crear_campeonato(client, 4)
+    mesa = sortear(client, campeonato["id"])[0]
+    cuerpo = resultado_mesa(mesa, random.Random(1))
+
+    assert client.post("/api/resultados/", json=cuerpo).status_code == 200
+    clasificacion = _clasificacion(client, campeonato["id"])
+
+    respuesta = client.post("/api/resultados/", json=cuerpo)
+    assert respuesta.status_code == 409
+    assert respuesta.json()["detail"] == "La mesa ya tiene resultados registrados"
+    assert _clasificacion(client, campeonato["id"]) == clasificacion
@@ -0,0 +1,100 @@
+# Pruebas del envío de resultados por lotes (POST /api/resultados/lote)
+import random
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.resultado import Resultado
+from tests.conftest import crear_campeonato, resultado_mesa, sortear
+
+def _lote(mesas, parcial=False):
+    """Cuerpo del envío con resultados válidos para todas las mesas indicadas."""
+    rng = random.Random(1)
+    entradas = []
+    for mesa in mesas:
+        cuerpo = resultado_mesa(mesa, rng)
+        entradas.append({k: cuerpo[k] for k in ("mesa_id", "pareja1", "pareja2") if k in cuerpo})
+    return {
+        "campeonato_id": mesas[0]["campeonato_id"],
+        "partida": mesas[0]["partida"],
+        "resultados": entradas,
+        "parcial": parcial
+    }
+
+def _mesas_pendientes(client, campeonato_id):
+    return client.get(f"/api/partidas/{campeonato_id}/progreso").json()["mesas_pendientes"]
+
+@pytest.fixture
+def mesas(client):
+    """Mesas sorteadas de la primera partida de un campeonato de 7 parejas (la última es mesa libre)."""
+    campeonato = crear_campeonato(client, 7)
+    return sortear(client, campeonato["id"])
+
+def test_lote_valido_con_un_solo_insert(client, mesas, contador_consultas):
+    contador_consultas.reiniciar()
+    respuesta = client.post("/api/resultados/lote", json=_lote(mesas))
+
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json() == {"registradas": [m["id"] for m in mesas], "errores": []}
+    inserts = [s for s in contador_consultas.sentencias if s.lstrip().upper().startswith("INSERT INTO RESULTADOS")]
+    assert len(inserts) == 1
+    assert _mesas_pendientes(client, mesas[0]["campeonato_id"]) == 0
+
+def _rp_iguales(lote):
+    lote["resultados"][0]["pareja2"]["RP"] = lote["resultados"][0]["pareja1"]["RP"]
+
+def _pg_incorrecto(lote):
+    lote["resultados"][0]["pareja1"]["PG"] = 0
+
+def _mesa_libre_sin_150(lote):
+    lote["resultados"][-1]["pareja1"]["RP"] = 120
+
+@pytest.mark.parametrize("estropear", [_rp_iguales, _pg_incorrecto, _mesa_libre_sin_150])
+def test_lote_con_una_mesa_invalida_se_rechaza_entero(client, mesas, estropear):
+    lote = _lote(mesas)
+    estropear(lote)
+    mesa_invalida = lote["resultados"][-1 if estropear is _mesa_libre_sin_150 else 0]["mesa_id"]
+
+    respuesta = client.post("/api/resultados/lote", json=lote)
+
+    assert respuesta.status_code == 400
+    assert [e["mesa_id"] for e in respuesta.json()["detail"]] == [mesa_invalida]
+    assert _mesas_pendientes(client, mesas[0]["campeonato_id"]) == len(mesas)
+
+def test_lote_parcial_registra_las_mesas_validas(client, mesas):
+    lote = _lote(mesas, parcial=True)
+    _rp_iguales(lote)
+
+    respuesta = client.post("/api/resultados/lote", json=lote)
+
+    assert respuesta.status_code == 200, respuesta.text
+    datos = respuesta.json()
+    assert datos["registradas"] == [m["id"] for m in mesas[1:]]
+    assert [e["mesa_id"] for e in datos["errores"]] == [mesas[0]["id"]]
+    assert _mesas_pendientes(client, mesas[0]["campeonato_id"]) == 1
+
+def test_lote_repetido_no_duplica_resultados(client, mesas):
+    assert client.post("/api/resultados/lote", json=_lote(mesas)).status_code == 200
+
+    respuesta = client.post("/api/resultados/lote", json=_lote(mesas, parcial=True))
+
+    assert respuesta.json()["registradas"] == []
+    assert {e["detail"] for e in respuesta.json()["errores"]} == {"La mesa ya tiene resultados registrados"}
+
+def test_resultado_duplicado_viola_la_restriccion_unica(client, mesas, db):
+    assert client.post("/api/resultados/lote", json=_lote(mesas)).status_code == 200
+    mesa = mesas[0]
+
+    db.add(Resultado(
+        campeonato_id=mesa["campeonato_id"],
+        partida=mesa["partida"],
+        mesa_id=mesa["id"],
+        id_pareja=mesa["pareja1"]["id"],
+        RP=100,
+        PG=1,
+        PP=10,
+        GB="A"
+    ))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
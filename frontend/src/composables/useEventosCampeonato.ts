@@ -0,0 +1,84 @@
+import { ref, watch, onUnmounted, type Ref } from 'vue'
+
+/**
+ * Tipos de evento que el servidor envía por /api/eventos/{campeonatoId}
+ */
+export type TipoEventoCampeonato =
+  | 'resultado'
+  | 'resultado_eliminado'
+  | 'gb'
+  | 'sorteo'
+  | 'mesas_eliminadas'
+  | 'partida'
+  | 'resincronizar'
+
+const TIPOS_EVENTO: TipoEventoCampeonato[] = [
+  'resultado',
+  'resultado_eliminado',
+  'gb',
+  'sorteo',
+  'mesas_eliminadas',
+  'partida',
+  'resincronizar'
+]
+
+/**
+ * Se suscribe a los eventos en vivo (server-sent events) de un campeonato.
+ * Sustituye al sondeo periódico: el servidor avisa cuando se registra un
+ * resultado, se sortean las mesas o cambia la partida en juego.
+ *
+ * @param {Ref<number | undefined>} campeonatoId - ID del campeonato a observar;
+ *        al cambiar se cierra la conexión anterior y se abre una nueva
+ * @param {Function} alRecibir - Se llama con el tipo y los datos de cada evento
+ * @returns {{ conectado: Ref<boolean> }} Estado de la conexión
+ *
+ * Note: EventSource reconecta solo si se corta la conexión; al reconectar
+ * se llama a alRecibir con tipo 'partida' para que la vista recargue los
+ * datos completos, ya que los eventos perdidos no se reenvían. Si la vista no
+ * da abasto, el servidor descarta los eventos pendientes y envía uno
+ * 'resincronizar', que también obliga a recargar.
+ */
+export function useEventosCampeonato(
+  campeonatoId: Ref<number | undefined>,
+  alRecibir: (tipo: TipoEventoCampeonato, datos: any) => void
+) {
+  const conectado = ref(false)
+  let fuente: EventSource | null = null
+  let huboConexion = false
+
+  const cerrar = () => {
+    fuente?.close()
+    fuente = null
+    conectado.value = false
+  }
+
+  const abrir = (id: number) => {
+    huboConexion = false
+    fuente = new EventSource(`/api/eventos/${id}`)
+
+    fuente.onopen = () => {
+      conectado.value = true
+      // Tras una reconexión pueden haberse perdido eventos: pedir recarga completa
+      if (huboConexion) alRecibir('partida', {})
+      huboConexion = true
+    }
+    fuente.onerror = () => {
+      conectado.value = false
+    }
+
+    for (const tipo of TIPOS_EVENTO) {
+      fuente.addEventListener(tipo, (evento) => {
+        alRecibir(tipo, JSON.parse((evento as MessageEvent).data))
+      })
+    }
+  }
+
+  watch(campeonatoId, (id) => {
+    cerrar()
+    if (id) abrir(id)
+  }, { immediate: true })
+
+  onUnmounted(cerrar)
+
+  return { conectado }
+}
@@ -44,12 +44,22 @@ export const useCampeonatoStore = defineStore('campeonato', {
 
     /**
      * Obtiene todos los campeonatos desde el servidor
+     * El listado está paginado: se siguen los cursores de X-Siguiente-Cursor
+     * hasta la última página
      * @returns {Promise<Campeonato[]>} Lista de campeonatos
      */
     async fetchCampeonatos() {
       try {
-        const response = await axios.get<Campeonato[]>('/api/campeonatos')
-        this.campeonatos = response.data
+        const campeonatos: Campeonato[] = []
+        let cursor: string | undefined
+        do {
+          const response = await axios.get<Campeonato[]>('/api/campeonatos', {
+            params: { cursor, limite: 1000 }
+          })
+          campeonatos.push(...response.data)
+          cursor = response.headers['x-siguiente-cursor']
+        } while (cursor)
+        this.campeonatos = campeonatos
         return this.campeonatos
       } catch (error) {
         console.error('Error fetching campeonatos:', error)
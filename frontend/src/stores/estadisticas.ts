@@ -42,8 +42,7 @@ export const useEstadisticasStore = defineStore('estadisticas', {
       try {
         // Realiza la petición al servidor para obtener las estadísticas
         const response = await axios.get<ResultadoEstadisticas>(
-          `/api/estadisticas/pareja/${parejaId}`,
-          { params: { campeonato_id: campeonatoId } }
+          `/api/estadisticas/${campeonatoId}/parejas/${parejaId}`
         )
         // Almacena las estadísticas en el estado
         this.estadisticasPorPareja[parejaId] = response.data
@@ -47,8 +47,7 @@ export const useHistorialStore = defineStore('historial', {
       try {
         // Realiza la petición al servidor para obtener el historial
         const response = await axios.get<ResultadoHistorico[]>(
-          `/api/historial/pareja/${parejaId}`,
-          { params: { campeonato_id: campeonatoId } }
+          `/api/historial/${campeonatoId}/parejas/${parejaId}`
         )
         // Almacena el historial en el estado
         this.historialPorPareja[parejaId] = response.data
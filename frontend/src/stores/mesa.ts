@@ -3,12 +3,51 @@ import axios from 'axios'
 import type { Mesa } from '@/types'
 import type { MesaStore, MesaState } from '@/types/store'
 import { useResultadoStore } from './resultado'
+import type { TipoEventoCampeonato } from '@/composables/useEventosCampeonato'
 
 interface RankingItem {
   pareja_id: number
   posicion: number
 }
 
+/**
+ * Aplica un evento en vivo del campeonato a la lista de mesas cargada, sin
+ * volver a pedirla al servidor
+ * @param {Mesa[]} mesas - Mesas de la partida actual (se modifican en el sitio)
+ * @param {TipoEventoCampeonato} tipo - Tipo de evento recibido
+ * @param {any} datos - Contenido del evento
+ * @returns {boolean} false si el evento no se puede aplicar como cambio y hay
+ *          que recargar las mesas completas
+ *
+ * Note: 'resultado' y 'resultado_eliminado' solo cambian el indicador
+ * tieneResultado de sus mesas; 'gb' no afecta a las mesas. Los sorteos, las
+ * mesas eliminadas, los cambios de partida y 'resincronizar' (eventos
+ * perdidos) obligan a recargar la lista entera.
+ */
+export function aplicarEventoMesas(mesas: Mesa[], tipo: TipoEventoCampeonato, datos: any): boolean {
+  const buscar = (mesaId: number) => mesas.find(mesa => mesa.id === mesaId)
+
+  switch (tipo) {
+    case 'resultado': {
+      if (mesas.length > 0 && datos.partida !== mesas[0].partida) return false
+      const afectadas = (datos.mesas || []).map((m: any) => buscar(m.mesa_id))
+      if (afectadas.some((mesa: Mesa | undefined) => !mesa)) return false
+      afectadas.forEach((mesa: Mesa) => { mesa.tieneResultado = true })
+      return true
+    }
+    case 'resultado_eliminado': {
+      const mesa = buscar(datos.mesa_id)
+      if (!mesa) return false
+      mesa.tieneResultado = false
+      return true
+    }
+    case 'gb':
+      return true
+    default:
+      return false
+  }
+}
+
 export const useMesaStore = defineStore('mesa', {
   state: (): MesaState => ({
     mesas: []
@@ -1,5 +1,6 @@
 import { defineStore } from 'pinia'
 import axios from 'axios'
+import type { TipoEventoCampeonato } from '@/composables/useEventosCampeonato'
 
 // Interfaces necesarias
 interface BaseResultado {
@@ -11,9 +12,10 @@ interface BaseResultado {
   nombre: string
   club?: string
   numero: number
+  ultima_partida: number
 }
 
-interface RankingResultado extends BaseResultado {
+export interface RankingResultado extends BaseResultado {
   PG_total: number
   PP_total: number
   posicion: number
@@ -23,6 +25,73 @@ interface ResultadoAcumulado {
   [key: number]: RankingResultado
 }
 
+/**
+ * Ordena el ranking por grupo, PG y PP (descendentes) y numera las posiciones
+ * @param {RankingResultado[]} filas - Una fila por pareja con sus totales
+ * @returns {RankingResultado[]} Nueva lista ordenada con la posición de cada pareja
+ */
+export function ordenarRanking(filas: RankingResultado[]): RankingResultado[] {
+  return [...filas]
+    .sort((a, b) => {
+      if (a.GB !== b.GB) return a.GB.localeCompare(b.GB)
+      if (a.PG_total !== b.PG_total) return b.PG_total - a.PG_total
+      return b.PP_total - a.PP_total
+    })
+    .map((resultado, index) => ({ ...resultado, posicion: index + 1 }))
+}
+
+/**
+ * Aplica un evento en vivo del campeonato al ranking cargado, sin volver a
+ * pedirlo al servidor
+ * @param {RankingResultado[]} ranking - Ranking mostrado actualmente
+ * @param {TipoEventoCampeonato} tipo - Tipo de evento recibido
+ * @param {any} datos - Contenido del evento
+ * @returns {RankingResultado[] | null} Ranking actualizado y reordenado, o null
+ *          si el evento no se puede aplicar como cambio y hay que recargarlo
+ *
+ * Note: los resultados nuevos suman su PG y PP a los totales de cada pareja y
+ * 'gb' cambia el grupo. Las correcciones y los borrados de resultados, las
+ * mesas eliminadas, los cambios de partida, 'resincronizar' (eventos
+ * perdidos) y las parejas que aún no están en el ranking obligan a recargar;
+ * los sorteos no cambian el ranking.
+ */
+export function aplicarEventoRanking(
+  ranking: RankingResultado[],
+  tipo: TipoEventoCampeonato,
+  datos: any
+): RankingResultado[] | null {
+  const filas = new Map(ranking.map(fila => [fila.pareja_id, { ...fila }]))
+
+  switch (tipo) {
+    case 'resultado': {
+      if (datos.correccion) return null
+      for (const mesa of datos.mesas || []) {
+        for (const pareja of [mesa.pareja1, mesa.pareja2]) {
+          if (!pareja) continue
+          const fila = filas.get(pareja.id)
+          if (!fila) return null
+          fila.PG_total += pareja.PG
+          fila.PP_total += pareja.PP
+          fila.PG = fila.PG_total
+          fila.PP = fila.PP_total
+          fila.ultima_partida = datos.partida
+        }
+      }
+      return ordenarRanking([...filas.values()])
+    }
+    case 'gb': {
+      const fila = filas.get(datos.pareja_id)
+      if (!fila) return null
+      fila.GB = datos.GB
+      return ordenarRanking([...filas.values()])
+    }
+    case 'sorteo':
+      return ranking
+    default:
+      return null
+  }
+}
+
 /**
  * Store de Pinia para gestionar los resultados de las partidas del campeonato
  * Proporciona funcionalidades para:
@@ -107,20 +176,11 @@ export const useResultadoStore = defineStore('resultado', {
           return acc
         }, {} as ResultadoAcumulado)
 
-        const resultadosOrdenados = Object.values(parejasTotales).sort((a, b) => {
-          if (a.GB !== b.GB) return a.GB.localeCompare(b.GB)
-          if (a.PG_total !== b.PG_total) return b.PG_total - a.PG_total
-          return b.PP_total - a.PP_total
-        })
-
-        return resultadosOrdenados.map((resultado: RankingResultado, index: number) => ({
+        return ordenarRanking(Object.values(parejasTotales).map((resultado: RankingResultado) => ({
           ...resultado,
           PP: resultado.PP_total,
-          PG: resultado.PG_total,
-          posicion: index + 1,
-          nombre: resultado.nombre,
-          numero: resultado.numero
-        }))
+          PG: resultado.PG_total
+        })))
 
       } catch (error) {
         throw error